@@ -4,9 +4,9 @@
 import os
 import re
 import json
+import time
 import traceback
 import unicodedata
-import inspect   # ✅ 이거 추가
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -36,7 +36,10 @@ from config import (
 from parser import (
     guess_intent,
     preprocess_user_input,
-    
+    nlu_to_pc_input,
+    preprocess_member_query,
+    get_parsed_command,
+    parse_command,
 )
 
 # =================================================
@@ -69,14 +72,32 @@ from service import (
 from utils import (
     normalize_code_query,
     clean_member_query,
-    now_kst, search_member, run_intent_func,
+    now_kst, search_member,
     call_searchMemo, openai_vision_extract_orders,
     normalize_request_data, clean_memo_query,
     clean_order_query,
     fallback_natural_search,
-    format_memo_results
+    format_memo_results,
+    get_intent_handler,
+    upstream_health,
+    get_outbox,
+    stop_outbox,
+    sheet_fetch_stats,
+    start_hot_sheet_refresher,
+    stop_hot_sheet_refresher,
+    get_hot_sheets,
+)
+from utils.outbox import OUTBOX_ENABLED
+from utils.snapshot import SheetSnapshot, sheet_batch_scope, PREFETCH_ENVIRON_KEY
+from utils.log import configure_logging, get_logger
+from utils.metrics import INTENT_LATENCY, render_metrics
+from utils.tracing import TRACE_HEADER, RequestTrace, trace_requested
+from utils.profiling import (
+    PROFILES, PROFILE_HEADER, PROFILE_SLOW_MS, RequestProfile, phase, profile_trigger, token_allowed,
 )
 
+logger = get_logger("app")
+
 # =================================================
 # 프로젝트: routes
 # =================================================
@@ -114,6 +135,8 @@ from routes import (
     order_auto_func,
     save_order_proxy_func,
     addOrders,
+    order_job_status_func,
+    order_extract_stats_func,
 
 
     # 후원수당
@@ -129,6 +152,12 @@ from routes.intent_map import (
     MEMO_INTENTS,
     ORDER_INTENTS,
     COMMISSION_INTENTS,
+    INTENT_REGISTRY,
+    MEMBER_REGISTRY,
+    ORDER_REGISTRY,
+    COMMISSION_REGISTRY,
+    MEMBER_ROUTE_ARGS,
+    intent_target_sheet,
 )
 
 
@@ -167,8 +196,7 @@ PROMPT_VERSION = os.getenv("PROMPT_VERSION")
 # --------------------------------------------------
 MEMBERSLIST_API_URL = os.getenv("MEMBERSLIST_API_URL")
 
-print("✅ OPENAI_API_KEY 세팅됨:", bool(OPENAI_API_KEY))
-print("✅ OPENAI_API_URL:", OPENAI_API_URL)
+logger.info("OPENAI_API_KEY 세팅됨: %s, OPENAI_API_URL: %s", bool(OPENAI_API_KEY), OPENAI_API_URL)
 
 
 
@@ -212,8 +240,8 @@ def plugin_logo():
 
 # ✅ 확인용 출력 (선택)
 if os.getenv("DEBUG", "false").lower() == "true":
-    print("✅ GOOGLE_SHEET_TITLE:", os.getenv("GOOGLE_SHEET_TITLE"))
-    print("✅ GOOGLE_SHEET_KEY 존재 여부:", "Yes" if os.getenv("GOOGLE_SHEET_KEY") else "No")
+    logger.info("GOOGLE_SHEET_TITLE: %s", os.getenv("GOOGLE_SHEET_TITLE"))
+    logger.info("GOOGLE_SHEET_KEY 존재 여부: %s", "Yes" if os.getenv("GOOGLE_SHEET_KEY") else "No")
 
 
 # --------------------------------------------------
@@ -279,14 +307,11 @@ def debug_sheets():
 # 공통 실행 유틸
 # --------------------------------------------------
 def run_intent_func(func, query=None, options=None):
-    """함수 시그니처 검사 후 안전하게 실행"""
-    sig = inspect.signature(func)
-    if len(sig.parameters) == 0:
-        return func()
-    elif len(sig.parameters) == 1:
-        return func(query)
-    else:
-        return func(query, options)
+    """
+    함수 시그니처에 맞춰 안전하게 실행
+    - INTENT_MAP 핸들러는 INTENT_REGISTRY 로 직접 호출하므로, 여기는 그 외 함수용
+    """
+    return get_intent_handler(func)(query, options)
 
 
 
@@ -297,15 +322,99 @@ def run_intent_func(func, query=None, options=None):
 # --------------------------------------------------
 # 요청 전처리
 # --------------------------------------------------
+@app.before_request
+def start_request_timer():
+    """요청 처리 시간 측정 시작 (record_request_metrics 에서 intent 별로 기록)"""
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """요청 처리 시간 → members_intent_duration_seconds{intent, status} (intent 가 없으면 endpoint 이름)"""
+    started = g.get("request_started")
+    if started is not None and request.endpoint != "metrics":
+        intent = g.get("intent") or request.endpoint or "unknown"
+        INTENT_LATENCY.observe(time.perf_counter() - started, intent=intent, status=response.status_code)
+    return response
+
+
+@app.before_request
+def start_request_profile():
+    """
+    요청 프로파일링 (X-Profile 헤더 또는 PROFILE_SAMPLE_RATE 비율)
+    - cProfile 누적시간 상위 함수 + 단계별(parse / sheets / dispatch / serialize) 시간 → /debug/profiles
+    """
+    if request.endpoint == "debug_profiles":
+        return
+    trigger = profile_trigger(request.headers)
+    if trigger:
+        g.request_profile = RequestProfile(request.method, request.path, trigger)
+
+
+@app.after_request
+def finish_request_profile(response):
+    profile = g.pop("request_profile", None)
+    if profile is not None:
+        entry = profile.finish(response.status_code, endpoint=request.endpoint, intent=g.get("intent"))
+        response.headers["X-Profile-Id"] = str(PROFILES.add(entry))
+    return response
+
+
+@app.teardown_request
+def discard_request_profile(exc):
+    """after_request 까지 가지 못한 요청도 cProfile 을 끄고 기록"""
+    profile = g.pop("request_profile", None)
+    if profile is not None:
+        PROFILES.add(profile.finish(500, endpoint=request.endpoint, intent=g.get("intent")))
+
+
+@app.before_request
+def start_request_trace():
+    """
+    외부 호출(gspread / OpenAI / Memberslist …) 추적
+    - TRACE_ENABLED(기본 DEBUG=true) 이거나 X-Trace 요청 헤더 값에 TRACE_TOKEN 이 있으면 추적
+    - 응답 X-Trace 헤더에 요약, X-Trace: body 면 JSON 응답에 _trace 필드도 추가
+    """
+    mode = trace_requested(request.headers)
+    if mode:
+        g.request_trace = RequestTrace()
+        g.request_trace_mode = mode
+
+
+@app.after_request
+def attach_request_trace(response):
+    trace = g.pop("request_trace", None)
+    if trace is None:
+        return response
+    response.headers[TRACE_HEADER] = trace.summary()
+    if g.get("request_trace_mode") == "body" and response.is_json:
+        body = response.get_json(silent=True)
+        if isinstance(body, dict):
+            body["_trace"] = trace.as_dict()
+            response.set_data(app.json.dumps(body))
+    return response
+
+
+@app.before_request
+def open_sheet_snapshot():
+    """
+    요청 단위 시트 스냅샷(unit of work) 연결
+    - 요청 안에서 같은 시트는 한 번만 내려받고, 그 요청의 쓰기는 스냅샷에도 반영
+    - ASGI 서빙(asgi.py)에서 미리 읽어 둔 시트가 있으면 그 스냅샷을 그대로 사용
+    """
+    snapshot = request.environ.get(PREFETCH_ENVIRON_KEY)
+    g.sheet_snapshot = snapshot if snapshot is not None else SheetSnapshot()
+
+
 @app.before_request
 def preprocess_input():
     """
     요청 전처리
-    1. /postIntent → 그대로 통과
+    1. /postIntent, /postIntent/batch → 그대로 통과
     2. POST JSON 입력이 있으면 g.query 에 저장
     3. 자연어(str)만 들어온 경우 → post_intent() 로 우회
     """
-    if request.endpoint == "post_intent":
+    if request.endpoint in ("post_intent", "post_intent_batch"):
         return None
 
     if request.method == "POST":
@@ -343,36 +452,6 @@ def preprocess_input():
 
 
 
-def preprocess_member_query(text: str) -> str:
-    """
-    회원 검색용 전처리
-    - 회원번호, 휴대폰번호, 한글 이름 감지
-    - 불필요한 접두어("회원검색")는 붙이지 않고 원래 값 그대로 반환
-    """
-    text = (text or "").strip()
-
-    # 1. 회원번호 (숫자만)
-    if text.isdigit():
-        print(f"[preprocess_member_query] 회원번호 감지 → {text}")
-        return text
-
-    # 2. 휴대폰 번호 (010-xxxx-xxxx or 010xxxxxxxx)
-    phone_pattern = r"^010[-]?\d{4}[-]?\d{4}$"
-    if re.fullmatch(phone_pattern, text):
-        print(f"[preprocess_member_query] 휴대폰번호 감지 → {text}")
-        return text
-
-    # 3. 한글 이름 (2~4자)
-    name_pattern = r"^[가-힣]{2,4}$"
-    if re.fullmatch(name_pattern, text):
-        print(f"[preprocess_member_query] 한글이름 감지 → {text}")
-        return text
-
-    # 4. 기본 (변경 없음)
-    print(f"[preprocess_member_query] 보정 없음 → {text}")
-    return text
-
-
 def ensure_query_dict(query) -> dict:
     """
     query가 문자열이면 {"raw_text": query}로 감싸고,
@@ -399,7 +478,7 @@ def post_intent():
         data = {}
 
     text = data.get("text") or data.get("query") or ""
-    print(f"[DEBUG] text type: {type(text)}, value: {text}")
+    logger.debug("text type: %s, value: %s", type(text), text)
 
     if isinstance(text, str):
         text = text.strip()
@@ -416,117 +495,229 @@ def post_intent():
             "message": "❌ text 또는 query 필드가 필요합니다."
         }), 400
 
-    # ✅ 1단계: 규칙 기반 intent
-    intent = guess_intent(text)
-    if intent and intent != "unknown":
-        parsed = nlu_to_pc_input(text)
-        g.intent = intent
-        g.query = parsed.get("query", {}) or {}
-        print(f"[INTENT 규칙 기반 처리] intent={intent}, query={g.query}")
-    else:
-        # ✅ 2단계: NLU fallback
-        parsed = nlu_to_pc_input(text)
-        intent = parsed.get("intent", "unknown")
-        g.intent = intent
-        g.query = parsed.get("query", {}) or {}
-        print(f"[INTENT NLU fallback 처리] intent={intent}, query={g.query}")
-
-    # ✅ intent 기반 전처리
-    initial_text = text
-    if intent in ["register_member", "update_member", "delete_member"]:
-        text = clean_member_query(initial_text)
-        text = preprocess_member_query(text)
-    elif intent in ["save_memo", "find_memo", "memo_add", "memo_search"]:
-        text = clean_memo_query(initial_text)
-    elif intent in ["register_order", "update_order", "delete_order", "find_order"]:
-        text = clean_order_query(initial_text)
-    else:
-        text = clean_member_query(initial_text)
-        text = preprocess_member_query(text)
-
-    # ✅ NLU 재분석 (전처리 후 → NLU 보강)
-    parsed = nlu_to_pc_input(text)
-    refined_intent = parsed.get("intent")
-    if (not intent or intent == "unknown") and refined_intent and refined_intent != "unknown":
-        intent = refined_intent
-        g.intent = intent
-        g.query = parsed.get("query", {}) or {}
-
-    # ✅ 여기 추가 (raw_text 세팅)
-    if isinstance(g.query, dict):
-        g.query["raw_text"] = initial_text  # 원본 자연어 그대로 저장    
-        
-    
-    print(f"[INTENT 최종 확정 결과] intent={intent}, query={g.query}")
+    # ✅ 요청당 1회 파싱 (규칙 → NLU fallback → 전처리 → NLU 보강)
+    #    결과는 g.parsed_command 에 저장되어 라우트/intent 함수에서 재사용
+    cmd = get_parsed_command(text)
+    intent = cmd.intent
+    text = cmd.cleaned_text
+    g.intent = intent
+    g.query = cmd.query_dict()
 
+    logger.debug("INTENT 최종 확정 결과 intent=%s, query=%s", intent, g.query)
 
-    # ✅ keywords 보정 (검색어 → keywords로 변환)
-    if intent == "memo_search":
-        if isinstance(g.query, dict):
-            if "검색어" in g.query and isinstance(g.query["검색어"], str):
-                g.query["keywords"] = g.query["검색어"].strip().split()
-                del g.query["검색어"]
-            elif "keywords" not in g.query:
-                g.query["keywords"] = []
+    try:
+        payload, status = execute_intent(intent, text)
+        with phase("serialize"):
+            return jsonify(payload), status
 
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            "status": "error",
+            "message": f"post_intent 처리 중 오류 발생: {str(e)}"
+        }), 500
 
 
+def execute_intent(intent: str, text: str):
+    """
+    확정된 intent 실행 → (응답 payload, http status)
+    - g.query / g.intent 는 호출 전에 세팅되어 있어야 함
+    - postIntent, postIntent/batch 공용
+    """
+    # ✅ 특정 intent 직접 처리
+    if intent == "member_select":
+        name_match = re.match(r"([가-힣]{2,4})(?:\s*(전체정보|상세|info))?", text)
+        if name_match:
+            member_name = name_match.group(1)
+            logger.debug("세션 없이 '%s' 전체정보 검색 시도", member_name)
+
+            results = find_member_logic(member_name)
+            if results.get("status") == "success":
+                return {
+                    "status": "success",
+                    "message": "회원 전체정보입니다.",
+                    "results": results["results"],
+                    "http_status": 200
+                }, 200
+            return results, results.get("http_status", 400)
 
+        return {
+            "status": "error",
+            "message": "회원 이름을 추출할 수 없습니다.",
+            "http_status": 400
+        }, 200
 
+    # ✅ 일반 intent 실행 (레지스트리 조회 + 직접 호출)
+    handler = INTENT_REGISTRY.get(intent)
+    if not handler:
+        return {
+            "status": "error",
+            "message": f"❌ 처리할 수 없는 intent입니다. (intent={intent})"
+        }, 400
 
-    try:
-        # ✅ 특정 intent 직접 처리
-        if intent == "member_select":
-            import re
-            name_match = re.match(r"([가-힣]{2,4})(?:\s*(전체정보|상세|info))?", text)
-            if name_match:
-                member_name = name_match.group(1)
-                print(f"[AUTO] 세션 없이 '{member_name}' 전체정보 검색 시도")
-
-                results = find_member_logic(member_name)
-                if results.get("status") == "success":
-                    return jsonify({
-                        "status": "success",
-                        "message": "회원 전체정보입니다.",
-                        "results": results["results"],
-                        "http_status": 200
-                    }), 200
-                else:
-                    return jsonify(results), results.get("http_status", 400)
+    result = handler(text, {})
 
-            return jsonify({
-                "status": "error",
-                "message": "회원 이름을 추출할 수 없습니다.",
-                "http_status": 400
-            })
+    if isinstance(result, dict):
+        return result, result.get("http_status", 200)
+    if isinstance(result, list):
+        return result, 200
 
-        # ✅ 일반 intent 실행
-        func = INTENT_MAP.get(intent)
-        if not func:
-            return jsonify({
-                "status": "error",
-                "message": f"❌ 처리할 수 없는 intent입니다. (intent={intent})"
-            }), 400
+    return {
+        "status": "error",
+        "message": "알 수 없는 반환 형식"
+    }, 500
 
-        result = run_intent_func(func, text, {})
 
-        if isinstance(result, dict):
-            return jsonify(result), result.get("http_status", 200)
-        if isinstance(result, list):
-            return jsonify(result), 200
 
+
+
+
+# --------------------------------------------------------------------
+# postIntent/batch (여러 명령 한 번에 처리)
+# --------------------------------------------------------------------
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "50"))
+
+
+@app.route("/postIntent/batch", methods=["POST"])
+def post_intent_batch():
+    """
+    여러 명령을 한 요청으로 처리
+    - 입력: ["홍길동", "이태수 상담일지 저장 ..."] 또는 {"items": [...]}
+      · 문자열 / {"text"|"query": "..."} → 자연어
+      · {"intent": "...", ...}            → 구조화 (query dict 또는 본문 그대로 사용)
+    - 대상 시트별로 묶어서 실행, 읽기는 하나의 스냅샷 공유
+    - 쓰기(일지 저장)는 시트별 1회 insert_rows 로 반영
+    - 결과는 입력 순서 그대로, 항목별 status 포함
+    """
+    raw = request.get_json(silent=True)
+    items = raw.get("items") if isinstance(raw, dict) else raw
+
+    if not isinstance(items, list) or not items:
         return jsonify({
             "status": "error",
-            "message": "알 수 없는 반환 형식"
-        }), 500
+            "message": "❌ items 는 비어 있지 않은 리스트여야 합니다.",
+            "http_status": 400
+        }), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({
+            "status": "error",
+            "message": f"❌ 한 번에 최대 {BATCH_MAX_ITEMS}건까지 처리할 수 있습니다. (요청={len(items)})",
+            "http_status": 400
+        }), 400
+
+    plans = [_plan_batch_item(i, item) for i, item in enumerate(items)]
+
+    # ✅ 대상 시트별 그룹 (처음 등장한 순서), 그룹 안에서는 입력 순서
+    group_rank = {}
+    for plan in plans:
+        group_rank.setdefault(plan["sheet"], len(group_rank))
+    run_order = sorted(range(len(plans)), key=lambda i: (group_rank[plans[i]["sheet"]], i))
+
+    results = [None] * len(plans)
+    with sheet_batch_scope() as (snapshot, write_batch):
+        for i in run_order:
+            write_batch.tag = i
+            results[i] = _run_batch_item(plans[i])
+        write_batch.tag = None
+        writes = write_batch.flush()
+
+    # ✅ 쓰기 실패한 시트에 속한 항목은 error 로 정정
+    for sheet_name, outcome in writes.items():
+        if outcome["status"] == "success":
+            continue
+        for i in outcome["tags"]:
+            if results[i]["status"] == "success":
+                results[i].update({
+                    "status": "error",
+                    "http_status": 500,
+                    "message": f"❌ '{sheet_name}' 시트 저장 실패: {outcome.get('message')}",
+                })
+
+    failed = sum(1 for r in results if r["status"] != "success")
+    return jsonify({
+        "status": "success" if failed == 0 else "partial",
+        "count": len(results),
+        "failed": failed,
+        "results": results,
+        "sheets": {
+            "read": snapshot.sheet_names,
+            "write": {k: {kk: vv for kk, vv in v.items() if kk != "tags"} for k, v in writes.items()},
+        },
+        "http_status": 200,
+    }), 200
+
+
+def _plan_batch_item(index: int, item) -> dict:
+    """배치 항목 1건 → 실행 계획 (intent / 입력 / 대상 시트)"""
+    plan = {"index": index, "input": item, "intent": None, "text": "",
+            "query": {}, "command": None, "error": None, "sheet": None}
+
+    if isinstance(item, dict) and item.get("intent"):
+        query = item["query"] if isinstance(item.get("query"), dict) else item
+        plan.update(intent=item["intent"], query=query)
+    else:
+        text = (item.get("text") or item.get("query")) if isinstance(item, dict) else item
+        if not isinstance(text, str) or not text.strip():
+            plan["error"] = "❌ 문자열 명령(text/query) 또는 intent 가 필요합니다."
+            return plan
+        cmd = parse_command(text)
+        plan.update(intent=cmd.intent, text=cmd.cleaned_text, command=cmd, query=cmd.slots)
+
+    plan["sheet"] = intent_target_sheet(plan["intent"], plan["query"])
+    return plan
+
 
+def _run_batch_item(plan: dict) -> dict:
+    """실행 계획 1건 실행 → 항목별 결과 (예외는 항목 단위로 격리)"""
+    entry = {"index": plan["index"], "intent": plan["intent"], "sheet": plan["sheet"]}
+    if plan["error"]:
+        return {**entry, "status": "error", "http_status": 400, "message": plan["error"]}
+
+    saved = {k: g.get(k) for k in ("query", "intent", "parsed_command")}
+    try:
+        cmd = plan["command"]
+        g.intent = plan["intent"]
+        if cmd is not None:
+            g.parsed_command = cmd
+            g.query = cmd.query_dict()
+            payload, status = execute_intent(cmd.intent, plan["text"])
+        else:
+            payload, status = _execute_structured_intent(plan["intent"], dict(plan["query"]))
     except Exception as e:
         import traceback
         traceback.print_exc()
-        return jsonify({
+        payload, status = {"message": f"처리 중 오류 발생: {str(e)}"}, 500
+    finally:
+        for k, v in saved.items():
+            setattr(g, k, v)
+
+    ok = status < 400 and not (isinstance(payload, dict) and payload.get("status") == "error")
+    return {**entry, "status": "success" if ok else "error", "http_status": status, "result": payload}
+
+
+def _execute_structured_intent(intent: str, query: dict):
+    """구조화 항목 실행 (/member, /memo 라우트와 같은 인자 규칙)"""
+    g.query = query
+    handler = INTENT_REGISTRY.get(intent)
+    if not handler:
+        return {
             "status": "error",
-            "message": f"post_intent 처리 중 오류 발생: {str(e)}"
-        }), 500
+            "message": f"❌ 처리할 수 없는 intent입니다. (intent={intent})"
+        }, 400
+
+    if intent == "memo_add" and "내용" in query:
+        # /memo 와 동일: JSON 저장은 add_counseling 으로 처리
+        handler = INTENT_REGISTRY["add_counseling"]
+
+    make_arg = MEMBER_ROUTE_ARGS.get(intent)
+    result = handler(make_arg(query) if make_arg else query)
+
+    if isinstance(result, dict):
+        return result, result.get("http_status", 200)
+    if isinstance(result, list):
+        return result, 200
+    return {"status": "error", "message": "알 수 없는 반환 형식"}, 500
 
 
 
@@ -557,12 +748,12 @@ def guess_intent_entry():
         return jsonify({"status": "error", "message": f"❌ intent 추출 실패 (query={normalized_query})"}), 400
 
     # 3. 실행 함수 매핑
-    func = INTENT_MAP.get(intent)
-    if not func:
+    handler = INTENT_REGISTRY.get(intent)
+    if not handler:
         return jsonify({"status": "error", "message": f"❌ 처리할 수 없는 intent입니다. (intent={intent})"}), 400
 
     # 4. 실행
-    result = run_intent_func(func, normalized_query, options)
+    result = handler(normalized_query, options)
 
     if isinstance(result, dict):
         return jsonify(result), result.get("http_status", 200)
@@ -570,248 +761,6 @@ def guess_intent_entry():
         return jsonify(result), 200
 
     return jsonify({"status": "error", "message": "알 수 없는 반환 형식"}), 500
-
-
-
-
-
-
-
-# ======================================================================================
-# nlu_to_pc_input 엔드포인트
-# ======================================================================================
-def nlu_to_pc_input(text: str) -> dict:
-    """
-    자연어 입력을 intent + query(dict) 구조로 변환
-    - guess_intent + nlu_to_pc_input 통합
-    - 회원 / 메모 / 주문 intent 지원
-    """
-    text = (text or "").strip()
-
-
-
-
-    # -------------------------------
-    # 회원 관련
-    # -------------------------------
-    # 회원 등록
-    if any(word in text for word in ["회원등록", "회원추가", "회원 등록", "회원 추가"]):
-        # ✅ 케이스3: "<이름> 회원 등록 ..." → 이름 + 나머지
-        print("[DEBUG] 회원등록 케이스3 매치 시도:", text)
-        # 더 안전한 대안 (이름에서 '회원'이 분리된 경우만 추출)
-        m = re.match(r"(?<!\S)([가-힣]{2,10})\s+회원\s*(등록|추가)\s*(.*)", text)
-
-        if m:
-            print("[DEBUG] 회원등록 케이스3 성공:", m.groups())
-            member_name, _, extra = m.groups()
-            return {
-                "intent": "register_member",
-                "query": {
-                    "회원명": member_name.strip(),
-                    "raw_text": extra.strip()
-                }
-            }
-
-        # 케이스1: "<이름> 회원등록"
-        m = re.search(r"([가-힣]{2,10})\s*(회원등록|회원추가|회원 등록|회원 추가)", text)
-        if m:
-            return {
-                "intent": "register_member",
-                "query": {
-                    "회원명": m.group(1),
-                    "raw_text": text   # ✅ 꼭 포함해야 함!
-                }
-            }
-
-
-
-        # 케이스2: "회원등록 <이름>"
-        m = re.search(r"(회원등록|회원추가|회원 등록|회원 추가)\s*([가-힣]{2,10})", text)
-        if m:
-            return {
-                "intent": "register_member",
-                "query": {
-                    "회원명": m.group(2),
-                    "raw_text": text   # ✅ 꼭 포함해야 함!
-                }
-            }
-
-
-
-        # fallback
-        return {"intent": "register_member", "query": {"raw_text": text}}
-
-
-
-
-
-
-
-    # 회원 수정
-    if any(word in text for word in ["수정", "회원수정", "회원변경", "회원 수정", "회원 변경"]):
-        return {
-            "intent": "update_member",
-            "query": {
-                "raw_text": text
-            }
-        }
-
-
-
-
-
-
-    # 회원 삭제
-    if any(word in text for word in ["회원삭제", "회원제거", "회원 삭제", "회원 제거", "삭제", "제거"]):
-        # "회원삭제 이판주", "이판주 삭제", "이판주 회원삭제", "삭제 이판주" 등 위치에 관계없이 추출
-        m = re.search(r"(?:회원)?\s*([가-힣]{2,4})\s*(?:회원)?\s*(삭제|제거)", text)
-        if m:
-            return {"intent": "delete_member", "query": {"회원명": m.group(1)}}
-        return {"intent": "delete_member", "query": {"raw_text": text}}
-
-    # 회원 조회 / 검색 (동의어 지원)
-    if any(word in text for word in ["회원조회", "회원검색", "검색회원", "조회회원", "회원 조회", "회원 검색", "검색 회원", "조회 회원"]):
-    # 이름까지 붙었는지 확인
-        m = re.search(r"(회원\s*(검색|조회)\s*)([가-힣]{2,4})", text)
-        if m:
-            return {"intent": "search_member", "query": {"회원명": m.group(3)}}
-        
-        return {"intent": "search_member", "query": {"raw_text": text}}
-    
-    # 코드 검색 (코드a, 코드 b, 코드AA...)
-    normalized = normalize_code_query(text)
-    if normalized.startswith("코드"):
-        return {"intent": "search_member", "query": {"코드": normalized}}
-
-    # 회원명 + "회원"
-    m = re.search(r"([가-힣]{2,4})\s*회원", text)
-    if m:
-        return {"intent": "search_member", "query": {"회원명": m.group(1)}}
-
-    # 회원번호
-    if re.fullmatch(r"\d{5,8}", text):
-        return {"intent": "search_member", "query": {"회원번호": text}}
-
-    # 휴대폰번호
-    if re.fullmatch(r"(010-\d{3,4}-\d{4}|010\d{7,8})", text):
-        return {"intent": "search_member", "query": {"휴대폰번호": text}}
-
-    # 특수번호
-    m = re.search(r"특수번호\s*([a-zA-Z0-9!@#]+)", text)
-    if m:
-        return {"intent": "search_member", "query": {"특수번호": m.group(1)}}
-
-    # -------------------------------
-    # 메모/일지 관련
-    # -------------------------------
-    # 메모 저장
-    m = re.match(r"(\S+)\s+(개인일지|상담일지|활동일지|개인 일지|상담 일지|활동 일지)\s+저장\s+(.+)", text)
-    if m:
-        member_name, diary_type, content = m.groups()
-        return {"intent": "memo_add", "query": {"회원명": member_name, "일지종류": diary_type, "내용": content}}
-
-    # 메모 검색 (회원명 + 일지종류 + 검색)
-    m = re.match(r"(\S+)\s+(개인일지|상담일지|활동일지|개인 일지|상담 일지|활동 일지)\s+(검색|조회)\s+(.+)", text)
-    if m:
-        member_name, diary_type, _, keyword = m.groups()
-        return {"intent": "memo_search", "query": {"회원명": member_name, "일지종류": diary_type, "검색어": keyword}}
-
-    # 전체 메모 검색
-    m = re.match(r"전체\s*(메모|일지)\s*(검색|조회)\s*(.+)", text)
-    if m:
-        keyword = m.group(3)
-        return {"intent": "memo_search", "query": {"회원명": "전체", "일지종류": "전체", "검색어": keyword}}
-
-    # -------------------------------
-    # 주문 관련
-    # -------------------------------
-    order_text = text.replace("제품주문", "주문")
-
-    if "주문" in order_text:
-        # 등록/추가/저장
-        if any(word in order_text for word in ["등록", "추가", "저장"]):
-            m = re.search(r"([가-힣]{2,4}).*(제품)?주문", order_text)
-            if m:
-                return {"intent": "order_upload_pc", "query": {"회원명": m.group(1)}}
-            return {"intent": "order_upload_pc", "query": {"raw_text": text}}
-
-        # 수정/변경/업데이트
-        if any(word in order_text for word in ["수정", "변경", "업데이트"]):
-            m = re.search(r"([가-힣]{2,4}).*(제품)?주문.*(수정|변경|업데이트)", order_text)
-            if m:
-                return {"intent": "update_order", "query": {"회원명": m.group(1)}}
-            return {"intent": "update_order", "query": {"raw_text": text}}
-
-        # 삭제/취소
-        if any(word in order_text for word in ["삭제", "취소"]):
-            m = re.search(r"([가-힣]{2,4}).*(제품)?주문.*(삭제|취소)", order_text)
-            if m:
-                return {"intent": "delete_order", "query": {"회원명": m.group(1)}}
-            return {"intent": "delete_order", "query": {"raw_text": text}}
-
-        # 단순 "홍길동 주문"
-        m = re.search(r"([가-힣]{2,4}).*(제품)?주문", order_text)
-        if m:
-            return {"intent": "order_auto", "query": {"주문회원": m.group(1)}}
-
-        # 그냥 "주문"
-        return {"intent": "order_auto", "query": {"주문": True}}
-    
-
-    # -------------------------------
-    # 회원 저장 (업서트)
-    # -------------------------------
-    if "회원 저장" in text:
-        return {"intent": "save_member", "query": {"raw_text": text}}
-
-
-    # -------------------------------
-    # 후원수당
-    # -------------------------------
-    if "후원수당" in text or "수당" in text:
-        return {"intent": "commission_find", "query": {"raw_text": text}}
-
-    # -------------------------------
-    # 기본 반환
-    # -------------------------------
-    parts = text.split()
-    result = {}
-    for part in parts:
-        parsed = fallback_natural_search(part)
-        result.update(parsed)
-
-    if result.get("회원명") and (result.get("회원번호") or result.get("휴대폰번호")):
-        return {
-            "intent": "register_member",
-            "query": result
-        }
-
-    return {"intent": "unknown", "query": {"raw_text": text}}
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
 
 
 
@@ -837,39 +786,8 @@ def member_route():
     intent = data.get("intent")
 
     # ✅ (1) intent 직접 지정된 경우
-    if intent and intent in MEMBER_INTENTS:
-        func = MEMBER_INTENTS[intent]
-
-        if intent in ("register_member", "update_member", "save_member"):
-            result = func(data)
-
-        elif intent == "search_member":
-            name = (
-                data.get("회원명")
-                or data.get("name")
-                or data.get("member_name")
-                or data.get("query")
-                or ""
-            )
-            result = func(name)
-
-        elif intent in ("delete_member", "delete_member_field_nl_func"):
-            result = func()
-
-        elif intent in ("member_select", "select_member"):
-            choice = data.get("choice") or g.query.get("choice", "")
-            result = func(choice)
-
-        elif intent == "search_by_code_logic":
-            code = data.get("코드") or data.get("code") or ""
-            result = func(code)
-
-        elif intent in ("summary_member", "compact_member"):
-            result = func()
-
-        else:
-            result = func()
-
+    if intent and intent in MEMBER_REGISTRY:
+        result = _run_member_intent(intent, data)
         return jsonify(result), result.get("http_status", 200)
 
     # ✅ (2) intent가 없을 경우 자연어 쿼리 자동 분석
@@ -903,47 +821,31 @@ def member_route():
                 return post_intent()
 
     # ✅ (3) fallback: intent 추론된 상태에서 처리
-    func = MEMBER_INTENTS.get(intent)
-    if not func:
+    if intent not in MEMBER_REGISTRY:
         result = {
             "status": "error",
             "message": f"❌ 처리할 수 없는 회원 intent입니다. (intent={intent})",
             "http_status": 400,
         }
     else:
-        if intent in ("register_member", "update_member", "save_member"):
-            result = func(data)
-        elif intent == "search_member":
-            name = (
-                data.get("회원명")
-                or data.get("name")
-                or data.get("member_name")
-                or data.get("query")
-                or ""
-            )
-            result = func(name)
-        elif intent in ("delete_member", "delete_member_field_nl_func"):
-            result = func()
-        elif intent in ("member_select", "select_member"):
-            choice = data.get("choice") or g.query.get("choice", "")
-            result = func(choice)
-        elif intent == "search_by_code_logic":
-            code = data.get("코드") or data.get("code") or ""
-            result = func(code)
-        else:
-            result = func()
+        result = _run_member_intent(intent, data)
 
+    # ✅ 결과 None 방지 (Flask 안전 반환)
+    if not result:
+        return jsonify({
+            "status": "error",
+            "message": f"❌ {intent or 'unknown'} intent 처리 결과가 비어 있습니다.",
+            "http_status": 500
+        }), 500
 
+    return jsonify(result), result.get("http_status", 200)
 
-        # ✅ 결과 None 방지 (Flask 안전 반환)
-        if not result:
-            return jsonify({
-                "status": "error",
-                "message": f"❌ {intent or 'unknown'} intent 처리 결과가 비어 있습니다.",
-                "http_status": 500
-            }), 500
 
-        return jsonify(result), result.get("http_status", 200)
+def _run_member_intent(intent: str, data: dict):
+    """회원 intent 실행 (인자는 MEMBER_ROUTE_ARGS, 호출 방식은 레지스트리 기준)"""
+    make_arg = MEMBER_ROUTE_ARGS.get(intent)
+    arg = make_arg(data) if make_arg else None
+    return MEMBER_REGISTRY[intent](arg)
 
 
 
@@ -1070,7 +972,7 @@ def order_route():
         if hasattr(request, "files") and request.files:
             if not hasattr(g, "query") or not isinstance(g.query, dict):
                 g.query = {"intent": "order_upload_pc", "query": {}}
-            result = ORDER_INTENTS.get("order_upload_pc", order_upload_pc_func)()
+            result = ORDER_REGISTRY["order_upload_pc"]()
 
 
             if isinstance(result, dict):
@@ -1093,15 +995,15 @@ def order_route():
 
         # 2) intent 기반 실행
         intent = data.get("intent")
-        func = ORDER_INTENTS.get(intent)
+        handler = ORDER_REGISTRY.get(intent)
 
-        if not func:
+        if not handler:
             return jsonify({
                 "status": "error",
                 "message": f"❌ 처리할 수 없는 주문 intent입니다. (intent={intent})",
             }), 400
 
-        result = func()
+        result = handler()
 
         # ✅ 결과 처리
         if isinstance(result, dict):
@@ -1136,6 +1038,94 @@ def order_route():
 
 
 
+# ======================================================================================
+# ✅ 비동기 주문 업로드 작업 상태 조회 (POST /order + async=1 → job_id)
+# ======================================================================================
+@app.route("/order/jobs/<job_id>", methods=["GET"])
+def order_job_status(job_id):
+    """
+    주문 업로드 작업 상태
+    - status: queued / running / done / failed
+    - 완료 시 result 에 추출된 주문 + 저장 결과
+    """
+    result = order_job_status_func(job_id)
+    return jsonify(result), result.get("http_status", 200)
+
+
+
+
+
+
+# ======================================================================================
+# ✅ 주문 이미지 추출 단계별 통계 (로컬 OCR / Vision)
+# ======================================================================================
+@app.route("/order/extract_stats", methods=["GET"])
+def order_extract_stats():
+    """단계별 attempts / hits / hit_rate / avg_ms"""
+    result = order_extract_stats_func()
+    return jsonify(result), result.get("http_status", 200)
+
+
+
+
+
+
+# ======================================================================================
+# ✅ 외부 서비스(OpenAI / Memberslist / Impact) 서킷 상태
+# ======================================================================================
+@app.route("/health/upstreams", methods=["GET"])
+def health_upstreams():
+    """
+    서비스별 서킷 상태(closed / open / half_open), 연속 실패 수, 호출·재시도 수, 타임아웃 설정
+    - 하나라도 open 이면 status: degraded (앱 자체는 동작하므로 HTTP 200)
+    - outbox: 목적지별 아웃박스 이벤트 건수 (pending / sending / sent / dead)
+    - sheet_fetches: 시트 전체 조회 수 / 실제 다운로드 수 / 동시 조회 합침(coalesced) 수
+    - hot_sheets: 백그라운드 갱신 시트의 hit / stale / miss, 시트별 경과 시간 (꺼져 있으면 None)
+    """
+    result = upstream_health()
+    result["outbox"] = get_outbox().stats() if OUTBOX_ENABLED else None
+    result["sheet_fetches"] = sheet_fetch_stats()
+    hot = get_hot_sheets()
+    result["hot_sheets"] = hot.stats() if hot is not None else None
+    return jsonify(result), 200
+
+
+# ======================================================================================
+# ✅ 지표 (Prometheus text format)
+# ======================================================================================
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    intent 별 요청 시간, 단계(nlu / sheets) 시간, Sheets 호출 수·응답 바이트,
+    429 / backoff 횟수, 외부 서비스(OpenAI 등) 요청 시간, OpenAI 토큰 사용량
+    ⚠️ 워커 프로세스별 값 (gunicorn 워커마다 따로 집계)
+    """
+    return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
+
+
+# ======================================================================================
+# ✅ 최근 프로파일 (느린 요청)
+# ======================================================================================
+@app.route("/debug/profiles", methods=["GET"])
+def debug_profiles():
+    """
+    최근 프로파일링한 요청 (최신순)
+    - min_ms: 이 시간 이상 걸린 요청만 (기본 PROFILE_SLOW_MS), limit: 최대 건수
+    - ?token= 또는 X-Profile 헤더 값이 PROFILE_TOKEN 과 같아야 함 (토큰 미설정이면 PROFILE_OPEN(기본 DEBUG) 일 때만)
+    """
+    token = request.args.get("token") or request.headers.get(PROFILE_HEADER)
+    if not token_allowed(token):
+        return jsonify({"status": "error", "message": "권한이 없습니다.", "http_status": 403}), 403
+    min_ms = request.args.get("min_ms", default=PROFILE_SLOW_MS, type=float)
+    limit = request.args.get("limit", default=20, type=int)
+    profiles = PROFILES.list(min_ms=min_ms, limit=limit)
+    return jsonify({"status": "success", "min_ms": min_ms, "count": len(profiles), "profiles": profiles}), 200
+
+
+
+
+
+
 # ======================================================================================
 # ✅ 후원수당 조회 (자동 분기) intent 기반 단일 라우트
 # ======================================================================================
@@ -1166,16 +1156,16 @@ def commission_route():
 
         # 2) intent 기반 실행
         intent = data.get("intent")
-        func = COMMISSION_INTENTS.get(intent)
+        handler = COMMISSION_REGISTRY.get(intent)
 
-        if not func:
+        if not handler:
             result = {
                 "status": "error",
                 "message": f"❌ 처리할 수 없는 후원수당 intent입니다. (intent={intent})",
                 "http_status": 400
             }
         else:
-            result = func()
+            result = handler()
 
         if isinstance(result, dict):
             return jsonify(result), result.get("http_status", 200)
@@ -1228,6 +1218,32 @@ def show_routes():
 
 
 
+# ======================================================================================
+# ✅ 운영 서버 진입점 (gunicorn -c gunicorn.conf.py → "app:create_app()")
+# ======================================================================================
+def create_app():
+    """
+    WSGI 앱 팩토리 (gunicorn 워커마다 1회 호출)
+    - 라우트는 이 모듈 import 시 등록됨
+    - 워커별 백그라운드 스레드(아웃박스 전송, 자주 읽는 시트 갱신)는 fork 뒤 여기서 시작
+    - 자주 읽는 시트 갱신은 HOT_SHEET_TTL > 0 일 때만
+    - 정지는 shutdown_app (ASGI lifespan shutdown 에서 호출)
+    - 로그 레벨/형식: LOG_LEVEL, LOG_FORMAT (text | json)
+    """
+    configure_logging()
+    if OUTBOX_ENABLED:
+        get_outbox()
+    start_hot_sheet_refresher()
+    return app
+
+
+def shutdown_app():
+    """create_app 이 시작한 워커 백그라운드 스레드 정지 (아웃박스 전송, 자주 읽는 시트 갱신)"""
+    stop_outbox()
+    stop_hot_sheet_refresher()
+
+
+# 로컬 개발용 (운영은 gunicorn.conf.py)
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=10000, debug=True)
 
@@ -0,0 +1,39 @@
+# =====================================================
+# ASGI 진입점 (asyncio 서빙)
+#   uvicorn asgi:application --workers 2 --port $PORT
+#   gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:application
+# =====================================================
+"""
+Flask 앱을 asyncio 서버에서 실행
+
+- WSGI → ASGI 변환은 a2wsgi, Flask 핸들러는 스레드 풀(ASGI_THREADS, 기본 32)에서 실행
+  → 워커 1개당 동시에 실행되는 핸들러는 최대 32개 (외부 호출은 동기라 스레드를 붙잡고 대기)
+    gthread 32스레드와 같은 상한 → 이 진입점의 이점은 아래 시트 동시 미리 읽기뿐
+- JSON 으로 읽기 전용 intent 가 지정된 요청은 핸들러 실행 전에 필요한 시트를
+  asyncio.gather 로 동시에 내려받아 요청 스냅샷으로 넘김 (예: 전체 메모 검색 → 일지 3개 동시)
+- 자연어 요청(/postIntent 등)은 intent 가 핸들러 안에서 정해지므로 미리 읽지 않음
+- 서버 종료(lifespan shutdown) 때 shutdown_app 으로 아웃박스/시트 갱신 스레드 정지
+"""
+
+from typing import Any, Dict, Iterable
+
+from app import create_app, shutdown_app
+from routes.intent_map import intent_prefetch_sheets
+from utils.aio import SheetPrefetchMiddleware, json_body
+
+# 읽기 전용 intent 를 JSON 본문으로 받는 엔드포인트
+PREFETCH_PATHS = {"/member", "/memo"}
+
+
+def prefetch_rule(scope: Dict[str, Any], body: bytes) -> Iterable[str]:
+    """POST {"intent": <읽기 전용 intent>, ...} → 미리 읽을 시트 목록"""
+    if scope["method"] != "POST" or scope["path"] not in PREFETCH_PATHS:
+        return ()
+    data = json_body(body)
+    if not data or not isinstance(data.get("intent"), str):
+        return ()
+    query = data["query"] if isinstance(data.get("query"), dict) else data
+    return intent_prefetch_sheets(data["intent"], query)
+
+
+application = SheetPrefetchMiddleware(create_app(), prefetch=prefetch_rule, on_shutdown=[shutdown_app])
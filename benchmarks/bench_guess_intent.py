@@ -0,0 +1,68 @@
+"""
+guess_intent 마이크로 벤치마크
+
+기존 규칙 루프(INTENT_RULES 를 매 호출마다 순회) 와
+컴파일된 IntentClassifier 기반 guess_intent 를 같은 코퍼스로 비교
+
+실행:
+    python -m benchmarks.bench_guess_intent [--number 20000]
+"""
+
+import argparse
+import timeit
+
+from parser import INTENT_RULES, guess_intent
+from parser.intent_classifier import IntentClassifier
+
+
+# 실제 채팅 명령과 비슷한 분포의 샘플
+CORPUS = [
+    "홍길동",
+    "강소희 전체정보",
+    "이태수 회원등록",
+    "회원 수정 강소희",
+    "이태수 상담일지 저장 오늘 출근합니다",
+    "이태수 상담일지 검색 중국",
+    "전체메모 검색 중국",
+    "이태수 주문 노니 2개",
+    "주문 자연어 노니 2개",
+    "수당 자연어 8월",
+    "알 수 없는 요청문",
+]
+
+
+def legacy_rule_loop(query: str) -> str:
+    """기존 구현의 규칙 루프 (비교용 고정 복사본)"""
+    for keywords, intent in INTENT_RULES.items():
+        if all(kw in query for kw in keywords):
+            return intent
+    return "unknown"
+
+
+def _run(func, number: int) -> float:
+    """코퍼스 1회 순회를 number 번 반복, 1회 호출당 µs 반환"""
+    def loop():
+        for q in CORPUS:
+            func(q)
+    seconds = min(timeit.repeat(loop, number=number, repeat=3))
+    return seconds / (number * len(CORPUS)) * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser(description="guess_intent 마이크로 벤치마크")
+    ap.add_argument("--number", type=int, default=20000)
+    args = ap.parse_args()
+
+    classifier = IntentClassifier(INTENT_RULES)
+
+    legacy = _run(legacy_rule_loop, args.number)
+    compiled = _run(classifier.classify, args.number)
+    full = _run(guess_intent, args.number)
+
+    print(f"rule loop (legacy)  : {legacy:8.2f} µs/call")
+    print(f"IntentClassifier    : {compiled:8.2f} µs/call  (x{legacy / compiled:.1f})")
+    print(f"guess_intent (full) : {full:8.2f} µs/call")
+
+
+if __name__ == "__main__":
+    main()
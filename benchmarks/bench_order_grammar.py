@@ -0,0 +1,52 @@
+"""
+주문 자연어 규칙 파서 마이크로 벤치마크
+
+parse_order_grammar 1회 호출 시간 (회원명 목록은 메모리 인덱스 사용, 네트워크 없음)
+
+실행:
+    python -m benchmarks.bench_order_grammar [--number 5000] [--members 3000]
+"""
+
+import argparse
+import timeit
+
+from parser.order_grammar import MemberNameIndex, parse_order_grammar
+
+
+# 실제 입력과 비슷한 주문 문장
+CORPUS = [
+    "이태수 주문 노니 2개",
+    "이수민 노니 2박스 카드 결제 오늘 주소 서울 강남구",
+    "이태수 홍삼 세 박스 현금 어제",
+    "김영희 비타민 주문 부산 해운대구로 배송",
+    "이태수 노니 30,000원 PV 20 1개 계좌이체",
+    "김영희 2025-09-11 치약 3병 주문 저장",
+    "노니 좀 보내줘 알아서",
+]
+
+
+def main():
+    ap = argparse.ArgumentParser(description="주문 규칙 파서 마이크로 벤치마크")
+    ap.add_argument("--number", type=int, default=5000)
+    ap.add_argument("--members", type=int, default=3000, help="회원명 목록 크기")
+    args = ap.parse_args()
+
+    names = ["이태수", "이수민", "김영희"] + [f"회원{i:05d}" for i in range(args.members)]
+    index = MemberNameIndex(lambda: names, ttl=3600)
+    index.match("워밍업")
+
+    def loop():
+        for text in CORPUS:
+            parse_order_grammar(text, member_matcher=index.match)
+
+    seconds = min(timeit.repeat(loop, number=args.number, repeat=3))
+    per_call = seconds / (args.number * len(CORPUS)) * 1e6
+
+    for text in CORPUS:
+        parsed = parse_order_grammar(text, member_matcher=index.match)
+        print(f"{parsed.confidence:4.2f}  {text}")
+    print(f"\nparse_order_grammar : {per_call:8.2f} µs/call  (회원 {len(names)}명)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+10k / 100k 규모 오프라인 벤치마크 (가짜 시트 백엔드)
+
+합성 회원 / 메모 / 주문 / 후원수당으로 채운 가짜 워크북(benchmarks/fake_sheets.py)에서
+회원 검색, 메모 검색, 의도 분류, 주문 저장 경로를 측정하고
+결과를 JSON 으로 남겨 저장된 기준값(benchmarks/baseline.json)과 비교
+
+- 시트를 읽는 경로는 실제 요청처럼 요청 컨텍스트 + 요청 스냅샷 안에서 1건씩 실행
+  (시트 다운로드 = 가짜 시트 사본 → 네트워크를 뺀 앱 쪽 비용만 측정)
+- guess_intent / nlu_to_pc_input 은 시트와 무관 → 명령 코퍼스 1건당 시간 (규모별로 재지 않음)
+- median 이 기준값의 --threshold 배를 넘으면 REGRESSION 표시 + 종료 코드 1
+- 기준값은 측정한 컴퓨터마다 다름 → 다른 환경에서는 먼저 --save-baseline 으로 기록
+
+실행:
+    python -m benchmarks.bench_scale                                # 10k, 100k + 기준값 비교
+    python -m benchmarks.bench_scale --scales 10000 --only memo     # 일부 항목만
+    python -m benchmarks.bench_scale --output results.json
+    python -m benchmarks.bench_scale --save-baseline                # 기준값 갱신
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import timeit
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import g
+
+from app import app, open_sheet_snapshot
+from benchmarks.bench_guess_intent import CORPUS
+from benchmarks.fake_sheets import KNOWN_MEMBERS, FakeWorkbook, seed_workbook, use_workbook
+from parser import guess_intent
+from parser.nlu import nlu_to_pc_input
+from parser.parse import handle_order_save, handle_order_save_many, save_order_to_sheet
+from routes.routes_member import find_member_logic, search_by_code_logic
+from routes.routes_memo import search_memo_core
+from service.service import find_commission
+from utils.utils import search_members
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+SAMPLE_ORDER = {
+    "주문일자": "2025-09-30", "회원명": "이태수", "회원번호": "1000001", "휴대폰번호": "010-1234-5678",
+    "제품명": "노니", "제품가격": "45000", "PV": "30", "결재방법": "카드",
+    "주문자_고객명": "", "주문자_휴대폰번호": "", "배송처": "택배", "수령확인": "",
+}
+
+Case = Tuple[str, Callable[[], Any]]
+
+
+def _in_request(func: Callable[[], Any], query: Any = None) -> Callable[[], Any]:
+    """요청 1건처럼 실행 (요청 컨텍스트 + 요청 스냅샷, g.query 설정)"""
+    def call():
+        with app.test_request_context("/postIntent", method="POST"):
+            open_sheet_snapshot()
+            g.query = {"query": query} if query is not None else {}
+            return func()
+    return call
+
+
+def sheet_cases(book: FakeWorkbook) -> List[Case]:
+    """시트 크기에 따라 달라지는 항목 (주문 저장은 시트를 늘리므로 마지막)"""
+    db = book["DB"]
+    last = db.row_values(db.row_count)          # 마지막 회원 → 끝까지 훑어야 찾음
+    rows = [dict(r) for r in db.get_all_records()]
+
+    return [
+        ("find_member_logic[name]", _in_request(lambda: find_member_logic(KNOWN_MEMBERS[0]))),
+        ("find_member_logic[number]", _in_request(lambda: find_member_logic(last[1]))),
+        ("find_member_logic[phone]", _in_request(lambda: find_member_logic(last[2]))),
+        ("search_by_code_logic", _in_request(search_by_code_logic, query="코드 A")),
+        ("search_memo_core[keyword]", _in_request(
+            lambda: search_memo_core("상담일지", ["출장"], limit=20))),
+        ("search_memo_core[miss]", _in_request(
+            lambda: search_memo_core("상담일지", ["없는키워드"], limit=20))),
+        ("search_memo_core[member+date]", _in_request(
+            lambda: search_memo_core("개인일지", ["상담"], member_name=KNOWN_MEMBERS[1],
+                                     start_date="2024-01-01", end_date="2025-12-31"))),
+        ("search_members[partial]", lambda: search_members(rows, {"회원명": "길동"})),
+        ("search_members[code+date]", lambda: search_members(
+            rows, {"코드": "A", "가입일자__gte": "2020-01-01"})),
+        ("find_commission", _in_request(lambda: find_commission({"회원명": KNOWN_MEMBERS[1]}))),
+        ("handle_order_save", _in_request(lambda: handle_order_save(dict(SAMPLE_ORDER)))),
+        ("handle_order_save_many[10]", _in_request(
+            lambda: handle_order_save_many([dict(SAMPLE_ORDER) for _ in range(10)]))),
+        ("save_order_to_sheet", _in_request(lambda: save_order_to_sheet(dict(SAMPLE_ORDER)))),
+    ]
+
+
+def corpus_cases() -> List[Case]:
+    """시트와 무관한 항목 (코드 1회 순회)"""
+    def loop(func):
+        return lambda: [func(q) for q in CORPUS]
+    return [
+        ("guess_intent", loop(guess_intent)),
+        ("nlu_to_pc_input", loop(nlu_to_pc_input)),
+    ]
+
+
+def measure(func: Callable[[], Any], repeat: int, per: int = 1) -> Dict[str, Any]:
+    """
+    timeit 으로 1회 호출 시간(ms) 측정
+    - number 는 Timer.autorange() 로 1회 측정이 0.2초 이상이 되게 자동 결정
+    - per: 1회 호출에 들어 있는 작업 수 (코퍼스 항목이면 len(CORPUS))
+    - 워밍업 결과가 {"status": "error"} 면 error 에 메시지 (오류 경로를 잰 것이므로 비교 제외)
+    """
+    first = func()                                    # 워밍업 (import / 정규식 컴파일 등)
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    per_call = sorted(t / number / per * 1000 for t in timer.repeat(repeat=repeat, number=number))
+    result = {
+        "median_ms": round(statistics.median(per_call), 4),
+        "min_ms": round(per_call[0], 4),
+        "number": number,
+        "repeat": repeat,
+    }
+    if isinstance(first, dict) and first.get("status") == "error":
+        result["error"] = str(first.get("message", ""))
+    return result
+
+
+def run(scales: List[int], repeat: int = 5, seed: int = 42, only: Optional[str] = None,
+        log: Callable[[str], None] = print) -> Dict[str, Any]:
+    """규모별로 워크북을 만들어 전체 항목 측정 → {"meta", "results"}"""
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def record(key: str, func: Callable[[], Any], per: int = 1, **extra: Any) -> None:
+        if only and only not in key:
+            return
+        results[key] = {**measure(func, repeat, per), **extra}
+        error = f"  ⚠️ 오류 응답: {results[key]['error']}" if "error" in results[key] else ""
+        log(f"  {key:48s} {results[key]['median_ms']:10.3f} ms{error}")
+
+    log("[corpus]")
+    for name, func in corpus_cases():
+        record(f"{name}@corpus", func, per=len(CORPUS), case=name, scale=None)
+
+    for scale in scales:
+        started = time.perf_counter()
+        book = seed_workbook(members=scale, seed=seed)
+        log(f"[{scale}] 워크북 생성 {time.perf_counter() - started:.1f}s")
+        with use_workbook(book):
+            for name, func in sheet_cases(book):
+                record(f"{name}@{scale}", func, case=name, scale=scale)
+
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scales": scales,
+            "repeat": repeat,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float) -> List[Dict[str, Any]]:
+    """
+    기준값과 비교 → 항목별 {"key", "median_ms", "baseline_ms", "ratio", "status"}
+    status: REGRESSION (ratio > threshold) / faster (ratio < 1/threshold) / ok / new / error
+    """
+    rows = []
+    for key, result in results["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if "error" in result:
+            rows.append({"key": key, "median_ms": result["median_ms"], "baseline_ms": None,
+                         "ratio": None, "status": "error"})
+            continue
+        if not base or not base.get("median_ms") or "error" in base:
+            rows.append({"key": key, "median_ms": result["median_ms"], "baseline_ms": None,
+                         "ratio": None, "status": "new"})
+            continue
+        ratio = result["median_ms"] / base["median_ms"]
+        status = "REGRESSION" if ratio > threshold else "faster" if ratio < 1 / threshold else "ok"
+        rows.append({"key": key, "median_ms": result["median_ms"], "baseline_ms": base["median_ms"],
+                     "ratio": round(ratio, 3), "status": status})
+    return rows
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="10k / 100k 규모 오프라인 벤치마크")
+    ap.add_argument("--scales", default="10000,100000", help="회원 수 (쉼표 구분, 메모/주문/수당도 같은 수)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--only", help="이 문자열이 들어간 항목만 (예: memo, order)")
+    ap.add_argument("--output", help="결과 JSON 저장 경로")
+    ap.add_argument("--baseline", default=DEFAULT_BASELINE, help="비교할 기준값 JSON")
+    ap.add_argument("--threshold", type=float, default=1.5, help="median 이 기준값의 몇 배를 넘으면 회귀")
+    ap.add_argument("--save-baseline", action="store_true", help="이번 결과를 --baseline 에 저장")
+    args = ap.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    report = run(scales, repeat=args.repeat, seed=args.seed, only=args.only)
+
+    if args.output:
+        _write_json(args.output, report)
+    if args.save_baseline:
+        _write_json(args.baseline, report)
+        print(f"기준값 저장: {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"기준값 없음: {args.baseline} (--save-baseline 으로 먼저 기록)")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    rows = compare(report, baseline, args.threshold)
+    print(f"\n기준값 비교 ({args.baseline}, threshold x{args.threshold:g})")
+    for r in rows:
+        base = f"{r['baseline_ms']:10.3f}" if r["baseline_ms"] is not None else f"{'-':>10s}"
+        ratio = f"x{r['ratio']:.2f}" if r["ratio"] is not None else ""
+        print(f"  {r['key']:48s} {r['median_ms']:10.3f} ms  기준 {base} ms  {ratio:>7s}  {r['status']}")
+
+    regressions = [r for r in rows if r["status"] in ("REGRESSION", "error")]
+    if regressions:
+        print(f"\n❌ 회귀 / 오류 {len(regressions)}건")
+        sys.exit(1)
+    print("\n✅ 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
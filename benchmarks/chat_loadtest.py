@@ -0,0 +1,400 @@
+"""
+채팅 명령 코퍼스 재생 부하 테스트 (가짜 시트 + 가짜 OpenAI)
+
+채팅 사용자 N 명(기본 50)이 실제 채팅 명령과 비슷한 비율로 요청을 보내는 동안
+처리량, intent 별 지연 백분위(p50/p90/p95/p99), 오류 / 429 비율을 측정
+
+- 앱은 이 프로세스 안에서 werkzeug 스레드 서버로 실행 (시트 = benchmarks/fake_sheets.py 합성 워크북)
+- OpenAI / Memberslist 는 로컬 가짜 서버 (응답 지연 / 429 비율 조절) → 외부 API 호출 없음
+- 명령: 회원·코드 검색, 전체정보, 메모 검색, 메모 저장, 주문 이미지 업로드(합성 주문서 이미지),
+  후원수당 조회, 회원 정보 수정
+- 사용자마다 명령 사이 생각 시간(--think, 지수분포 평균 초), 0 이면 쉬지 않고 연속 요청
+- 오류 = 5xx / 연결 실패, 앱 오류 = 2xx·4xx 이지만 본문 status 가 error
+
+실행:
+    python -m benchmarks.chat_loadtest                                   # 50명, 60초
+    python -m benchmarks.chat_loadtest --users 50 --duration 30 --members 10000
+    python -m benchmarks.chat_loadtest --openai-latency 0.8 --openai-429 0.05
+    python -m benchmarks.chat_loadtest --think 0 --output report.json
+"""
+
+import argparse
+import http.client
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.fake_sheets import KNOWN_MEMBERS, MEMO_SHEETS, seed_workbook, use_workbook
+from benchmarks.loadtest import _percentile
+
+# 요청 1건: (intent, method, path, body, headers)
+Request = Tuple[str, str, str, Optional[bytes], Dict[str, str]]
+
+_SEARCH_KEYWORDS = ["출장", "상담", "노니", "세미나", "배송", "홍삼", "미팅", "수당"]
+_MEMO_TEXTS = ["오늘 출근합니다", "노니 재구매 상담", "다음 주 세미나 참석", "홍삼 샘플 전달 완료",
+               "배송 지연 사과 전화", "신규 회원 소개 받음"]
+_ADDRESSES = ["서울시 강남구 테헤란로 1", "부산시 해운대구 우동 2", "대전시 유성구 봉명동 3"]
+
+STUB_ORDER = {"orders": [{"제품명": "노니", "제품가격": 45000, "PV": 30,
+                          "주문자_고객명": "", "주문자_휴대폰번호": "", "배송처": "택배"}]}
+
+
+# ======================================================================================
+# ✅ 가짜 OpenAI / Memberslist 서버
+# ======================================================================================
+class StubUpstream:
+    """
+    OpenAI chat/completions 형식으로 주문 JSON 을 돌려주는 로컬 서버 (다른 경로는 200 {})
+    - latency: 응답 지연 평균(초, ±50% 무작위)
+    - rate_429: 이 비율만큼 429 (앱의 재시도 / 서킷 동작 확인용)
+    """
+
+    def __init__(self, latency: float = 0.3, rate_429: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.rate_429 = rate_429
+        self.requests = 0
+        self.sent_429 = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _decide(self) -> Tuple[float, bool]:
+        with self._lock:
+            self.requests += 1
+            throttled = self._rng.random() < self.rate_429
+            if throttled:
+                self.sent_429 += 1
+            return self.latency * self._rng.uniform(0.5, 1.5), throttled
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, body: Dict[str, Any]) -> None:
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 429:
+                    self.send_header("Retry-After", "1")
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                delay, throttled = stub._decide()
+                time.sleep(delay)
+                if throttled:
+                    return self._reply(429, {"error": {"message": "Rate limit reached", "type": "requests"}})
+                if "chat/completions" not in self.path:
+                    return self._reply(200, {"status": "ok"})
+                self._reply(200, {
+                    "choices": [{"message": {"role": "assistant",
+                                             "content": json.dumps(STUB_ORDER, ensure_ascii=False)}}],
+                    "usage": {"prompt_tokens": 850, "completion_tokens": 60},
+                })
+
+            do_GET = do_POST
+
+        return Handler
+
+    def start(self) -> "StubUpstream":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+# ======================================================================================
+# ✅ 주문서 이미지 / 명령 코퍼스
+# ======================================================================================
+def sample_images(count: int, seed: int = 0, image_dir: Optional[str] = None) -> List[Tuple[str, bytes]]:
+    """
+    주문 업로드용 이미지
+    - image_dir 지정 시 그 폴더의 jpg/png (실제 주문서 샘플)
+    - 아니면 합성 주문서 JPEG count 장 (장마다 내용이 달라 비전 캐시는 같은 이미지 재업로드에만 적중)
+    """
+    if image_dir:
+        files = sorted(f for f in os.listdir(image_dir) if f.lower().endswith((".jpg", ".jpeg", ".png")))
+        images = []
+        for name in files:
+            with open(os.path.join(image_dir, name), "rb") as f:
+                images.append((name, f.read()))
+        if not images:
+            raise ValueError(f"이미지가 없습니다: {image_dir}")
+        return images
+
+    from PIL import Image, ImageDraw
+
+    rng = random.Random(seed)
+    images = []
+    for i in range(count):
+        img = Image.new("RGB", (1240, 1754), "white")
+        draw = ImageDraw.Draw(img)
+        draw.text((80, 60), f"ORDER FORM #{i:05d}", fill="black")
+        for line in range(rng.randint(3, 12)):
+            y = 160 + line * 90
+            draw.rectangle((80, y, 1160, y + 70), outline="black")
+            draw.text((100, y + 25), f"ITEM-{rng.randint(100, 999)}  QTY {rng.randint(1, 5)}  "
+                                     f"PRICE {rng.randrange(10, 200) * 1000}  PV {rng.randint(5, 90)}",
+                      fill="black")
+        buf = io.BytesIO()
+        img.save(buf, format="JPEG", quality=85)
+        images.append((f"order_{i:05d}.jpg", buf.getvalue()))
+    return images
+
+
+def _json_request(intent: str, path: str, body: Dict[str, Any]) -> Request:
+    return (intent, "POST", path, json.dumps(body, ensure_ascii=False).encode("utf-8"),
+            {"Content-Type": "application/json"})
+
+
+def _multipart(fields: Dict[str, str], files: Sequence[Tuple[str, str, bytes]]) -> Tuple[bytes, str]:
+    """multipart/form-data 본문 → (body, Content-Type)"""
+    boundary = uuid.uuid4().hex
+    parts: List[bytes] = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'
+                     .encode("utf-8"))
+    for field, filename, data in files:
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; '
+                     f'filename="{filename}"\r\nContent-Type: image/jpeg\r\n\r\n'.encode("utf-8"))
+        parts.append(data + b"\r\n")
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    return b"".join(parts), f"multipart/form-data; boundary={boundary}"
+
+
+class CommandMix:
+    """
+    채팅 명령 비율대로 요청 생성 (intent 이름 → 비율, 요청 생성 함수)
+    - 회원 이름은 KNOWN_MEMBERS(80%) / 합성 회원(20%)
+    """
+
+    def __init__(self, names: Sequence[str], numbers: Sequence[str],
+                 images: Sequence[Tuple[str, bytes]]):
+        self.names = list(names)
+        self.numbers = list(numbers)
+        self.images = list(images)
+        self.mix: List[Tuple[str, int, Callable[[random.Random], Request]]] = [
+            ("search_member", 20, self._search_member),
+            ("member_select", 5, lambda rng: _json_request(
+                "member_select", "/postIntent", {"query": f"{self._name(rng)} 전체정보"})),
+            ("search_by_code", 5, lambda rng: _json_request(
+                "search_by_code", "/postIntent", {"query": f"코드 {rng.choice('ABCDEF')}"})),
+            ("memo_search", 15, self._memo_search),
+            ("memo_add", 15, lambda rng: _json_request("memo_add", "/postIntent", {
+                "query": f"{self._name(rng)} {rng.choice(MEMO_SHEETS)} 저장 {rng.choice(_MEMO_TEXTS)}"})),
+            ("order_upload", 10, self._order_upload),
+            ("commission_find", 15, lambda rng: _json_request("commission_find", "/commission", {
+                "intent": "commission_find", "query": {"회원명": self._name(rng)}})),
+            ("update_member", 5, lambda rng: _json_request("update_member", "/postIntent", {
+                "query": f"{self._name(rng)} 주소 수정 {rng.choice(_ADDRESSES)}"})),
+        ]
+        self._weights = [w for _, w, _ in self.mix]
+
+    def _name(self, rng: random.Random) -> str:
+        return rng.choice(KNOWN_MEMBERS) if rng.random() < 0.8 else rng.choice(self.names)
+
+    def _search_member(self, rng: random.Random) -> Request:
+        query = rng.choice(self.numbers) if rng.random() < 0.2 else self._name(rng)
+        return _json_request("search_member", "/postIntent", {"query": query})
+
+    def _memo_search(self, rng: random.Random) -> Request:
+        keyword = rng.choice(_SEARCH_KEYWORDS)
+        query = (f"전체메모 검색 {keyword}" if rng.random() < 0.3
+                 else f"{self._name(rng)} {rng.choice(MEMO_SHEETS)} 검색 {keyword}")
+        return _json_request("memo_search", "/postIntent", {"query": query})
+
+    def _order_upload(self, rng: random.Random) -> Request:
+        filename, data = rng.choice(self.images)
+        body, content_type = _multipart({"회원명": self._name(rng)}, [("image", filename, data)])
+        return ("order_upload", "POST", "/order", body, {"Content-Type": content_type})
+
+    def next(self, rng: random.Random) -> Request:
+        _, _, build = rng.choices(self.mix, weights=self._weights)[0]
+        return build(rng)
+
+
+# ======================================================================================
+# ✅ 부하 생성 / 집계
+# ======================================================================================
+class Samples:
+    """intent 별 (지연 초, HTTP 상태, 앱 오류 여부) 기록"""
+
+    def __init__(self):
+        self.by_intent: Dict[str, List[Tuple[float, int, bool]]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, intent: str, seconds: float, status: int, app_error: bool) -> None:
+        with self._lock:
+            self.by_intent.setdefault(intent, []).append((seconds, status, app_error))
+
+
+def _is_app_error(body: bytes) -> bool:
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and data.get("status") == "error"
+
+
+def run_users(host: str, port: int, mix: CommandMix, users: int, duration: float,
+              think: float = 1.0, seed: int = 0, timeout: float = 120.0) -> Tuple[Samples, float]:
+    """users 명이 duration 초 동안 명령을 보냄 → (Samples, 실제 경과 초)"""
+    samples = Samples()
+    deadline = time.perf_counter() + duration
+
+    def user(index: int):
+        rng = random.Random(seed * 10007 + index)
+        conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        if think > 0:
+            time.sleep(rng.uniform(0, think))                 # 시작 시점 분산
+        while time.perf_counter() < deadline:
+            intent, method, path, body, headers = mix.next(rng)
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                payload = resp.read()
+                samples.add(intent, time.perf_counter() - start, resp.status, _is_app_error(payload))
+            except (OSError, http.client.HTTPException):
+                samples.add(intent, time.perf_counter() - start, 0, False)
+                conn.close()
+                conn = http.client.HTTPConnection(host, port, timeout=timeout)
+            if think > 0:
+                time.sleep(min(rng.expovariate(1 / think), max(0.0, deadline - time.perf_counter())))
+        conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples: Samples, elapsed: float) -> Dict[str, Any]:
+    """전체 / intent 별 처리량, 지연 백분위(ms), 오류·429 비율"""
+    def stats(rows: List[Tuple[float, int, bool]]) -> Dict[str, Any]:
+        latencies = [s for s, _, _ in rows]
+        count = len(rows)
+        errors = sum(1 for _, status, _ in rows if status == 0 or status >= 500)
+        throttled = sum(1 for _, status, _ in rows if status == 429)
+        app_errors = sum(1 for _, status, app in rows if app and 0 < status < 500 and status != 429)
+        return {
+            "requests": count,
+            "rps": round(count / elapsed, 2) if elapsed else 0.0,
+            "p50_ms": round(_percentile(latencies, 0.50) * 1000, 1),
+            "p90_ms": round(_percentile(latencies, 0.90) * 1000, 1),
+            "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+            "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+            "max_ms": round(max(latencies, default=0.0) * 1000, 1),
+            "error_rate": round(errors / count, 4) if count else 0.0,
+            "rate_429": round(throttled / count, 4) if count else 0.0,
+            "app_error_rate": round(app_errors / count, 4) if count else 0.0,
+        }
+
+    all_rows = [row for rows in samples.by_intent.values() for row in rows]
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "total": stats(all_rows),
+        "intents": {intent: stats(rows) for intent, rows in sorted(samples.by_intent.items())},
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    header = (f"{'intent':16s} {'요청':>7s} {'req/s':>7s} {'p50':>8s} {'p90':>8s} {'p95':>8s} "
+              f"{'p99':>8s} {'오류':>7s} {'429':>7s} {'앱오류':>7s}")
+    print(header)
+    rows = list(report["intents"].items()) + [("(전체)", report["total"])]
+    for intent, s in rows:
+        print(f"{intent:16s} {s['requests']:7d} {s['rps']:7.1f} {s['p50_ms']:8.1f} {s['p90_ms']:8.1f} "
+              f"{s['p95_ms']:8.1f} {s['p99_ms']:8.1f} {s['error_rate']:7.1%} {s['rate_429']:7.1%} "
+              f"{s['app_error_rate']:7.1%}")
+    stub = report.get("openai_stub")
+    if stub:
+        print(f"\n가짜 OpenAI/Memberslist: 요청 {stub['requests']}  429 응답 {stub['sent_429']}")
+    print(f"경과 {report['elapsed_s']}s  (지연 단위 ms)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="채팅 명령 코퍼스 재생 부하 테스트 (가짜 시트 + 가짜 OpenAI)")
+    ap.add_argument("--users", type=int, default=50, help="동시 채팅 사용자 수")
+    ap.add_argument("--duration", type=float, default=60.0, help="측정 시간(초)")
+    ap.add_argument("--warmup", type=float, default=5.0)
+    ap.add_argument("--think", type=float, default=1.0, help="명령 사이 평균 생각 시간(초, 0 = 연속)")
+    ap.add_argument("--members", type=int, default=10000, help="합성 회원 수 (메모/주문/수당도 같은 수)")
+    ap.add_argument("--images", type=int, default=200, help="합성 주문서 이미지 수")
+    ap.add_argument("--image-dir", help="실제 주문서 이미지 폴더 (지정 시 합성 이미지 대신 사용)")
+    ap.add_argument("--openai-latency", type=float, default=0.3, help="가짜 OpenAI 평균 응답 시간(초)")
+    ap.add_argument("--openai-429", type=float, default=0.0, help="가짜 OpenAI 429 응답 비율")
+    ap.add_argument("--port", type=int, default=18010)
+    ap.add_argument("--seed", type=int, default=42)
+    ap.add_argument("--output", help="결과 JSON 저장 경로")
+    args = ap.parse_args()
+
+    # ✅ 앱 import 전에 외부 API 주소를 가짜 서버로 (모듈 상수로 읽힘)
+    stub = StubUpstream(args.openai_latency, args.openai_429, seed=args.seed).start()
+    os.environ["OPENAI_API_URL"] = f"{stub.url}/v1/chat/completions"
+    os.environ["MEMBERSLIST_API_URL"] = f"{stub.url}/memberslist"
+    os.environ.setdefault("OPENAI_API_KEY", "loadtest")
+    os.environ.pop("IMPACT_API_URL", None)
+    # 비전 캐시는 실행마다 새로 (이전 실행의 적중이 섞이지 않게)
+    os.environ["VISION_CACHE_DIR"] = tempfile.mkdtemp(prefix="chat_loadtest_vision_")
+
+    from werkzeug.serving import make_server
+    from app import app
+
+    book = seed_workbook(members=args.members, seed=args.seed)
+    db = book["DB"].get_all_values()[1:]
+    mix = CommandMix([r[0] for r in db], [r[1] for r in db],
+                     sample_images(args.images, args.seed, args.image_dir))
+
+    with use_workbook(book):
+        server = make_server("127.0.0.1", args.port, app, threaded=True)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            if args.warmup > 0:
+                run_users("127.0.0.1", args.port, mix, min(args.users, 5), args.warmup, think=0, seed=-1)
+            stub.requests = stub.sent_429 = 0
+            samples, elapsed = run_users("127.0.0.1", args.port, mix, args.users, args.duration,
+                                         think=args.think, seed=args.seed)
+        finally:
+            server.shutdown()
+            stub.stop()
+
+    report = summarize(samples, elapsed)
+    report["config"] = {k: v for k, v in vars(args).items() if k != "output"}
+    report["openai_stub"] = {"requests": stub.requests, "sent_429": stub.sent_429}
+    report["sheet_calls"] = book.calls()
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""
+벤치마크 / 부하 테스트용 가짜 시트 백엔드
+
+- FakeWorksheet: gspread Worksheet 에서 이 앱이 쓰는 메서드만 메모리로 구현
+- seed_workbook(): 합성 한국어 회원(DB) / 메모(상담일지·개인일지·활동일지) / 제품주문 / 후원수당
+- use_workbook(): utils.sheets.open_worksheet 를 가짜 워크북으로 바꿔 끼움
+  (get_worksheet / 요청 스냅샷 / get_rows_from_sheet 모두 이 경로로 읽고 씀)
+
+같은 seed 면 항상 같은 데이터 → 실행 간 결과 비교 가능
+"""
+
+import random
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+
+# 검색 벤치마크가 쓰는 고정 회원 (시트 가운데와 끝에 배치 → 전체를 훑어야 찾음)
+KNOWN_MEMBERS = ["홍길동", "이태수", "강소희"]
+
+DB_HEADERS = ["회원명", "회원번호", "휴대폰번호", "특수번호", "코드", "생년월일",
+              "계보도", "근무처", "주소", "가입일자", "메모"]
+MEMO_HEADERS = ["날짜", "회원명", "내용"]
+MEMO_SHEETS = ["상담일지", "개인일지", "활동일지"]
+ORDER_HEADERS = ["주문일자", "회원명", "회원번호", "휴대폰번호", "제품명", "제품가격", "PV",
+                 "결재방법", "주문자_고객명", "주문자_휴대폰번호", "배송처", "수령확인"]
+COMMISSION_HEADERS = ["기준일자", "지급일자", "회원명", "후원수당", "좌수", "비고"]
+
+_SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍전고문양손배백허유남심노하곽성차주우구민"
+_GIVEN = "민서지현수영준호성진우혜은경희태동석재소윤하연주아채원도훈승미선정상철광"
+_CITIES = ["서울시 강남구", "서울시 마포구", "부산시 해운대구", "대구시 수성구", "인천시 연수구",
+           "광주시 북구", "대전시 유성구", "수원시 영통구", "성남시 분당구", "제주시 노형동"]
+_WORKPLACES = ["삼성전자", "현대자동차", "자영업", "주부", "공무원", "교사", "간호사", "", "", ""]
+_MEMO_TEXTS = [
+    "오늘 출근합니다", "중국 출장 일정 상담", "노니 제품 재구매 문의", "건강 상담 진행",
+    "세미나 참석 예정", "배송 지연 문의 전화", "신규 회원 소개 받음", "홍삼 샘플 전달",
+    "다음 주 미팅 약속", "수당 지급일 문의", "가족 건강 관련 상담", "제품 사용 후기 공유",
+]
+_PRODUCTS = [("노니", 45000, 30), ("홍삼", 89000, 60), ("비타민C", 32000, 20),
+             ("프로바이오틱스", 54000, 36), ("오메가3", 41000, 28), ("콜라겐", 67000, 45)]
+_PAYMENTS = ["카드", "현금", "계좌이체"]
+_DELIVERY = ["택배", "방문수령", "센터수령"]
+
+
+def _numericise(value: str) -> Any:
+    """gspread get_all_records() 와 같은 숫자 변환 ("123" → 123, "1.5" → 1.5)"""
+    if value == "" or "_" in value:
+        return value
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _cell(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+# ======================================================================================
+# ✅ 가짜 워크시트
+# ======================================================================================
+class FakeWorksheet:
+    """
+    메모리 워크시트 (1행 = 헤더)
+    - get_all_records() 결과는 쓰기 전까지 재사용 → 돌려받은 행(dict)은 수정하지 말 것
+    - calls: 메서드별 호출 수 (부하 테스트 보고용)
+    """
+
+    def __init__(self, title: str, headers: Sequence[str], rows: Sequence[Sequence[Any]] = ()):
+        self.title = title
+        self._values: List[List[str]] = [list(headers)] + [[_cell(v) for v in r] for r in rows]
+        self._records: Optional[List[Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+        self.calls: Dict[str, int] = {}
+
+    def _count(self, method: str) -> None:
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+    def _changed(self) -> None:
+        self._records = None
+
+    @property
+    def row_count(self) -> int:
+        return len(self._values)
+
+    # ---------------- 읽기 ----------------
+    def get_all_values(self, *args, **kwargs) -> List[List[str]]:
+        self._count("get_all_values")
+        with self._lock:
+            return [list(r) for r in self._values]
+
+    def get_all_records(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        self._count("get_all_records")
+        with self._lock:
+            if self._records is None:
+                headers = self._values[0] if self._values else []
+                self._records = [
+                    {h: _numericise(r[i] if i < len(r) else "") for i, h in enumerate(headers)}
+                    for r in self._values[1:]
+                ]
+            return self._records
+
+    def row_values(self, row: int, *args, **kwargs) -> List[str]:
+        self._count("row_values")
+        with self._lock:
+            return list(self._values[row - 1]) if 0 < row <= len(self._values) else []
+
+    def col_values(self, col: int, *args, **kwargs) -> List[str]:
+        self._count("col_values")
+        with self._lock:
+            column = [r[col - 1] if col - 1 < len(r) else "" for r in self._values]
+        while column and column[-1] == "":
+            column.pop()
+        return column
+
+    # ---------------- 쓰기 ----------------
+    def insert_rows(self, values: List[List[Any]], row: int = 1, *args, **kwargs) -> None:
+        self._count("insert_rows")
+        with self._lock:
+            self._values[row - 1:row - 1] = [[_cell(v) for v in r] for r in values]
+            self._changed()
+
+    def insert_row(self, values: List[Any], index: int = 1, *args, **kwargs) -> None:
+        self._count("insert_row")
+        with self._lock:
+            self._values.insert(index - 1, [_cell(v) for v in values])
+            self._changed()
+
+    def append_rows(self, values: List[List[Any]], *args, **kwargs) -> None:
+        self._count("append_rows")
+        with self._lock:
+            self._values.extend([_cell(v) for v in r] for r in values)
+            self._changed()
+
+    def append_row(self, values: List[Any], *args, **kwargs) -> None:
+        self._count("append_row")
+        with self._lock:
+            self._values.append([_cell(v) for v in values])
+            self._changed()
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None) -> None:
+        self._count("delete_rows")
+        with self._lock:
+            del self._values[start_index - 1:end_index or start_index]
+            self._changed()
+
+    def update_cell(self, row: int, col: int, value: Any) -> None:
+        self._count("update_cell")
+        with self._lock:
+            while len(self._values) < row:
+                self._values.append([])
+            line = self._values[row - 1]
+            line.extend([""] * (col - len(line)))
+            line[col - 1] = _cell(value)
+            self._changed()
+
+    def __repr__(self) -> str:
+        return f"<FakeWorksheet {self.title!r} rows={len(self._values) - 1}>"
+
+
+class FakeWorkbook(dict):
+    """시트 이름 → FakeWorksheet"""
+
+    def open_worksheet(self, sheet_name: Any) -> FakeWorksheet:
+        name = sheet_name if isinstance(sheet_name, str) else sheet_name.title
+        try:
+            return self[name.strip()]
+        except KeyError:
+            raise ValueError(f"❌ 시트 '{name}'을(를) 찾을 수 없습니다.") from None
+
+    def calls(self) -> Dict[str, Dict[str, int]]:
+        return {name: dict(ws.calls) for name, ws in self.items() if ws.calls}
+
+
+# ======================================================================================
+# ✅ 합성 데이터
+# ======================================================================================
+def _name(rng: random.Random) -> str:
+    return rng.choice(_SURNAMES) + rng.choice(_GIVEN) + rng.choice(_GIVEN)
+
+
+def _phone(rng: random.Random) -> str:
+    return f"010-{rng.randint(1000, 9999)}-{rng.randint(0, 9999):04d}"
+
+
+def _day(rng: random.Random, start: date, span_days: int) -> date:
+    return start + timedelta(days=rng.randrange(span_days))
+
+
+def member_rows(count: int, rng: random.Random) -> List[List[Any]]:
+    """DB 시트 행 (KNOWN_MEMBERS 는 가운데 / 끝 근처에 한 번씩)"""
+    rows = []
+    known = {count // 2: 0, count - 2: 1, count - 1: 2}
+    for i in range(count):
+        name = KNOWN_MEMBERS[known[i]] if i in known else _name(rng)
+        rows.append([
+            name,
+            str(1000000 + i),
+            _phone(rng),
+            f"{rng.choice('ABCDEF')}{i % 100}" if rng.random() < 0.05 else "",
+            rng.choice("ABCDEF"),
+            _day(rng, date(1950, 1, 1), 365 * 50).isoformat(),
+            f"{_name(rng)} {rng.choice(['좌측', '우측'])}",
+            rng.choice(_WORKPLACES),
+            f"{rng.choice(_CITIES)} {rng.randint(1, 300)}",
+            _day(rng, date(2015, 1, 1), 365 * 10).isoformat(),
+            "",
+        ])
+    return rows
+
+
+def memo_rows(count: int, names: Sequence[str], rng: random.Random) -> List[List[Any]]:
+    """메모 시트 행 (최신순 = 위쪽, 앱이 2행에 넣는 것과 같은 순서, 50건마다 KNOWN_MEMBERS 메모)"""
+    newest = datetime(2025, 9, 30, 18, 0)
+    rows = []
+    for i in range(count):
+        stamp = newest - timedelta(minutes=37 * i + rng.randrange(30))
+        text = rng.choice(_MEMO_TEXTS)
+        if rng.random() < 0.3:
+            text += " " + rng.choice(_MEMO_TEXTS)
+        name = KNOWN_MEMBERS[(i // 50) % len(KNOWN_MEMBERS)] if i % 50 == 0 else rng.choice(names)
+        rows.append([stamp.strftime("%Y-%m-%d %H:%M"), name, text])
+    return rows
+
+
+def order_rows(count: int, members: Sequence[Sequence[Any]], rng: random.Random) -> List[List[Any]]:
+    """제품주문 시트 행"""
+    rows = []
+    for i in range(count):
+        member = rng.choice(members)
+        product, price, pv = rng.choice(_PRODUCTS)
+        qty = rng.randint(1, 3)
+        rows.append([
+            _day(rng, date(2023, 1, 1), 1000).isoformat(), member[0], member[1], member[2],
+            product, price * qty, pv * qty, rng.choice(_PAYMENTS),
+            _name(rng) if rng.random() < 0.2 else "", "", rng.choice(_DELIVERY), "",
+        ])
+    return rows
+
+
+def commission_rows(count: int, names: Sequence[str], rng: random.Random) -> List[List[Any]]:
+    """후원수당 시트 행"""
+    rows = []
+    for i in range(count):
+        base = _day(rng, date(2023, 1, 1), 1000).replace(day=1)
+        rows.append([
+            base.isoformat(), (base + timedelta(days=14)).isoformat(), rng.choice(names),
+            rng.randrange(10, 3000) * 1000, rng.randint(1, 20), "",
+        ])
+    return rows
+
+
+def seed_workbook(members: int = 10000, memos: Optional[int] = None, orders: Optional[int] = None,
+                  commissions: Optional[int] = None, seed: int = 42) -> FakeWorkbook:
+    """
+    합성 워크북 생성
+    - memos: 메모 시트(상담일지/개인일지/활동일지) 각각의 행 수 (기본: members 와 같음)
+    - orders / commissions 기본: members 와 같음
+    """
+    if members < len(KNOWN_MEMBERS):
+        raise ValueError(f"members 는 {len(KNOWN_MEMBERS)} 이상이어야 합니다.")
+    rng = random.Random(seed)
+    memos = members if memos is None else memos
+    orders = members if orders is None else orders
+    commissions = members if commissions is None else commissions
+
+    db = member_rows(members, rng)
+    names = [r[0] for r in db]
+    book = FakeWorkbook()
+    book["DB"] = FakeWorksheet("DB", DB_HEADERS, db)
+    for sheet in MEMO_SHEETS:
+        book[sheet] = FakeWorksheet(sheet, MEMO_HEADERS, memo_rows(memos, names, rng))
+    book["제품주문"] = FakeWorksheet("제품주문", ORDER_HEADERS, order_rows(orders, db, rng))
+    book["후원수당"] = FakeWorksheet("후원수당", COMMISSION_HEADERS, commission_rows(commissions, names, rng))
+    return book
+
+
+# ======================================================================================
+# ✅ 앱에 연결
+# ======================================================================================
+@contextmanager
+def use_workbook(book: FakeWorkbook) -> Iterator[FakeWorkbook]:
+    """with 블록 동안 utils.sheets.open_worksheet → 가짜 워크북"""
+    import utils.sheets
+
+    original = utils.sheets.open_worksheet
+    utils.sheets.open_worksheet = book.open_worksheet
+    try:
+        yield book
+    finally:
+        utils.sheets.open_worksheet = original
@@ -0,0 +1,165 @@
+"""
+운영 서버(gunicorn) 워커 수별 처리량 부하 테스트
+
+워커 수마다 gunicorn 을 띄워 같은 부하를 보내고 req/s, p50/p95 지연, 오류 수를 비교
+(표준 라이브러리만 사용, 부하는 스레드로 생성)
+
+실행:
+    # 워커 1/2/4 개로 차례로 띄워 비교 (gunicorn 설치 필요)
+    python -m benchmarks.loadtest --workers 1,2,4 --path /health/upstreams
+
+    # 이미 떠 있는 서버에 부하만
+    python -m benchmarks.loadtest --url http://127.0.0.1:10000/ --concurrency 32
+
+    # POST 요청 (JSON 본문)
+    python -m benchmarks.loadtest --workers 1,4 --path /member --json '{"요청문": "홍길동 회원 조회"}'
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def run_load(url: str, concurrency: int, duration: float, method: str = "GET",
+             body: Optional[bytes] = None) -> Dict[str, float]:
+    """duration 초 동안 concurrency 개 스레드가 keep-alive 연결로 연속 요청"""
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+    headers = {"Content-Type": "application/json"} if body else {}
+
+    latencies: List[float] = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+        local, local_errors = [], 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 500:
+                    local_errors += 1
+                else:
+                    local.append(time.perf_counter() - start)
+            except (OSError, http.client.HTTPException):
+                local_errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=60)
+        conn.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += local_errors
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors[0],
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p95_ms": _percentile(latencies, 0.95) * 1000,
+    }
+
+
+def _wait_ready(host: str, port: int, timeout: float = 60.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except (OSError, http.client.HTTPException):
+            time.sleep(0.3)
+    raise RuntimeError(f"서버가 {timeout:g}초 안에 뜨지 않았습니다: {host}:{port}")
+
+
+def start_gunicorn(workers: int, port: int, extra_env: Optional[Dict[str, str]] = None) -> subprocess.Popen:
+    """gunicorn.conf.py 설정으로 워커 workers 개 실행 (접속 로그 끔)"""
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(port), **(extra_env or {})}
+    cmd = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py",
+           "--bind", f"127.0.0.1:{port}", "--access-logfile", "/dev/null"]
+    return subprocess.Popen(cmd, env=env, stdout=subprocess.DEVNULL)
+
+
+def stop_gunicorn(proc: subprocess.Popen) -> None:
+    proc.send_signal(signal.SIGTERM)
+    try:
+        proc.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="gunicorn 워커 수별 처리량 부하 테스트")
+    ap.add_argument("--workers", default="1,2,4", help="비교할 워커 수 (쉼표 구분)")
+    ap.add_argument("--url", help="이미 떠 있는 서버 URL (지정 시 gunicorn 을 띄우지 않음)")
+    ap.add_argument("--path", default="/", help="요청 경로 (--workers 모드)")
+    ap.add_argument("--port", type=int, default=18000)
+    ap.add_argument("--concurrency", type=int, default=32, help="동시 연결 수")
+    ap.add_argument("--duration", type=float, default=15.0, help="워커 수별 측정 시간(초)")
+    ap.add_argument("--warmup", type=float, default=3.0)
+    ap.add_argument("--json", help="POST 본문 (지정 시 POST)")
+    args = ap.parse_args()
+
+    body = args.json.encode("utf-8") if args.json else None
+    method = "POST" if body else "GET"
+    if body:
+        json.loads(args.json)   # 잘못된 JSON 이면 여기서 중단
+
+    if args.url:
+        r = run_load(args.url, args.concurrency, args.duration, method, body)
+        print(f"{r['rps']:9.1f} req/s  p50 {r['p50_ms']:7.1f} ms  p95 {r['p95_ms']:7.1f} ms  "
+              f"요청 {r['requests']}  오류 {r['errors']}")
+        return
+
+    rows = []
+    for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+        proc = start_gunicorn(workers, args.port)
+        try:
+            _wait_ready("127.0.0.1", args.port)
+            url = f"http://127.0.0.1:{args.port}{args.path}"
+            run_load(url, args.concurrency, args.warmup, method, body)
+            rows.append((workers, run_load(url, args.concurrency, args.duration, method, body)))
+        finally:
+            stop_gunicorn(proc)
+        time.sleep(1)
+
+    base = rows[0][1]["rps"] if rows and rows[0][1]["rps"] else None
+    print(f"\n{method} {args.path}  동시 연결 {args.concurrency}, {args.duration:g}초씩")
+    print(f"{'workers':>7} {'req/s':>9} {'배율':>6} {'p50 ms':>8} {'p95 ms':>8} {'오류':>6}")
+    for workers, r in rows:
+        scale = f"{r['rps'] / base:5.2f}x" if base else "    -"
+        print(f"{workers:>7} {r['rps']:9.1f} {scale:>6} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['errors']:>6}")
+
+
+if __name__ == "__main__":
+    main()
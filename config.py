@@ -57,3 +57,15 @@ SHEET_MAP = {
 DT_FORMATS = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M"]
 
 
+
+# --------------------------------------------------
+# 캐시
+# --------------------------------------------------
+NLU_CACHE_SIZE = int(os.getenv("NLU_CACHE_SIZE", "2048"))  # 자연어 파싱 결과 LRU 크기
+MEMBER_NAMES_TTL = int(os.getenv("MEMBER_NAMES_TTL", "300"))  # 주문 문장 회원명 매칭용 회원명 목록 캐시(초)
+PRODUCT_PRICES_TTL = int(os.getenv("PRODUCT_PRICES_TTL", "300"))  # 주문 문장 가격/PV 보충용 제품별 최근 가격 캐시(초)
+
+# --------------------------------------------------
+# 주문 자연어 파싱
+# --------------------------------------------------
+ORDER_RULE_MIN_CONFIDENCE = float(os.getenv("ORDER_RULE_MIN_CONFIDENCE", "0.75"))  # 미만이면 LLM 호출
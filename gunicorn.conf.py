@@ -0,0 +1,46 @@
+# =====================================================
+# gunicorn 운영 설정
+#   gunicorn -c gunicorn.conf.py
+# =====================================================
+import os
+import multiprocessing
+
+# ✅ 앱 팩토리 (워커마다 create_app() 호출)
+wsgi_app = "app:create_app()"
+
+bind = f"0.0.0.0:{os.getenv('PORT', '10000')}"
+
+# ✅ 워커: 대부분 시간이 Google Sheets / OpenAI 대기 → 스레드(gthread) 또는 gevent
+#   GUNICORN_WORKER_CLASS=gevent 로 바꾸려면 gevent 설치 필요
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(4, multiprocessing.cpu_count() * 2 + 1))))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))            # gthread 전용
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "200"))   # gevent 전용
+
+# ✅ Vision 호출(최대 60초 + 재시도)보다 길게
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "180"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# ✅ 메모리 누수 대비 주기적 워커 교체 (동시에 교체되지 않도록 jitter)
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+
+# ⚠️ preload 하지 않음: 백그라운드 스레드·sqlite 연결은 fork 뒤 워커에서 만들어야 함
+preload_app = False
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+# ✅ 워커 간 시트 읽기 공유: SHEET_SHARED_CACHE_TTL=30 처럼 켜면
+#   모든 워커가 SHARED_CACHE_PATH(기본 임시 폴더의 sqlite 파일 1개)를 함께 사용
+
+# ✅ asyncio 서빙 (asgi.py, a2wsgi 필요): Flask 핸들러는 ASGI_THREADS 스레드 풀 (gthread 와 같은 동시 처리 상한)
+#   gunicorn -c gunicorn.conf.py -k uvicorn.workers.UvicornWorker asgi:application
+
+# ✅ 자주 읽는 시트 백그라운드 갱신: HOT_SHEET_TTL=60 처럼 켜면 워커마다 HOT_SHEETS(기본 DB,상담일지,제품주문)를
+#   만료 전에 미리 내려받아 요청이 시트 전체 다운로드를 기다리지 않음
+
+# ✅ 비동기 주문 업로드(async=1) 작업 상태: ORDER_JOB_DB_PATH(기본 임시 폴더의 sqlite 파일 1개)를 모든 워커가 공유
+#   → 작업을 받은 워커와 /order/jobs/<id> 조회가 들어온 워커가 달라도 조회됨
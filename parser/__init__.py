@@ -12,6 +12,22 @@ from .parse import (
     guess_intent,
     preprocess_user_input,
 )
+from .intent_classifier import IntentClassifier
+
+# --------------------------
+# 자연어 → intent + query (요청당 1회 파싱)
+# --------------------------
+from .nlu import (
+    nlu_to_pc_input,
+    preprocess_member_query,
+    ParsedCommand,
+    parse_command,
+    get_parsed_command,
+    current_command,
+    normalize_command_text,
+    parse_cache_stats,
+    clear_parse_cache,
+)
 
 # --------------------------
 # 회원 관련 파서
@@ -44,6 +60,11 @@ from .parse import (
     ensure_orders_list,
     parse_order_text_rule,
     handle_order_save,   # ✅ 이제 parser 소속으로 관리
+    handle_order_save_many,
+)
+from .order_grammar import (
+    OrderParse, MemberNameIndex, ProductPriceIndex,
+    parse_order_grammar, parse_order_hybrid, expand_order_quantity,
 )
 
 # --------------------------
@@ -61,6 +82,12 @@ from .parse import (
 __all__ = [
     # intent
     "field_map", "INTENT_RULES", "guess_intent", "preprocess_user_input",
+    "IntentClassifier",
+
+    # NLU
+    "nlu_to_pc_input", "preprocess_member_query",
+    "ParsedCommand", "parse_command", "get_parsed_command", "current_command",
+    "normalize_command_text", "parse_cache_stats", "clear_parse_cache",
 
     # 회원 파서
     "extract_value", "parse_field_value", "extract_phone", "extract_member_number",
@@ -74,7 +101,8 @@ __all__ = [
     "parse_request_line", "parse_memo",
 
     # 주문 파서
-    "parse_order_text", "ensure_orders_list", "parse_order_text_rule", "handle_order_save",
+    "parse_order_text", "ensure_orders_list", "parse_order_text_rule", "handle_order_save", "handle_order_save_many",
+    "OrderParse", "MemberNameIndex", "ProductPriceIndex", "parse_order_grammar", "parse_order_hybrid", "expand_order_quantity",
 
     # 후원수당 파서
     "process_date", "clean_commission_data", "parse_commission",
@@ -0,0 +1,115 @@
+# =================================================
+# 표준 라이브러리
+# =================================================
+import re
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+
+# ======================================================================================
+# ✅ 키워드 규칙 기반 intent 분류기 (컴파일 버전)
+# ======================================================================================
+class IntentClassifier:
+    """
+    INTENT_RULES(키워드 튜플 → intent)를 한 번만 컴파일해 두고 재사용하는 분류기
+
+    - 모든 키워드를 하나의 정규식(lookahead 교대)으로 묶어 query 를 한 번만 스캔
+    - 키워드마다 비트를 부여하고, 규칙은 "필요 키워드 비트마스크"로 보관
+    - 우선순위는 규칙의 입력 순서 그대로 (먼저 선언된 규칙이 이김)
+    - 같은 키워드 조합(비트마스크)에 대한 결정은 캐시해서 재사용
+
+    기존 루프와 동일한 결과:
+        for keywords, intent in rules.items():
+            if all(kw in query for kw in keywords):
+                return intent
+    """
+
+    # 결정 캐시 최대 크기 (키워드 조합 수는 실제로 매우 적음)
+    MAX_DECISIONS = 4096
+
+    def __init__(self, rules: Dict[Tuple[str, ...], str]):
+        self._rules_src = tuple(rules.items())
+
+        keywords = {kw for kws, _ in self._rules_src for kw in kws}
+        # 긴 키워드 먼저 → 같은 위치에서 가장 긴 키워드가 잡힘
+        ordered = sorted(keywords, key=lambda k: (-len(k), k))
+        bits = {kw: 1 << i for i, kw in enumerate(ordered)}
+
+        # 키워드가 잡히면 그 안에 포함된 짧은 키워드도 함께 존재하는 것으로 처리
+        # (예: "상담일지" → "일지", "상세정보" → "상세", "전체메모" → "메모")
+        self._closure = {
+            kw: _or_bits(bits[other] for other in ordered if other in kw)
+            for kw in ordered
+        }
+
+        if ordered:
+            alternation = "|".join(re.escape(kw) for kw in ordered)
+            self._pattern: Optional[re.Pattern] = re.compile(f"(?=({alternation}))")
+        else:
+            self._pattern = None
+
+        # (필요 비트마스크, intent) — 우선순위 순서
+        self._rules = tuple(
+            (_or_bits(bits[kw] for kw in kws), intent)
+            for kws, intent in self._rules_src
+        )
+
+        self._decisions: Dict[int, Optional[str]] = {}
+        self._lock = threading.Lock()
+
+    # --------------------------------------------------
+    # 키워드 스캔
+    # --------------------------------------------------
+    def keyword_mask(self, query: str) -> int:
+        """query 에 포함된 키워드들의 비트마스크 (단일 스캔)"""
+        if self._pattern is None:
+            return 0
+        mask = 0
+        closure = self._closure
+        for kw in self._pattern.findall(query):
+            mask |= closure[kw]
+        return mask
+
+    def _decide(self, mask: int) -> Optional[str]:
+        for required, intent in self._rules:
+            if required & mask == required:
+                return intent
+        return None
+
+    # --------------------------------------------------
+    # 분류
+    # --------------------------------------------------
+    def match(self, query: str) -> Optional[str]:
+        """
+        규칙에 매칭되는 intent 반환, 없으면 None
+        ⚠️ intent 값이 ""(빈 문자열)인 규칙도 그대로 반환 (기존 동작 유지)
+        """
+        mask = self.keyword_mask(query or "")
+        try:
+            return self._decisions[mask]
+        except KeyError:
+            pass
+
+        intent = self._decide(mask)
+        with self._lock:
+            if len(self._decisions) >= self.MAX_DECISIONS:
+                self._decisions.clear()
+            self._decisions[mask] = intent
+        return intent
+
+    def classify(self, query: str, default: str = "unknown") -> str:
+        """규칙 매칭 결과 반환 (없으면 default)"""
+        intent = self.match(query)
+        return default if intent is None else intent
+
+    @property
+    def rules(self) -> Tuple[Tuple[Tuple[str, ...], str], ...]:
+        """컴파일에 사용된 규칙 (우선순위 순서)"""
+        return self._rules_src
+
+
+def _or_bits(values: Iterable[int]) -> int:
+    mask = 0
+    for v in values:
+        mask |= v
+    return mask
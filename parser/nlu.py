@@ -0,0 +1,435 @@
+# =================================================
+# 표준 라이브러리
+# =================================================
+import re
+import unicodedata
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+# =================================================
+# 외부 라이브러리
+# =================================================
+from flask import g
+
+# =================================================
+# 프로젝트: config
+# =================================================
+from config import NLU_CACHE_SIZE
+
+# =================================================
+# 프로젝트: utils
+# =================================================
+from utils import (
+    normalize_code_query,
+    fallback_natural_search,
+    clean_member_query,
+    clean_memo_query,
+    clean_order_query,
+)
+from utils.cache import LRUCache
+from utils.log import get_logger
+from utils.metrics import STAGE_LATENCY
+from utils.profiling import phase
+
+from .parse import guess_intent
+
+logger = get_logger(__name__)
+
+
+# ======================================================================================
+# ✅ 회원 검색용 전처리
+# ======================================================================================
+def preprocess_member_query(text: str) -> str:
+    """
+    회원 검색용 전처리
+    - 회원번호, 휴대폰번호, 한글 이름 감지
+    - 불필요한 접두어("회원검색")는 붙이지 않고 원래 값 그대로 반환
+    """
+    text = (text or "").strip()
+
+    # 1. 회원번호 (숫자만)
+    if text.isdigit():
+        logger.debug("preprocess_member_query 회원번호 감지 → %s", text)
+        return text
+
+    # 2. 휴대폰 번호 (010-xxxx-xxxx or 010xxxxxxxx)
+    phone_pattern = r"^010[-]?\d{4}[-]?\d{4}$"
+    if re.fullmatch(phone_pattern, text):
+        logger.debug("preprocess_member_query 휴대폰번호 감지 → %s", text)
+        return text
+
+    # 3. 한글 이름 (2~4자)
+    name_pattern = r"^[가-힣]{2,4}$"
+    if re.fullmatch(name_pattern, text):
+        logger.debug("preprocess_member_query 한글이름 감지 → %s", text)
+        return text
+
+    # 4. 기본 (변경 없음)
+    logger.debug("preprocess_member_query 보정 없음 → %s", text)
+    return text
+
+
+
+# ======================================================================================
+# ✅ 자연어 → intent + query(dict) 변환
+# ======================================================================================
+def nlu_to_pc_input(text: str) -> dict:
+    """
+    자연어 입력을 intent + query(dict) 구조로 변환
+    - guess_intent + nlu_to_pc_input 통합
+    - 회원 / 메모 / 주문 intent 지원
+    """
+    text = (text or "").strip()
+
+
+
+
+    # -------------------------------
+    # 회원 관련
+    # -------------------------------
+    # 회원 등록
+    if any(word in text for word in ["회원등록", "회원추가", "회원 등록", "회원 추가"]):
+        # ✅ 케이스3: "<이름> 회원 등록 ..." → 이름 + 나머지
+        logger.debug("회원등록 케이스3 매치 시도: %s", text)
+        # 더 안전한 대안 (이름에서 '회원'이 분리된 경우만 추출)
+        m = re.match(r"(?<!\S)([가-힣]{2,10})\s+회원\s*(등록|추가)\s*(.*)", text)
+
+        if m:
+            logger.debug("회원등록 케이스3 성공: %s", m.groups())
+            member_name, _, extra = m.groups()
+            return {
+                "intent": "register_member",
+                "query": {
+                    "회원명": member_name.strip(),
+                    "raw_text": extra.strip()
+                }
+            }
+
+        # 케이스1: "<이름> 회원등록"
+        m = re.search(r"([가-힣]{2,10})\s*(회원등록|회원추가|회원 등록|회원 추가)", text)
+        if m:
+            return {
+                "intent": "register_member",
+                "query": {
+                    "회원명": m.group(1),
+                    "raw_text": text   # ✅ 꼭 포함해야 함!
+                }
+            }
+
+
+
+        # 케이스2: "회원등록 <이름>"
+        m = re.search(r"(회원등록|회원추가|회원 등록|회원 추가)\s*([가-힣]{2,10})", text)
+        if m:
+            return {
+                "intent": "register_member",
+                "query": {
+                    "회원명": m.group(2),
+                    "raw_text": text   # ✅ 꼭 포함해야 함!
+                }
+            }
+
+
+
+        # fallback
+        return {"intent": "register_member", "query": {"raw_text": text}}
+
+
+
+
+
+
+
+    # 회원 수정
+    if any(word in text for word in ["수정", "회원수정", "회원변경", "회원 수정", "회원 변경"]):
+        return {
+            "intent": "update_member",
+            "query": {
+                "raw_text": text
+            }
+        }
+
+
+
+
+
+
+    # 회원 삭제
+    if any(word in text for word in ["회원삭제", "회원제거", "회원 삭제", "회원 제거", "삭제", "제거"]):
+        # "회원삭제 이판주", "이판주 삭제", "이판주 회원삭제", "삭제 이판주" 등 위치에 관계없이 추출
+        m = re.search(r"(?:회원)?\s*([가-힣]{2,4})\s*(?:회원)?\s*(삭제|제거)", text)
+        if m:
+            return {"intent": "delete_member", "query": {"회원명": m.group(1)}}
+        return {"intent": "delete_member", "query": {"raw_text": text}}
+
+    # 회원 조회 / 검색 (동의어 지원)
+    if any(word in text for word in ["회원조회", "회원검색", "검색회원", "조회회원", "회원 조회", "회원 검색", "검색 회원", "조회 회원"]):
+    # 이름까지 붙었는지 확인
+        m = re.search(r"(회원\s*(검색|조회)\s*)([가-힣]{2,4})", text)
+        if m:
+            return {"intent": "search_member", "query": {"회원명": m.group(3)}}
+        
+        return {"intent": "search_member", "query": {"raw_text": text}}
+    
+    # 코드 검색 (코드a, 코드 b, 코드AA...)
+    normalized = normalize_code_query(text)
+    if normalized.startswith("코드"):
+        return {"intent": "search_member", "query": {"코드": normalized}}
+
+    # 회원명 + "회원"
+    m = re.search(r"([가-힣]{2,4})\s*회원", text)
+    if m:
+        return {"intent": "search_member", "query": {"회원명": m.group(1)}}
+
+    # 회원번호
+    if re.fullmatch(r"\d{5,8}", text):
+        return {"intent": "search_member", "query": {"회원번호": text}}
+
+    # 휴대폰번호
+    if re.fullmatch(r"(010-\d{3,4}-\d{4}|010\d{7,8})", text):
+        return {"intent": "search_member", "query": {"휴대폰번호": text}}
+
+    # 특수번호
+    m = re.search(r"특수번호\s*([a-zA-Z0-9!@#]+)", text)
+    if m:
+        return {"intent": "search_member", "query": {"특수번호": m.group(1)}}
+
+    # -------------------------------
+    # 메모/일지 관련
+    # -------------------------------
+    # 메모 저장
+    m = re.match(r"(\S+)\s+(개인일지|상담일지|활동일지|개인 일지|상담 일지|활동 일지)\s+저장\s+(.+)", text)
+    if m:
+        member_name, diary_type, content = m.groups()
+        return {"intent": "memo_add", "query": {"회원명": member_name, "일지종류": diary_type, "내용": content}}
+
+    # 메모 검색 (회원명 + 일지종류 + 검색)
+    m = re.match(r"(\S+)\s+(개인일지|상담일지|활동일지|개인 일지|상담 일지|활동 일지)\s+(검색|조회)\s+(.+)", text)
+    if m:
+        member_name, diary_type, _, keyword = m.groups()
+        return {"intent": "memo_search", "query": {"회원명": member_name, "일지종류": diary_type, "검색어": keyword}}
+
+    # 전체 메모 검색
+    m = re.match(r"전체\s*(메모|일지)\s*(검색|조회)\s*(.+)", text)
+    if m:
+        keyword = m.group(3)
+        return {"intent": "memo_search", "query": {"회원명": "전체", "일지종류": "전체", "검색어": keyword}}
+
+    # -------------------------------
+    # 주문 관련
+    # -------------------------------
+    order_text = text.replace("제품주문", "주문")
+
+    if "주문" in order_text:
+        # 등록/추가/저장
+        if any(word in order_text for word in ["등록", "추가", "저장"]):
+            m = re.search(r"([가-힣]{2,4}).*(제품)?주문", order_text)
+            if m:
+                return {"intent": "order_upload_pc", "query": {"회원명": m.group(1)}}
+            return {"intent": "order_upload_pc", "query": {"raw_text": text}}
+
+        # 수정/변경/업데이트
+        if any(word in order_text for word in ["수정", "변경", "업데이트"]):
+            m = re.search(r"([가-힣]{2,4}).*(제품)?주문.*(수정|변경|업데이트)", order_text)
+            if m:
+                return {"intent": "update_order", "query": {"회원명": m.group(1)}}
+            return {"intent": "update_order", "query": {"raw_text": text}}
+
+        # 삭제/취소
+        if any(word in order_text for word in ["삭제", "취소"]):
+            m = re.search(r"([가-힣]{2,4}).*(제품)?주문.*(삭제|취소)", order_text)
+            if m:
+                return {"intent": "delete_order", "query": {"회원명": m.group(1)}}
+            return {"intent": "delete_order", "query": {"raw_text": text}}
+
+        # 단순 "홍길동 주문"
+        m = re.search(r"([가-힣]{2,4}).*(제품)?주문", order_text)
+        if m:
+            return {"intent": "order_auto", "query": {"주문회원": m.group(1)}}
+
+        # 그냥 "주문"
+        return {"intent": "order_auto", "query": {"주문": True}}
+    
+
+    # -------------------------------
+    # 회원 저장 (업서트)
+    # -------------------------------
+    if "회원 저장" in text:
+        return {"intent": "save_member", "query": {"raw_text": text}}
+
+
+    # -------------------------------
+    # 후원수당
+    # -------------------------------
+    if "후원수당" in text or "수당" in text:
+        return {"intent": "commission_find", "query": {"raw_text": text}}
+
+    # -------------------------------
+    # 기본 반환
+    # -------------------------------
+    parts = text.split()
+    result = {}
+    for part in parts:
+        parsed = fallback_natural_search(part)
+        result.update(parsed)
+
+    if result.get("회원명") and (result.get("회원번호") or result.get("휴대폰번호")):
+        return {
+            "intent": "register_member",
+            "query": result
+        }
+
+    return {"intent": "unknown", "query": {"raw_text": text}}
+
+
+
+# ======================================================================================
+# ✅ 요청당 1회 파싱 결과 (ParsedCommand)
+# ======================================================================================
+MEMBER_CLEAN_INTENTS = ("register_member", "update_member", "delete_member")
+MEMO_CLEAN_INTENTS = ("save_memo", "find_memo", "memo_add", "memo_search")
+ORDER_CLEAN_INTENTS = ("register_order", "update_order", "delete_order", "find_order")
+
+
+def _freeze(value: Any) -> Any:
+    """dict → 읽기 전용 Mapping, list → tuple (중첩 포함)"""
+    if isinstance(value, Mapping):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """_freeze 의 역변환 (항상 새 객체 생성)"""
+    if isinstance(value, Mapping):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+@dataclass(frozen=True)
+class ParsedCommand:
+    """
+    자연어 요청 1건의 파싱 결과 (불변)
+
+    - intent       : 최종 확정 intent
+    - slots        : nlu_to_pc_input 이 추출한 query (읽기 전용)
+    - raw_text     : 사용자가 보낸 원문 (strip 만 적용)
+    - cleaned_text : intent 별 전처리(clean_*_query) 적용 후 문자열
+    """
+    intent: str
+    slots: Mapping[str, Any]
+    raw_text: str
+    cleaned_text: str
+
+    def query_dict(self) -> Dict[str, Any]:
+        """g.query 로 쓸 수정 가능한 복사본 (원본 slots 는 그대로 유지)"""
+        return _thaw(self.slots)
+
+
+def clean_text_for_intent(intent: str, text: str) -> str:
+    """intent 별 전처리 (회원 / 메모 / 주문 / 기본)"""
+    if intent in MEMO_CLEAN_INTENTS:
+        return clean_memo_query(text)
+    if intent in ORDER_CLEAN_INTENTS:
+        return clean_order_query(text)
+    return preprocess_member_query(clean_member_query(text))
+
+
+# ✅ 파싱 결과 LRU 캐시 (NFC 정규화된 원문 → ParsedCommand)
+#    ParsedCommand 는 불변이므로 스레드 간 그대로 공유 가능
+_PARSE_CACHE = LRUCache(maxsize=NLU_CACHE_SIZE)
+
+
+def normalize_command_text(text: str) -> str:
+    """캐시 키/파싱 입력용 정규화 (NFC + 앞뒤 공백 제거)"""
+    return unicodedata.normalize("NFC", text or "").strip()
+
+
+def parse_command(text: str) -> ParsedCommand:
+    """
+    자연어 입력을 한 번만 분석해서 ParsedCommand 로 반환
+    - 같은 문장(NFC 기준)은 LRU 캐시에서 바로 반환
+    """
+    key = normalize_command_text(text)
+    return _PARSE_CACHE.get_or_set(key, lambda: _parse_command(key))
+
+
+def parse_cache_stats() -> Dict[str, int]:
+    """파싱 캐시 통계 (hits / misses / size / maxsize)"""
+    return _PARSE_CACHE.stats()
+
+
+def clear_parse_cache() -> None:
+    """파싱 캐시 비우기 (규칙 변경/테스트용)"""
+    _PARSE_CACHE.clear()
+
+
+def _parse_command(raw_text: str) -> ParsedCommand:
+    """
+    parse_command 실제 처리 (캐시 미스 시에만 실행)
+
+    1. guess_intent (규칙 기반)
+    2. nlu_to_pc_input (query 추출 + 규칙 실패 시 intent fallback)
+    3. intent 별 전처리 → cleaned_text
+    4. 여전히 intent 를 모르면, 전처리된 문장으로 한 번 더 NLU 보강
+       (전처리 결과가 원문과 같으면 재분석하지 않음)
+    """
+    intent = guess_intent(raw_text)
+    parsed = nlu_to_pc_input(raw_text)
+    if not intent or intent == "unknown":
+        intent = parsed.get("intent", "unknown")
+    query = parsed.get("query", {}) or {}
+
+    cleaned_text = clean_text_for_intent(intent, raw_text)
+
+    # ✅ NLU 보강 (전처리 후에도 intent 미확정인 경우만)
+    if (not intent or intent == "unknown") and cleaned_text != raw_text:
+        refined = nlu_to_pc_input(cleaned_text)
+        refined_intent = refined.get("intent")
+        if refined_intent and refined_intent != "unknown":
+            intent = refined_intent
+            query = refined.get("query", {}) or {}
+
+    slots = dict(query)
+    slots["raw_text"] = raw_text  # 원본 자연어 그대로 저장
+
+    # ✅ keywords 보정 (검색어 → keywords)
+    if intent == "memo_search":
+        if isinstance(slots.get("검색어"), str):
+            slots["keywords"] = slots.pop("검색어").strip().split()
+        elif "keywords" not in slots:
+            slots["keywords"] = []
+
+    return ParsedCommand(
+        intent=intent or "unknown",
+        slots=_freeze(slots),
+        raw_text=raw_text,
+        cleaned_text=cleaned_text,
+    )
+
+
+def get_parsed_command(text: str) -> ParsedCommand:
+    """
+    현재 요청(g)에 저장된 ParsedCommand 재사용, 없거나 원문이 다르면 새로 파싱 후 저장
+    - before_request → post_intent → 라우트/intent 함수까지 같은 결과 공유
+    """
+    raw_text = normalize_command_text(text)
+    cmd = current_command()
+    if cmd is None or cmd.raw_text != raw_text:
+        with STAGE_LATENCY.time(stage="nlu"), phase("parse"):
+            cmd = parse_command(raw_text)
+        g.parsed_command = cmd
+    return cmd
+
+
+def current_command() -> Optional[ParsedCommand]:
+    """현재 요청에서 이미 파싱된 ParsedCommand (없으면 None)"""
+    try:
+        return g.get("parsed_command")
+    except RuntimeError:
+        # 요청 컨텍스트 밖 (테스트/스크립트)
+        return None
@@ -0,0 +1,425 @@
+# =================================================
+# 표준 라이브러리
+# =================================================
+import re
+import json
+import time
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+# =================================================
+# 프로젝트: config
+# =================================================
+from config import MEMBER_NAMES_TTL, ORDER_RULE_MIN_CONFIDENCE, PRODUCT_PRICES_TTL
+
+# =================================================
+# 프로젝트: utils
+# =================================================
+from utils import process_order_date
+from utils.log import get_logger
+from utils.shared_cache import on_sheet_invalidated
+
+logger = get_logger(__name__)
+
+
+# ======================================================================================
+# ✅ 주문 문장 문법 (규칙 기반, 네트워크 호출 없음)
+# ======================================================================================
+_KOREAN_COUNTS = {
+    "한": 1, "하나": 1, "두": 2, "둘": 2, "세": 3, "셋": 3, "네": 4, "넷": 4,
+    "다섯": 5, "여섯": 6, "일곱": 7, "여덟": 8, "아홉": 9, "열": 10,
+}
+_UNITS = r"개|박스|병|포|세트|통|팩|box|set"
+
+_QTY_RE = re.compile(
+    rf"(?P<product>[가-힣A-Za-z][가-힣A-Za-z0-9]*)\s*"
+    rf"(?:(?P<num>\d+)\s*(?P<unit>{_UNITS})?|(?P<word>{'|'.join(sorted(_KOREAN_COUNTS, key=len, reverse=True))})\s*(?P<unit2>{_UNITS}))"
+    r"(?![0-9가-힣])",
+    re.IGNORECASE,
+)
+_PRICE_RE = re.compile(r"(?P<price>\d{1,3}(?:,\d{3})+|\d{4,})\s*원")
+_PV_RE = re.compile(r"PV\s*[:：]?\s*(?P<pv>\d+(?:\.\d+)?)", re.IGNORECASE)
+_DATE_RE = re.compile(r"(20\d{2}[./-]\d{1,2}[./-]\d{1,2}|오늘|어제|내일)")
+_PAYMENT_RE = re.compile(r"(카드|현금|계좌\s*이체|이체|무통장)\s*(?:결제|결재|로|으로)?")
+_ADDRESS_LABEL_RE = re.compile(r"(?:주소|배송지|배송처)\s*[:：]?\s*(?P<addr>.+?)\s*(?:(?:으로|로)\s*)?(?:배송|보내.*)?$")
+_ADDRESS_SEND_RE = re.compile(r"(?P<addr>[가-힣0-9][가-힣0-9\s\-]*?)\s*(?:으로|로)\s*(?:배송|보내)")
+_REGION_RE = re.compile(
+    r"^(?:서울|부산|대구|인천|광주|대전|울산|세종|경기|강원|충북|충남|전북|전남|경북|경남|제주)"
+    r"|(?:시|도|구|군|동|읍|면|로|길)$"
+)
+_NOISE_RE = re.compile(r"(제품\s*)?주문(?:\s*(?:저장|등록|해\s*줘|해주세요|부탁(?:해요|합니다)?))?|저장|해\s*줘|해주세요|부탁(?:해요|합니다)?")
+_LEFTOVER_TOKEN_RE = re.compile(r"[가-힣A-Za-z0-9]+")
+
+_PAYMENT_NAMES = {"카드": "카드", "현금": "현금", "계좌이체": "계좌이체", "이체": "계좌이체", "무통장": "계좌이체"}
+_NOT_PRODUCT = {"주문", "제품", "카드", "현금", "이체", "계좌", "오늘", "어제", "내일", "결제", "결재", "주소", "배송", "PV", "pv"}
+
+# 필드별 신뢰도 가중치 (회원 + 제품 + 수량이 있으면 0.75)
+_WEIGHTS = {"회원명": 0.3, "제품명": 0.3, "수량": 0.15, "결재방법": 0.1, "배송처": 0.1, "주문일자": 0.05}
+
+# 규칙 결과를 그대로 저장하려면 문장에서 찾아야 하는 필드 (제품가격 / PV 는 문장에 없으면 최근 주문에서 보충)
+RULE_REQUIRED_FIELDS = ("회원명", "제품명")
+MAX_ORDER_QUANTITY = 100        # 수량 → 행 펼치기 상한 (오타로 시트가 수천 행 늘어나지 않도록)
+
+
+@dataclass(frozen=True)
+class OrderParse:
+    """
+    규칙 기반 주문 파싱 결과 (불변)
+
+    - fields: 회원명/제품명/수량/결재방법/배송처/주문일자 (+ 제품가격, PV: 1개 가격)
+    - found: 문장에서 실제로 찾은 필드 (기본값으로 채운 필드 제외)
+    - confidence: 0~1, 찾은 필드 가중치 합 × 해석 못한 단어 비율 감점
+    """
+    raw_text: str
+    fields: Mapping[str, Any]
+    found: Tuple[str, ...]
+    confidence: float
+
+    def to_order(self) -> Dict[str, Any]:
+        """제품주문 시트 저장용 dict (handle_order_save 입력 형식)"""
+        order = dict(self.fields)
+        order.setdefault("수령확인", "N")
+        return order
+
+
+_SPAN_FILL = " "
+
+
+def _consume(text: str, m: "re.Match") -> str:
+    """매칭 구간을 공백으로 치환 (이후 규칙이 같은 단어를 다시 쓰지 않도록)"""
+    return text[:m.start()] + _SPAN_FILL * (m.end() - m.start()) + text[m.end():]
+
+
+def parse_order_grammar(text: str,
+                        member_matcher: Optional[Callable[[str], Optional[str]]] = None) -> OrderParse:
+    """
+    자연어 주문 문장 → OrderParse
+
+    예: "이수민 노니 2박스 카드 결제 오늘 주소 서울 강남구"
+    - 회원명: member_matcher(text) (기본: 캐시된 DB 회원명 목록)
+    - 제품명 + 수량: "노니 2개", "홍삼 세 박스"
+    - 결재방법: 카드 / 현금 / 계좌이체 (없으면 카드)
+    - 배송처: "주소/배송지: ...", "... 로 배송"
+    - 주문일자: 오늘/어제/내일/YYYY-MM-DD → process_order_date
+    """
+    raw = (text or "").strip()
+    work = re.sub(r"\s+", " ", raw)
+    fields: Dict[str, Any] = {}
+    found: List[str] = []
+
+    # ✅ 회원명
+    member = (member_matcher or match_cached_member_name)(work) if work else None
+    if member:
+        fields["회원명"] = member
+        found.append("회원명")
+        work = work.replace(member, _SPAN_FILL * len(member), 1)
+
+    # ✅ 주문일자
+    m = _DATE_RE.search(work)
+    fields["주문일자"] = process_order_date(m.group(1) if m else "")
+    if m:
+        found.append("주문일자")
+        work = _consume(work, m)
+
+    # ✅ 결재방법
+    m = _PAYMENT_RE.search(work)
+    fields["결재방법"] = _PAYMENT_NAMES[re.sub(r"\s+", "", m.group(1))] if m else "카드"
+    if m:
+        found.append("결재방법")
+        work = _consume(work, m)
+
+    # ✅ 가격 / PV (있을 때만)
+    m = _PRICE_RE.search(work)
+    if m:
+        fields["제품가격"] = m.group("price").replace(",", "")
+        found.append("제품가격")
+        work = _consume(work, m)
+    m = _PV_RE.search(work)
+    if m:
+        fields["PV"] = m.group("pv")
+        found.append("PV")
+        work = _consume(work, m)
+
+    # ✅ 배송처 ("주소 ..." 는 문장 끝까지, "... 로 배송" 은 앞 구간)
+    address = ""
+    m = _ADDRESS_LABEL_RE.search(work)
+    if m:
+        address = m.group("addr").strip()
+        work = _consume(work, m)
+    else:
+        m = _ADDRESS_SEND_RE.search(_NOISE_RE.sub(lambda n: _SPAN_FILL * len(n.group(0)), work))
+        if m:
+            # "비타민 부산 해운대구로 배송" → 지역명처럼 보이는 단어부터 (없으면 마지막 단어)
+            tokens = m.group("addr").split()
+            first = next((i for i, t in enumerate(tokens) if _REGION_RE.search(t)), len(tokens) - 1)
+            address = " ".join(tokens[first:])
+            # 주소 단어 + "로 배송" 만 소비 (앞의 제품명 등은 남김)
+            tail = re.search(
+                r"\s*".join(map(re.escape, tokens[first:])) + r"\s*(?:으로|로)\s*(?:배송|보내\S*)", work
+            )
+            if tail:
+                work = _consume(work, tail)
+    fields["배송처"] = re.sub(r"\s+", " ", address).strip()
+    if fields["배송처"]:
+        found.append("배송처")
+
+    # ✅ 제품명 + 수량
+    work = _NOISE_RE.sub(lambda n: _SPAN_FILL * len(n.group(0)), work)
+    for m in _QTY_RE.finditer(work):
+        if m.group("product") in _NOT_PRODUCT:
+            continue
+        fields["제품명"] = m.group("product")
+        fields["수량"] = int(m.group("num")) if m.group("num") else _KOREAN_COUNTS[m.group("word")]
+        found.extend(["제품명", "수량"])
+        work = _consume(work, m)
+        break
+    else:
+        # 수량 없이 제품명만: 남은 단어가 정확히 하나면 제품명으로 간주
+        leftover = [t for t in _LEFTOVER_TOKEN_RE.findall(work) if t not in _NOT_PRODUCT]
+        if len(leftover) == 1:
+            fields["제품명"] = leftover[0]
+            work = work.replace(leftover[0], _SPAN_FILL * len(leftover[0]), 1)
+            # 문장 전체를 해석했으면 "노니 주문" = 1개 주문으로 확정
+            found.extend(["제품명", "수량"])
+        fields["수량"] = 1
+
+    # ✅ 신뢰도: 찾은 필드 가중치 합, 해석 못한 단어가 남으면 감점
+    score = sum(_WEIGHTS[f] for f in found if f in _WEIGHTS)
+    leftover = [t for t in _LEFTOVER_TOKEN_RE.findall(work) if t not in _NOT_PRODUCT]
+    total_tokens = max(1, len(_LEFTOVER_TOKEN_RE.findall(raw)))
+    score *= 1.0 - 0.5 * min(1.0, len(leftover) / total_tokens)
+
+    return OrderParse(
+        raw_text=raw,
+        fields=MappingProxyType(fields),
+        found=tuple(found),
+        confidence=round(min(1.0, score), 3),
+    )
+
+
+# ======================================================================================
+# ✅ 회원명 매칭 (DB 회원명 목록 캐시)
+# ======================================================================================
+class MemberNameIndex:
+    """
+    회원명 목록 → 긴 이름 우선 정규식 1개로 컴파일 (utils.match_member_name 과 같은 규칙)
+    - loader 결과를 ttl 초 동안 재사용 (주문 문장마다 시트를 내려받지 않음)
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[str]], ttl: float = MEMBER_NAMES_TTL):
+        self._loader = loader
+        self.ttl = ttl
+        self._pattern: Optional["re.Pattern"] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def compile(names: Iterable[str]) -> Optional["re.Pattern"]:
+        cleaned = sorted({str(n).strip() for n in names if n and str(n).strip()}, key=len, reverse=True)
+        if not cleaned:
+            return None
+        return re.compile("|".join(map(re.escape, cleaned)))
+
+    def _current(self) -> Optional["re.Pattern"]:
+        if self._loaded_at and time.monotonic() - self._loaded_at < self.ttl:
+            return self._pattern
+        with self._lock:
+            if not self._loaded_at or time.monotonic() - self._loaded_at >= self.ttl:
+                self._pattern = self.compile(self._loader())
+                self._loaded_at = time.monotonic()
+        return self._pattern
+
+    def match(self, text: str) -> Optional[str]:
+        pattern = self._current()
+        if not text or pattern is None:
+            return None
+        # 문장에 포함된 이름 중 가장 긴 것 (앞에 나온 짧은 이름보다 우선)
+        hits = [m.group(0) for m in pattern.finditer(text)]
+        return max(hits, key=len) if hits else None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._pattern = None
+            self._loaded_at = 0.0
+
+
+def _load_member_names() -> List[str]:
+    from utils.sheets import get_member_sheet   # 순환 import 방지
+    from utils.shared_cache import SHEET_SHARED_CACHE_TTL, shared_sheet_records
+    # 워커 공유 캐시를 켠 경우 회원명 목록도 워커끼리 한 번만 내려받음
+    ttl = MEMBER_NAMES_TTL if SHEET_SHARED_CACHE_TTL > 0 else 0
+    return shared_sheet_records("DB:회원명", lambda: get_member_sheet().col_values(1)[1:], ttl=ttl)
+
+
+MEMBER_NAME_INDEX = MemberNameIndex(_load_member_names)
+
+
+def match_cached_member_name(text: str) -> Optional[str]:
+    try:
+        return MEMBER_NAME_INDEX.match(text)
+    except Exception as e:
+        logger.warning("회원명 목록 조회 실패: %s", e)
+        return None
+
+
+# ======================================================================================
+# ✅ 제품 가격 / PV (제품주문 시트의 최근 주문 기준)
+# ======================================================================================
+def _product_key(name: Any) -> str:
+    return re.sub(r"\s+", "", str(name or "")).lower()
+
+
+def _number_text(value: Any) -> Optional[str]:
+    """시트 값 → 숫자 문자열 ("45,000" / 45000.0 → "45000"), 숫자가 아니면 None"""
+    try:
+        number = float(str(value).replace(",", "").strip())
+    except ValueError:
+        return None
+    return str(int(number)) if number.is_integer() else str(number)
+
+
+class ProductPriceIndex:
+    """
+    제품명 → 가장 최근 주문의 1개 가격 / PV (제품주문 시트는 맨 위 행이 최신)
+    - 제품명은 공백 제거 + 소문자로 비교, 가격이 0 이하이거나 숫자가 아닌 행은 건너뜀
+    - loader 결과를 ttl 초 동안 재사용 (주문 문장마다 시트를 내려받지 않음)
+    """
+
+    def __init__(self, loader: Callable[[], Iterable[Mapping[str, Any]]], ttl: float = PRODUCT_PRICES_TTL):
+        self._loader = loader
+        self.ttl = ttl
+        self._prices: Dict[str, Dict[str, str]] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def build(rows: Iterable[Mapping[str, Any]]) -> Dict[str, Dict[str, str]]:
+        prices: Dict[str, Dict[str, str]] = {}
+        for row in rows:
+            key = _product_key(row.get("제품명"))
+            if not key or key in prices:
+                continue
+            price, pv = _number_text(row.get("제품가격", "")), _number_text(row.get("PV", ""))
+            if price is None or pv is None or float(price) <= 0:
+                continue
+            prices[key] = {"제품가격": price, "PV": pv}
+        return prices
+
+    def _current(self) -> Dict[str, Dict[str, str]]:
+        if self._loaded_at and time.monotonic() - self._loaded_at < self.ttl:
+            return self._prices
+        with self._lock:
+            if not self._loaded_at or time.monotonic() - self._loaded_at >= self.ttl:
+                self._prices = self.build(self._loader())
+                self._loaded_at = time.monotonic()
+        return self._prices
+
+    def lookup(self, product: str) -> Optional[Dict[str, str]]:
+        """{"제품가격", "PV"} 사본 (주문 이력이 없으면 None)"""
+        found = self._current().get(_product_key(product))
+        return dict(found) if found else None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._prices = {}
+            self._loaded_at = 0.0
+
+
+def _load_product_rows() -> List[Dict[str, Any]]:
+    from utils.sheets import get_rows_from_sheet   # 순환 import 방지
+    return get_rows_from_sheet("제품주문")
+
+
+PRODUCT_PRICE_INDEX = ProductPriceIndex(_load_product_rows)
+
+
+@on_sheet_invalidated
+def _invalidate_product_prices(sheet_name: str) -> None:
+    if sheet_name == "제품주문":     # 새 주문이 저장되면 다음 조회에서 최근 가격 다시 읽기
+        PRODUCT_PRICE_INDEX.invalidate()
+
+
+def lookup_cached_product_price(product: str) -> Optional[Dict[str, str]]:
+    try:
+        return PRODUCT_PRICE_INDEX.lookup(product)
+    except Exception as e:
+        logger.warning("제품 가격 조회 실패: %s", e)
+        return None
+
+
+# ======================================================================================
+# ✅ 수량 → 주문 행
+# ======================================================================================
+def expand_order_quantity(orders: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    수량 N 주문 → 같은 주문 N 행 (제품주문 시트에는 수량 열이 없음 → 1행 = 1개)
+    - 제품가격 / PV 는 1개 기준으로 보고 그대로 복사
+    - 수량이 없거나 숫자가 아니면 1, MAX_ORDER_QUANTITY 초과는 잘라냄
+    """
+    rows: List[Dict[str, Any]] = []
+    for order in orders:
+        order = dict(order)
+        try:
+            quantity = int(str(order.pop("수량", 1) or 1).strip())
+        except ValueError:
+            quantity = 1
+        rows.extend(dict(order) for _ in range(max(1, min(quantity, MAX_ORDER_QUANTITY))))
+    return rows
+
+
+# ======================================================================================
+# ✅ 규칙 우선, 신뢰도 낮을 때만 LLM
+# ======================================================================================
+def _orders_from_llm_response(resp: Any) -> List[Dict[str, Any]]:
+    """parse_order_from_text 응답(OpenAI JSON) → 주문 리스트"""
+    from .parse import ensure_orders_list   # 순환 import 방지
+
+    content = resp
+    if isinstance(resp, dict) and "choices" in resp:
+        content = resp["choices"][0]["message"].get("content", "")
+    if isinstance(content, str):
+        content = re.sub(r"```(?:json)?|```", "", content).strip()
+        try:
+            content = json.loads(content)
+        except json.JSONDecodeError:
+            return []
+    return ensure_orders_list(content)
+
+
+def parse_order_hybrid(text: str,
+                       llm: Optional[Callable[[str], Any]] = None,
+                       member_matcher: Optional[Callable[[str], Optional[str]]] = None,
+                       min_confidence: float = ORDER_RULE_MIN_CONFIDENCE,
+                       price_lookup: Optional[Callable[[str], Optional[Dict[str, str]]]] = None) -> Dict[str, Any]:
+    """
+    규칙 기반 파싱 → confidence >= min_confidence 이고 회원/제품을 찾았으면 그대로 사용, 아니면 LLM 호출
+
+    반환: {"orders": [...], "source": "rule" | "llm", "confidence": float}
+    - 문장에 제품가격 / PV 가 없으면 price_lookup(제품명) (기본: 그 제품의 최근 제품주문 행) 으로 채움
+      → 주문 이력이 없는 제품이면 0원 / 0 PV 로 저장하지 않고 LLM 으로 넘김
+    - LLM 결과에 회원명이 없으면 규칙에서 찾은 회원명으로 보강
+    - orders 는 수량을 유지 (시트 저장 전에 expand_order_quantity 로 행 펼치기)
+    """
+    parsed = parse_order_grammar(text, member_matcher=member_matcher)
+    resolved = all(f in parsed.found for f in RULE_REQUIRED_FIELDS)
+    if parsed.confidence >= min_confidence and resolved:
+        order = parsed.to_order()
+        missing = [f for f in ("제품가격", "PV") if f not in parsed.found]
+        known = (price_lookup or lookup_cached_product_price)(order["제품명"]) if missing else {}
+        if known is not None:
+            order.update({f: known[f] for f in missing})
+            return {"orders": [order], "source": "rule", "confidence": parsed.confidence}
+        logger.debug("가격/PV 를 알 수 없는 제품 → LLM: %s", order["제품명"])
+
+    if llm is None:
+        from utils import parse_order_from_text   # 순환 import 방지
+        llm = parse_order_from_text
+
+    orders = _orders_from_llm_response(llm(text))
+    for order in orders:
+        if parsed.fields.get("회원명"):
+            order.setdefault("회원명", parsed.fields["회원명"])
+        order.setdefault("주문일자", parsed.fields["주문일자"])
+    return {"orders": orders, "source": "llm", "confidence": parsed.confidence}
@@ -57,6 +57,14 @@ from utils import (
 
 
 from utils.sheets import get_order_sheet
+from utils.snapshot import active_write_batch, SheetWriteBatch
+from utils.outbox import enqueue_impact_orders, new_save_id
+from utils.shared_cache import invalidate_sheet
+from utils.log import get_logger, debug_sampled
+
+from .intent_classifier import IntentClassifier
+
+logger = get_logger(__name__)
 
 
 
@@ -173,44 +181,50 @@ INTENT_RULES = {
 
 
 
+# 규칙 컴파일 (import 시 1회)
+_INTENT_CLASSIFIER = IntentClassifier(INTENT_RULES)
+
+_RE_NAME_SELECT = re.compile(r"[가-힣]{2,4}\s*(전체정보|상세|info)")
+_RE_NAME_ONLY = re.compile(r"[가-힣]{2,4}")
+_RE_NAME_UPDATE = re.compile(r"[가-힣]{2,4}\s+.*(수정|변경|업데이트)")
+_RE_NAME_DELETE = re.compile(r"[가-힣]{2,4}\s+삭제")
+
+_MEMBER_SELECT_WORDS = frozenset(["전체정보", "상세", "info"])
+_MEMO_SAVE_PHRASES = ("개인일지 저장", "상담일지 저장", "활동일지 저장", "메모 저장")
+_MEMO_SEARCH_PHRASES = ("메모 검색", "상담일지 검색", "개인일지 검색", "활동일지 검색")
+_DIARY_PREFIXES = ("개인일지", "상담일지", "활동일지")
+
+
 def guess_intent(query: str) -> str:
     query = (query or "").strip()
-    import re
 
     # ✅ "강소희 전체정보", "강소희 상세", "강소희 info"
-    if re.fullmatch(r"[가-힣]{2,4}\s*(전체정보|상세|info)", query):
+    if _RE_NAME_SELECT.fullmatch(query):
         return "member_select"
 
     # ✅ "전체정보", "상세", "info" 단독 입력
-    if query in ["전체정보", "상세", "info"]:
+    if query in _MEMBER_SELECT_WORDS:
         return "member_select"
 
     # ✅ 이름만 입력 (2~4글자 한글) → 회원 검색
-    if re.fullmatch(r"[가-힣]{2,4}", query):
+    if _RE_NAME_ONLY.fullmatch(query):
         return "search_member"
 
     if query.endswith("회원등록") or query.endswith("회원 등록"):
         return "register_member"
 
-    
     # ex) "홍길동 주소 수정 대구시" 같은 구조에만 반응
-    if re.search(r"[가-힣]{2,4}\s+.*(수정|변경|업데이트)", query) and "회원" in query:
+    if "회원" in query and _RE_NAME_UPDATE.search(query):
         return "update_member"
 
-    
-    if "삭제" in query and ("회원" in query or re.match(r"^[가-힣]{2,4}\s+삭제", query)):
+    if "삭제" in query and ("회원" in query or _RE_NAME_DELETE.match(query)):
         parts = query.split()
         if len(parts) >= 3:
             return "delete_member_field_nl_func"
-        elif len(parts) >= 2:
-            return "delete_member"
         return "delete_member"
 
-    
-
-
     # ✅ 메모 저장 intent
-    if any(kw in query for kw in ["개인일지 저장", "상담일지 저장", "활동일지 저장", "메모 저장"]):
+    if any(kw in query for kw in _MEMO_SAVE_PHRASES):
         return "memo_add"
 
     # ✅ 상담일지 추가 (특수 케이스)
@@ -218,27 +232,19 @@ def guess_intent(query: str) -> str:
         return "add_counseling"
 
     # ✅ 메모 검색 intent
-    if any(kw in query for kw in ["메모 검색", "상담일지 검색", "개인일지 검색", "활동일지 검색"]):
+    if any(kw in query for kw in _MEMO_SEARCH_PHRASES):
         return "memo_search"
 
     # ✅ 메모 검색 intent (검색 토큰이 전처리에서 지워진 경우까지 보강)
-    if any(query.startswith(prefix) for prefix in ["개인일지", "상담일지", "활동일지"]) \
-    and not query.endswith("저장"):
+    if query.startswith(_DIARY_PREFIXES) and not query.endswith("저장"):
         return "memo_search"
 
-
     # 🔹 전체메모 검색 케이스 추가 (띄어쓰기 포함/미포함 대응)
-    normalized = query.replace(" ", "")
-    if normalized.startswith("전체메모") and "검색" in query:
+    if "검색" in query and query.replace(" ", "").startswith("전체메모"):
         return "memo_search"
 
-    # ✅ 기존 intent 규칙 검사 (INTENT_RULES 기반)
-    for keywords, intent in INTENT_RULES.items():
-        if all(kw in query for kw in keywords):
-            return intent
-
-    # fallback
-    return "unknown"
+    # ✅ 기존 intent 규칙 검사 (INTENT_RULES 기반, 컴파일된 단일 스캔)
+    return _INTENT_CLASSIFIER.classify(query, default="unknown")
 
 
 
@@ -1252,17 +1258,25 @@ def save_memo(sheet_name: str, member_name: str, content: str) -> bool:
     if not member_name or not content:
         raise ValueError("회원명과 내용은 필수 입력 항목입니다.")
 
-    if sheet_name == "상담일지":
-        sheet = get_counseling_sheet()
-    elif sheet_name == "개인일지":
-        sheet = get_personal_memo_sheet()
-    elif sheet_name == "활동일지":
-        sheet = get_activity_log_sheet()
-    else:
+    getters = {
+        "상담일지": get_counseling_sheet,
+        "개인일지": get_personal_memo_sheet,
+        "활동일지": get_activity_log_sheet,
+    }
+    if sheet_name not in getters:
         raise ValueError(f"지원하지 않는 일지 종류: {sheet_name}")
 
     ts = now_kst().strftime("%Y-%m-%d %H:%M")
-    sheet.insert_row([ts, member_name.strip(), content.strip()], index=2)
+    row = [ts, member_name.strip(), content.strip()]
+
+    # ✅ 배치 요청 중이면 시트별로 모았다가 한 번에 반영
+    batch = active_write_batch()
+    if batch is not None:
+        batch.insert_top(sheet_name, row)
+        return True
+
+    getters[sheet_name]().insert_row(row, index=2)
+    invalidate_sheet(sheet_name)   # 요청 밖에서 원본 워크시트에 쓴 경우에도 메모 검색 캐시 비움
     return True
 
 
@@ -1278,7 +1292,7 @@ def find_memo(keyword: str, sheet_name: str = "상담일지") -> list:
     try:
         sheet = get_worksheet(sheet_name)
         if not sheet:
-            print(f"[ERROR] ❌ 시트를 가져올 수 없습니다: {sheet_name}")
+            logger.error("시트를 가져올 수 없습니다: %s", sheet_name)
             return []
 
         all_records = sheet.get_all_records()
@@ -1288,10 +1302,10 @@ def find_memo(keyword: str, sheet_name: str = "상담일지") -> list:
             if keyword in row_text:
                 results.append(row)
 
-        print(f"[INFO] ✅ '{sheet_name}' 시트에서 '{keyword}' 검색 결과 {len(results)}건 발견")
+        logger.info("'%s' 시트에서 '%s' 검색 결과 %d건 발견", sheet_name, keyword, len(results))
         return results
     except Exception as e:
-        print(f"[ERROR] find_memo 오류: {e}")
+        logger.error("find_memo 오류: %s", e)
         return []
 
 
@@ -1362,8 +1376,8 @@ def keyword_match(content_lower: str, clean_keywords: list, search_mode="any") -
         k_norm = normalize_korean(k)
         found = k_norm in normalized_content
         results.append(found)
-        print(f"[DEBUG] keyword_match | keyword={k_norm} | "
-              f"in_content={found} | content={normalized_content[:50]}...")
+        debug_sampled(logger, "keyword_match | keyword=%s | in_content=%s | content=%.50s...",
+                      k_norm, found, normalized_content)
 
     if search_mode == "동시검색":
         return all(results)
@@ -1545,20 +1559,30 @@ def parse_order_text_rule(text: str) -> dict:
 # -----------------------------
 # 주문 저장 함수
 # -----------------------------
-def handle_order_save(data: dict):
-    sheet = get_worksheet("제품주문")
-    if not sheet:
-        return {"http_status": 500, "status": "error", "message": "제품주문 시트를 찾을 수 없습니다."}
-
-    # ✅ 주문일자 변환
+def _order_row(data: dict) -> list:
+    """주문 dict → 제품주문 시트 행 (주문일자 변환, 가격/PV 숫자화)"""
     order_date = process_order_date(data.get("주문일자", ""))
-    row = [
+    return [
         order_date, data.get("회원명", ""), data.get("회원번호", ""), data.get("휴대폰번호", ""),
         data.get("제품명", ""), float(data.get("제품가격", 0)), float(data.get("PV", 0)),
         data.get("결재방법", ""), data.get("주문자_고객명", ""), data.get("주문자_휴대폰번호", ""),
         data.get("배송처", ""), data.get("수령확인", "")
     ]
 
+
+def handle_order_save(data: dict, save_id: Optional[str] = None):
+    """
+    주문 1건을 제품주문 시트 맨 위(2행)에 저장
+    - save_id: 같은 저장을 재시도할 때 넘기면 Impact 동기화가 중복 기록되지 않음 (없으면 새로 생성)
+    """
+    save_id = save_id or new_save_id()
+    sheet = get_worksheet("제품주문")
+    if not sheet:
+        return {"http_status": 500, "status": "error", "message": "제품주문 시트를 찾을 수 없습니다."}
+
+    # ✅ 주문일자 변환
+    row = _order_row(data)
+
     values = sheet.get_all_values()
 
     # ✅ 헤더 없으면 생성
@@ -1573,6 +1597,8 @@ def handle_order_save(data: dict):
 
     # ✅ 항상 맨 위(2행)에 삽입
     sheet.insert_row(row, index=2)
+    invalidate_sheet("제품주문")
+    enqueue_impact_orders(data.get("회원명", ""), [data], save_id=save_id)
 
     # ✅ 최신 주문(2행) 조회
     latest = sheet.row_values(2)
@@ -1590,6 +1616,76 @@ def handle_order_save(data: dict):
 
 
 
+def handle_order_save_many(orders: List[dict], save_id: Optional[str] = None) -> dict:
+    """
+    여러 주문을 제품주문 시트에 한 번에 저장 (insert_rows 1회)
+    - 행 순서는 handle_order_save 를 차례로 호출한 것과 동일 (마지막 주문이 맨 위)
+    - 가격/PV 변환 실패 주문은 건너뛰고 skipped 에 사유 기록
+    - save_id: handle_order_save 와 같음 (회원별 Impact 이벤트 키에 공통으로 사용)
+    - results: 주문별 결과 리스트 (handle_order_save 를 주문마다 호출했을 때와 같은 모양)
+    """
+    save_id = save_id or new_save_id()
+    sheet = get_worksheet("제품주문")
+    if not sheet:
+        error = {"http_status": 500, "status": "error", "message": "제품주문 시트를 찾을 수 없습니다."}
+        return {**error, "results": [dict(error) for _ in orders]}
+
+    rows, skipped = [], []
+    results: List[dict] = []
+    for i, data in enumerate(orders):
+        try:
+            row = _order_row(data)
+        except (TypeError, ValueError) as e:
+            skipped.append({"index": i, "제품명": data.get("제품명", ""), "message": str(e)})
+            results.append({"http_status": 400, "status": "error", "message": str(e)})
+            continue
+        rows.append(row)
+        results.append({
+            "http_status": 200,
+            "status": "ok",
+            "message": "✅ 주문이 새로 저장되었습니다.",
+            "latest_order": dict(zip(ORDER_HEADERS, row)),
+        })
+
+    if not rows:
+        return {"http_status": 400, "status": "error", "message": "저장할 주문이 없습니다.",
+                "skipped": skipped, "results": results}
+
+    # ✅ 헤더 없으면 생성
+    if not sheet.row_values(1):
+        sheet.append_row(ORDER_HEADERS)
+
+    batch = SheetWriteBatch(worksheet_getter=lambda name: sheet)
+    for row in rows:
+        batch.insert_top("제품주문", row)
+    outcome = batch.flush()["제품주문"]
+
+    if outcome["status"] != "success":
+        error = {"http_status": 500, "status": "error", "message": outcome.get("message", "")}
+        return {**error, "skipped": skipped, "results": [dict(error) for _ in orders]}
+
+    # ✅ Impact 동기화는 회원별로 아웃박스에 기록 (전송은 백그라운드)
+    skipped_index = {s["index"] for s in skipped}
+    by_member: Dict[str, List[dict]] = {}
+    for i, data in enumerate(orders):
+        if i not in skipped_index:
+            by_member.setdefault(data.get("회원명", ""), []).append(data)
+    for member_name, member_orders in by_member.items():
+        enqueue_impact_orders(member_name, member_orders, save_id=save_id)
+
+    return {
+        "http_status": 200,
+        "status": "ok",
+        "message": f"✅ 주문 {len(rows)}건이 저장되었습니다.",
+        "saved": len(rows),
+        "skipped": skipped,
+        "results": results,
+    }
+
+
+
+
+
 # ===============================================
 # ✅ 제품 주문 처리
 # ===============================================
@@ -1623,7 +1719,7 @@ def save_order_to_sheet(order: dict) -> bool:
         append_row(sheet, row_data)
         return True
     except Exception as e:
-        print(f"[ERROR] 주문 저장 중 오류: {e}")
+        logger.error("주문 저장 중 오류: %s", e)
         return False
 
 
@@ -1936,7 +2032,7 @@ def register_commission(data: dict) -> bool:
         ws.append_row(row_data, value_input_option="USER_ENTERED")
         return True
     except Exception as e:
-        print(f"[ERROR] register_commission: {e}")
+        logger.error("register_commission: %s", e)
         return False
 
 
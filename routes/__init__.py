@@ -55,6 +55,9 @@ from .routes_order import (
     order_auto_func,
     save_order_proxy_func,
     addOrders,
+    process_order_upload,
+    order_job_status_func,
+    order_extract_stats_func,
 )
 
 
@@ -98,6 +101,9 @@ __all__ = [
     "order_nl_func",
     "order_auto_func",
     "save_order_proxy_func",
+    "process_order_upload",
+    "order_job_status_func",
+    "order_extract_stats_func",
     "addOrders",
 
     # 후원수당
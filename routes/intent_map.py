@@ -3,11 +3,13 @@
 # =================================================
 from flask import g
 
+from utils.dispatch import build_intent_registry
+
 from routes.routes_member import (
     search_member_func, register_member_func, update_member_func,
     save_member_func, delete_member_func, search_by_code_logic, member_select,
     get_full_member_info, get_summary_info, get_compact_info,
-    delete_member_field_nl_func, handle_update_member,
+    delete_member_field_nl_func,
 )
 from routes.routes_memo import (
     memo_save_auto_func, add_counseling_func,
@@ -88,3 +90,101 @@ INTENT_MAP = {
 }
 
 
+
+# ======================================================================================
+# ✅ dispatch 레지스트리 (import 시 1회 생성)
+# ======================================================================================
+# intent → IntentHandler (호출 방식 미리 계산)
+# ⚠️ 시그니처를 (query, options) 규칙으로 바인딩할 수 없는 핸들러가 있으면
+#    여기서 IntentBindingError 발생 → 서버 기동 자체가 실패
+INTENT_REGISTRY = build_intent_registry(INTENT_MAP)
+
+MEMBER_REGISTRY = {k: INTENT_REGISTRY[k] for k in MEMBER_INTENTS}
+MEMO_REGISTRY = {k: INTENT_REGISTRY[k] for k in MEMO_INTENTS}
+ORDER_REGISTRY = {k: INTENT_REGISTRY[k] for k in ORDER_INTENTS}
+COMMISSION_REGISTRY = {k: INTENT_REGISTRY[k] for k in COMMISSION_INTENTS}
+
+
+def _member_name_arg(data: dict):
+    return (
+        data.get("회원명")
+        or data.get("name")
+        or data.get("member_name")
+        or data.get("query")
+        or ""
+    )
+
+
+# /member 라우트: intent 별로 핸들러에 넘길 첫 번째 인자 (없으면 None)
+MEMBER_ROUTE_ARGS = {
+    "register_member": lambda data: data,
+    "update_member": lambda data: data,
+    "save_member": lambda data: data,
+    "search_member": _member_name_arg,
+    "member_select": lambda data: data.get("choice") or g.query.get("choice", ""),
+    "select_member": lambda data: data.get("choice") or g.query.get("choice", ""),
+    "search_by_code_logic": lambda data: data.get("코드") or data.get("code") or "",
+}
+
+
+def dispatch_intent(intent, query=None, options=None, registry=None):
+    """
+    intent 실행 (dict 조회 1회 + 직접 호출)
+    - 등록되지 않은 intent 면 None 반환 (호출부에서 에러 응답 처리)
+    """
+    handler = (registry or INTENT_REGISTRY).get(intent)
+    if handler is None:
+        return None
+    return handler(query, options)
+
+
+
+# ======================================================================================
+# ✅ intent → 대상 시트 (배치 실행 시 그룹 기준)
+# ======================================================================================
+MEMO_SHEETS = ("상담일지", "개인일지", "활동일지")
+
+
+def intent_target_sheet(intent, query=None) -> str:
+    """
+    intent 가 주로 읽고/쓰는 워크시트 이름
+    - 메모 intent 는 query["일지종류"] 기준 ("전체" → "전체메모"), 없으면 상담일지
+    - 알 수 없는 intent 는 "" 반환
+    """
+    query = query if hasattr(query, "get") else {}
+    if intent in MEMBER_INTENTS:
+        return "DB"
+    if intent in MEMO_INTENTS:
+        diary = str(query.get("일지종류") or "").replace(" ", "")
+        if diary == "전체":
+            return "전체메모"
+        return diary if diary in MEMO_SHEETS else "상담일지"
+    if intent in ORDER_INTENTS:
+        return "제품주문"
+    if intent in COMMISSION_INTENTS:
+        return "후원수당"
+    return ""
+
+
+
+# ======================================================================================
+# ✅ intent → 미리 읽어도 되는 시트 (ASGI 서빙 시 동시 다운로드)
+# ======================================================================================
+# ⚠️ 읽기 전용 intent 만 등록 (저장/수정 intent 는 읽을 시트가 입력에 따라 달라 미리 읽으면 낭비)
+READ_ONLY_INTENTS = {
+    "search_member", "search_by_code_logic",
+    "memo_search", "search_memo_from_text", "memo_find", "memo_find_auto",
+}
+
+
+def intent_prefetch_sheets(intent, query=None) -> tuple:
+    """
+    읽기 전용 intent 가 읽을 시트 목록 (그 외 intent 는 빈 tuple)
+    - 메모 "전체" 검색은 상담일지/개인일지/활동일지 3개를 함께
+    """
+    if intent not in READ_ONLY_INTENTS:
+        return ()
+    sheet = intent_target_sheet(intent, query)
+    if sheet == "전체메모":
+        return MEMO_SHEETS
+    return (sheet,) if sheet else ()
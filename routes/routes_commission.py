@@ -2,6 +2,8 @@
 import re
 from flask import g
 from parser.parse import parse_commission, clean_commission_data
+from parser.nlu import current_command
+from service import find_commission
 
 
 # ────────────────────────────────────────────────────────────────────
@@ -13,10 +15,10 @@ def _norm(s):
 def _get_text_from_g() -> str:
     """
     g.query에서 자연어 텍스트 안전 추출
-    우선순위: raw_text > query(str) > query(dict)["text","요청문","조건","criteria"]
+    우선순위: raw_text > query(str) > query(dict)["text","요청문","조건","criteria"] > ParsedCommand.raw_text
     """
     if not hasattr(g, "query") or not isinstance(g.query, dict):
-        return ""
+        return _command_text()
     rt = g.query.get("raw_text")
     if isinstance(rt, str) and rt.strip():
         return rt.strip()
@@ -28,7 +30,12 @@ def _get_text_from_g() -> str:
             v = q.get(k)
             if isinstance(v, str) and v.strip():
                 return v.strip()
-    return ""
+    return _command_text()
+
+def _command_text() -> str:
+    """postIntent 에서 이미 파싱된 원문 (ParsedCommand) 재사용"""
+    cmd = current_command()
+    return cmd.raw_text if cmd else ""
 
 # ────────────────────────────────────────────────────────────────────
 # 허브: 자동 분기
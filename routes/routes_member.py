@@ -25,6 +25,10 @@ from parser.parse import parse_registration   # 회원 등록/수정 파서
 from parser.parse import field_map  # ✅ field_map import
 from parser.parse import field_map
 
+from utils.log import get_logger, debug_sampled
+
+logger = get_logger(__name__)
+
 SHEET_NAME_DB = "DB"  # 매직스트링 방지
 
 
@@ -39,10 +43,10 @@ from utils.sheets import get_member_sheet, safe_update_cell
 # 공통 헬퍼
 # ────────────────────────────────────────────────────────────────────
 def _norm(s):
-    return (s or "").strip()
+    return str(s or "").strip()      # get_all_records() 는 숫자 셀을 int 로 돌려줌
 
 def _digits(s):
-    return re.sub(r"\D", "", s or "")
+    return re.sub(r"\D", "", str(s or ""))
 
 def _compact_row(r: dict) -> OrderedDict:
     """회원 정보를 고정된 필드 순서로 반환"""
@@ -231,14 +235,11 @@ def search_by_code_logic():
         raw = g.query.get("query") or ""
         text = str(raw).strip()
 
-        print("=== ENTER search_by_code_logic ===")
-        print("raw from g.query:", g.query.get("query"))
+        logger.debug("search_by_code_logic raw=%r", raw)
 
 
         # ✅ 한글/영문 '코드' + 선택적 콜론 + 공백 허용
         m = re.match(r"^(?:코드|code)\s*:?\s*([A-Za-z0-9]+)$", text, re.IGNORECASE)
-        
-        print("=== DEBUG REGEX ===", "text:", text, "m:", m)
 
         if not m:
             return {
@@ -254,20 +255,7 @@ def search_by_code_logic():
         matched = [r for r in rows if str(r.get("코드", "")).strip().upper() == code_value]
         matched.sort(key=lambda r: str(r.get("회원명", "")).strip())
 
-       
-        # 🔽 여기서 디버깅 로그 찍기
-        print("=== DEBUG search_by_code_logic ===")
-        print("raw:", raw)
-        print("text:", text)
-        print("code_value:", code_value)
-        print("rows 첫 3개:", rows[:3])
-        print("matched 개수:", len(matched))       
-             
-       
-        matched.sort(key=lambda r: str(r.get("회원명", "")).strip())
-        print("=== DEBUG REGEX ===", "text:", text, "m:", m)   # 👈 여기에 추가
-
-
+        logger.debug("search_by_code_logic code=%s rows=%d matched=%d", code_value, len(rows), len(matched))
 
         # ✅ summary 정규화 → display 변환
         results = [_normalize_summary(r) for r in matched]
@@ -343,7 +331,7 @@ def find_member_logic(name=None):
         def match_row(r: dict) -> bool:
             if f["회원명"]:
                 db_name = (r.get("회원명", "") or "").strip()
-                print("[DEBUG] 회원명 비교:", f["회원명"], "vs", repr(db_name))
+                debug_sampled(logger, "회원명 비교: %s vs %r", f["회원명"], db_name)
                 if f["회원명"] != db_name:
                     return False
 
@@ -759,7 +747,7 @@ def delete_member_func(data=None):
             from utils import fallback_natural_search
             query = fallback_natural_search(query)
 
-        print("[DEBUG] query:", query)
+        logger.debug("delete_member_func query=%s", query)
 
         raw_text = query.get("raw_text") or query.get("요청문", "")
         if isinstance(raw_text, dict):
@@ -772,7 +760,7 @@ def delete_member_func(data=None):
             or ""
         ).strip()
 
-        print("[DEBUG] name:", name)
+        logger.debug("delete_member_func name=%s", name)
 
         choice = str(query.get("choice", "")).strip()
 
@@ -961,7 +949,7 @@ def update_member_func(data: dict = None):
         raw_text = query.get("raw_text") or query.get("요청문") or ""
         if not isinstance(raw_text, str):
             raw_text = str(raw_text or "")   # ✅ dict/None 방지용
-        print(f"[DEBUG] raw_text type={type(raw_text)}, value={raw_text}")
+        logger.debug("update_member_func raw_text=%r", raw_text)
 
         member_name = query.get("회원명")
 
@@ -985,10 +973,7 @@ def update_member_func(data: dict = None):
 
 
 
-        print("DEBUG update_member_func >>> data =", data)
-        print("DEBUG update_member_func >>> query =", query)
-        print("DEBUG update_member_func >>> member_name =", member_name)
-        print(">>> raw_text =", raw_text)
+        logger.debug("update_member_func member_name=%s query=%s", member_name, query)
 
         # --------------------------
         # 2. 수정할 필드/값 추출
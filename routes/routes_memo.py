@@ -2,10 +2,15 @@
 import re
 from flask import g
 from parser.parse import save_memo, parse_memo,  find_memo
+from parser.nlu import current_command
 from utils import handle_search_memo
 from utils.sheets import get_worksheet
+from utils.snapshot import active_snapshot
+from utils.log import get_logger
 from datetime import datetime
 
+logger = get_logger(__name__)
+
 
 
 
@@ -18,10 +23,10 @@ def _norm(s: str) -> str:
 def _get_text_from_g() -> str:
     """
     g.query에서 자연어 텍스트를 안전하게 추출
-    우선순위: raw_text(str) > query(str) > query(dict)["text"/"요청문"/"메모"/"내용"]
+    우선순위: raw_text(str) > query(str) > query(dict)["text"/"요청문"/"메모"/"내용"] > ParsedCommand.raw_text
     """
     if not hasattr(g, "query") or not isinstance(g.query, dict):
-        return ""
+        return _command_text()
     # 1) raw_text 우선
     rt = g.query.get("raw_text")
     if isinstance(rt, str) and rt.strip():
@@ -37,7 +42,12 @@ def _get_text_from_g() -> str:
             v = q.get(k)
             if isinstance(v, str) and v.strip():
                 return v.strip()
-    return ""
+    return _command_text()
+
+def _command_text() -> str:
+    """postIntent 에서 이미 파싱된 원문 (ParsedCommand) 재사용"""
+    cmd = current_command()
+    return cmd.raw_text if cmd else ""
 
 # ────────────────────────────────────────────────────────────────────
 # 1) 메모/일지 자동 분기 허브
@@ -154,7 +164,7 @@ def search_memo_func():
         q = getattr(g, "query", None)  # g.query 전체
         results = {}
 
-        print("[DEBUG] raw g.query:", q)
+        logger.debug("raw g.query: %s", q)
 
         sheet_name, keywords, member_name = None, [], None
 
@@ -183,7 +193,7 @@ def search_memo_func():
         else:
             # ✅ g.query가 문자열인 경우 (자연어 직접 입력)
             parsed = parse_memo(q) if q else {}
-            print("[DEBUG] parse_memo output:", parsed)
+            logger.debug("parse_memo output: %s", parsed)
 
             sheet_name = parsed.get("일지종류", "").strip()
             member_name = parsed.get("회원명", "").strip()
@@ -230,7 +240,7 @@ def search_memo_func():
                     member_name=member_name,
                     and_mode=and_mode
                 )
-                print(f"[DEBUG] {sn} 검색 결과 {len(core_results)}건")
+                logger.debug("%s 검색 결과 %d건", sn, len(core_results))
                 results[sn] = core_results
 
         else:
@@ -252,15 +262,8 @@ def search_memo_func():
         # 4) 반환
         # ----------------------------
 
-        # 🔽 여기에 출력 코드 삽입
-        results_data = results
-        for category, memos in results_data.items():
-            print(f"### {category}")
-            for memo in memos:
-                print(f"- 날짜: {memo.get('날짜')}")
-                print(f"- 회원명: {memo.get('회원명')}")
-                print(f"- 일지종류: {memo.get('일지종류')}")
-                print(f"- 내용: {memo.get('내용')}\n")
+        # 메모 전체를 찍지 않고 일지별 건수만
+        logger.debug("메모 검색 결과: %s", {category: len(memos) for category, memos in results.items()})
 
 
         return {
@@ -293,12 +296,16 @@ def search_memo_core(sheet_name, keywords, member_name=None,
     - and_mode=True → 모든 키워드 포함(AND), 기본은 OR 검색
     """
     results = []
-    sheet = get_worksheet(sheet_name)
-    if not sheet:
-        print(f"[ERROR] ❌ 시트를 가져올 수 없습니다: {sheet_name}")
-        return []
-
-    rows = sheet.get_all_records()
+    snapshot = active_snapshot()
+    if snapshot is not None:
+        # ✅ 요청 단위 스냅샷(open_sheet_snapshot)에서 읽기 → 같은 요청 안에서는 시트 1회만 조회
+        rows = snapshot.records(sheet_name)
+    else:
+        sheet = get_worksheet(sheet_name)
+        if not sheet:
+            logger.error("시트를 가져올 수 없습니다: %s", sheet_name)
+            return []
+        rows = sheet.get_all_records()
 
     # ✅ keywords 정규화
     keywords = [kw.strip().lower() for kw in keywords if kw and kw.strip()]
@@ -358,7 +365,7 @@ def search_memo_core(sheet_name, keywords, member_name=None,
         if len(results) >= limit:
             break
 
-    print(f"[DEBUG] ✅ 최종 results({sheet_name}) | {len(results)}건")
+    logger.debug("최종 results(%s) | %d건", sheet_name, len(results))
     return results
 
 
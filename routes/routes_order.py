@@ -5,12 +5,25 @@ from utils import extract_order_from_uploaded_image
 from utils import process_order_date
 from utils import get_worksheet
 from parser.parse import handle_product_order, save_order_to_sheet
+from parser.nlu import current_command
+from parser.order_grammar import expand_order_quantity, parse_order_hybrid
 
 
 import os, re, io, json, base64, requests, traceback
-from flask import jsonify
+from flask import jsonify, current_app
+from utils.jobs import check_callback_url, get_job_store
+from utils.ocr import get_order_extractor
+from utils.upstream import get_upstream
+from utils.outbox import OUTBOX_ENABLED, get_outbox
+from utils.order_extract import (
+    ORDER_UPLOAD_MAX_ITEMS,
+    expand_upload_items, extract_orders_from_images, merge_extracted_orders,
+)
 from datetime import datetime
 from utils import get_rows_from_sheet
+from utils.log import get_logger, LazyJson
+
+logger = get_logger(__name__)
 
 
 def _norm(s): 
@@ -27,10 +40,10 @@ def _ok(res) -> bool:
 def _get_text_from_g() -> str:
     """
     g.query에서 주문 자연어 텍스트를 안전하게 추출
-    우선순위: raw_text > query(str) > query(dict)["text","요청문","주문문","내용"]
+    우선순위: raw_text > query(str) > query(dict)["text","요청문","주문문","내용"] > ParsedCommand.raw_text
     """
     if not hasattr(g, "query") or not isinstance(g.query, dict):
-        return ""
+        return _command_text()
     rt = g.query.get("raw_text")
     if isinstance(rt, str) and rt.strip():
         return rt.strip()
@@ -42,7 +55,12 @@ def _get_text_from_g() -> str:
             v = q.get(k)
             if isinstance(v, str) and v.strip():
                 return v.strip()
-    return ""
+    return _command_text()
+
+def _command_text() -> str:
+    """postIntent 에서 이미 파싱된 원문 (ParsedCommand) 재사용"""
+    cmd = current_command()
+    return cmd.raw_text if cmd else ""
 
 def _is_structured_order(obj: dict) -> bool:
     """
@@ -69,23 +87,29 @@ def _is_structured_order(obj: dict) -> bool:
 def order_nl_func():
     """
     자연어 주문 처리
-    - g.query["raw_text"] 기준으로 파싱 → 서비스 저장
+    - g.query["raw_text"] 기준으로 규칙 파싱 (가격/PV 는 최근 제품주문에서 보충, 신뢰도 낮거나 회원/제품/가격을 못 찾으면 LLM) → 제품주문 시트 저장
+    - 수량 N 은 N 행으로 저장 (시트에 수량 열 없음)
     """
     try:
         text = _get_text_from_g()
         if not text:
             return {"status": "error", "message": "주문 문장이 비어 있습니다.", "http_status": 400}
 
-        parsed = parse_order_from_text(text)  # 프로젝트 파서 사용
-        if not parsed:
+        result = parse_order_hybrid(text)
+        orders = result["orders"]
+        logger.debug("주문 파싱 source=%s confidence=%s", result["source"], result["confidence"])
+        if not orders:
             return {"status": "error", "message": "주문을 해석할 수 없습니다.", "http_status": 400}
 
-        # 저장 로직 (서비스 계층)
-        res = handle_product_order(parsed) if callable(handle_product_order) else save_order_to_sheet(parsed)
+        # 저장 로직
+        rows = expand_order_quantity(orders)
+        res = handle_order_save(rows[0]) if len(rows) == 1 else handle_order_save_many(rows)
         return {
             "status": "success" if _ok(res) else "error",
             "intent": "order_auto",  # 허브에서 호출되므로 intent는 order_auto로 유지
-            "parsed": parsed,
+            "parsed": orders,
+            "source": result["source"],
+            "confidence": result["confidence"],
             "http_status": 200 if _ok(res) else 400
         }
 
@@ -309,8 +333,7 @@ if __name__ == "__main__":
     '''
 
     parsed = parse_order_natural_text(order_text)
-    import json
-    print(json.dumps(parsed, ensure_ascii=False, indent=2))
+    logger.info("%s", LazyJson(parsed))
 
 
 
@@ -336,12 +359,24 @@ if __name__ == "__main__":
 
 
 def addOrders(payload):
+    """
+    Memberslist 주문 추가
+    - OUTBOX_ENABLED(기본): 아웃박스에 기록하고 즉시 반환 → 백그라운드에서 묶음 전송/재시도
+    - OUTBOX_ENABLED=0: 요청 안에서 바로 전송
+    """
     url = os.getenv("MEMBERSLIST_API_URL", "").strip()
     if not url:
         return {"ok": False, "error": "API 미설정, 시트에 저장됨"}
 
+    if OUTBOX_ENABLED:
+        try:
+            queued = get_outbox().enqueue("memberslist", payload)
+        except Exception as e:
+            return {"ok": False, "error": f"아웃박스 기록 실패: {str(e)}"}
+        return {"ok": True, "queued": True, "outbox_id": queued["id"], "duplicate": queued["duplicate"]}
+
     try:
-        resp = requests.post(url, json=payload, timeout=20)
+        resp = get_upstream("memberslist").post(url, json=payload)   # 주문 추가 → 재시도 없음
         if resp.status_code == 200:
             return resp.json()
         else:
@@ -378,7 +413,7 @@ def get_member_info_by_name(member_name: str) -> dict:
                     "휴대폰번호": row.get("휴대폰번호", "")
                 }
     except Exception as e:
-        print(f"[get_member_info_by_name] 에러: {e}")
+        logger.warning("get_member_info_by_name 에러: %s", e)
 
     return {}
 
@@ -402,7 +437,7 @@ def order_auto_func():
     - 그 외(문자열/텍스트 dict 등) → order_nl_func
     """
     try:
-        print("📌 [DEBUG] order_auto_func 진입")
+        logger.debug("order_auto_func 진입")
         q = g.query.get("query") if hasattr(g, "query") and isinstance(g.query, dict) else None
         raw = _get_text_from_g()
         if raw:
@@ -412,16 +447,16 @@ def order_auto_func():
 
         # 1) 파일 업로드 우선
         if hasattr(request, "files") and request.files:
-            print("📌 [DEBUG] 파일 업로드 감지됨 → order_upload_pc_func 호출")
+            logger.debug("파일 업로드 감지됨 → order_upload_pc_func 호출")
             return order_upload_pc_func()
 
         # 2) 구조화 JSON → 저장 프록시
         if isinstance(q, dict) and _is_structured_order(q):
-            print("📌 [DEBUG] 구조화 JSON 감지됨 → save_order_proxy_func 호출")
+            logger.debug("구조화 JSON 감지됨 → save_order_proxy_func 호출")
             return save_order_proxy_func()
 
         # 3) 자연어 텍스트 → NLU 기반
-        print("📌 [DEBUG] 자연어 주문 처리 → order_nl_func 호출")
+        logger.debug("자연어 주문 처리 → order_nl_func 호출")
         return order_nl_func()
 
     except Exception as e:
@@ -434,118 +469,199 @@ def order_auto_func():
 
 
 
-from parser import handle_order_save 
+from parser import handle_order_save, handle_order_save_many
 
 # ===================== 주문 처리 함수 =====================
-def order_upload_pc_func():
-    """PC 업로드"""
-    print("📌 [DEBUG] order_upload_pc_func 호출됨")
+def _wants_async() -> bool:
+    """form/query 의 async=1 → 백그라운드 작업으로 처리"""
+    flag = request.form.get("async") or request.args.get("async") or ""
+    return flag.strip().lower() in ("1", "true", "yes", "y")
 
-    mode = request.form.get("mode") or request.args.get("mode") or "api"
-    member_name = request.form.get("회원명")
-    image_file = request.files.get("image")
-    image_url = request.form.get("image_url")
-    message_text = (request.form.get("message") or "").strip()
 
-    if "제품주문 저장" in message_text and not member_name:
-        member_name = message_text.replace("제품주문 저장", "").strip()
+def _load_order_images(files=None, image_urls=None):
+    """
+    업로드 (파일명, bytes) + image_url 목록 → (라벨, 이미지 bytes) 목록
+    - PDF 는 페이지별 이미지로 분리
+    - 실패 시 오류 dict
+    """
+    loaded = list(files or [])
+    for url in image_urls or []:
+        logger.debug("image_url 사용: %s", url)
+        resp = requests.get(url, timeout=20)
+        if resp.status_code != 200:
+            return {"status": "error", "message": f"이미지 다운로드 실패: {url}", "http_status": 400}
+        loaded.append((url, resp.content))
+
+    if not loaded:
+        return {"status": "error", "message": "image(파일) 또는 image_url 필요", "http_status": 400}
+
+    items = expand_upload_items(loaded)
+    if len(items) > ORDER_UPLOAD_MAX_ITEMS:
+        return {
+            "status": "error",
+            "message": f"이미지/페이지는 최대 {ORDER_UPLOAD_MAX_ITEMS}개까지 처리할 수 있습니다. (요청: {len(items)}개)",
+            "http_status": 400,
+        }
+    return items
 
 
-    print(f"📌 [DEBUG] member_name={member_name}, message_text={message_text}")
-    if not member_name:
-        return {"status": "error", "message": "회원명이 필요합니다.", "http_status": 400}
+def _fix_order_for_sheet(o: dict, member_name: str, member_number: str, member_phone: str) -> dict:
+    """추출된 주문 1건 → 제품주문 시트 컬럼에 맞게 보정"""
+    o = dict(o)
 
-    try:
-        # 이미지 읽기
-        if image_file:
-            print("📌 [DEBUG] 업로드된 파일 사용")
-            image_bytes = io.BytesIO(image_file.read())
-        elif image_url:
-            print(f"📌 [DEBUG] image_url 사용: {image_url}")
-            resp = requests.get(image_url, timeout=20)
-            if resp.status_code != 200:
-                return {"status": "error", "message": "이미지 다운로드 실패", "http_status": 400}
-            image_bytes = io.BytesIO(resp.content)
-        else:
-            return {"status": "error", "message": "image(파일) 또는 image_url 필요", "http_status": 400}
+    # 숫자만 추출 (제품가격, PV)
+    if "제품가격" in o:
+        o["제품가격"] = re.sub(r"[^0-9]", "", str(o["제품가격"]))
+    if "PV" in o:
+        o["PV"] = re.sub(r"[^0-9]", "", str(o["PV"]))
+
+    # 회원 정보 보강
+    o.setdefault("회원명", member_name)
+    o.setdefault("회원번호", member_number)
+    o.setdefault("휴대폰번호", member_phone)
+
+    # 기본값 채우기
+    o.setdefault("주문일자", process_order_date(""))
+    o.setdefault("결재방법", "")
+    o.setdefault("수령확인", "N")
+    o.setdefault("주문자_고객명", "")
+    o.setdefault("주문자_휴대폰번호", "")
+    o.setdefault("배송처", "")
+    return o
 
-        # 이미지에서 주문 정보 추출
-        print("📌 [DEBUG] extract_order_from_uploaded_image 호출 시작")
-        result = extract_order_from_uploaded_image(image_bytes)
-        print(f"📌 [DEBUG] extract_order_from_uploaded_image 결과: {result}")
 
+def process_order_upload(member_name: str, files=None, image_urls=None, mode: str = "api") -> dict:
+    """
+    주문서 이미지(여러 장/PDF 페이지) → 병렬 주문 추출 → 병합/중복 제거 → 제품주문 시트 일괄 저장
+    - files: [(파일명, bytes)], image_urls: [url]
+    - request 에 의존하지 않음 (백그라운드 작업에서도 그대로 실행)
+    - 일부 이미지만 실패하면 성공한 주문만 저장하고 status="partial"
+    """
+    try:
+        items = _load_order_images(files, image_urls)
+        if isinstance(items, dict):
+            return items
 
+        # 이미지에서 주문 정보 추출 (이미지/페이지별 동시 실행, 로컬 OCR → Vision 순)
+        logger.debug("주문 추출 시작: %d개 이미지", len(items))
+        results = extract_orders_from_images(items, extractor=get_order_extractor())
+        pages = [r.summary() for r in results]
+        logger.debug("이미지별 추출 결과: %s", pages)
 
-        if "error" in result:
-            return {"status": "error", "message": result["error"], "http_status": 400}
+        failed = [r for r in results if r.status != "success"]
+        if len(failed) == len(results):
+            return {"status": "error", "message": failed[0].message, "페이지별_결과": pages, "http_status": 400}
 
-        orders_list = result.get("orders", [])
+        merged, duplicates = merge_extracted_orders(results)
 
         # ✅ DB 시트에서 회원번호, 휴대폰번호 가져오기
         member_info = get_member_info_by_name(member_name)
-        print(f"📌 [DEBUG] member_info={member_info}")
+        logger.debug("member_info=%s", member_info)
 
         member_number = member_info.get("회원번호", "")
         member_phone = member_info.get("휴대폰번호", "")
 
         # ✅ 시트 컬럼에 맞게 보정
-        fixed_orders = []
-        for o in orders_list:
-            if not isinstance(o, dict):
-                o = {"raw_text": str(o)}
+        orders_list = [_fix_order_for_sheet(o, member_name, member_number, member_phone) for o in merged]
 
-            # 숫자만 추출 (제품가격, PV)
-            if "제품가격" in o:
-                o["제품가격"] = re.sub(r"[^0-9]", "", o["제품가격"])
-            if "PV" in o:
-                o["PV"] = re.sub(r"[^0-9]", "", o["PV"])
+        # 📌 로그 찍기
+        logger.debug("제품주문 일괄 저장 직전 payload: %s", LazyJson({"회원명": member_name, "orders": orders_list}))
 
-            # 회원 정보 보강
-            o.setdefault("회원명", member_name)
-            o.setdefault("회원번호", member_number)
-            o.setdefault("휴대폰번호", member_phone)
+        # 시트 저장 (insert_rows 1회)
+        if orders_list:
+            save_result = handle_order_save_many(orders_list)
+        else:
+            save_result = {"status": "ok", "message": "저장할 주문이 없습니다.", "saved": 0, "skipped": [], "results": []}
+        logger.debug("handle_order_save_many 결과: %s", save_result)
 
-            # 기본값 채우기
-            o.setdefault("주문일자", process_order_date(""))
-            o.setdefault("결재방법", "")
-            o.setdefault("수령확인", "N")
-            o.setdefault("주문자_고객명", "")
-            o.setdefault("주문자_휴대폰번호", "")
-            o.setdefault("배송처", "")
+        if save_result.get("status") == "error":
+            status, http_status = "error", save_result.get("http_status", 500)
+        else:
+            status, http_status = ("partial" if failed else "success"), 200
 
-            fixed_orders.append(o)
+        image_stats = [r.image_stats for r in results]
+        return {
+            "status": status,
+            "mode": mode,
+            "회원명": member_name,
+            "추출된_JSON": orders_list,
+            "저장_결과": save_result["results"],   # 주문별 결과 리스트 (기존 응답 형태 유지)
+            "이미지_최적화": image_stats[0] if len(image_stats) == 1 else image_stats,
+            "페이지별_결과": pages,
+            "중복_제거": duplicates,
+            "http_status": http_status,
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e), "http_status": 500}
 
-        orders_list = fixed_orders
 
-        # 최종 payload
-        payload = {"회원명": member_name, "orders": orders_list}
+def order_upload_pc_func():
+    """
+    PC 업로드
+    - image 파일 여러 개 / PDF(페이지별) / image_url 여러 개 가능
+    - 기본: 추출 + 저장 후 결과 반환
+    - async=1: 업로드만 받고 202 + job_id 반환 → /order/jobs/<job_id> 로 결과 조회
+      (callback_url 지정 시 완료 후 작업 상태를 POST, JOB_CALLBACK_ALLOWED_HOSTS 의 공인 주소만)
+    """
+    logger.debug("order_upload_pc_func 호출됨")
 
-        # 📌 로그 찍기
-        print("==== addOrders 호출 직전 payload ====")
-        print(json.dumps(payload, ensure_ascii=False, indent=2))
+    mode = request.form.get("mode") or request.args.get("mode") or "api"
+    member_name = request.form.get("회원명")
+    image_files = [f for f in request.files.getlist("image") + request.files.getlist("images") if f]
+    image_urls = [u.strip() for u in request.form.getlist("image_url") if u.strip()]
+    message_text = (request.form.get("message") or "").strip()
 
-        # 시트 저장 호출
-        save_results = []
-        for order in orders_list:
-            res = handle_order_save(order)
-            save_results.append(res)
+    if "제품주문 저장" in message_text and not member_name:
+        member_name = message_text.replace("제품주문 저장", "").strip()
 
-        print(f"📌 [DEBUG] handle_order_save 결과: {save_results}")
 
+    logger.debug("member_name=%s, message_text=%s", member_name, message_text)
+    if not member_name:
+        return {"status": "error", "message": "회원명이 필요합니다.", "http_status": 400}
+    if not image_files and not image_urls:
+        return {"status": "error", "message": "image(파일) 또는 image_url 필요", "http_status": 400}
+
+    # 업로드 파일은 요청이 끝나면 닫히므로 여기서 bytes 로 보관
+    files = [(f.filename or f"image{i}", f.read()) for i, f in enumerate(image_files, start=1)]
+
+    if not _wants_async():
+        return process_order_upload(member_name, files, image_urls, mode)
+
+    callback_url = (request.form.get("callback_url") or "").strip() or None
+    if callback_url:
+        rejected = check_callback_url(callback_url)
+        if rejected:
+            return {"status": "error", "message": rejected, "http_status": 400}
+
+    app = current_app._get_current_object()
+
+    def run_job():
+        with app.app_context():
+            return process_order_upload(member_name, files, image_urls, mode)
+
+    job = get_job_store().submit("order_upload", run_job, callback_url=callback_url)
+    return {
+        "status": "accepted",
+        "mode": mode,
+        "회원명": member_name,
+        "job_id": job["job_id"],
+        "status_url": f"/order/jobs/{job['job_id']}",
+        "http_status": 202,
+    }
 
 
+def order_extract_stats_func() -> dict:
+    """주문 이미지 추출 단계별(OCR/Vision) 채택률·지연 통계"""
+    return {"status": "success", "tiers": get_order_extractor().stats(), "http_status": 200}
 
 
-        return {
-            "status": "success",
-            "mode": mode,
-            "회원명": member_name,
-            "추출된_JSON": orders_list,
-            "저장_결과": save_results,
-            "http_status": 200
-        }
-    except Exception as e:
-        return {"status": "error", "message": str(e), "http_status": 500}
+def order_job_status_func(job_id: str) -> dict:
+    """비동기 주문 업로드 작업 상태 조회"""
+    job = get_job_store().get(job_id)
+    if not job:
+        return {"status": "error", "message": f"작업을 찾을 수 없습니다: {job_id}", "http_status": 404}
+    job.pop("callback_url", None)
+    return {**job, "http_status": 200}
 
 
 
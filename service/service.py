@@ -44,6 +44,9 @@ from utils import (
 
     get_order_sheet, 
 )
+from utils.log import get_logger
+
+logger = get_logger(__name__)
 
 
 
@@ -289,7 +292,7 @@ def find_memo(keyword: str, sheet_name: str = "상담일지") -> list:
         all_records = sheet.get_all_records()
         return [row for row in all_records if keyword in " ".join(str(v) for v in row.values())]
     except Exception as e:
-        print(f"[ERROR] find_memo 오류: {e}")
+        logger.error("find_memo 오류: %s", e)
         return []
 
 
@@ -338,7 +341,7 @@ def handle_order_save(data: dict):
         sheet.append_row(headers)
     for existing in values[1:]:
         if existing[0] == order_date and existing[1] == data.get("회원명") and existing[4] == data.get("제품명"):
-            print("⚠️ 이미 동일한 주문이 존재하여 저장하지 않음")
+            logger.warning("이미 동일한 주문이 존재하여 저장하지 않음")
             return
     sheet.insert_row(row, index=2)
 
@@ -362,7 +365,7 @@ def save_order_to_sheet(order: dict) -> bool:
         append_row(sheet, row_data)
         return True
     except Exception as e:
-        print(f"[ERROR] 주문 저장 중 오류: {e}")
+        logger.error("주문 저장 중 오류: %s", e)
         return False
 
 
@@ -478,7 +481,7 @@ def update_member_info(name: str, field: str, value: str) -> bool:
     """
     시트에서 회원 정보를 업데이트하는 함수
     """
-    print(f"[UPDATE] {name}님의 {field}를 {value}로 수정합니다.")
+    logger.info("%s님의 %s를 %s로 수정합니다.", name, field, value)
     # TODO: 실제 시트 수정 로직 구현
     return True
 
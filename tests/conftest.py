@@ -1,6 +1,129 @@
 import pytest
+import requests
 from datetime import datetime
 from utils import now_kst
+import utils.outbox
+
+
+# -------------------------------
+# 공용 가짜 객체 (시계 / 시트 / HTTP 응답·세션)
+# -------------------------------
+class FakeClock:
+    """호출하면 now 를 돌려주는 시계 (time.monotonic / clock= 인자 대신)"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeSheet:
+    """메모리 격자 워크시트 (reads: 읽기 호출 수)"""
+
+    def __init__(self, title, headers=("회원명", "메모"), rows=None):
+        self.title = title
+        self.grid = [list(headers)] + [list(r) for r in (rows or [])]
+        self.reads = 0
+
+    def get_all_values(self):
+        self.reads += 1
+        return [list(r) for r in self.grid]
+
+    def get_all_records(self):
+        self.reads += 1
+        headers = self.grid[0]
+        return [dict(zip(headers, r + [""] * (len(headers) - len(r)))) for r in self.grid[1:]]
+
+    def row_values(self, row):
+        self.reads += 1
+        return list(self.grid[row - 1])
+
+    def insert_row(self, values, index=1, value_input_option="RAW"):
+        self.grid.insert(index - 1, [str(v) for v in values])
+
+    def append_row(self, values, value_input_option="RAW"):
+        self.grid.append([str(v) for v in values])
+
+    def delete_rows(self, start, end=None):
+        del self.grid[start - 1:(end or start)]
+
+    def update_cell(self, row, col, value):
+        self.grid[row - 1][col - 1] = str(value)
+
+    def update(self, *args, **kwargs):
+        self.grid[1][0] = "바뀜"
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, body=None, url="", content=b""):
+        self.status_code = status_code
+        self._body = body if body is not None else {}
+        self.url = url
+        self.content = content
+        self.text = str(self._body)
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}", response=self)
+
+
+class FakeSession:
+    """
+    응답 / 예외 / 상태 코드(int)를 순서대로 돌려주는 세션 (마지막 것은 계속 반복)
+    - calls: 받은 요청 {"method", "url", **kwargs}
+    """
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes) or [200]
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append({"method": method, "url": url, **kwargs})
+        outcome = self.outcomes.pop(0) if len(self.outcomes) > 1 else self.outcomes[0]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        if isinstance(outcome, int):
+            return FakeResponse(outcome, url=url)
+        return outcome
+
+
+@pytest.fixture
+def fake_clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def fake_sheet():
+    """FakeSheet(title, headers, rows) 생성 함수"""
+    return FakeSheet
+
+
+@pytest.fixture
+def fake_response():
+    """FakeResponse(status_code, body, url, content) 생성 함수"""
+    return FakeResponse
+
+
+@pytest.fixture
+def fake_session():
+    """FakeSession(*outcomes) 생성 함수"""
+    return FakeSession
+
+
+@pytest.fixture(autouse=True)
+def isolated_outbox(tmp_path, monkeypatch):
+    """
+    테스트마다 임시 디렉터리의 아웃박스 사용 (전송 스레드는 시작하지 않음)
+    - create_app() / /health/upstreams 가 저장소 루트에 DB 를 만들거나 실제로 전송하지 않게
+    """
+    outbox = utils.outbox.Outbox(str(tmp_path / "outbox.sqlite3"), senders=utils.outbox.DEFAULT_SENDERS)
+    monkeypatch.setattr(utils.outbox, "OUTBOX_DB_PATH", outbox.path)
+    monkeypatch.setattr(utils.outbox, "_outbox", outbox)
+    return outbox
 
 @pytest.fixture
 def unique_member_number():
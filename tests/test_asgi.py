@@ -0,0 +1,181 @@
+import asyncio
+import json
+import threading
+import time
+
+from flask import Flask
+
+from app import app, open_sheet_snapshot
+from routes.intent_map import intent_prefetch_sheets
+from utils.aio import SheetPrefetchMiddleware, gather_sheet_records, prefetch_snapshot
+from utils.snapshot import active_snapshot
+
+
+async def call_asgi(application, method, path, body=b"", content_type=b"application/json", chunk=None):
+    """ASGI 앱 1회 호출 → (status, headers, body) (chunk 지정 시 본문을 나눠 전송)"""
+    scope = {
+        "type": "http", "method": method, "path": path, "query_string": b"", "http_version": "1.1",
+        "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode())],
+        "server": ("testserver", 80), "client": ("127.0.0.1", 5000), "scheme": "http",
+    }
+    size = chunk or max(1, len(body))
+    parts = [body[i:i + size] for i in range(0, len(body), size)] or [b""]
+    messages = [{"type": "http.request", "body": p, "more_body": i < len(parts) - 1}
+                for i, p in enumerate(parts)]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await asyncio.sleep(3600)          # 응답이 끝날 때까지 연결 유지
+
+    async def send(message):
+        sent.append(message)
+
+    await application(scope, receive, send)
+    start = sent[0]
+    content = b"".join(m.get("body", b"") for m in sent[1:])
+    return start["status"], dict(start["headers"]), content
+
+
+async def run_lifespan(application):
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message["type"])
+
+    await application({"type": "lifespan"}, receive, send)
+    return sent
+
+
+# -------------------------------
+# a2wsgi 위에서 Flask 실행
+# -------------------------------
+def test_middleware_serves_flask_app():
+    middleware = SheetPrefetchMiddleware(app, threads=2)
+    status, headers, body = asyncio.run(call_asgi(middleware, "GET", "/health/upstreams"))
+
+    assert status == 200
+    assert headers[b"content-type"].startswith(b"application/json")
+    assert "services" in json.loads(body)
+
+
+def test_middleware_passes_body_and_runs_handlers_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+
+    def wsgi_app(environ, start_response):
+        barrier.wait()          # 3개가 동시에 실행 중이어야 통과
+        data = environ["wsgi.input"].read()
+        start_response("201 Created", [("Content-Type", "text/plain")])
+        return [data.upper()]
+
+    middleware = SheetPrefetchMiddleware(wsgi_app, threads=3)
+
+    async def main():
+        return await asyncio.gather(*(call_asgi(middleware, "POST", "/x", b"abc") for _ in range(3)))
+
+    assert [(s, b) for s, _, b in asyncio.run(main())] == [(201, b"ABC")] * 3
+
+
+def test_lifespan_shutdown_runs_hooks():
+    stopped = []
+    middleware = SheetPrefetchMiddleware(app, threads=1, on_shutdown=[lambda: stopped.append("outbox"),
+                                                                      lambda: 1 / 0,        # 실패해도 계속
+                                                                      lambda: stopped.append("hot")])
+
+    assert asyncio.run(run_lifespan(middleware)) == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+    assert stopped == ["outbox", "hot"]
+
+
+# -------------------------------
+# 시트 동시 읽기 / 미리 읽기
+# -------------------------------
+def test_gather_sheet_records_runs_in_parallel():
+    def loader(name):
+        time.sleep(0.2)
+        if name == "없는시트":
+            raise ValueError("not found")
+        return [{"sheet": name}]
+
+    started = time.perf_counter()
+    result = asyncio.run(gather_sheet_records(["상담일지", "개인일지", "활동일지", "없는시트"], loader))
+
+    assert time.perf_counter() - started < 0.6
+    assert result["개인일지"] == [{"sheet": "개인일지"}]
+    assert isinstance(result["없는시트"], ValueError)
+
+
+def test_prefetch_snapshot_retries_failed_sheet_lazily():
+    calls = []
+
+    def loader(name):
+        calls.append(name)
+        if calls.count(name) == 1 and name == "DB":
+            raise RuntimeError("timeout")
+        return [name]
+
+    snapshot = asyncio.run(prefetch_snapshot(["DB", "상담일지"], loader))
+
+    assert snapshot.sheet_names == ["상담일지"]
+    assert snapshot.records("DB") == ["DB"]          # 핸들러에서 다시 읽음
+
+
+def test_prefetched_snapshot_reaches_handler():
+    seen = {}
+    test_app = Flask("asgi_test")
+    test_app.before_request(open_sheet_snapshot)
+
+    @test_app.route("/_test_asgi_snapshot", methods=["POST"])
+    def _test_asgi_snapshot():
+        seen["records"] = active_snapshot().records("DB")
+        return {"ok": True}
+
+    middleware = SheetPrefetchMiddleware(test_app, threads=2, prefetch=lambda scope, body: ["DB"],
+                                         prefetch_loader=lambda name: [{"회원명": "홍길동"}])
+    status, _, _ = asyncio.run(call_asgi(middleware, "POST", "/_test_asgi_snapshot", b'{"a": 1}', chunk=3))
+
+    assert status == 200
+    assert seen["records"] == [{"회원명": "홍길동"}]
+    assert middleware.prefetched == 1
+
+
+def test_prefetch_skips_non_json_and_large_bodies():
+    bodies, rule_calls = [], []
+
+    def wsgi_app(environ, start_response):
+        bodies.append(environ["wsgi.input"].read())
+        start_response("200 OK", [("Content-Type", "text/plain")])
+        return [b"ok"]
+
+    middleware = SheetPrefetchMiddleware(wsgi_app, threads=1, max_prefetch_body=8,
+                                         prefetch=lambda scope, body: rule_calls.append(body) or ["DB"],
+                                         prefetch_loader=lambda name: [])
+    asyncio.run(call_asgi(middleware, "POST", "/order", b"--boundary--", content_type=b"multipart/form-data"))
+    asyncio.run(call_asgi(middleware, "POST", "/memo", b'{"intent": "x", "pad": "0123456789"}', chunk=4))
+
+    assert rule_calls == [] and middleware.prefetched == 0
+    assert bodies == [b"--boundary--", b'{"intent": "x", "pad": "0123456789"}']   # 본문은 그대로 전달
+
+
+def test_prefetch_only_for_read_only_intents():
+    assert intent_prefetch_sheets("memo_search", {"일지종류": "전체"}) == ("상담일지", "개인일지", "활동일지")
+    assert intent_prefetch_sheets("memo_search", {"일지종류": "개인일지"}) == ("개인일지",)
+    assert intent_prefetch_sheets("search_member", {}) == ("DB",)
+    assert intent_prefetch_sheets("memo_add", {"일지종류": "상담일지"}) == ()
+    assert intent_prefetch_sheets("register_member", {}) == ()
+
+
+
+def test_shutdown_app_stops_worker_threads(isolated_outbox):
+    import utils.outbox
+    from app import shutdown_app
+
+    isolated_outbox.start(interval=0.01)
+    shutdown_app()
+
+    assert not isolated_outbox._thread.is_alive()
+    assert utils.outbox._outbox is None
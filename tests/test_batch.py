@@ -0,0 +1,139 @@
+import pytest
+
+import utils.sheets
+from app import app
+from utils.snapshot import SheetSnapshot, SheetWriteBatch
+
+
+@pytest.fixture
+def client():
+    app.testing = True
+    with app.test_client() as client:
+        yield client
+
+
+class DummySheet:
+    def __init__(self, headers, rows=None):
+        self.headers = headers
+        self.rows = [list(r) for r in (rows or [])]
+        self.downloads = 0
+        self.insert_calls = []
+
+    def get_all_records(self):
+        self.downloads += 1
+        return [dict(zip(self.headers, r)) for r in self.rows]
+
+    def insert_rows(self, values, row=2):
+        self.insert_calls.append([list(v) for v in values])
+        self.rows[row - 2:row - 2] = [list(v) for v in values]
+
+    def insert_row(self, values, index=2):
+        self.insert_rows([values], row=index)
+
+
+@pytest.fixture
+def sheets(monkeypatch):
+    data = {
+        "DB": DummySheet(
+            ["회원명", "회원번호", "휴대폰번호", "특수번호", "코드",
+             "생년월일", "계보도", "근무처", "주소", "메모"],
+            [["홍길동", "1000001", "010-1111-2222", "", "A", "", "", "", "", ""],
+             ["이태수", "1000002", "010-3333-4444", "", "B", "", "", "", "", ""]],
+        ),
+        "상담일지": DummySheet(["날짜", "회원명", "내용"], [["2025-01-01 10:00", "이태수", "중국 출장"]]),
+        "개인일지": DummySheet(["날짜", "회원명", "내용"]),
+        "활동일지": DummySheet(["날짜", "회원명", "내용"]),
+    }
+    monkeypatch.setattr(utils.sheets, "get_worksheet", lambda name: data[name])
+    return data
+
+
+# -------------------------------
+# SheetSnapshot / SheetWriteBatch
+# -------------------------------
+def test_snapshot_loads_each_sheet_once():
+    calls = []
+    snapshot = SheetSnapshot(loader=lambda name: calls.append(name) or [{"name": name}])
+
+    assert snapshot.records("DB") == [{"name": "DB"}]
+    assert snapshot.records("DB") is snapshot.records("DB")
+    snapshot.records("상담일지")
+
+    assert calls == ["DB", "상담일지"]
+    assert snapshot.sheet_names == ["DB", "상담일지"]
+
+
+def test_write_batch_keeps_insert_row_order():
+    sheet = DummySheet(["날짜", "회원명", "내용"], [["old", "x", "y"]])
+    batch = SheetWriteBatch(worksheet_getter=lambda name: sheet)
+
+    batch.tag = 0
+    batch.insert_top("상담일지", ["t1", "A", "첫번째"])
+    batch.tag = 1
+    batch.insert_top("상담일지", ["t2", "B", "두번째"])
+    outcome = batch.flush()
+
+    # insert_row(index=2) 를 두 번 호출한 것과 같은 순서 (나중 행이 위)
+    assert sheet.rows == [["t2", "B", "두번째"], ["t1", "A", "첫번째"], ["old", "x", "y"]]
+    assert len(sheet.insert_calls) == 1
+    assert outcome == {"상담일지": {"status": "success", "rows": 2, "tags": [0, 1]}}
+    assert batch.pending() == 0
+
+
+# -------------------------------
+# /postIntent/batch
+# -------------------------------
+def test_batch_results_in_input_order(client, sheets):
+    items = [
+        "홍길동",
+        "이태수 상담일지 저장 오늘 출근합니다",
+        "",
+        "이태수",
+        "김영희 상담일지 저장 기분 좋음",
+        {"intent": "search_member", "회원명": "홍길동"},
+    ]
+    res = client.post("/postIntent/batch", json={"items": items})
+    assert res.status_code == 200
+    data = res.get_json()
+
+    assert data["count"] == len(items)
+    assert [r["index"] for r in data["results"]] == list(range(len(items)))
+    assert [r["status"] for r in data["results"]] == [
+        "success", "success", "error", "success", "success", "success"
+    ]
+    assert data["status"] == "partial"
+    assert data["failed"] == 1
+    assert data["results"][0]["sheet"] == "DB"
+    assert data["results"][1]["sheet"] == "상담일지"
+
+    # 읽기: DB 시트는 한 번만 다운로드
+    assert sheets["DB"].downloads == 1
+
+    # 쓰기: 상담일지에 insert_rows 1회, 순서 유지
+    assert len(sheets["상담일지"].insert_calls) == 1
+    assert [r[1] for r in sheets["상담일지"].rows[:2]] == ["김영희", "이태수"]
+    assert data["sheets"]["write"]["상담일지"] == {"status": "success", "rows": 2}
+
+
+def test_batch_write_failure_marks_items(client, sheets, monkeypatch):
+    def boom(values, row=2):
+        raise RuntimeError("quota")
+
+    monkeypatch.setattr(sheets["개인일지"], "insert_rows", boom)
+
+    res = client.post("/postIntent/batch", json=[
+        "이태수 개인일지 저장 테스트",
+        "홍길동",
+    ])
+    data = res.get_json()
+
+    assert data["results"][0]["status"] == "error"
+    assert "quota" in data["results"][0]["message"]
+    assert data["results"][1]["status"] == "success"
+
+
+@pytest.mark.parametrize("payload", [None, [], {"items": "홍길동"}])
+def test_batch_rejects_invalid_payload(client, payload):
+    res = client.post("/postIntent/batch", json=payload)
+    assert res.status_code == 400
+    assert res.get_json()["status"] == "error"
@@ -0,0 +1,33 @@
+from benchmarks.bench_scale import compare, sheet_cases
+from benchmarks.fake_sheets import KNOWN_MEMBERS, seed_workbook, use_workbook
+
+
+def test_seeded_workbook_is_deterministic():
+    a = seed_workbook(members=50, memos=20, seed=7)
+    b = seed_workbook(members=50, memos=20, seed=7)
+
+    assert a["DB"].get_all_values() == b["DB"].get_all_values()
+    assert [ws.row_count for ws in a.values()] == [51, 21, 21, 21, 51, 51]
+    assert {r["회원명"] for r in a["DB"].get_all_records()} >= set(KNOWN_MEMBERS)
+
+
+def test_every_case_runs_against_fake_workbook():
+    book = seed_workbook(members=200, seed=1)
+    with use_workbook(book):
+        for name, call in sheet_cases(book):
+            result = call()
+            assert not (isinstance(result, dict) and result.get("status") == "error"), name
+
+    assert book["제품주문"].row_count == 201 + 1 + 10 + 1
+    assert book["DB"].calls["get_all_records"] >= 5
+
+
+def test_compare_flags_regressions_against_baseline():
+    baseline = {"results": {"a@10": {"median_ms": 10.0}, "b@10": {"median_ms": 10.0},
+                            "c@10": {"median_ms": 10.0}}}
+    current = {"results": {"a@10": {"median_ms": 16.0}, "b@10": {"median_ms": 5.0},
+                           "c@10": {"median_ms": 11.0}, "d@10": {"median_ms": 1.0},
+                           "e@10": {"median_ms": 1.0, "error": "boom"}}}
+
+    status = {r["key"]: r["status"] for r in compare(current, baseline, threshold=1.5)}
+    assert status == {"a@10": "REGRESSION", "b@10": "faster", "c@10": "ok", "d@10": "new", "e@10": "error"}
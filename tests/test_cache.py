@@ -0,0 +1,307 @@
+import threading
+import time
+import unicodedata
+
+import pytest
+
+import parser.nlu as nlu
+from parser import parse_command, parse_cache_stats, clear_parse_cache
+import utils.utils
+from utils.cache import LRUCache, SWRCache, SingleFlight
+
+
+# -------------------------------
+# LRUCache
+# -------------------------------
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1      # a 를 최근 사용으로 갱신
+    cache.set("c", 3)               # b 제거
+
+    assert "b" not in cache
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_lru_get_or_set_and_stats():
+    cache = LRUCache(maxsize=4)
+    calls = []
+
+    def factory():
+        calls.append(1)
+        return "value"
+
+    assert cache.get_or_set("k", factory) == "value"
+    assert cache.get_or_set("k", factory) == "value"
+    assert len(calls) == 1
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "maxsize": 4}
+
+    cache.clear()
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_invalid_size():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_lru_thread_safe():
+    cache = LRUCache(maxsize=64)
+
+    def worker(n):
+        for i in range(2000):
+            key = (n * 7 + i) % 100
+            cache.get_or_set(key, lambda: key * 2)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(cache) == 64
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 8 * 2000
+
+
+# -------------------------------
+# SWRCache (TTL + stale-while-revalidate + single-flight)
+# -------------------------------
+def test_swr_fresh_hit_then_stale_refresh(fake_clock):
+    clock = fake_clock
+    cache = SWRCache(ttl=10, stale_ttl=60, clock=clock)
+    values = iter(["v1", "v2"])
+    refreshed = threading.Event()
+
+    def fetch():
+        value = next(values)
+        if value == "v2":
+            refreshed.set()
+        return value
+
+    assert cache.get_or_fetch("k", fetch) == "v1"
+    clock.now += 5
+    assert cache.get_or_fetch("k", fetch) == "v1"          # fresh
+
+    clock.now += 15
+    assert cache.get_or_fetch("k", fetch) == "v1"          # stale → 이전 값 즉시 반환
+    assert refreshed.wait(2)
+    while cache._inflight:                                 # 갱신 스레드가 저장을 마칠 때까지
+        time.sleep(0.01)
+    assert cache.get_or_fetch("k", fetch) == "v2"          # 갱신된 값
+    assert cache.stats()["stale"] == 1
+
+
+def test_swr_expired_entry_fetched_again(fake_clock):
+    clock = fake_clock
+    cache = SWRCache(ttl=10, stale_ttl=5, clock=clock)
+    calls = []
+    fetch = lambda: calls.append(1) or len(calls)
+
+    assert cache.get_or_fetch("k", fetch) == 1
+    clock.now += 16
+    assert cache.get_or_fetch("k", fetch) == 2
+    assert cache.stats()["misses"] == 2
+
+
+def test_swr_single_flight_coalesces_concurrent_misses():
+    cache = SWRCache(ttl=10)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return "result"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("k", slow_fetch)))
+               for _ in range(8)]
+    threads[0].start()
+    started.wait(2)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert results == ["result"] * 8
+    assert cache.stats()["coalesced"] == 7
+
+
+def test_swr_errors_not_cached():
+    cache = SWRCache(ttl=10)
+
+    def failing():
+        raise RuntimeError("down")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_fetch("k", failing)
+    assert cache.get_or_fetch("k", lambda: "ok") == "ok"
+    assert cache.stats()["errors"] == 1
+
+
+# -------------------------------
+# SingleFlight
+# -------------------------------
+def test_single_flight_shares_one_call_and_does_not_keep_result():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return ["row"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow_fetch))) for _ in range(5)]
+    threads[0].start()
+    started.wait(2)
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1 and results == [["row"]] * 5
+    assert flight.do("k", lambda: calls.append(1) or ["again"]) == ["again"]   # 끝난 뒤에는 다시 실행
+    assert flight.stats() == {"calls": 6, "fetches": 2, "coalesced": 4, "errors": 0, "in_flight": 0}
+
+
+def test_single_flight_propagates_errors():
+    flight = SingleFlight()
+    with pytest.raises(RuntimeError):
+        flight.do("k", lambda: (_ for _ in ()).throw(RuntimeError("quota")))
+    assert flight.stats()["errors"] == 1
+
+
+# -------------------------------
+# searchMemo 응답 캐시
+# -------------------------------
+def test_memo_search_key_canonical():
+    key = utils.utils.memo_search_cache_key
+    a = key("searchMemo", {"keywords": ["중국", " 홍길동"], "start_date": "2024.1.5", "mode": "전체"})
+    b = key("searchMemo", {"mode": "전체 ", "start_date": "2024-01-05", "keywords": ["홍길동", "중국", "중국"]})
+    assert a == b
+    assert a != key("searchMemoFromText", {"keywords": ["중국", "홍길동"], "start_date": "2024-01-05",
+                                           "mode": "전체"})
+
+
+def test_call_searchmemo_reuses_response(monkeypatch):
+    calls = []
+
+    def fake_post(payload):
+        calls.append(payload)
+        return [{"내용": "메모"}]
+
+    monkeypatch.setattr(utils.utils, "memo_search_cache", SWRCache(ttl=30))
+    monkeypatch.setattr(utils.utils, "_post_search_memo", fake_post)
+
+    first = utils.utils.call_searchMemo({"keywords": ["중국", "홍길동"]})
+    first[0]["내용"] = "수정"                                 # 호출부 수정이 캐시에 번지지 않음
+    second = utils.utils.call_searchMemo({"keywords": ["홍길동", "중국"]})
+
+    assert len(calls) == 1
+    assert second == [{"내용": "메모"}]
+
+
+def test_memo_save_then_search_sees_new_memo(monkeypatch, fake_sheet):
+    import parser.parse
+    sheet = fake_sheet("상담일지", headers=("날짜", "회원명", "내용"), rows=[["2024-01-01", "홍길동", "첫 상담"]])
+    monkeypatch.setattr(parser.parse, "get_counseling_sheet", lambda: sheet)
+    monkeypatch.setattr(utils.utils, "memo_search_cache", SWRCache(ttl=30, stale_ttl=120))
+    monkeypatch.setattr(utils.utils, "_post_search_memo",
+                        lambda payload: [r["내용"] for r in sheet.get_all_records()])
+
+    assert utils.utils.call_searchMemo({"keywords": ["홍길동"]}) == ["첫 상담"]
+    parser.parse.save_memo("상담일지", "홍길동", "두번째 상담")
+
+    assert utils.utils.call_searchMemo({"keywords": ["홍길동"]}) == ["두번째 상담", "첫 상담"]
+
+
+def test_memo_search_cache_ignores_other_sheets(monkeypatch):
+    from utils.shared_cache import invalidate_sheet
+    cache = SWRCache(ttl=30)
+    monkeypatch.setattr(utils.utils, "memo_search_cache", cache)
+    cache.get_or_fetch("k", lambda: 1)
+
+    invalidate_sheet("DB")
+    assert len(cache) == 1
+    invalidate_sheet("개인일지")
+    assert len(cache) == 0
+
+
+def test_swr_invalidate_drops_inflight_result():
+    cache = SWRCache(ttl=30)
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fetch():
+        started.set()
+        release.wait(5)
+        return "old"
+
+    worker = threading.Thread(target=cache.get_or_fetch, args=("k", slow_fetch))
+    worker.start()
+    started.wait(5)
+    cache.invalidate()          # 조회 중에 쓰기 발생
+    release.set()
+    worker.join(5)
+
+    assert cache.get_or_fetch("k", lambda: "new") == "new"
+
+
+# -------------------------------
+# 자연어 파싱 캐시
+# -------------------------------
+@pytest.fixture
+def nlu_calls(monkeypatch):
+    clear_parse_cache()
+    calls = []
+    original = nlu.nlu_to_pc_input
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(nlu, "nlu_to_pc_input", counting)
+    yield calls
+    clear_parse_cache()
+
+
+def test_parse_cache_hit(nlu_calls):
+    first = parse_command("홍길동 전체정보")
+    second = parse_command("  홍길동 전체정보 ")
+    assert first is second
+    assert len(nlu_calls) == 1
+    assert parse_cache_stats()["hits"] == 1
+
+
+def test_parse_cache_nfc_key(nlu_calls):
+    text = "전체메모 검색 중국"
+    nfd = unicodedata.normalize("NFD", text)
+    assert nfd != text
+
+    cmd = parse_command(nfd)
+    assert cmd is parse_command(text)
+    assert cmd.raw_text == text
+    assert cmd.intent == "memo_search"
+    assert len(nlu_calls) == 1
+
+
+def test_parse_cache_entries_not_corrupted_by_callers(nlu_calls):
+    q = parse_command("전체메모 검색 중국").query_dict()
+    q["keywords"].append("일본")
+    q["회원명"] = "홍길동"
+
+    again = parse_command("전체메모 검색 중국").query_dict()
+    assert again["keywords"] == ["중국"]
+    assert again["회원명"] == "전체"
@@ -0,0 +1,63 @@
+import json
+import random
+import urllib.error
+import urllib.request
+
+import pytest
+
+from benchmarks.chat_loadtest import CommandMix, Samples, StubUpstream, summarize
+
+
+@pytest.fixture
+def stub():
+    server = StubUpstream(latency=0.0).start()
+    yield server
+    server.stop()
+
+
+def test_stub_answers_chat_completions_with_orders(stub):
+    req = urllib.request.Request(f"{stub.url}/v1/chat/completions", data=b"{}", method="POST")
+    body = json.loads(urllib.request.urlopen(req).read())
+
+    content = json.loads(body["choices"][0]["message"]["content"])
+    assert content["orders"][0]["제품명"] == "노니"
+    assert stub.requests == 1
+
+
+def test_stub_injects_429(stub):
+    stub.rate_429 = 1.0
+    req = urllib.request.Request(f"{stub.url}/v1/chat/completions", data=b"{}", method="POST")
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        urllib.request.urlopen(req)
+    assert exc.value.code == 429
+    assert stub.sent_429 == 1
+
+
+def test_mix_covers_every_intent():
+    mix = CommandMix(["김민서"], ["1000000"], [("a.jpg", b"\xff\xd8")])
+    rng = random.Random(0)
+    requests = [mix.next(rng) for _ in range(500)]
+
+    assert {r[0] for r in requests} == {name for name, _, _ in mix.mix}
+    upload = next(r for r in requests if r[0] == "order_upload")
+    assert upload[2] == "/order" and upload[4]["Content-Type"].startswith("multipart/form-data")
+    assert "회원명".encode("utf-8") in upload[3]
+
+
+def test_summarize_reports_percentiles_and_rates():
+    samples = Samples()
+    for i in range(1, 101):
+        samples.add("search_member", i / 1000, 200, False)
+    samples.add("order_upload", 2.0, 500, False)
+    samples.add("order_upload", 1.0, 429, False)
+    samples.add("order_upload", 0.5, 200, True)
+    samples.add("order_upload", 0.5, 0, False)
+
+    report = summarize(samples, elapsed=10.0)
+    search = report["intents"]["search_member"]
+    upload = report["intents"]["order_upload"]
+
+    assert search["requests"] == 100 and search["rps"] == 10.0
+    assert (search["p50_ms"], search["p99_ms"]) == (51.0, 99.0)
+    assert (upload["error_rate"], upload["rate_429"], upload["app_error_rate"]) == (0.5, 0.25, 0.25)
+    assert report["total"]["requests"] == 104
@@ -0,0 +1,112 @@
+import pytest
+
+import utils.dispatch as dispatch
+from utils import run_intent_func
+from utils.dispatch import (
+    IntentHandler, IntentBindingError,
+    build_intent_registry, get_intent_handler,
+)
+
+
+# -------------------------------
+# 호출 방식 (arity) 결정
+# -------------------------------
+def _zero():
+    return ("zero",)
+
+
+def _one(query):
+    return ("one", query)
+
+
+def _one_default(data=None):
+    return ("one", data)
+
+
+def _two(query, options):
+    return ("two", query, options)
+
+
+def _two_default(query, options=None, extra=None):
+    return ("two", query, options)
+
+
+def _var(query, *args, **kwargs):
+    return ("var", query, args, kwargs)
+
+
+@pytest.mark.parametrize("func,arity,expected", [
+    (_zero, 0, ("zero",)),
+    (_one, 1, ("one", "q")),
+    (_one_default, 1, ("one", "q")),
+    (_two, 2, ("two", "q", {"o": 1})),
+    (_two_default, 2, ("two", "q", {"o": 1})),
+    (lambda: "lambda", 0, "lambda"),
+])
+def test_handler_arity(func, arity, expected):
+    handler = IntentHandler(func, "test")
+    assert handler.arity == arity
+    assert handler("q", {"o": 1}) == expected
+
+
+def test_var_args_handler_receives_extra_kwargs():
+    handler = IntentHandler(_var, "var")
+    assert handler.arity == -1
+    assert handler("q", "o", page=2) == ("var", "q", ("o",), {"page": 2})
+
+
+# -------------------------------
+# 바인딩 불가 → 시작 시점 실패
+# -------------------------------
+def _three_required(a, b, c):
+    return None
+
+
+def _keyword_only(query, *, member):
+    return None
+
+
+@pytest.mark.parametrize("func", [_three_required, _keyword_only, "not callable"])
+def test_unbindable_handler_fails_fast(func):
+    with pytest.raises(IntentBindingError):
+        build_intent_registry({"broken": func})
+
+
+def test_intent_map_registry_is_bindable():
+    from routes.intent_map import INTENT_MAP, INTENT_REGISTRY
+
+    assert set(INTENT_REGISTRY) == set(INTENT_MAP)
+    for intent, handler in INTENT_REGISTRY.items():
+        assert handler.func is INTENT_MAP[intent]
+        assert handler.arity in (0, 1, 2, -1)
+
+
+def test_dispatch_intent():
+    from routes import intent_map
+
+    registry = build_intent_registry({"echo": _one})
+    assert intent_map.dispatch_intent("echo", "홍길동", registry=registry) == ("one", "홍길동")
+    assert intent_map.dispatch_intent("없는_intent", "홍길동", registry=registry) is None
+
+
+# -------------------------------
+# run_intent_func: 시그니처 분석 1회
+# -------------------------------
+def test_run_intent_func_inspects_signature_once(monkeypatch):
+    calls = []
+    original = dispatch.inspect.signature
+
+    def counting(func):
+        calls.append(func)
+        return original(func)
+
+    monkeypatch.setattr(dispatch.inspect, "signature", counting)
+
+    def handler(query, options):
+        return query, options
+
+    for _ in range(5):
+        assert run_intent_func(handler, "q", {}) == ("q", {})
+
+    assert calls == [handler]
+    assert get_intent_handler(handler) is get_intent_handler(handler)
@@ -0,0 +1,140 @@
+import time
+
+import pytest
+
+import utils.hot_sheets as hot_sheets
+import utils.sheets
+from app import app, create_app, open_sheet_snapshot
+from utils.hot_sheets import HotSheetCache
+from utils.shared_cache import invalidate_sheet
+from utils.sheets import get_rows_from_sheet
+
+
+class QuotaError(Exception):
+    def __init__(self):
+        super().__init__("APIError: [429]: Quota exceeded for quota metric 'Read requests'")
+
+
+class Loader:
+    def __init__(self):
+        self.calls = []
+        self.fail = None
+
+    def __call__(self, name):
+        self.calls.append(name)
+        if self.fail:
+            raise self.fail
+        return [{"sheet": name, "n": len(self.calls)}]
+
+
+@pytest.fixture
+def clock(fake_clock):
+    return fake_clock
+
+
+@pytest.fixture
+def loader():
+    return Loader()
+
+
+@pytest.fixture
+def cache(clock, loader):
+    return HotSheetCache(["DB", "상담일지"], ttl=60, stale_ttl=30, refresh_ahead=0.8,
+                         backoff=5, backoff_max=20, loader=loader, clock=clock)
+
+
+# -------------------------------
+# 미리 갱신 / stale-while-revalidate
+# -------------------------------
+def test_refresh_loads_hot_sheets_and_serves_copies(cache, loader):
+    assert cache.get("DB") is None                   # 아직 안 읽음
+    cache.refresh_due()
+
+    rows = cache.get("DB")
+    rows[0]["sheet"] = "수정"
+    assert cache.get("DB") == [{"sheet": "DB", "n": 1}]
+    assert cache.get("제품주문") is None                 # 대상 시트가 아님
+    assert loader.calls == ["DB", "상담일지"]
+
+
+def test_refreshes_ahead_of_expiry(cache, loader, clock):
+    cache.refresh_due()
+    clock.now += 47
+    assert cache.refresh_due() == pytest.approx(1.0)
+    assert len(loader.calls) == 2
+
+    clock.now += 1                                   # 60 * 0.8 = 48초
+    cache.refresh_due()
+    assert len(loader.calls) == 4
+
+
+def test_stale_window_then_miss(cache, clock):
+    cache.refresh_due()
+    clock.now += 70
+    assert cache.get("DB") is not None
+    clock.now += 30
+    assert cache.get("DB") is None
+    assert cache.stats()["stale"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_local_write_drops_hot_copy(cache, loader):
+    cache.refresh_due()
+    invalidate_sheet("DB")
+
+    assert cache.get("DB") is None
+    cache.refresh_due()
+    assert cache.get("DB") == [{"sheet": "DB", "n": 3}]
+    assert loader.calls == ["DB", "상담일지", "DB"]
+
+
+# -------------------------------
+# 할당량 초과 시 쉬기
+# -------------------------------
+def test_quota_error_backs_off_exponentially(cache, loader, clock):
+    loader.fail = QuotaError()
+
+    assert cache.refresh_due() == 5
+    assert cache.refresh_due() == pytest.approx(5)   # 쉬는 중 → 호출하지 않음
+    assert len(loader.calls) == 1
+
+    clock.now += 5
+    assert cache.refresh_due() == 10
+    clock.now += 10
+    assert cache.refresh_due() == 20
+    clock.now += 20
+    assert cache.refresh_due() == 20                 # backoff_max
+
+    loader.fail = None
+    clock.now += 20
+    cache.refresh_due()
+    assert cache.get("DB") is not None
+    assert cache.stats()["quota_backoffs"] == 4
+
+
+# -------------------------------
+# 앱 팩토리 / 요청 연동
+# -------------------------------
+def test_app_factory_starts_refresher_and_requests_use_it(monkeypatch, loader):
+    monkeypatch.setattr(hot_sheets, "HOT_SHEET_TTL", 60)
+    monkeypatch.setattr(hot_sheets, "_default_loader", loader)
+    monkeypatch.setattr(utils.sheets, "open_worksheet", lambda name: pytest.fail("시트를 직접 읽음"))
+    try:
+        create_app()
+        hot = hot_sheets.get_hot_sheets()
+        deadline = time.time() + 5
+        while len(loader.calls) < len(hot.sheets) and time.time() < deadline:
+            time.sleep(0.01)
+
+        assert hot.running and hot.ttl == 60
+        with app.test_request_context("/member", method="POST"):
+            open_sheet_snapshot()
+            assert get_rows_from_sheet("DB")[0]["sheet"] == "DB"
+    finally:
+        hot_sheets.stop_hot_sheet_refresher()
+
+    assert hot_sheets.get_hot_sheets() is None
+    assert not hot.running
+
+
+def test_refresher_disabled_by_default():
+    assert hot_sheets.start_hot_sheet_refresher() is None
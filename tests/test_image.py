@@ -0,0 +1,134 @@
+import io
+import json
+
+import pytest
+from PIL import Image
+
+import utils.utils
+from utils.image import VISION_TIMEOUT, prepare_image_for_vision, read_image_bytes
+from utils.upstream import get_upstream
+
+
+def _encode(img, fmt="JPEG", **kwargs):
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, **kwargs)
+    return buf.getvalue()
+
+
+# -------------------------------
+# 전처리
+# -------------------------------
+def test_downscale_to_long_edge():
+    raw = _encode(Image.effect_noise((3000, 4000), 50).convert("RGB"), quality=95)
+    prepared = prepare_image_for_vision(raw, max_edge=1600)
+
+    assert max(prepared.width, prepared.height) == 1600
+    assert (prepared.width, prepared.height) == (1200, 1600)
+    assert prepared.saved_bytes > 0
+    assert prepared.stats()["sent_bytes"] == len(prepared.data)
+
+
+def test_exif_orientation_applied():
+    img = Image.new("RGB", (400, 200), (200, 10, 10))
+    exif = img.getexif()
+    exif[0x0112] = 6   # 90도 회전
+    prepared = prepare_image_for_vision(_encode(img, exif=exif), grayscale=False)
+
+    assert (prepared.width, prepared.height) == (200, 400)
+    assert prepared.reencoded
+
+
+def _gray_screenshot():
+    return Image.effect_noise((2000, 1000), 30).convert("RGB")
+
+
+def _color_photo():
+    gradient = Image.linear_gradient("L").resize((2000, 1000))
+    return Image.merge("RGB", [gradient, gradient.rotate(180), Image.effect_noise((2000, 1000), 30)])
+
+
+@pytest.mark.parametrize("make,expected", [
+    (_gray_screenshot, True),   # 흑백 스크린샷/스캔
+    (_color_photo, False),      # 컬러 사진
+])
+def test_auto_grayscale(make, expected):
+    prepared = prepare_image_for_vision(_encode(make(), "PNG"), grayscale="auto")
+    assert prepared.grayscale is expected
+
+
+@pytest.mark.parametrize("fmt,mime", [("jpeg", "image/jpeg"), ("webp", "image/webp")])
+def test_mime_type_matches_encoding(fmt, mime):
+    raw = _encode(Image.effect_noise((2000, 1000), 40).convert("RGB"), "PNG")
+    prepared = prepare_image_for_vision(raw, fmt=fmt)
+
+    assert prepared.mime_type == mime
+    assert prepared.data_url().startswith(f"data:{mime};base64,")
+
+
+def test_small_original_kept_with_real_mime():
+    raw = _encode(Image.new("RGB", (32, 32), (0, 128, 255)), "PNG")
+    prepared = prepare_image_for_vision(raw, grayscale=False)
+
+    assert prepared.data == raw
+    assert prepared.mime_type == "image/png"
+    assert prepared.saved_bytes == 0
+
+
+def test_non_image_passthrough():
+    prepared = prepare_image_for_vision(b"\x89PNG-broken")
+    assert prepared.data == b"\x89PNG-broken"
+    assert prepared.mime_type == "image/png"
+    assert not prepared.reencoded
+
+
+def test_read_image_bytes_inputs():
+    assert read_image_bytes(b"abc") == b"abc"
+    assert read_image_bytes(io.BytesIO(b"abc")) == b"abc"
+
+    class Upload:
+        def __init__(self):
+            self.stream = io.BytesIO(b"abc")
+        def read(self):
+            return self.stream.read()
+        def seek(self, pos):
+            self.stream.seek(pos)
+
+    upload = Upload()
+    upload.read()
+    assert read_image_bytes(upload) == b"abc"
+
+
+# -------------------------------
+# extract_order_from_uploaded_image
+# -------------------------------
+def test_extract_order_sends_prepared_image(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_URL", "http://openai.local/v1/chat/completions")
+    sent = {}
+
+    class DummyResponse:
+        status_code = 200
+        def raise_for_status(self):
+            pass
+        def json(self):
+            content = json.dumps({"orders": [{"제품명": "노니"}]}, ensure_ascii=False)
+            return {"choices": [{"message": {"content": content}}]}
+
+    def fake_post(url, headers=None, json=None, **kwargs):
+        sent["payload"] = json
+        sent["timeout"] = kwargs.get("timeout")
+        return DummyResponse()
+
+    monkeypatch.setattr(get_upstream("openai").session, "request",
+                        lambda method, url, **kw: fake_post(url, **kw))
+    monkeypatch.setattr(utils.utils, "get_vision_cache", lambda: None)
+
+    raw = _encode(Image.effect_noise((3000, 2000), 50).convert("RGB"), quality=95)
+    result = utils.utils.extract_order_from_uploaded_image(io.BytesIO(raw))
+
+    url = sent["payload"]["messages"][0]["content"][1]["image_url"]["url"]
+    assert url.startswith("data:image/jpeg;base64,")
+    assert sent["timeout"][1] == VISION_TIMEOUT
+    assert result["orders"] == [{"제품명": "노니"}]
+    assert result["image_stats"]["original_bytes"] == len(raw)
+    assert result["image_stats"]["saved_bytes"] > 0
@@ -0,0 +1,146 @@
+import random
+
+import pytest
+
+from parser import INTENT_RULES, guess_intent
+from parser.intent_classifier import IntentClassifier
+
+
+# -------------------------------
+# 골든 코퍼스 (기존 규칙 루프 구현 기준 결과)
+# ⚠️ 기존 동작을 그대로 고정한 값이므로, 규칙을 바꿀 때만 함께 갱신
+# -------------------------------
+GOLDEN_CORPUS = [
+    ('홍길동', 'search_member'),
+    ('강소희 전체정보', 'member_select'),
+    ('강소희 상세', 'member_select'),
+    ('강소희 info', 'member_select'),
+    ('전체정보', 'member_select'),
+    ('상세', 'member_select'),
+    ('info', 'member_select'),
+    ('상세정보', 'search_member'),
+    ('종료', 'search_member'),
+    ('끝', 'member_select'),
+    ('이태수 회원등록', 'register_member'),
+    ('이태수 회원 등록', 'register_member'),
+    ('회원 등록 이태수', 'register_member'),
+    ('회원 추가 김영희', 'register_member'),
+    ('회원 수정 강소희', 'update_member'),
+    ('홍길동 주소 수정 대구시', 'unknown'),
+    ('홍길동 회원 주소 수정 대구시', 'update_member'),
+    ('회원 삭제 홍길동', 'delete_member_field_nl_func'),
+    ('홍길동 삭제', 'delete_member'),
+    ('홍길동 주소 삭제', 'unknown'),
+    ('회원 탈퇴 홍길동', 'delete_member'),
+    ('회원 검색 이영숙', ''),
+    ('회원 조회 이영숙', 'search_member'),
+    ('코드 검색 a', 'search_by_code_logic'),
+    ('코드a', 'unknown'),
+    ('코드 A', 'unknown'),
+    ('이태수 상담일지 저장 오늘 출근합니다', 'memo_add'),
+    ('김영희 개인일지 저장 기분 좋음', 'memo_add'),
+    ('박철수 활동일지 저장 운동 완료', 'memo_add'),
+    ('메모 저장 오늘 일정', 'memo_add'),
+    ('상담 추가 홍길동', 'add_counseling'),
+    ('상담일지 추가', 'add_counseling'),
+    ('이태수 상담일지 검색 중국', 'memo_search'),
+    ('메모 검색 중국', 'memo_search'),
+    ('상담일지 중국', 'memo_search'),
+    ('개인일지', 'search_member'),
+    ('활동일지 검색', 'memo_search'),
+    ('전체메모 검색 중국', 'memo_search'),
+    ('전체 메모 검색 중국', 'memo_search'),
+    ('전체메모 중국', 'unknown'),
+    ('일지 저장', 'memo_add'),
+    ('일지 검색 중국', 'memo_search'),
+    ('일지 조회', 'memo_find'),
+    ('일지 자동', 'memo_find_auto'),
+    ('검색 자연어 비', 'search_memo_from_text'),
+    ('전체메모', 'search_member'),
+    ('메모', 'search_member'),
+    ('상담일지', 'search_member'),
+    ('주문', 'search_member'),
+    ('홍길동 주문', 'handle_product_order'),
+    ('이태수 주문 노니 2개', 'handle_product_order'),
+    ('주문 자동', 'order_auto'),
+    ('주문 업로드', 'order_upload'),
+    ('주문 자연어 노니 2개', 'order_nl'),
+    ('주문 저장', 'save_order_proxy'),
+    ('제품 주문', 'handle_product_order'),
+    ('카드 주문', 'handle_product_order'),
+    ('홍길동 후원수당 조회', 'unknown'),
+    ('수당 찾기', 'commission_find'),
+    ('수당 자동', 'commission_find_auto'),
+    ('수당 자연어 8월', 'search_commission_by_nl'),
+    ('후원수당 전체 조회', 'unknown'),
+    ('수당 내역', 'unknown'),
+    ('회원 저장 홍길동 전화번호 010-9999-8888', 'save_member'),
+    ('12345678', 'unknown'),
+    ('010-1234-5678', 'unknown'),
+    ('특수번호 aa668800@', 'unknown'),
+    ('알 수 없는 요청문', 'unknown'),
+    ('', 'unknown'),
+    ('   ', 'unknown'),
+    ('안녕하세요 반갑습니다', 'unknown'),
+    ('홍길동 회원', 'unknown'),
+    ('회원', 'search_member'),
+    ('검색', 'search_member'),
+]
+
+
+@pytest.mark.parametrize("text,expected", GOLDEN_CORPUS)
+def test_guess_intent_golden(text, expected):
+    assert guess_intent(text) == expected
+
+
+# -------------------------------
+# 기존 규칙 루프와 동등성
+# -------------------------------
+def _legacy_rule_loop(rules, query):
+    for keywords, intent in rules.items():
+        if all(kw in query for kw in keywords):
+            return intent
+    return "unknown"
+
+
+def test_classifier_matches_rule_loop_on_random_queries():
+    classifier = IntentClassifier(INTENT_RULES)
+    vocab = sorted({kw for kws in INTENT_RULES for kw in kws}) + ["홍길동", "전체", "상담", " ", "abc"]
+
+    rng = random.Random(20251019)
+    for _ in range(5000):
+        query = " ".join(rng.choice(vocab) for _ in range(rng.randint(0, 4)))
+        if rng.random() < 0.3:
+            query = query.replace(" ", "")
+        assert classifier.classify(query) == _legacy_rule_loop(INTENT_RULES, query), query
+
+
+# -------------------------------
+# IntentClassifier 단위 테스트
+# -------------------------------
+def test_overlapping_keywords_are_all_detected():
+    # "상담일지" 안의 "일지", "상세정보" 안의 "상세"도 존재하는 것으로 처리해야 함
+    rules = {("상세",): "detail", ("일지", "저장"): "memo_add"}
+    classifier = IntentClassifier(rules)
+    assert classifier.classify("상세정보") == "detail"
+    assert classifier.classify("상담일지 저장") == "memo_add"
+
+
+def test_priority_follows_rule_order():
+    classifier = IntentClassifier({("주문",): "first", ("주문", "저장"): "second"})
+    assert classifier.classify("주문 저장") == "first"
+
+    classifier = IntentClassifier({("주문", "저장"): "second", ("주문",): "first"})
+    assert classifier.classify("주문 저장") == "second"
+
+
+def test_empty_intent_is_returned_as_is():
+    classifier = IntentClassifier({("회원", "검색"): "", ("회원",): "search_member"})
+    assert classifier.classify("회원 검색") == ""
+    assert classifier.match("없음") is None
+    assert classifier.classify("없음", default="fallback") == "fallback"
+
+
+def test_empty_rules():
+    classifier = IntentClassifier({})
+    assert classifier.classify("아무거나") == "unknown"
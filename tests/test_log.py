@@ -0,0 +1,78 @@
+import json
+import logging
+
+import utils.log as log
+from parser.parse import keyword_match
+from utils.log import JsonFormatter, LazyJson, debug_sampled, get_logger
+
+
+class CountingJson(LazyJson):
+    dumps = 0
+
+    def __str__(self):
+        CountingJson.dumps += 1
+        return super().__str__()
+
+
+# -------------------------------
+# 레벨 / 지연 포맷
+# -------------------------------
+def test_module_loggers_default_to_info():
+    assert get_logger("parser.parse").getEffectiveLevel() == logging.INFO
+    assert not get_logger("routes.routes_order").isEnabledFor(logging.DEBUG)
+
+
+def test_lazy_json_is_not_serialized_when_debug_is_off(caplog):
+    caplog.set_level(logging.INFO, logger="routes")
+    CountingJson.dumps = 0
+
+    get_logger("routes.routes_order").debug("payload=%s", CountingJson({"회원명": "홍길동"}))
+    assert CountingJson.dumps == 0
+
+    caplog.set_level(logging.DEBUG, logger="routes")
+    get_logger("routes.routes_order").debug("payload=%s", CountingJson({"회원명": "홍길동"}))
+    assert CountingJson.dumps >= 1                      # 핸들러마다 1회
+    assert 'payload={"회원명": "홍길동"}' in caplog.text
+
+
+def test_keyword_match_is_silent_at_info(caplog):
+    caplog.set_level(logging.INFO, logger="parser")
+    assert keyword_match("홍길동 상담 메모", ["상담", "주문"]) is True
+    assert caplog.records == []
+
+
+# -------------------------------
+# 샘플링
+# -------------------------------
+def test_debug_sampled_respects_rate(caplog):
+    logger = get_logger("utils.test_log")
+    caplog.set_level(logging.DEBUG, logger="utils.test_log")
+
+    for i in range(10):
+        debug_sampled(logger, "row %d", i, rate=0)
+    assert caplog.records == []
+
+    for i in range(3):
+        debug_sampled(logger, "row %d", i, rate=1)
+    assert [r.getMessage() for r in caplog.records] == ["row 0", "row 1", "row 2"]
+
+
+def test_debug_sampled_skips_random_when_debug_is_off(caplog, monkeypatch):
+    caplog.set_level(logging.INFO, logger="utils.test_log")
+    monkeypatch.setattr(log.random, "random", lambda: (_ for _ in ()).throw(AssertionError("called")))
+    debug_sampled(get_logger("utils.test_log"), "row %d", 1, rate=1)
+
+
+# -------------------------------
+# JSON 형식
+# -------------------------------
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("utils.sheets", logging.WARNING, __file__, 1, "재시도 %d", (2,), None)
+    record.sheet = "DB"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["level"] == "WARNING"
+    assert entry["logger"] == "utils.sheets"
+    assert entry["msg"] == "재시도 2"
+    assert entry["sheet"] == "DB"
@@ -0,0 +1,112 @@
+import pytest
+
+import utils.sheets
+from app import app
+from utils.metrics import (
+    INTENT_LATENCY, METRICS, OPENAI_TOKENS, RATE_LIMITED, SHEETS_BYTES, SHEETS_CALLS,
+    UPSTREAM_LATENCY, MetricsRegistry, _worksheet_from_url, record_openai_usage, record_sheets_response,
+)
+from utils.cache import SingleFlight
+from utils.sheets import fetch_sheet
+from utils.upstream import UpstreamClient, UpstreamConfig
+
+
+@pytest.fixture(autouse=True)
+def clean_metrics():
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+# -------------------------------
+# 지표 종류 / Prometheus 형식
+# -------------------------------
+def test_histogram_and_counter_render_prometheus_text():
+    registry = MetricsRegistry()
+    latency = registry.histogram("t_seconds", "지연", ("intent",), buckets=(0.1, 1.0))
+    calls = registry.counter("t_calls_total", "호출", ("method",))
+
+    latency.observe(0.05, intent="search_member")
+    latency.observe(0.5, intent="search_member")
+    calls.inc(method="get_all_records")
+    calls.inc(2, method="get_all_records")
+
+    text = registry.render()
+    assert "# TYPE t_seconds histogram" in text
+    assert 't_seconds_bucket{intent="search_member",le="0.1"} 1' in text
+    assert 't_seconds_bucket{intent="search_member",le="1.0"} 2' in text
+    assert 't_seconds_bucket{intent="search_member",le="+Inf"} 2' in text
+    assert 't_seconds_count{intent="search_member"} 2' in text
+    assert 't_calls_total{method="get_all_records"} 3' in text
+    assert latency.sum(intent="search_member") == pytest.approx(0.55)
+
+
+def test_wrong_labels_are_rejected():
+    with pytest.raises(ValueError):
+        SHEETS_CALLS.inc(method="get_all_records")
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("t_total", "x", ("name",)).inc(name='a"b')
+    assert 't_total{name="a\\"b"} 1' in registry.render()
+
+
+# -------------------------------
+# 계측 지점
+# -------------------------------
+def test_fetch_sheet_counts_only_downloads(monkeypatch, fake_sheet):
+    monkeypatch.setattr(utils.sheets, "sheet_fetches", SingleFlight())
+    fetch_sheet(fake_sheet("DB", ["회원명"], [["홍길동"]]))
+    assert SHEETS_CALLS.value(method="get_all_records", worksheet="DB") == 1
+
+
+def test_sheets_response_hook_counts_bytes_and_429(fake_response):
+    url = "https://sheets.googleapis.com/v4/spreadsheets/abc/values/%27%EC%83%81%EB%8B%B4%EC%9D%BC%EC%A7%80%27%21A1%3AZ"
+    record_sheets_response(fake_response(200, url=url, content=b"x" * 120))
+    record_sheets_response(fake_response(429, url=url, content=b"{}"))
+
+    assert SHEETS_BYTES.value(worksheet="상담일지") == 122
+    assert RATE_LIMITED.value(source="sheets") == 1
+
+
+def test_worksheet_from_url():
+    base = "https://sheets.googleapis.com/v4/spreadsheets/abc"
+    assert _worksheet_from_url(base + "/values/'DB'!A1:C3") == "DB"
+    assert _worksheet_from_url(base + "/values/'DB':append") == "DB"
+    assert _worksheet_from_url(base + "/values/DB!A1") == "DB"
+    assert _worksheet_from_url(base + "/values:batchGet?ranges=%27DB%27%21A1") == "DB"
+    assert _worksheet_from_url(base + ":batchUpdate") == "-"
+
+
+def test_upstream_records_latency_429_and_backoff(fake_session):
+    client = UpstreamClient(UpstreamConfig(name="openai", backoff=0), session=fake_session(429, 200))
+    client.get("http://openai.local/v1/models")
+
+    assert RATE_LIMITED.value(source="openai") == 1
+    assert METRICS.get("members_backoffs_total").value(source="openai") == 1
+    assert UPSTREAM_LATENCY.count(service="openai", outcome="rate_limited") == 1
+    assert UPSTREAM_LATENCY.count(service="openai", outcome="ok") == 1
+
+
+def test_record_openai_usage():
+    record_openai_usage("order_text", {"usage": {"prompt_tokens": 120, "completion_tokens": 30}})
+    record_openai_usage("order_text", {"choices": []})
+
+    assert OPENAI_TOKENS.value(operation="order_text", kind="prompt") == 120
+    assert OPENAI_TOKENS.value(operation="order_text", kind="completion") == 30
+
+
+# -------------------------------
+# /metrics 엔드포인트
+# -------------------------------
+def test_metrics_endpoint_reports_intent_latency():
+    client = app.test_client()
+    client.get("/health/upstreams")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/plain"
+    assert INTENT_LATENCY.count(intent="health_upstreams", status="200") == 1
+    assert 'members_intent_duration_seconds_count{intent="health_upstreams",status="200"} 1' in response.get_data(as_text=True)
+    assert INTENT_LATENCY.count(intent="metrics", status="200") == 0
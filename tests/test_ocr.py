@@ -0,0 +1,158 @@
+import io
+import shutil
+
+import pytest
+from PIL import Image, ImageDraw
+
+import utils.ocr as ocr
+from app import app
+from utils.ocr import OCRUnavailable, TieredOrderExtractor, parse_receipt_text
+
+
+LABEL_RECEIPT = """
+주문서
+제품명: 노니 주스
+가격: 30,000원
+PV: 20
+제품명: 홍삼정
+가격: 50,000
+PV: 40
+고객명: 김영희
+연락처 010-1234-5678
+배송처: 서울시 강남구 테헤란로 1
+"""
+
+LINE_RECEIPT = """
+노니 주스 30,000원 PV 20
+홍삼정 50000 40
+배송지: 부산시 해운대구
+"""
+
+
+# -------------------------------
+# 규칙 기반 파서
+# -------------------------------
+def test_parse_label_layout():
+    orders, completeness = parse_receipt_text(LABEL_RECEIPT)
+
+    assert [(o["제품명"], o["제품가격"], o["PV"]) for o in orders] == [
+        ("노니 주스", "30000", "20"), ("홍삼정", "50000", "40"),
+    ]
+    assert all(o["배송처"] == "서울시 강남구 테헤란로 1" for o in orders)
+    assert all(o["주문자_고객명"] == "김영희" for o in orders)
+    assert all(o["주문자_휴대폰번호"] == "010-1234-5678" for o in orders)
+    assert completeness == 1.0
+
+
+def test_parse_line_layout():
+    orders, completeness = parse_receipt_text(LINE_RECEIPT)
+
+    assert [(o["제품명"], o["제품가격"], o["PV"]) for o in orders] == [
+        ("노니 주스", "30000", "20"), ("홍삼정", "50000", "40"),
+    ]
+    assert orders[0]["배송처"] == "부산시 해운대구"
+    assert completeness == 1.0
+
+
+def test_parse_incomplete_and_empty():
+    orders, completeness = parse_receipt_text("제품명: 노니\nPV: 20")
+    assert orders[0]["제품가격"] == ""
+    assert completeness == pytest.approx(2 / 3)
+
+    assert parse_receipt_text("영수증 아님") == ([], 0.0)
+
+
+# -------------------------------
+# 단계별 추출기
+# -------------------------------
+def _vision_stub(calls):
+    def vision(buf):
+        calls.append(buf.read())
+        return {"orders": [{"제품명": "vision"}], "image_stats": {}}
+    return vision
+
+
+def test_confident_ocr_skips_vision():
+    calls = []
+    extractor = TieredOrderExtractor(vision=_vision_stub(calls), ocr=lambda data: (LINE_RECEIPT, 0.95),
+                                     threshold=0.85, ocr_enabled=True)
+    result = extractor(b"img")
+
+    assert result["tier"] == "ocr"
+    assert result["ocr_confidence"] == 0.95
+    assert [o["제품명"] for o in result["orders"]] == ["노니 주스", "홍삼정"]
+    assert calls == []
+
+    stats = extractor.stats()
+    assert stats["ocr"]["hits"] == 1 and stats["ocr"]["hit_rate"] == 1.0
+    assert stats["vision"]["attempts"] == 0
+
+
+@pytest.mark.parametrize("ocr_result", [
+    (LINE_RECEIPT, 0.6),               # 흐린 이미지 (OCR 신뢰도 낮음)
+    ("제품명: 노니\nPV: 20", 0.99),     # 필드 누락
+    ("", 0.0),
+])
+def test_low_confidence_falls_through_to_vision(ocr_result):
+    calls = []
+    extractor = TieredOrderExtractor(vision=_vision_stub(calls), ocr=lambda data: ocr_result,
+                                     threshold=0.85, ocr_enabled=True)
+    result = extractor(io.BytesIO(b"img"))
+
+    assert result["tier"] == "vision"
+    assert result["orders"] == [{"제품명": "vision"}]
+    assert calls == [b"img"]
+
+    stats = extractor.stats()
+    assert stats["ocr"] == {**stats["ocr"], "attempts": 1, "hits": 0, "hit_rate": 0.0}
+    assert stats["vision"]["hits"] == 1
+
+
+def test_ocr_unavailable_and_errors_are_counted():
+    def unavailable(data):
+        raise OCRUnavailable("pytesseract 미설치")
+
+    extractor = TieredOrderExtractor(vision=lambda buf: {"error": "OpenAI API 호출 실패"},
+                                     ocr=unavailable, ocr_enabled=True)
+    result = extractor(b"img")
+
+    assert result["error"] == "OpenAI API 호출 실패"
+    stats = extractor.stats()
+    assert stats["ocr"]["unavailable"] == 1
+    assert stats["vision"]["errors"] == 1
+
+
+def test_extract_stats_route(monkeypatch):
+    extractor = TieredOrderExtractor(vision=_vision_stub([]), ocr=lambda data: (LINE_RECEIPT, 0.99),
+                                     ocr_enabled=True)
+    extractor(b"img")
+    monkeypatch.setattr(ocr, "_order_extractor", extractor)
+
+    app.testing = True
+    with app.test_client() as client:
+        res = client.get("/order/extract_stats")
+    data = res.get_json()
+
+    assert res.status_code == 200
+    assert data["tiers"]["ocr"]["hits"] == 1
+
+
+# -------------------------------
+# 실제 Tesseract (설치된 환경에서만)
+# -------------------------------
+@pytest.mark.skipif(shutil.which("tesseract") is None, reason="tesseract 미설치")
+def test_ocr_on_sample_image():
+    pytest.importorskip("pytesseract")
+    img = Image.new("RGB", (900, 160), "white")
+    draw = ImageDraw.Draw(img)
+    draw.text((20, 30), "Noni Juice 30,000 PV 20", fill="black")
+    draw.text((20, 90), "Red Ginseng 50000 40", fill="black")
+    img = img.resize((2700, 480))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+
+    text, confidence = ocr.ocr_image(buf.getvalue())
+    orders, _ = parse_receipt_text(text)
+
+    assert 0.0 < confidence <= 1.0
+    assert [o["제품가격"] for o in orders] == ["30000", "50000"]
@@ -0,0 +1,220 @@
+import pytest
+from flask import g
+
+import parser.order_grammar as order_grammar
+import routes.routes_order as routes_order
+from app import app
+from parser.order_grammar import (MemberNameIndex, ProductPriceIndex, expand_order_quantity, parse_order_grammar,
+                                  parse_order_hybrid)
+from utils import process_order_date
+
+
+MEMBERS = MemberNameIndex(lambda: ["이수민", "이태수", "김영희", "이태"], ttl=60)
+
+
+def _parse(text):
+    return parse_order_grammar(text, member_matcher=MEMBERS.match)
+
+
+# -------------------------------
+# 규칙 기반 문법
+# -------------------------------
+@pytest.mark.parametrize("text,expected", [
+    ("이수민 노니 2박스 카드 결제 오늘 주소 서울 강남구",
+     {"회원명": "이수민", "제품명": "노니", "수량": 2, "결재방법": "카드", "배송처": "서울 강남구"}),
+    ("이태수 주문 노니 2개",
+     {"회원명": "이태수", "제품명": "노니", "수량": 2, "결재방법": "카드", "배송처": ""}),
+    ("이태수 홍삼 세 박스 현금 어제",
+     {"회원명": "이태수", "제품명": "홍삼", "수량": 3, "결재방법": "현금"}),
+    ("김영희 비타민 주문 부산 해운대구로 배송",
+     {"회원명": "김영희", "제품명": "비타민", "수량": 1, "배송처": "부산 해운대구"}),
+    ("이태수 노니 30,000원 PV 20 1개 계좌이체",
+     {"제품명": "노니", "수량": 1, "결재방법": "계좌이체", "제품가격": "30000", "PV": "20"}),
+    ("김영희 2025-09-11 치약 3병 주문 저장",
+     {"회원명": "김영희", "제품명": "치약", "수량": 3, "주문일자": "2025-09-11"}),
+])
+def test_grammar_fields(text, expected):
+    parsed = _parse(text)
+    assert {k: parsed.fields.get(k) for k in expected} == expected
+    assert parsed.confidence >= 0.75
+
+
+def test_date_words_use_process_order_date():
+    assert _parse("이태수 노니 1개 어제").fields["주문일자"] == process_order_date("어제")
+    assert _parse("이태수 노니 1개").fields["주문일자"] == process_order_date("")
+
+
+def test_longest_member_name_wins():
+    assert _parse("이태수 노니 1개").fields["회원명"] == "이태수"
+
+
+@pytest.mark.parametrize("text", [
+    "노니 좀 보내줘 알아서",              # 회원 없음, 제품 모호
+    "이태수 저번에 말한 그거 두 개랑 뭐였더라",
+    "",
+])
+def test_low_confidence(text):
+    assert _parse(text).confidence < 0.75
+
+
+def test_parse_is_immutable():
+    parsed = _parse("이태수 노니 2개")
+    with pytest.raises(TypeError):
+        parsed.fields["수량"] = 3
+    assert parsed.to_order()["수령확인"] == "N"
+
+
+# -------------------------------
+# 규칙 → LLM 폴백
+# -------------------------------
+def test_hybrid_skips_llm_when_confident():
+    def llm(text):
+        raise AssertionError("LLM 호출되면 안 됨")
+
+    result = parse_order_hybrid("이태수 노니 2개 45,000원 PV 30 카드", llm=llm, member_matcher=MEMBERS.match)
+    assert result["source"] == "rule"
+    assert result["orders"][0]["제품명"] == "노니"
+
+
+PRICES = ProductPriceIndex(lambda: [{"제품명": "노니", "제품가격": "45,000", "PV": 30}], ttl=60)
+
+
+def test_hybrid_fills_price_and_pv_from_recent_order():
+    def llm(text):
+        raise AssertionError("LLM 호출되면 안 됨")
+
+    result = parse_order_hybrid("이수민 노니 2박스 카드", llm=llm, member_matcher=MEMBERS.match,
+                                price_lookup=PRICES.lookup)
+
+    assert result["source"] == "rule"
+    assert result["orders"][0]["회원명"] == "이수민"
+    assert (result["orders"][0]["제품가격"], result["orders"][0]["PV"]) == ("45000", "30")
+
+
+def test_hybrid_uses_llm_when_product_price_unknown():
+    calls = []
+
+    def llm(text):
+        calls.append(text)
+        return {"orders": [{"제품명": "홍삼", "수량": 2, "제품가격": "60000", "PV": "40"}]}
+
+    result = parse_order_hybrid("이수민 홍삼 2박스", llm=llm, member_matcher=MEMBERS.match,
+                                price_lookup=PRICES.lookup)
+
+    assert _parse("이수민 홍삼 2박스").confidence >= 0.75
+    assert calls == ["이수민 홍삼 2박스"]
+    assert result["source"] == "llm"
+    assert result["orders"][0]["제품가격"] == "60000"
+
+
+def test_product_price_index_uses_latest_valid_row():
+    loads = []
+    rows = [{"제품명": "노 니", "제품가격": "", "PV": ""},            # 가격 없는 최신 행은 건너뜀
+            {"제품명": "노니", "제품가격": 47000, "PV": 31.5},
+            {"제품명": "노니", "제품가격": 45000, "PV": 30}]
+    index = ProductPriceIndex(lambda: loads.append(1) or rows, ttl=60)
+
+    assert index.lookup("노니") == {"제품가격": "47000", "PV": "31.5"}
+    assert index.lookup("없는제품") is None
+    assert len(loads) == 1
+
+    index.invalidate()
+    index.lookup("노니")
+    assert len(loads) == 2
+
+
+def test_order_save_invalidates_product_prices(monkeypatch):
+    from utils.shared_cache import invalidate_sheet
+
+    index = ProductPriceIndex(lambda: [], ttl=60)
+    index.lookup("노니")
+    monkeypatch.setattr(order_grammar, "PRODUCT_PRICE_INDEX", index)
+
+    invalidate_sheet("DB")
+    assert index._loaded_at
+    invalidate_sheet("제품주문")
+    assert not index._loaded_at
+
+
+def test_expand_order_quantity():
+    rows = expand_order_quantity([{"제품명": "노니", "수량": 2, "제품가격": "45000"},
+                                  {"제품명": "홍삼"}, {"제품명": "치약", "수량": "abc"}])
+    assert [r["제품명"] for r in rows] == ["노니", "노니", "홍삼", "치약"]
+    assert all("수량" not in r for r in rows)
+    assert len(expand_order_quantity([{"제품명": "노니", "수량": 100000}])) == order_grammar.MAX_ORDER_QUANTITY
+
+
+def test_hybrid_falls_back_to_llm():
+    calls = []
+
+    def llm(text):
+        calls.append(text)
+        content = '```json\n{"orders": [{"제품명": "노니", "수량": 2}]}\n```'
+        return {"choices": [{"message": {"content": content}}]}
+
+    result = parse_order_hybrid("이태수 저번에 말한 그거 두 개랑 뭐였더라", llm=llm,
+                                member_matcher=MEMBERS.match)
+
+    assert calls == ["이태수 저번에 말한 그거 두 개랑 뭐였더라"]
+    assert result["source"] == "llm"
+    assert result["orders"] == [{"제품명": "노니", "수량": 2, "회원명": "이태수",
+                                 "주문일자": process_order_date("")}]
+
+
+def test_member_index_loads_once_per_ttl():
+    loads = []
+    index = MemberNameIndex(lambda: loads.append(1) or ["홍길동"], ttl=60)
+
+    assert index.match("홍길동 노니 1개") == "홍길동"
+    assert index.match("없는사람 노니 1개") is None
+    assert len(loads) == 1
+
+    index.invalidate()
+    index.match("홍길동")
+    assert len(loads) == 2
+
+
+# -------------------------------
+# order_nl_func
+# -------------------------------
+def test_order_nl_saves_rule_parse(monkeypatch):
+    saved = []
+    monkeypatch.setattr(order_grammar, "MEMBER_NAME_INDEX", MEMBERS)
+    monkeypatch.setattr(routes_order, "handle_order_save_many",
+                        lambda orders: saved.extend(orders) or {"status": "ok"})
+
+    def llm(text):
+        raise AssertionError("LLM 호출되면 안 됨")
+
+    monkeypatch.setattr("utils.parse_order_from_text", llm)
+
+    with app.test_request_context("/order", method="POST"):
+        g.query = {"query": "이태수 노니 2개 45,000원 PV 30 현금 주문"}
+        result = routes_order.order_nl_func()
+
+    assert result["status"] == "success"
+    assert result["source"] == "rule"
+    assert len(saved) == 2                          # 수량 2 → 2행
+    assert saved[0]["회원명"] == "이태수"
+    assert saved[0]["결재방법"] == "현금"
+    assert (saved[0]["제품가격"], saved[0]["PV"]) == ("45000", "30")
+
+
+def test_order_nl_fills_price_without_llm(monkeypatch):
+    saved = []
+    monkeypatch.setattr(order_grammar, "MEMBER_NAME_INDEX", MEMBERS)
+    monkeypatch.setattr(order_grammar, "PRODUCT_PRICE_INDEX", PRICES)
+    monkeypatch.setattr(routes_order, "handle_order_save_many",
+                        lambda orders: saved.extend(orders) or {"status": "ok"})
+
+    def llm(text):
+        raise AssertionError("LLM 호출되면 안 됨")
+
+    monkeypatch.setattr("utils.parse_order_from_text", llm)
+
+    with app.test_request_context("/order", method="POST"):
+        g.query = {"query": "이수민 노니 2박스 카드"}
+        result = routes_order.order_nl_func()
+
+    assert result["source"] == "rule"
+    assert [(r["회원명"], r["제품가격"], r["PV"], r["결재방법"]) for r in saved] == [("이수민", "45000", "30", "카드")] * 2
@@ -0,0 +1,215 @@
+import io
+import threading
+import time
+
+import pytest
+
+import routes.routes_order as routes_order
+import utils.jobs
+from app import app
+from utils.jobs import JobStore
+
+
+@pytest.fixture
+def client():
+    app.testing = True
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    store = JobStore(max_workers=2, ttl=60, max_jobs=100, path=str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(routes_order, "get_job_store", lambda: store)
+    yield store
+    store.shutdown()
+
+
+def _wait(store, job_id, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = store.get(job_id)
+        if job["status"] in ("done", "failed") and ("callback" in job or not job["callback_url"]):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} 미완료: {store.get(job_id)}")
+
+
+# -------------------------------
+# JobStore
+# -------------------------------
+def test_job_lifecycle(store):
+    gate = threading.Event()
+
+    def work(x):
+        gate.wait(2)
+        return {"status": "success", "value": x * 2}
+
+    job = store.submit("test", work, 21)
+    assert job["status"] in ("queued", "running")
+
+    gate.set()
+    job = _wait(store, job["job_id"])
+    assert job["status"] == "done"
+    assert job["result"] == {"status": "success", "value": 42}
+    assert job["finished_at"] >= job["started_at"] >= job["created_at"]
+
+
+def test_job_failures(store):
+    def boom():
+        raise RuntimeError("vision timeout")
+
+    failed = _wait(store, store.submit("test", boom)["job_id"])
+    assert failed["status"] == "failed"
+    assert failed["error"] == "vision timeout"
+
+    error_result = _wait(store, store.submit("test", lambda: {"status": "error"})["job_id"])
+    assert error_result["status"] == "failed"
+
+
+@pytest.fixture
+def resolve(monkeypatch):
+    """callback 호스트 → IP 고정 (DNS 조회 없이)"""
+    addresses = {"client.local": "93.184.216.34", "intranet.local": "10.0.0.5"}
+    monkeypatch.setattr(utils.jobs, "JOB_CALLBACK_ALLOWED_HOSTS", ["client.local", "intranet.local"])
+    monkeypatch.setattr(utils.jobs.socket, "getaddrinfo",
+                        lambda host, port, **kw: [(None, None, None, "", (addresses[host], port))])
+
+
+def test_job_callback(store, monkeypatch, resolve):
+    posted = []
+
+    def fake_post(url, ip, payload, timeout):
+        posted.append((url, ip, payload, timeout))
+        return 204
+
+    monkeypatch.setattr(utils.jobs, "post_callback", fake_post)
+
+    job = store.submit("test", lambda: {"status": "success"}, callback_url="http://client.local/hook")
+    job = _wait(store, job["job_id"])
+
+    url, ip, payload, timeout = posted[0]
+    assert (url, ip, timeout) == ("http://client.local/hook", "93.184.216.34", utils.jobs.JOB_CALLBACK_TIMEOUT)
+    assert payload["status"] == "done" and "callback_url" not in payload
+    assert job["callback"] == {"status": "sent", "http_status": 204}
+
+
+def test_post_callback_connects_to_checked_ip_with_original_host():
+    import http.server
+    import json
+
+    seen = {}
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_POST(self):
+            seen["host"] = self.headers["Host"]
+            seen["path"] = self.path
+            seen["body"] = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            self.send_response(302)                  # 리다이렉트는 따라가지 않음
+            self.send_header("Location", "http://169.254.169.254/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.handle_request, daemon=True).start()
+    port = server.server_address[1]
+    try:
+        # 이름(rebind.local)은 조회하지 않고 넘겨준 IP 로 바로 접속
+        status = utils.jobs.post_callback(f"http://rebind.local:{port}/hook?x=1", "127.0.0.1",
+                                          {"job_id": "j1"}, timeout=5)
+    finally:
+        server.server_close()
+
+    assert status == 302
+    assert seen == {"host": f"rebind.local:{port}", "path": "/hook?x=1", "body": {"job_id": "j1"}}
+
+
+def test_callback_url_checks(resolve):
+    check = utils.jobs.check_callback_url
+    assert check("https://client.local/hook") is None
+    assert "http(s)" in check("file:///etc/passwd")
+    assert "http(s)" in check("gopher://client.local/")
+    assert "허용되지 않은" in check("http://169.254.169.254/latest/meta-data")
+    assert "내부 주소" in check("http://intranet.local/hook")
+
+
+def test_async_upload_rejects_bad_callback(client, store, resolve):
+    res = client.post("/order", data={
+        "회원명": "이태수", "async": "1", "callback_url": "http://127.0.0.1:10000/admin",
+        "image": (io.BytesIO(b"fake-image"), "order.jpg"),
+    }, content_type="multipart/form-data")
+
+    assert res.status_code == 400
+    assert len(store) == 0
+
+
+def test_jobs_visible_from_another_store(store, tmp_path):
+    job = _wait(store, store.submit("test", lambda: {"status": "success", "value": 1})["job_id"])
+
+    other = JobStore(max_workers=1, path=store.path)      # 다른 워커 프로세스의 저장소
+    try:
+        assert other.get(job["job_id"])["result"] == {"status": "success", "value": 1}
+    finally:
+        other.shutdown()
+
+
+def test_finished_jobs_are_purged(tmp_path):
+    store = JobStore(max_workers=1, ttl=60, max_jobs=3, path=str(tmp_path / "jobs.sqlite3"))
+    try:
+        ids = [_wait(store, store.submit("test", lambda: {})["job_id"])["job_id"] for _ in range(5)]
+        assert len(store) <= 3
+        assert store.get(ids[0]) is None
+        assert store.get(ids[-1])["status"] == "done"
+    finally:
+        store.shutdown()
+
+
+# -------------------------------
+# POST /order (async=1) → GET /order/jobs/<id>
+# -------------------------------
+def test_async_order_upload(client, store, monkeypatch):
+    calls = []
+
+    def fake_process(member_name, files=None, image_urls=None, mode="api"):
+        calls.append((member_name, files, threading.current_thread().name))
+        return {"status": "success", "회원명": member_name, "추출된_JSON": [{"제품명": "노니"}]}
+
+    monkeypatch.setattr(routes_order, "process_order_upload", fake_process)
+
+    res = client.post("/order", data={
+        "회원명": "이태수",
+        "async": "1",
+        "image": (io.BytesIO(b"fake-image"), "order.jpg"),
+    }, content_type="multipart/form-data")
+
+    assert res.status_code == 202
+    body = res.get_json()
+    assert body["status"] == "accepted"
+    assert body["status_url"] == f"/order/jobs/{body['job_id']}"
+
+    _wait(store, body["job_id"])
+    status = client.get(body["status_url"])
+    data = status.get_json()
+
+    assert status.status_code == 200
+    assert data["status"] == "done"
+    assert data["result"]["추출된_JSON"] == [{"제품명": "노니"}]
+    assert "callback_url" not in data
+    assert calls[0][:2] == ("이태수", [("order.jpg", b"fake-image")])
+    assert calls[0][2].startswith("job")
+
+
+def test_unknown_job_is_404(client, store):
+    res = client.get("/order/jobs/없는작업")
+    assert res.status_code == 404
+    assert res.get_json()["status"] == "error"
+
+
+def test_upload_requires_image(client, store):
+    res = client.post("/order", data={"회원명": "이태수", "async": "1", "dummy": (io.BytesIO(b""), "")},
+                      content_type="multipart/form-data")
+    assert res.status_code == 400
+    assert len(store) == 0
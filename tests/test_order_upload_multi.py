@@ -0,0 +1,217 @@
+import io
+import threading
+import time
+
+import pytest
+
+import parser.parse
+import routes.routes_order as routes_order
+import utils.order_extract as order_extract
+import utils.utils
+from app import app
+from parser import handle_order_save_many
+from utils.order_extract import (
+    expand_upload_items, extract_orders_from_images, merge_extracted_orders,
+)
+
+
+@pytest.fixture
+def client():
+    app.testing = True
+    with app.test_client() as client:
+        yield client
+
+
+class DummyOrderSheet:
+    def __init__(self, rows=None):
+        self.rows = [list(r) for r in (rows or [])]
+        self.insert_calls = 0
+
+    def row_values(self, index):
+        return self.rows[index - 1] if len(self.rows) >= index else []
+
+    def append_row(self, values):
+        self.rows.append(list(values))
+
+    def insert_rows(self, values, row=2):
+        self.insert_calls += 1
+        self.rows[row - 1:row - 1] = [list(v) for v in values]
+
+
+@pytest.fixture
+def order_sheet(monkeypatch):
+    sheet = DummyOrderSheet()
+    monkeypatch.setattr(parser.parse, "get_worksheet", lambda name: sheet)
+    return sheet
+
+
+# -------------------------------
+# 병렬 추출
+# -------------------------------
+def test_extract_keeps_input_order_and_caps_concurrency():
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def extractor(buf):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        data = buf.read()
+        time.sleep(0.05 if data == b"0" else 0.01)
+        with lock:
+            running[0] -= 1
+        return {"orders": [{"제품명": data.decode()}]}
+
+    items = [(f"img{i}", str(i).encode()) for i in range(6)]
+    results = extract_orders_from_images(items, extractor=extractor, max_workers=2, item_timeout=5)
+
+    assert [r.source for r in results] == [name for name, _ in items]
+    assert [r.orders[0]["제품명"] for r in results] == [str(i) for i in range(6)]
+    assert all(r.status == "success" for r in results)
+    assert peak[0] <= 2
+
+
+def test_extract_marks_errors_and_timeouts():
+    release = threading.Event()
+
+    def extractor(buf):
+        data = buf.read()
+        if data == b"slow":
+            release.wait(2)
+        if data == b"bad":
+            return {"error": "OpenAI API 호출 실패"}
+        if data == b"boom":
+            raise RuntimeError("connection reset")
+        return {"orders": [{"제품명": "노니"}]}
+
+    items = [("a", b"ok"), ("b", b"bad"), ("c", b"boom"), ("d", b"slow")]
+    results = extract_orders_from_images(items, extractor=extractor, max_workers=4, item_timeout=0.2)
+    release.set()
+
+    assert [r.status for r in results] == ["success", "error", "error", "timeout"]
+    assert results[1].message == "OpenAI API 호출 실패"
+    assert results[2].message == "connection reset"
+    assert results[3].orders is None
+
+
+def test_merge_removes_cross_page_duplicates():
+    results = extract_orders_from_images(
+        [("p1", b"1"), ("p2", b"2")],
+        extractor=lambda buf: {"orders": {
+            b"1": [{"제품명": "노니", "제품가격": "30,000", "PV": "20"},
+                   {"제품명": "홍삼", "제품가격": "50000", "PV": "40"}],
+            b"2": [{"제품명": "노니 ", "제품가격": "30000원", "PV": "20"},
+                   {"제품명": "비타민", "제품가격": "10000", "PV": "5"}],
+        }[buf.read()]},
+    )
+    merged, duplicates = merge_extracted_orders(results)
+
+    assert [o["제품명"] for o in merged] == ["노니", "홍삼", "비타민"]
+    assert duplicates == 1
+
+
+def test_merge_keeps_repeated_items_on_one_page():
+    noni = {"제품명": "노니", "제품가격": "30000", "PV": "20"}
+    results = extract_orders_from_images(
+        [("p1", b"1"), ("p2", b"2"), ("p3", b"3")],
+        extractor=lambda buf: {"orders": {
+            b"1": [dict(noni), dict(noni)],                  # 같은 제품 2줄
+            b"2": [dict(noni), dict(noni)],                  # 같은 사진 재업로드
+            b"3": [dict(noni), dict(noni), dict(noni)],      # 3줄 → 1줄만 새 주문
+        }[buf.read()]},
+    )
+    merged, duplicates = merge_extracted_orders(results)
+
+    assert len(merged) == 3
+    assert duplicates == 4
+
+
+def test_expand_pdf_pages(monkeypatch):
+    monkeypatch.setattr(order_extract, "pdf_to_images", lambda data: [b"page1", b"page2"])
+    items = expand_upload_items([("a.jpg", b"jpeg"), ("scan.pdf", b"%PDF-1.4 ...")])
+    assert items == [("a.jpg", b"jpeg"), ("scan.pdf#p1", b"page1"), ("scan.pdf#p2", b"page2")]
+
+
+# -------------------------------
+# 일괄 저장
+# -------------------------------
+def test_handle_order_save_many_single_write(order_sheet):
+    orders = [
+        {"주문일자": "2025-01-01", "회원명": "이태수", "제품명": "노니", "제품가격": "30000", "PV": "20"},
+        {"주문일자": "2025-01-01", "회원명": "이태수", "제품명": "홍삼", "제품가격": "", "PV": "40"},
+        {"주문일자": "2025-01-01", "회원명": "이태수", "제품명": "비타민", "제품가격": "10000", "PV": "5"},
+    ]
+    result = handle_order_save_many(orders)
+
+    assert result["status"] == "ok"
+    assert result["saved"] == 2
+    assert [s["제품명"] for s in result["skipped"]] == ["홍삼"]
+    assert [r["status"] for r in result["results"]] == ["ok", "error", "ok"]
+    assert result["results"][2]["latest_order"]["제품명"] == "비타민"
+    assert order_sheet.insert_calls == 1
+    assert order_sheet.rows[0] == parser.parse.ORDER_HEADERS
+    # handle_order_save 를 차례로 호출한 것과 같은 순서 (마지막 주문이 맨 위)
+    assert [r[4] for r in order_sheet.rows[1:]] == ["비타민", "노니"]
+
+
+# -------------------------------
+# POST /order (여러 이미지 + PDF)
+# -------------------------------
+def test_order_upload_many_files(client, order_sheet, monkeypatch):
+    monkeypatch.setattr(order_extract, "pdf_to_images", lambda data: [b"page1", b"page2"])
+    monkeypatch.setattr(routes_order, "get_member_info_by_name",
+                        lambda name: {"회원명": name, "회원번호": "1000002", "휴대폰번호": "010-3333-4444"})
+
+    extracted = {
+        b"photo": {"orders": [{"제품명": "노니", "제품가격": "30,000", "PV": "20"}], "image_stats": {"n": 1}},
+        b"page1": {"orders": [{"제품명": "홍삼", "제품가격": "50000", "PV": "40"}]},
+        b"page2": {"orders": [{"제품명": "노니", "제품가격": "30000", "PV": "20"}]},
+    }
+    monkeypatch.setattr(utils.utils, "extract_order_from_uploaded_image", lambda buf: extracted[buf.read()])
+
+    res = client.post("/order", data={
+        "회원명": "이태수",
+        "image": [(io.BytesIO(b"photo"), "a.jpg"), (io.BytesIO(b"%PDF-1.4"), "scan.pdf")],
+    }, content_type="multipart/form-data")
+
+    data = res.get_json()
+    assert res.status_code == 200
+    assert data["status"] == "success"
+    assert [o["제품명"] for o in data["추출된_JSON"]] == ["노니", "홍삼"]
+    assert data["중복_제거"] == 1
+    assert [p["source"] for p in data["페이지별_결과"]] == ["a.jpg", "scan.pdf#p1", "scan.pdf#p2"]
+    assert [r["status"] for r in data["저장_결과"]] == ["ok", "ok"]      # 주문별 결과 리스트
+    assert [r["latest_order"]["제품명"] for r in data["저장_결과"]] == ["노니", "홍삼"]
+    assert order_sheet.insert_calls == 1
+    assert all(r[2] == "1000002" for r in order_sheet.rows[1:])
+
+
+def test_order_upload_partial_failure(client, order_sheet, monkeypatch):
+    monkeypatch.setattr(routes_order, "get_member_info_by_name", lambda name: {})
+
+    def extractor(buf):
+        data = buf.read()
+        if data == b"blurry":
+            return {"error": "orders 필드가 없습니다"}
+        return {"orders": [{"제품명": "노니", "제품가격": "30000", "PV": "20"}]}
+
+    monkeypatch.setattr(utils.utils, "extract_order_from_uploaded_image", extractor)
+
+    res = client.post("/order", data={
+        "회원명": "이태수",
+        "image": [(io.BytesIO(b"ok"), "a.jpg"), (io.BytesIO(b"blurry"), "b.jpg")],
+    }, content_type="multipart/form-data")
+
+    data = res.get_json()
+    assert data["status"] == "partial"
+    assert [p["status"] for p in data["페이지별_결과"]] == ["success", "error"]
+    assert [r["status"] for r in data["저장_결과"]] == ["ok"]
+
+
+def test_order_upload_too_many_items(client, monkeypatch):
+    monkeypatch.setattr(routes_order, "ORDER_UPLOAD_MAX_ITEMS", 1)
+    res = client.post("/order", data={
+        "회원명": "이태수",
+        "image": [(io.BytesIO(b"a"), "a.jpg"), (io.BytesIO(b"b"), "b.jpg")],
+    }, content_type="multipart/form-data")
+    assert res.status_code == 400
@@ -0,0 +1,218 @@
+import pytest
+
+import routes.routes_order as routes_order
+import utils.http
+import utils.outbox
+import utils.upstream
+from utils.outbox import Outbox, merge_batch
+from utils.upstream import UpstreamClient, UpstreamConfig
+
+
+class RecordingSender:
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.calls = []
+
+    def __call__(self, payload, key):
+        self.calls.append((payload, key))
+        if self.fail_times > 0:
+            self.fail_times -= 1
+            raise RuntimeError("remote down")
+        return {"ok": True}
+
+
+@pytest.fixture
+def sender():
+    return RecordingSender()
+
+
+@pytest.fixture
+def outbox(tmp_path, sender):
+    return Outbox(str(tmp_path / "outbox.sqlite3"),
+                  senders={"memberslist": sender, "impact": RecordingSender()},
+                  max_attempts=3, backoff=10, backoff_max=100)
+
+
+# -------------------------------
+# 등록 / 중복 제거
+# -------------------------------
+def test_enqueue_returns_immediately_and_dedups(outbox, sender):
+    payload = {"회원명": "홍길동", "orders": [{"제품명": "노니"}]}
+    first = outbox.enqueue("memberslist", payload, key="save-1")
+    again = outbox.enqueue("memberslist", dict(payload), key="save-1")
+
+    assert first["duplicate"] is False
+    assert again == {**first, "duplicate": True}
+    assert sender.calls == []
+    assert outbox.stats()["memberslist"]["pending"] == 1
+
+
+def test_same_content_from_separate_saves_is_kept(monkeypatch, outbox):
+    monkeypatch.setattr(utils.outbox, "get_outbox", lambda: outbox)
+    monkeypatch.setattr(utils.outbox, "OUTBOX_ENABLED", True)
+    monkeypatch.setattr(utils.outbox, "IMPACT_ORDER_SYNC_ENABLED", True)
+    monkeypatch.setenv("IMPACT_API_URL", "http://impact.local")
+    orders = [{"제품명": "노니", "제품가격": "45000"}]
+
+    first = utils.outbox.enqueue_impact_orders("홍길동", orders)
+    second = utils.outbox.enqueue_impact_orders("홍길동", orders)          # 같은 제품 재주문
+    retried = utils.outbox.enqueue_impact_orders("홍길동", orders, save_id="s1")
+    again = utils.outbox.enqueue_impact_orders("홍길동", orders, save_id="s1")   # 같은 저장 재시도
+
+    assert not first["duplicate"] and not second["duplicate"] and not retried["duplicate"]
+    assert again["duplicate"] is True
+    assert outbox.stats()["impact"]["pending"] == 3
+
+
+def test_unknown_destination_rejected(outbox):
+    with pytest.raises(ValueError):
+        outbox.enqueue("nowhere", {})
+
+
+def test_same_key_allowed_again_after_dedup_window(tmp_path, sender):
+    box = Outbox(str(tmp_path / "o.sqlite3"), senders={"memberslist": sender}, dedup_window=0)
+    box.enqueue("memberslist", {"orders": []}, key="k")
+    assert box.enqueue("memberslist", {"orders": []}, key="k")["duplicate"] is False
+
+
+# -------------------------------
+# 묶음 전송
+# -------------------------------
+def test_dispatch_batches_per_member(outbox, sender):
+    outbox.enqueue("memberslist", {"회원명": "홍길동", "orders": [{"제품명": "노니"}]})
+    outbox.enqueue("memberslist", {"회원명": "홍길동", "orders": [{"제품명": "비타민"}]})
+    outbox.enqueue("memberslist", {"회원명": "김철수", "orders": [{"제품명": "홍삼"}]})
+
+    report = outbox.dispatch_once()
+
+    assert report["memberslist"] == {"sent": 3, "failed": 0, "dead": 0, "requests": 2}
+    payloads = {p["회원명"]: p["orders"] for p, _ in sender.calls}
+    assert payloads["홍길동"] == [{"제품명": "노니"}, {"제품명": "비타민"}]
+    assert outbox.stats()["memberslist"]["sent"] == 3
+    assert outbox.dispatch_once() == {}
+
+
+def test_merge_batch_key_is_stable():
+    events = [
+        {"id": 1, "idempotency_key": "a", "payload": {"m": 1, "orders": [1]}},
+        {"id": 2, "idempotency_key": "b", "payload": {"m": 1, "orders": [2]}},
+    ]
+    assert merge_batch(events)[0][2] == merge_batch(list(events))[0][2]
+    assert merge_batch(events[:1])[0] == ({"m": 1, "orders": [1]}, [1], "a")
+
+
+def test_retried_batch_keeps_membership_and_key(outbox, sender):
+    sender.fail_times = 1
+    outbox.enqueue("memberslist", {"회원명": "홍길동", "orders": [{"제품명": "노니"}]}, key="a")
+    outbox.enqueue("memberslist", {"회원명": "홍길동", "orders": [{"제품명": "비타민"}]}, key="b")
+    now = 1e10
+    outbox.dispatch_once(now)
+
+    outbox.enqueue("memberslist", {"회원명": "홍길동", "orders": [{"제품명": "홍삼"}]}, key="c")
+    report = outbox.dispatch_once(now + 1000)
+
+    assert report["memberslist"] == {"sent": 3, "failed": 0, "dead": 0, "requests": 2}
+    first_key = sender.calls[0][1]
+    sent = {key: [o["제품명"] for o in p["orders"]] for p, key in sender.calls[1:]}
+    assert sent == {first_key: ["노니", "비타민"], "c": ["홍삼"]}   # 새 이벤트는 재시도 묶음에 섞이지 않음
+
+
+def test_fixed_batch_claimed_whole_beyond_batch_size(tmp_path):
+    sender = RecordingSender(fail_times=1)
+    box = Outbox(str(tmp_path / "o.sqlite3"), senders={"memberslist": sender}, batch_size=3, backoff=10)
+    for i in range(3):
+        box.enqueue("memberslist", {"회원명": "홍길동", "orders": [i]}, key=f"k{i}")
+    box.dispatch_once(1e10)
+    box.batch_size = 1
+
+    assert box.dispatch_once(1e10 + 1000)["memberslist"]["sent"] == 3
+    assert sender.calls[1] == sender.calls[0]
+
+
+# -------------------------------
+# 재시도 / dead
+# -------------------------------
+def test_failed_dispatch_backs_off_then_dies(outbox, sender):
+    sender.fail_times = 10
+    outbox.enqueue("memberslist", {"회원명": "홍길동", "orders": [{"제품명": "노니"}]})
+
+    now = 1e10
+    assert outbox.dispatch_once(now)["memberslist"]["failed"] == 1
+    assert outbox.dispatch_once(now) == {}                 # 백오프 중
+    assert outbox.dispatch_once(now + 200)["memberslist"]["failed"] == 1
+    assert outbox.dispatch_once(now + 400)["memberslist"]["dead"] == 1
+    assert outbox.stats()["memberslist"]["dead"] == 1
+    assert len(sender.calls) == 3
+
+
+def test_existing_db_gains_batch_key_column(tmp_path, sender):
+    import sqlite3
+    path = str(tmp_path / "old.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, destination TEXT NOT NULL, "
+                 "idempotency_key TEXT NOT NULL, payload TEXT NOT NULL, status TEXT NOT NULL DEFAULT 'pending', "
+                 "attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL, locked_until REAL, "
+                 "last_error TEXT, created_at REAL NOT NULL, sent_at REAL)")
+    conn.close()
+
+    box = Outbox(path, senders={"memberslist": sender})
+    box.enqueue("memberslist", {"orders": []})
+    assert box.dispatch_once()["memberslist"]["sent"] == 1
+
+
+def test_expired_lease_is_reclaimed(outbox, sender):
+    outbox.enqueue("memberslist", {"회원명": "홍길동", "orders": []})
+    conn = outbox._connect()
+    outbox._claim(conn, "memberslist", 1e10)             # 전송 도중 프로세스가 죽은 상황
+    conn.close()
+
+    assert outbox.dispatch_once(1e10) == {}
+    assert outbox.dispatch_once(1e10 + outbox.lease + 1)["memberslist"]["sent"] == 1
+
+
+# -------------------------------
+# addOrders / Memberslist 경로 기억
+# -------------------------------
+def test_add_orders_route_queues_instead_of_calling(monkeypatch, outbox, sender):
+    monkeypatch.setattr(routes_order, "get_outbox", lambda: outbox)
+    monkeypatch.setattr(routes_order, "OUTBOX_ENABLED", True)
+
+    result = routes_order.addOrders({"회원명": "홍길동", "orders": [{"제품명": "노니"}]})
+
+    assert result["ok"] is True and result["queued"] is True
+    assert sender.calls == []
+
+
+def test_add_orders_fallback_path_is_remembered(monkeypatch, fake_response):
+    urls = []
+
+    class Session:
+        def request(self, method, url, **kwargs):
+            urls.append(url)
+            return fake_response(404) if url.endswith("/add_orders") else fake_response(200, {"ok": True})
+
+    client = UpstreamClient(UpstreamConfig(name="memberslist"), session=Session())
+    monkeypatch.setitem(utils.upstream.UPSTREAMS, "memberslist", client)
+    monkeypatch.setattr(utils.http, "MEMBERSLIST_API_URL", "http://ml.local/api/add_orders")
+    monkeypatch.setattr(utils.http, "_resolved_add_orders_url", None)
+
+    utils.http.call_memberslist_add_orders({"orders": []}, idempotency_key="k1")
+    utils.http.call_memberslist_add_orders({"orders": []}, idempotency_key="k2")
+
+    assert urls == ["http://ml.local/api/add_orders", "http://ml.local/api/addOrders",
+                    "http://ml.local/api/addOrders"]
+
+
+def test_impact_orders_not_queued_without_url(monkeypatch):
+    monkeypatch.setattr(utils.outbox, "IMPACT_ORDER_SYNC_ENABLED", True)
+    monkeypatch.delenv("IMPACT_API_URL", raising=False)
+    assert utils.outbox.enqueue_impact_orders("홍길동", [{"제품명": "노니"}]) is None
+
+
+def test_impact_order_sync_is_opt_in(monkeypatch, outbox):
+    monkeypatch.setattr(utils.outbox, "get_outbox", lambda: outbox)
+    monkeypatch.setenv("IMPACT_API_URL", "http://impact.local")
+
+    assert utils.outbox.IMPACT_ORDER_SYNC_ENABLED is False          # 기본 꺼짐
+    assert utils.outbox.enqueue_impact_orders("홍길동", [{"제품명": "노니"}]) is None
+    assert outbox.stats()["impact"]["pending"] == 0
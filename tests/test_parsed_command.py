@@ -0,0 +1,95 @@
+import dataclasses
+
+import pytest
+
+import parser.nlu as nlu
+from parser import ParsedCommand, parse_command, clear_parse_cache
+
+
+@pytest.fixture(autouse=True)
+def _fresh_parse_cache():
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+# -------------------------------
+# parse_command 결과
+# -------------------------------
+@pytest.mark.parametrize("text,intent,slots,cleaned", [
+    ("이태수 회원등록", "register_member",
+     {"회원명": "이태수", "raw_text": "이태수 회원등록"}, "이태수 회원등록"),
+    ("회원 검색 이영숙", "search_member",
+     {"회원명": "이영숙", "raw_text": "회원 검색 이영숙"}, "이영숙"),
+    ("이태수 상담일지 검색 중국", "memo_search",
+     {"회원명": "이태수", "일지종류": "상담일지", "keywords": ["중국"],
+      "raw_text": "이태수 상담일지 검색 중국"}, None),
+    ("  알 수 없는 요청문  ", "unknown",
+     {"raw_text": "알 수 없는 요청문"}, None),
+])
+def test_parse_command(text, intent, slots, cleaned):
+    cmd = parse_command(text)
+    assert cmd.intent == intent
+    assert cmd.query_dict() == slots
+    assert cmd.raw_text == text.strip()
+    if cleaned is not None:
+        assert cmd.cleaned_text == cleaned
+
+
+def test_parsed_command_is_immutable():
+    cmd = parse_command("이태수 상담일지 검색 중국")
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cmd.intent = "memo_add"
+    with pytest.raises(TypeError):
+        cmd.slots["회원명"] = "홍길동"
+
+    # query_dict() 는 매번 새 복사본 → 수정해도 원본 영향 없음
+    q = cmd.query_dict()
+    q["회원명"] = "홍길동"
+    q["keywords"].append("일본")
+    assert cmd.slots["회원명"] == "이태수"
+    assert cmd.query_dict()["keywords"] == ["중국"]
+
+
+# -------------------------------
+# NLU 호출 횟수 (요청당 1회)
+# -------------------------------
+def _count_nlu_calls(monkeypatch):
+    calls = []
+    original = nlu.nlu_to_pc_input
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(nlu, "nlu_to_pc_input", counting)
+    return calls
+
+
+def test_known_intent_parses_once(monkeypatch):
+    calls = _count_nlu_calls(monkeypatch)
+    parse_command("이태수 회원등록")
+    assert calls == ["이태수 회원등록"]
+
+
+def test_refine_only_when_cleaned_text_differs(monkeypatch):
+    calls = _count_nlu_calls(monkeypatch)
+    parse_command("알 수 없는 요청문")
+    assert calls == ["알 수 없는 요청문"]
+
+
+def test_get_parsed_command_reuses_request_result(monkeypatch):
+    from flask import Flask, g
+
+    calls = _count_nlu_calls(monkeypatch)
+    app = Flask(__name__)
+    with app.test_request_context("/postIntent", method="POST"):
+        first = nlu.get_parsed_command("이태수 회원등록")
+        second = nlu.get_parsed_command(" 이태수 회원등록 ")
+        assert first is second
+        assert g.parsed_command is first
+        assert isinstance(nlu.current_command(), ParsedCommand)
+
+    assert len(calls) == 1
+    assert nlu.current_command() is None
@@ -0,0 +1,131 @@
+import time
+
+import pytest
+from flask import Flask, jsonify
+
+import utils.profiling as profiling
+import utils.sheets
+from app import app, finish_request_profile, start_request_profile
+from utils.cache import SingleFlight
+from utils.profiling import PROFILES, ProfileStore, RequestProfile, phase, profile_trigger
+from utils.sheets import fetch_sheet
+
+
+class SlowSheet:
+    title = "DB"
+
+    def get_all_records(self):
+        time.sleep(0.05)
+        return [{"회원명": "홍길동"}]
+
+
+@pytest.fixture(autouse=True)
+def clean_profiles():
+    PROFILES.clear()
+    yield
+    PROFILES.clear()
+
+
+# -------------------------------
+# 단계별 시간
+# -------------------------------
+def test_nested_phases_are_exclusive(fake_clock):
+    clock = fake_clock
+    profile = RequestProfile("POST", "/postIntent", "header", use_cprofile=False, clock=clock)
+
+    clock.now += 0.1                 # dispatch
+    profile.enter("parse")
+    clock.now += 0.2
+    profile.exit()
+    profile.enter("sheets")
+    clock.now += 0.5
+    profile.exit()
+    profile.enter("serialize")
+    clock.now += 0.05
+    profile.exit()
+
+    entry = profile.finish(200)
+    assert entry["phases_ms"] == {"parse": 200.0, "sheets": 500.0, "dispatch": 100.0, "serialize": 50.0}
+    assert entry["wall_ms"] == 850.0
+    assert entry["top"] == []
+
+
+def test_phase_outside_profiled_request_is_noop():
+    with app.test_request_context("/member"):
+        with phase("sheets"):
+            pass
+    with phase("sheets"):
+        pass
+
+
+# -------------------------------
+# 트리거 / 보관
+# -------------------------------
+def test_trigger_by_header_or_sample(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_OPEN", False)
+    assert profile_trigger({"X-Profile": "1"}, sample_rate=0) is None     # 기본: 닫힘
+    assert profile_trigger({}, sample_rate=1) == "sample"
+
+    monkeypatch.setattr(profiling, "PROFILE_OPEN", True)
+    assert profile_trigger({"X-Profile": "1"}) == "header"
+    assert profile_trigger({}, sample_rate=0) is None
+
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    assert profile_trigger({"X-Profile": "1"}, sample_rate=0) is None
+    assert profile_trigger({"X-Profile": "secret"}) == "header"
+
+
+def test_store_is_a_ring_buffer_newest_first():
+    store = ProfileStore(size=3)
+    for ms in (10, 2000, 30, 1500):
+        store.add({"wall_ms": ms})
+
+    assert [e["wall_ms"] for e in store.list()] == [1500, 30, 2000]
+    assert [e["wall_ms"] for e in store.list(min_ms=1000)] == [1500, 2000]
+    assert store.get(1) is None
+
+
+# -------------------------------
+# 요청 훅 / 엔드포인트
+# -------------------------------
+def test_profiled_request_records_top_functions_and_sheet_time(monkeypatch):
+    monkeypatch.setattr(profiling, "PROFILE_OPEN", True)
+    monkeypatch.setattr(utils.sheets, "sheet_fetches", SingleFlight())
+    test_app = Flask("profile_test")
+    test_app.before_request(start_request_profile)
+    test_app.after_request(finish_request_profile)
+
+    @test_app.route("/slow", methods=["POST"])
+    def slow():
+        rows = fetch_sheet(SlowSheet())
+        with phase("serialize"):
+            return jsonify(rows)
+
+    client = test_app.test_client()
+    response = client.post("/slow", headers={"X-Profile": "1"})
+    assert client.post("/slow").headers.get("X-Profile-Id") is None
+
+    entry = PROFILES.get(int(response.headers["X-Profile-Id"]))
+    assert entry["trigger"] == "header"
+    assert entry["phases_ms"]["sheets"] >= 50
+    assert entry["wall_ms"] >= sum(entry["phases_ms"].values()) - 0.5
+    assert any("get_all_records" in f["function"] for f in entry["top"])
+    assert entry["top"] == sorted(entry["top"], key=lambda f: f["cumtime_ms"], reverse=True)
+
+
+def test_debug_profiles_lists_slow_requests(monkeypatch):
+    PROFILES.add({"wall_ms": 8000.0, "path": "/postIntent"})
+    PROFILES.add({"wall_ms": 12.0, "path": "/member"})
+
+    client = app.test_client()
+    monkeypatch.setattr(profiling, "PROFILE_OPEN", False)
+    assert client.get("/debug/profiles").status_code == 403
+
+    monkeypatch.setattr(profiling, "PROFILE_OPEN", True)
+    body = client.get("/debug/profiles").get_json()
+    assert [p["path"] for p in body["profiles"]] == ["/postIntent"]
+    assert client.get("/debug/profiles?min_ms=0").get_json()["count"] == 2
+
+    monkeypatch.setattr(profiling, "PROFILE_TOKEN", "secret")
+    assert client.get("/debug/profiles").status_code == 403
+    assert client.get("/debug/profiles?token=secret").status_code == 200
@@ -0,0 +1,147 @@
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+
+import utils.shared_cache as shared_cache
+import utils.sheets
+from utils.shared_cache import SharedCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "shared.sqlite3")
+
+
+# -------------------------------
+# SharedCache
+# -------------------------------
+def test_get_set_and_expiry(cache_path):
+    cache = SharedCache(cache_path)
+    cache.set("k", [{"회원명": "홍길동"}], ttl=60)
+    cache.set("old", 1, ttl=-1)
+
+    assert cache.get("k") == [{"회원명": "홍길동"}]
+    assert cache.get("old") is None
+    assert cache.get("k") is not cache.get("k")      # 조회마다 새 객체
+
+
+def test_value_visible_to_other_instance(cache_path):
+    SharedCache(cache_path).set("k", {"a": 1}, ttl=60)
+    assert SharedCache(cache_path).get("k") == {"a": 1}
+
+
+def test_get_or_load_loads_once(cache_path):
+    cache = SharedCache(cache_path)
+    calls = []
+    loader = lambda: calls.append(1) or ["row"]
+
+    assert cache.get_or_load("sheet:DB", loader, ttl=60) == ["row"]
+    assert cache.get_or_load("sheet:DB", loader, ttl=60) == ["row"]
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_waits_for_worker_holding_lease(cache_path):
+    other = SharedCache(cache_path)
+    assert other._acquire("sheet:DB", time.time())       # 다른 워커가 로딩 중
+
+    cache = SharedCache(cache_path, load_wait=5, poll_interval=0.01)
+    calls = []
+
+    def finish_other():
+        time.sleep(0.1)
+        other.set("sheet:DB", ["from other"], ttl=60)
+        other._release("sheet:DB")
+    threading.Thread(target=finish_other).start()
+
+    assert cache.get_or_load("sheet:DB", lambda: calls.append(1) or ["mine"], ttl=60) == ["from other"]
+    assert calls == []
+    assert cache.stats()["waits"] > 0
+
+
+def test_stale_lease_does_not_block_forever(cache_path):
+    other = SharedCache(cache_path, load_wait=0.05)
+    other._acquire("k", time.time())                    # 로딩하다 죽은 워커
+
+    cache = SharedCache(cache_path, load_wait=0.2, poll_interval=0.01)
+    assert cache.get_or_load("k", lambda: "loaded", ttl=60) == "loaded"
+
+
+def test_invalidate_prefix(cache_path):
+    cache = SharedCache(cache_path)
+    cache.set("sheet:DB", 1, ttl=60)
+    cache.set("sheet:제품주문", 2, ttl=60)
+    cache.set("other", 3, ttl=60)
+
+    cache.invalidate(prefix="sheet:")
+    assert cache.get("sheet:DB") is None and cache.get("sheet:제품주문") is None
+    assert cache.get("other") == 3
+
+
+def _worker_load(path, counter_path, results):
+    cache = SharedCache(path, load_wait=10, poll_interval=0.01)
+
+    def loader():
+        with open(counter_path, "a") as f:
+            f.write("x")
+        time.sleep(0.3)
+        return ["rows"]
+
+    results.put(cache.get_or_load("sheet:DB", loader, ttl=60))
+
+
+def test_workers_share_one_download(cache_path, tmp_path):
+    """워커 프로세스 4개가 동시에 요청해도 시트는 한 번만 내려받음"""
+    counter = str(tmp_path / "loads.txt")
+    SharedCache(cache_path)                              # 스키마 생성
+    ctx = multiprocessing.get_context("fork" if hasattr(os, "fork") else "spawn")
+    results = ctx.Queue()
+    procs = [ctx.Process(target=_worker_load, args=(cache_path, counter, results)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(20)
+
+    assert [results.get(timeout=5) for _ in procs] == [["rows"]] * 4
+    with open(counter) as f:
+        assert f.read() == "x"
+
+
+# -------------------------------
+# 시트 읽기 공유 / 스프레드시트 핸들
+# -------------------------------
+def test_shared_sheet_records_disabled_by_default(monkeypatch):
+    calls = []
+    records = shared_cache.shared_sheet_records("DB", lambda: calls.append(1) or [], ttl=0)
+    shared_cache.shared_sheet_records("DB", lambda: calls.append(1) or [], ttl=0)
+    assert records == [] and len(calls) == 2
+
+
+def test_shared_sheet_records_and_invalidate(monkeypatch, cache_path):
+    monkeypatch.setattr(shared_cache, "_shared_cache", SharedCache(cache_path))
+    monkeypatch.setattr(shared_cache, "SHEET_SHARED_CACHE_TTL", 30)
+    calls = []
+    loader = lambda: calls.append(1) or [{"n": len(calls)}]
+
+    assert shared_cache.shared_sheet_records("DB", loader, ttl=30) == [{"n": 1}]
+    assert shared_cache.shared_sheet_records("DB", loader, ttl=30) == [{"n": 1}]
+    shared_cache.invalidate_sheet("DB")
+    assert shared_cache.shared_sheet_records("DB", loader, ttl=30) == [{"n": 2}]
+
+
+def test_spreadsheet_handle_reused(monkeypatch):
+    opened = []
+    monkeypatch.setattr(utils.sheets, "_open_spreadsheet", lambda: opened.append(1) or object())
+    monkeypatch.setattr(utils.sheets, "_spreadsheet_handle", {"sheet": None, "opened_at": 0.0})
+
+    assert utils.sheets.get_spreadsheet() is utils.sheets.get_spreadsheet()
+    assert len(opened) == 1
+
+
+def test_create_app_returns_flask_app(monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, "OUTBOX_ENABLED", False)
+    assert app_module.create_app() is app_module.app
@@ -0,0 +1,159 @@
+import threading
+import time
+
+import pytest
+
+import utils.sheets
+from app import app, open_sheet_snapshot
+from service.service import delete_member_internal
+from utils.cache import SingleFlight
+from utils.shared_cache import invalidate_sheet
+from utils.sheets import fetch_sheet, get_rows_from_sheet, get_worksheet
+from utils.snapshot import SheetSnapshot, SnapshotWorksheet
+
+
+@pytest.fixture
+def sheets(monkeypatch, fake_sheet):
+    data = {
+        "DB": fake_sheet("DB", ["회원명", "회원번호", "메모"],
+                         [["홍길동", "1000001", ""], ["이태수", "1000002", ""]]),
+        "백업": fake_sheet("백업", ["회원명", "회원번호", "메모"]),
+    }
+    opened = []
+    monkeypatch.setattr(utils.sheets, "open_worksheet", lambda name: opened.append(name) or data[name])
+    data["opened"] = opened
+    return data
+
+
+@pytest.fixture
+def request_scope():
+    with app.test_request_context("/member", method="POST"):
+        open_sheet_snapshot()
+        yield
+
+
+# -------------------------------
+# 요청 단위 읽기 공유
+# -------------------------------
+def test_worksheet_and_reads_are_memoized(sheets, request_scope):
+    ws = get_worksheet("DB")
+    assert isinstance(ws, SnapshotWorksheet)
+    assert get_worksheet("DB") is ws
+
+    assert ws.get_all_records() == get_rows_from_sheet("DB")
+    assert ws.row_values(1) == ["회원명", "회원번호", "메모"]     # 행 데이터의 키에서 헤더 계산
+    ws.get_all_records()
+
+    assert sheets["DB"].reads == 1
+    assert sheets["opened"] == ["DB"]
+
+
+def test_returned_rows_are_copies(sheets, request_scope):
+    rows = get_worksheet("DB").get_all_records()
+    rows[0]["회원명"] = "수정"
+    rows.clear()
+    assert get_worksheet("DB").get_all_records()[0]["회원명"] == "홍길동"
+
+
+def test_no_snapshot_outside_request(sheets):
+    assert get_worksheet("DB") is sheets["DB"]
+
+
+# -------------------------------
+# 요청 안의 쓰기 반영
+# -------------------------------
+def test_writes_are_applied_to_snapshot(sheets, request_scope):
+    ws = get_worksheet("DB")
+    ws.get_all_records()
+    ws.get_all_values()
+
+    ws.insert_row(["김영희", "1000003", ""], 2)
+    ws.update_cell(3, 3, "VIP")                                 # 홍길동 메모
+    ws.delete_rows(4)                                           # 이태수 삭제
+    ws.append_row(["박민수", "1000004", ""])
+
+    records = ws.get_all_records()
+    assert [r["회원명"] for r in records] == ["김영희", "홍길동", "박민수"]
+    assert records[0]["회원번호"] == 1000003                      # get_all_records 와 같은 숫자 변환
+    assert records[1]["메모"] == "VIP"
+    assert ws.get_all_values() == sheets["DB"].grid
+    assert sheets["DB"].reads == 2                               # records 1회 + values 1회
+
+
+def test_unknown_write_drops_cached_sheet(sheets, request_scope):
+    ws = get_worksheet("DB")
+    ws.get_all_records()
+    ws.update("A2", [["바뀜"]])
+
+    assert ws.get_all_records()[0]["회원명"] == "바뀜"
+    assert sheets["DB"].reads == 2
+
+
+def test_header_write_drops_cached_sheet(sheets, request_scope):
+    ws = get_worksheet("DB")
+    ws.get_all_records()
+    ws.update_cell(1, 3, "비고")
+
+    assert "비고" in ws.get_all_records()[0]
+
+
+def test_delete_member_reads_db_once(sheets, request_scope):
+    rows_before = get_rows_from_sheet("DB")
+    body, status = delete_member_internal("홍길동", "")
+
+    assert status == 200, body
+    assert [r["회원명"] for r in get_rows_from_sheet("DB")] == ["이태수"]
+    assert sheets["백업"].grid[1][0] == "홍길동"
+    assert len(rows_before) == 2
+    assert sheets["DB"].reads == 1
+
+
+def test_snapshot_with_custom_loader_still_works():
+    snapshot = SheetSnapshot(loader=lambda name: [{"name": name}])
+    snapshot.seed("상담일지", [])
+    assert snapshot.records("DB") == [{"name": "DB"}]
+    assert snapshot.sheet_names == ["상담일지", "DB"]
+
+
+# -------------------------------
+# 동시 조회 합침 (single-flight)
+# -------------------------------
+def test_concurrent_reads_download_once(monkeypatch, fake_sheet):
+    sheet = fake_sheet("DB", ["회원명"], [["홍길동"]])
+    release, load = threading.Event(), sheet.get_all_records
+
+    def slow_records():
+        release.wait(2)
+        return load()
+
+    sheet.get_all_records = slow_records
+    monkeypatch.setattr(utils.sheets, "sheet_fetches", SingleFlight())
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fetch_sheet(sheet))) for _ in range(10)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+
+    assert sheet.reads == 1
+    assert results == [[{"회원명": "홍길동"}]] * 10
+    assert results[0] is not results[1]                           # 호출부마다 사본
+    assert utils.sheets.sheet_fetch_stats()["coalesced"] == 9
+
+
+def test_fetch_after_write_is_not_coalesced(monkeypatch, fake_sheet):
+    sheet = fake_sheet("DB", ["회원명"], [["홍길동"]])
+    flight = SingleFlight()
+    monkeypatch.setattr(utils.sheets, "sheet_fetches", flight)
+    keys = []
+    real_do = flight.do
+    monkeypatch.setattr(flight, "do", lambda key, fetch: keys.append(key) or real_do(key, fetch))
+
+    fetch_sheet(sheet)
+    invalidate_sheet("DB")
+    fetch_sheet(sheet)
+
+    assert keys[0][:3] == keys[1][:3] and keys[0][3] + 1 == keys[1][3]
@@ -0,0 +1,119 @@
+import pytest
+from flask import Flask, jsonify
+
+import utils.sheets
+from app import attach_request_trace, open_sheet_snapshot, start_request_trace
+from utils.cache import SingleFlight
+from utils.sheets import fetch_sheet, get_worksheet
+import utils.tracing as tracing
+from utils.tracing import RequestTrace, sheet_range, span, trace_requested
+from utils.upstream import UpstreamClient, UpstreamConfig
+
+
+@pytest.fixture
+def traced_app(monkeypatch, fake_sheet, fake_session):
+    monkeypatch.setattr(tracing, "TRACE_ENABLED", False)
+    monkeypatch.setattr(tracing, "TRACE_TOKEN", "secret")
+    sheets = {"DB": fake_sheet("DB", rows=[["홍길동", ""]])}
+    monkeypatch.setattr(utils.sheets, "open_worksheet", lambda name: sheets[name])
+    monkeypatch.setattr(utils.sheets, "sheet_fetches", SingleFlight())
+
+    test_app = Flask("trace_test")
+    test_app.before_request(start_request_trace)
+    test_app.before_request(open_sheet_snapshot)
+    test_app.after_request(attach_request_trace)
+    memberslist = UpstreamClient(UpstreamConfig(name="memberslist"), session=fake_session())
+
+    @test_app.route("/work", methods=["POST"])
+    def work():
+        ws = get_worksheet("DB")
+        ws.get_all_records()
+        ws.update_cell(2, 2, "VIP")
+        fetch_sheet(utils.sheets.open_worksheet("DB"))       # 스냅샷을 거치지 않은 중복 조회
+        memberslist.post("http://memberslist.local/api/orders?x=1", json={})
+        return jsonify({"status": "success"})
+
+    return test_app
+
+
+# -------------------------------
+# 요약 / 범위 표시
+# -------------------------------
+def test_sheet_range_hints():
+    assert sheet_range("update_cell", (3, 5, "x")) == "E3"
+    assert sheet_range("update_cell", (1, 28, "x")) == "AB1"
+    assert sheet_range("delete_rows", (4,)) == "4:4"
+    assert sheet_range("insert_rows", ([[1], [2]], 2)) == "2:3"
+    assert sheet_range("get_all_records", ()) == "all"
+    assert sheet_range("update", ("A2:C3", [[1]])) == "A2:C3"
+    assert sheet_range("batch_clear", ()) == ""
+
+
+def test_summary_marks_duplicates():
+    trace = RequestTrace()
+    t0 = trace.started
+    trace.add("sheets", "get_all_records", "DB!all", t0, t0 + 0.4)
+    trace.add("openai", "POST", "/v1/chat/completions", t0, t0 + 1.2, status=200)
+    trace.add("sheets", "get_all_records", "DB!all", t0, t0 + 0.4)
+
+    assert trace.summary() == (
+        "calls=3; ms=2000.0; sheets.get_all_records[DB!all]x2=800.0ms; "
+        "openai.POST[/v1/chat/completions]=1200.0ms"
+    )
+    assert trace.as_dict()["duplicates"] == {"sheets.get_all_records[DB!all]": 2}
+    assert len(trace.summary(max_length=20)) == 20
+
+
+def test_summary_header_is_ascii():
+    trace = RequestTrace()
+    trace.add("sheets", "get_all_records", "상담일지!all", trace.started, trace.started)
+    trace.summary().encode("latin-1")
+
+
+def test_span_without_trace_is_noop():
+    with span("sheets", "get_all_records", "DB!all"):
+        pass
+
+
+# -------------------------------
+# 요청 훅
+# -------------------------------
+def test_no_trace_without_header(traced_app):
+    response = traced_app.test_client().post("/work", json={})
+    assert "X-Trace" not in response.headers
+    assert "_trace" not in response.get_json()
+
+
+def test_trace_header_needs_token_unless_enabled(monkeypatch):
+    monkeypatch.setattr(tracing, "TRACE_ENABLED", False)
+    monkeypatch.setattr(tracing, "TRACE_TOKEN", "")
+    assert trace_requested({"X-Trace": "body"}) is None
+
+    monkeypatch.setattr(tracing, "TRACE_TOKEN", "secret")
+    assert trace_requested({"X-Trace": "1"}) is None
+    assert trace_requested({"X-Trace": "secret"}) == "header"
+    assert trace_requested({"X-Trace": "secret, body"}) == "body"
+
+    monkeypatch.setattr(tracing, "TRACE_ENABLED", True)
+    assert trace_requested({}) == "header"
+    assert trace_requested({"X-Trace": "body"}) == "body"
+
+
+def test_trace_header_lists_every_outbound_call(traced_app):
+    response = traced_app.test_client().post("/work", json={}, headers={"X-Trace": "secret"})
+    summary = response.headers["X-Trace"]
+
+    assert summary.startswith("calls=4;")
+    assert "sheets.get_all_records[DB!all]x2=" in summary
+    assert "sheets.update_cell[DB!B2]=" in summary
+    assert "memberslist.POST[/api/orders]=" in summary
+
+
+def test_trace_body_adds_trace_field(traced_app):
+    response = traced_app.test_client().post("/work", json={}, headers={"X-Trace": "secret,body"})
+    trace = response.get_json()["_trace"]
+
+    assert trace["calls"] == 4
+    assert trace["duplicates"] == {"sheets.get_all_records[DB!all]": 2}
+    assert [s["kind"] for s in trace["spans"]] == ["sheets", "sheets", "sheets", "memberslist"]
+    assert trace["spans"][-1]["status"] == 200
@@ -0,0 +1,218 @@
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+import utils.upstream as upstream
+from app import app
+from utils.upstream import CircuitBreaker, CircuitOpenError, UpstreamClient, UpstreamConfig
+
+
+@pytest.fixture
+def clock(monkeypatch, fake_clock):
+    monkeypatch.setattr(upstream.time, "monotonic", fake_clock)
+    monkeypatch.setattr(upstream.time, "sleep", lambda s: None)
+    return fake_clock
+
+
+@pytest.fixture
+def make_client(fake_session):
+    def make(*outcomes, **config):
+        defaults = dict(connect_timeout=2.0, read_timeout=10.0, retries=2,
+                        failure_threshold=3, reset_timeout=30.0)
+        return UpstreamClient(UpstreamConfig(name="svc", **{**defaults, **config}),
+                              session=fake_session(*outcomes))
+    return make
+
+
+# -------------------------------
+# 타임아웃 / 재시도
+# -------------------------------
+def test_connect_and_read_timeouts_applied(clock, make_client, fake_response):
+    client = make_client(fake_response())
+    client.post("http://svc.local/a", json={})
+    client.post("http://svc.local/a", json={}, timeout=45)
+
+    assert client.session.calls[0]["timeout"] == (2.0, 10.0)
+    assert client.session.calls[1]["timeout"] == (2.0, 45.0)
+
+
+def test_idempotent_call_retries_transient_failures(clock, make_client, fake_response):
+    client = make_client(requests.ConnectionError("reset"), fake_response(503), fake_response(200, {"ok": 1}))
+    r = client.post("http://svc.local/search", json={}, idempotent=True)
+
+    assert r.json() == {"ok": 1}
+    assert len(client.session.calls) == 3
+    assert client.retried == 2
+
+
+def test_non_idempotent_call_is_not_retried(clock, make_client, fake_response):
+    client = make_client(requests.Timeout("slow"), fake_response(200))
+    with pytest.raises(requests.Timeout):
+        client.post("http://svc.local/add_orders", json={})
+    assert len(client.session.calls) == 1
+
+
+def _refused():
+    """연결 거부 (requests 가 실제로 내는 모양: ConnectionError(MaxRetryError(reason=NewConnectionError)))"""
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.ConnectionError(MaxRetryError(None, "http://svc.local/add_orders", reason))
+
+
+def test_unsent_only_retries_refused_connections_and_429_503(clock, make_client, fake_response):
+    client = make_client(_refused(), requests.ConnectTimeout("connect"), fake_response(503),
+                         fake_response(201), retries=3, failure_threshold=5)
+    r = client.post("http://svc.local/add_orders", json={}, retry_unsent=True)
+
+    assert r.status_code == 201
+    assert len(client.session.calls) == 4
+
+
+@pytest.mark.parametrize("outcome", [
+    requests.ReadTimeout("slow"),
+    requests.ConnectionError("Connection aborted: RemoteDisconnected"),
+    502, 504,
+])
+def test_unsent_does_not_retry_once_request_may_be_stored(clock, make_client, outcome):
+    client = make_client(outcome, 200)
+    if isinstance(outcome, int):
+        assert client.post("http://svc.local/add_orders", json={}, retry_unsent=True).status_code == outcome
+    else:
+        with pytest.raises(type(outcome)):
+            client.post("http://svc.local/add_orders", json={}, retry_unsent=True)
+    assert len(client.session.calls) == 1
+
+
+def test_memberslist_post_sends_key_but_does_not_retry_timeouts(monkeypatch, clock, make_client):
+    import utils.http
+    client = make_client(requests.ReadTimeout("slow"), 200)
+    monkeypatch.setitem(upstream.UPSTREAMS, "memberslist", client)
+    monkeypatch.setattr(utils.http, "MEMBERSLIST_API_URL", "http://ml.local/api/add_orders")
+    monkeypatch.setattr(utils.http, "_resolved_add_orders_url", None)
+
+    with pytest.raises(utils.http.MemberslistError):
+        utils.http.call_memberslist_add_orders({"orders": []}, idempotency_key="k1")
+    assert len(client.session.calls) == 1
+    assert client.session.calls[0]["headers"] == {"Idempotency-Key": "k1"}
+
+
+def test_client_errors_are_not_retried(clock, make_client, fake_response):
+    client = make_client(fake_response(400), fake_response(200))
+    r = client.get("http://svc.local/a")
+    assert r.status_code == 400
+    assert len(client.session.calls) == 1
+    assert client.breaker.state == "closed"
+
+
+def test_retry_backoff_is_jittered_and_capped(monkeypatch, clock, make_client, fake_response):
+    sleeps = []
+    monkeypatch.setattr(upstream.time, "sleep", sleeps.append)
+    client = make_client(fake_response(502), retries=4, backoff=1.0, backoff_max=2.5, failure_threshold=100)
+    client.get("http://svc.local/a")
+
+    assert len(sleeps) == 4
+    assert all(0 <= s <= cap for s, cap in zip(sleeps, (1.0, 2.0, 2.5, 2.5)))
+
+
+# -------------------------------
+# 서킷 브레이커
+# -------------------------------
+def test_circuit_opens_and_fails_fast(clock, make_client):
+    client = make_client(requests.ConnectionError("down"), retries=0)
+    for _ in range(3):
+        with pytest.raises(requests.ConnectionError):
+            client.post("http://svc.local/a")
+
+    with pytest.raises(CircuitOpenError) as e:
+        client.post("http://svc.local/a")
+    assert len(client.session.calls) == 3
+    assert e.value.service == "svc"
+    assert client.health()["state"] == "open"
+    assert client.health()["total_short_circuits"] == 1
+
+
+def test_circuit_open_error_is_request_exception(clock):
+    """기존 except requests.RequestException 처리 그대로 동작"""
+    assert issubclass(CircuitOpenError, requests.RequestException)
+
+
+def test_half_open_trial_closes_or_reopens(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 31
+    assert breaker.state == "half_open"
+    assert breaker.allow() == (True, 0.0)
+    assert breaker.allow()[0] is False          # 시험 요청은 1개만
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now += 31
+    assert breaker.allow()[0] is True
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_half_open_trial_released_on_non_retry_error(clock, make_client, fake_response):
+    client = make_client(requests.ConnectionError("down"), requests.exceptions.ChunkedEncodingError("cut"),
+                     fake_response(200), retries=0, failure_threshold=1)
+    with pytest.raises(requests.ConnectionError):
+        client.post("http://svc.local/a")
+
+    clock.now += 31
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.post("http://svc.local/a")          # 시험 요청 실패 → 다시 open
+    assert client.health()["state"] == "open"
+
+    clock.now += 31
+    assert client.post("http://svc.local/a").status_code == 200
+    assert client.health()["state"] == "closed"
+
+
+def test_half_open_trial_released_on_interrupt(clock, make_client, fake_response):
+    client = make_client(KeyboardInterrupt(), fake_response(200), retries=0, failure_threshold=1)
+    client.breaker.record_failure()
+    clock.now += 31
+    with pytest.raises(KeyboardInterrupt):
+        client.post("http://svc.local/a")
+    assert client.post("http://svc.local/a").status_code == 200
+
+
+def test_config_env_override(monkeypatch):
+    monkeypatch.setenv("UPSTREAM_SVC_READ_TIMEOUT", "7.5")
+    monkeypatch.setenv("UPSTREAM_SVC_RETRIES", "0")
+    config = UpstreamConfig.from_env("svc", read_timeout=30.0, retries=2)
+    assert config.read_timeout == 7.5
+    assert config.retries == 0
+
+
+# -------------------------------
+# 호출부 / 상태 엔드포인트
+# -------------------------------
+def test_call_searchmemo_uses_memberslist_client(monkeypatch, clock, make_client, fake_response):
+    import utils.utils
+    client = make_client(fake_response(502), fake_response(200, {"results": [{"내용": "메모"}]}))
+    monkeypatch.setitem(upstream.UPSTREAMS, "memberslist", client)
+    monkeypatch.setattr(utils.utils, "memo_search_cache", utils.utils.SWRCache(ttl=30))
+
+    assert utils.utils.call_searchMemo({"keywords": ["메모"]}) == [{"내용": "메모"}]
+    assert len(client.session.calls) == 2
+
+
+def test_health_endpoint_reports_open_circuit(monkeypatch, clock, make_client):
+    client = make_client(requests.ConnectionError("down"), retries=0, failure_threshold=1)
+    monkeypatch.setitem(upstream.UPSTREAMS, "impact", client)
+    with pytest.raises(requests.ConnectionError):
+        client.post("http://svc.local/sync")
+
+    app.testing = True
+    with app.test_client() as c:
+        resp = c.get("/health/upstreams")
+
+    data = resp.get_json()
+    assert resp.status_code == 200
+    assert data["status"] == "degraded"
+    assert data["services"]["impact"]["state"] == "open"
+    assert set(data["services"]) >= {"openai", "memberslist", "impact"}
+    assert data["outbox"]["memberslist"]["pending"] == 0
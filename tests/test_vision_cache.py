@@ -0,0 +1,146 @@
+import io
+import json
+import os
+
+import pytest
+from PIL import Image
+
+import utils.sheets
+import utils.utils
+from utils.disk_cache import DiskLRUCache, vision_cache_key
+from utils.upstream import get_upstream
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskLRUCache(str(tmp_path / "vision"), max_bytes=10_000)
+
+
+# -------------------------------
+# DiskLRUCache
+# -------------------------------
+def test_roundtrip_and_stats(cache):
+    key = vision_cache_key(b"img", "prompt", "gpt-4o")
+    assert cache.get(key) is None
+
+    cache.set(key, '{"orders": [{"제품명": "노니"}]}')
+    assert key in cache
+    assert cache.get(key) == '{"orders": [{"제품명": "노니"}]}'
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["files"]) == (1, 1, 1)
+
+
+def test_key_depends_on_image_prompt_and_model():
+    base = vision_cache_key(b"img", "prompt", "gpt-4o")
+    assert base == vision_cache_key(b"img", "prompt", "gpt-4o")
+    assert base != vision_cache_key(b"img2", "prompt", "gpt-4o")
+    assert base != vision_cache_key(b"img", "prompt v2", "gpt-4o")
+    assert base != vision_cache_key(b"img", "prompt", "gpt-4o-mini")
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=2_500)
+    keys = [vision_cache_key(str(i).encode(), "p", "m") for i in range(3)]
+
+    cache.set(keys[0], "a" * 1000)
+    cache.set(keys[1], "b" * 1000)
+    # keys[0] 을 가장 최근 사용으로 (mtime 을 명시적으로 지정해 순서 고정)
+    os.utime(cache._path(keys[1]), ns=(1, 1))
+    assert cache.get(keys[0]) == "a" * 1000
+
+    cache.set(keys[2], "c" * 1000)
+
+    assert keys[0] in cache
+    assert keys[1] not in cache
+    assert keys[2] in cache
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 2_500
+
+
+def test_corrupt_entry_is_miss(cache):
+    key = vision_cache_key(b"img", "prompt", "gpt-4o")
+    cache.set(key, "ok")
+    with open(cache._path(key), "w", encoding="utf-8") as f:
+        f.write("{broken")
+
+    assert cache.get(key, "default") == "default"
+    assert key not in cache
+
+
+# -------------------------------
+# extract_order_from_uploaded_image
+# -------------------------------
+def test_duplicate_upload_skips_vision_call(monkeypatch, cache):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_URL", "http://openai.local/v1/chat/completions")
+    monkeypatch.setattr(utils.utils, "get_vision_cache", lambda: cache)
+    calls = []
+
+    class DummyResponse:
+        status_code = 200
+        def raise_for_status(self):
+            pass
+        def json(self):
+            content = json.dumps({"orders": [{"제품명": "노니"}]}, ensure_ascii=False)
+            return {"choices": [{"message": {"content": content}}]}
+
+    def fake_post(url, headers=None, json=None, **kwargs):
+        calls.append(json)
+        return DummyResponse()
+
+    monkeypatch.setattr(get_upstream("openai").session, "request",
+                        lambda method, url, **kw: fake_post(url, **kw))
+
+    buf = io.BytesIO()
+    Image.effect_noise((400, 300), 40).convert("RGB").save(buf, format="PNG")
+    raw = buf.getvalue()
+
+    first = utils.utils.extract_order_from_uploaded_image(io.BytesIO(raw))
+    second = utils.utils.extract_order_from_uploaded_image(io.BytesIO(raw))
+
+    assert len(calls) == 1
+    assert first["vision_cache"] == "miss"
+    assert second["vision_cache"] == "hit"
+    assert second["orders"] == first["orders"] == [{"제품명": "노니"}]
+
+
+def test_failed_response_not_cached(monkeypatch, cache):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_URL", "http://openai.local/v1/chat/completions")
+    monkeypatch.setattr(utils.utils, "get_vision_cache", lambda: cache)
+
+    class DummyResponse:
+        status_code = 200
+        def raise_for_status(self):
+            pass
+        def json(self):
+            return {"choices": [{"message": {"content": "주문을 찾을 수 없습니다"}}]}
+
+    monkeypatch.setattr(get_upstream("openai").session, "request", lambda *a, **k: DummyResponse())
+
+    result = utils.utils.extract_order_from_uploaded_image(b"not-an-image")
+    assert "error" in result
+    assert cache.stats()["files"] == 0
+
+
+# -------------------------------
+# openai_vision_extract_orders (utils.sheets)
+# -------------------------------
+@pytest.mark.parametrize("content,cached", [
+    ('{"orders": [{"제품명": "노니"}]}', True),
+    ("죄송하지만 이 이미지는 처리할 수 없습니다.", False),     # 거절 응답
+    ('{"orders": [', False),                               # 깨진 JSON
+    ('{"orders": []}', False),                             # 주문 없음
+])
+def test_sheets_vision_caches_only_parsed_orders(monkeypatch, cache, content, cached):
+    monkeypatch.setattr(utils.sheets, "OPENAI_API_KEY", "test")
+    monkeypatch.setattr(utils.sheets, "OPENAI_API_URL", "http://openai.local/v1/chat/completions")
+    monkeypatch.setattr(utils.sheets, "get_vision_cache", lambda: cache)
+    monkeypatch.setattr(utils.sheets, "_request_vision_content", lambda prepared, prompt: content)
+
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 30), "white").save(buf, format="PNG")
+    utils.sheets.openai_vision_extract_orders(io.BytesIO(buf.getvalue()))
+
+    assert cache.stats()["files"] == (1 if cached else 0)
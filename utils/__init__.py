@@ -19,6 +19,9 @@ from .sheets import (
     get_gspread_client, 
     get_spreadsheet, 
     get_worksheet,
+    open_worksheet,
+    fetch_sheet,
+    sheet_fetch_stats,
     get_rows_from_sheet, 
     append_row, 
     update_cell, 
@@ -40,6 +43,106 @@ from .sheets import (
     
 )
 
+# =====================================================
+# cache (프로세스 내 / 디스크 캐시)
+# =====================================================
+from .cache import LRUCache, SWRCache, SingleFlight
+from .disk_cache import DiskLRUCache, get_vision_cache, vision_cache_key
+
+# =====================================================
+# upstream (외부 서비스 공용 클라이언트 / 서킷 브레이커)
+# =====================================================
+from .upstream import (
+    UpstreamConfig, UpstreamClient, CircuitBreaker, CircuitOpenError,
+    get_upstream, upstream_health,
+)
+
+# =====================================================
+# log (레벨/샘플링 로깅)
+# =====================================================
+from .log import configure_logging, get_logger, debug_sampled, LazyJson, JsonFormatter
+
+# =====================================================
+# metrics (Prometheus 지표)
+# =====================================================
+from .metrics import (
+    Counter, Histogram, MetricsRegistry, METRICS,
+    record_openai_usage, render_metrics, metrics_snapshot,
+)
+
+# =====================================================
+# profiling (요청 프로파일링)
+# =====================================================
+from .profiling import RequestProfile, ProfileStore, PROFILES, phase, active_profile, top_functions
+
+# =====================================================
+# tracing (요청별 외부 호출 추적)
+# =====================================================
+from .tracing import RequestTrace, active_trace, span, sheet_span, record_span
+
+# =====================================================
+# outbox (외부 동기화 아웃박스)
+# =====================================================
+from .outbox import Outbox, get_outbox, stop_outbox, enqueue_impact_orders
+
+# =====================================================
+# shared_cache (워커 프로세스 공유 캐시)
+# =====================================================
+from .shared_cache import SharedCache, get_shared_cache, shared_sheet_records, invalidate_sheet
+
+# =====================================================
+# hot_sheets (자주 읽는 시트 백그라운드 갱신)
+# =====================================================
+from .hot_sheets import (
+    HotSheetCache, start_hot_sheet_refresher, stop_hot_sheet_refresher,
+    get_hot_sheets, hot_sheet_records,
+)
+
+# =====================================================
+# aio (asyncio 서빙 / 시트 동시 읽기)
+# =====================================================
+from .aio import (
+    SheetPrefetchMiddleware,
+    gather_sheet_records, prefetch_snapshot,
+)
+
+# =====================================================
+# snapshot (요청 단위 시트 스냅샷 / 쓰기 배치)
+# =====================================================
+from .snapshot import (
+    SheetSnapshot, SheetWriteBatch, SnapshotWorksheet,
+    active_snapshot, active_write_batch, sheet_batch_scope,
+)
+
+# =====================================================
+# dispatch (intent 핸들러 호출 규칙)
+# =====================================================
+from .dispatch import (
+    IntentHandler, IntentBindingError,
+    build_intent_registry, get_intent_handler,
+)
+
+# =====================================================
+# image (비전 모델 전송용 이미지 전처리)
+# =====================================================
+from .image import PreparedImage, prepare_image_for_vision
+
+# =====================================================
+# ocr (로컬 OCR → Vision 단계별 주문 추출)
+# =====================================================
+from .ocr import (
+    OCRUnavailable, TieredOrderExtractor,
+    ocr_image, parse_receipt_text, get_order_extractor,
+)
+
+# =====================================================
+# order_extract (여러 이미지/PDF 주문 병렬 추출)
+# =====================================================
+from .order_extract import (
+    ExtractionResult,
+    expand_upload_items, extract_orders_from_images, merge_extracted_orders,
+)
+
 # =====================================================
 # utils (날짜/문자열/검색/메모/GPT/실행)
 # =====================================================
@@ -56,7 +159,7 @@ from .utils import (
     normalize_query, fallback_natural_search,
     search_members, find_all_members_from_sheet,
     parse_natural_query, searchMemberByNaturalText,
-    search_member, find_member_in_text,
+    search_member, find_member_in_text, match_member_name,
     # 메모
     get_memo_results, format_memo_results,
     filter_results_by_member, handle_search_memo,
@@ -86,7 +189,8 @@ __all__ = [
     "call_memberslist_add_orders", "call_impact_sync",
 
     # sheets
-    "get_sheet","get_gspread_client", "get_spreadsheet", "get_worksheet",
+    "get_sheet","get_gspread_client", "get_spreadsheet", "get_worksheet", "open_worksheet",
+    "fetch_sheet", "sheet_fetch_stats",
     "get_rows_from_sheet", "append_row", "update_cell", "delete_row",
     "safe_update_cell", "header_maps",
     "get_db_sheet", "get_member_sheet", "get_product_order_sheet",
@@ -96,6 +200,59 @@ __all__ = [
     "get_member_info", "get_gsheet_data",
     "openai_vision_extract_orders",
 
+    # cache
+    "LRUCache", "SWRCache", "SingleFlight", "DiskLRUCache", "get_vision_cache", "vision_cache_key",
+
+    # upstream
+    "UpstreamConfig", "UpstreamClient", "CircuitBreaker", "CircuitOpenError",
+    "get_upstream", "upstream_health",
+
+    # log
+    "configure_logging", "get_logger", "debug_sampled", "LazyJson", "JsonFormatter",
+
+    # metrics
+    "Counter", "Histogram", "MetricsRegistry", "METRICS",
+    "record_openai_usage", "render_metrics", "metrics_snapshot",
+
+    # profiling
+    "RequestProfile", "ProfileStore", "PROFILES", "phase", "active_profile", "top_functions",
+
+    # tracing
+    "RequestTrace", "active_trace", "span", "sheet_span", "record_span",
+
+    # outbox
+    "Outbox", "get_outbox", "stop_outbox", "enqueue_impact_orders",
+
+    # shared_cache
+    "SharedCache", "get_shared_cache", "shared_sheet_records", "invalidate_sheet",
+
+    # hot_sheets
+    "HotSheetCache", "start_hot_sheet_refresher", "stop_hot_sheet_refresher",
+    "get_hot_sheets", "hot_sheet_records",
+
+    # aio
+    "SheetPrefetchMiddleware",
+    "gather_sheet_records", "prefetch_snapshot",
+
+    # image
+    "PreparedImage", "prepare_image_for_vision",
+
+    # ocr
+    "OCRUnavailable", "TieredOrderExtractor",
+    "ocr_image", "parse_receipt_text", "get_order_extractor",
+
+    # order_extract
+    "ExtractionResult",
+    "expand_upload_items", "extract_orders_from_images", "merge_extracted_orders",
+
+    # snapshot
+    "SheetSnapshot", "SheetWriteBatch", "SnapshotWorksheet",
+    "active_snapshot", "active_write_batch", "sheet_batch_scope",
+
+    # dispatch
+    "IntentHandler", "IntentBindingError",
+    "build_intent_registry", "get_intent_handler",
+
     # utils
     "now_kst", "process_order_date", "parse_dt",
     "remove_josa", "remove_spaces", "split_to_parts",
@@ -106,7 +263,7 @@ __all__ = [
     "normalize_query", "fallback_natural_search",
     "search_members", "find_all_members_from_sheet",
     "parse_natural_query", "searchMemberByNaturalText",
-    "search_member", "find_member_in_text",
+    "search_member", "find_member_in_text", "match_member_name",
     "get_memo_results", "format_memo_results",
     "filter_results_by_member", "handle_search_memo",
     "call_searchMemo", "call_searchMemoFromText",
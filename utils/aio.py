@@ -0,0 +1,176 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import json
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.snapshot import PREFETCH_ENVIRON_KEY, SheetSnapshot, _default_loader
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+ASGI_THREADS = int(os.getenv("ASGI_THREADS", "32"))                 # Flask 핸들러 실행 스레드 수 (= 동시 처리 상한)
+ASGI_PREFETCH_LIMIT = int(os.getenv("ASGI_PREFETCH_LIMIT", "4"))    # 요청당 동시 시트 다운로드 수
+ASGI_PREFETCH_MAX_BODY = int(os.getenv("ASGI_PREFETCH_MAX_BODY", str(64 * 1024)))   # 미리 읽기 판단용 본문 최대 크기
+
+
+# ======================================================================================
+# ✅ 시트 동시 읽기
+# ======================================================================================
+async def gather_sheet_records(sheet_names: Iterable[str],
+                               loader: Optional[Callable[[str], List[Dict[str, Any]]]] = None,
+                               limit: int = ASGI_PREFETCH_LIMIT) -> Dict[str, Any]:
+    """
+    여러 시트의 get_all_records() 를 동시에 내려받기 → {시트명: 행 리스트 또는 예외}
+    - gspread 는 동기 라이브러리 → 시트마다 스레드에서 실행, limit 개까지 동시
+    - 실패한 시트는 예외 객체로 돌려줌 (호출부에서 건너뛰고 필요하면 다시 읽음)
+    """
+    names = list(dict.fromkeys(sheet_names))
+    loader = loader or _default_loader
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def load(name: str):
+        async with semaphore:
+            return await asyncio.to_thread(loader, name)
+
+    results = await asyncio.gather(*(load(n) for n in names), return_exceptions=True)
+    return dict(zip(names, results))
+
+
+async def prefetch_snapshot(sheet_names: Iterable[str],
+                            loader: Optional[Callable[[str], List[Dict[str, Any]]]] = None,
+                            limit: int = ASGI_PREFETCH_LIMIT) -> SheetSnapshot:
+    """시트들을 동시에 내려받아 채워 둔 SheetSnapshot (실패한 시트는 비워 둠 → 읽을 때 다시 시도)"""
+    snapshot = SheetSnapshot(loader)
+    for name, records in (await gather_sheet_records(sheet_names, loader, limit)).items():
+        if isinstance(records, BaseException):
+            logger.warning("시트 미리 읽기 실패 → 핸들러에서 다시 읽음: %s (%s)", name, records)
+            continue
+        snapshot.seed(name, records)
+    return snapshot
+
+
+# ======================================================================================
+# ✅ ASGI 서빙 (WSGI → ASGI 변환은 a2wsgi, 여기서는 시트 미리 읽기만)
+# ======================================================================================
+# (scope, 요청 본문) → 미리 읽을 시트 이름 목록
+PrefetchRule = Callable[[Dict[str, Any], bytes], Iterable[str]]
+
+
+def _attach_prefetched(wsgi_app: Callable) -> Callable:
+    """scope 에 실어 보낸 미리 읽은 스냅샷 → environ[PREFETCH_ENVIRON_KEY] (a2wsgi 는 scope 를 environ["asgi.scope"] 로 전달)"""
+    def app(environ, start_response):
+        snapshot = (environ.get("asgi.scope") or {}).get(PREFETCH_ENVIRON_KEY)
+        if snapshot is not None:
+            environ[PREFETCH_ENVIRON_KEY] = snapshot
+        return wsgi_app(environ, start_response)
+    return app
+
+
+class SheetPrefetchMiddleware:
+    """
+    Flask(WSGI) 앱을 asyncio 서버(uvicorn 등)에서 실행
+
+    - WSGI → ASGI 변환은 a2wsgi.WSGIMiddleware (핸들러는 threads 개짜리 스레드 풀에서 실행)
+      ⚠️ 워커 1개가 동시에 처리하는 요청은 최대 threads 개 (기본 ASGI_THREADS=32, gthread 32스레드와 같은 상한)
+         핸들러 안의 시트 / OpenAI / Memberslist 호출은 모두 동기 → 스레드를 붙잡은 채 대기
+    - prefetch 규칙이 시트 목록을 돌려주면 핸들러 실행 전에 asyncio.gather 로 동시에 내려받아
+      environ[PREFETCH_ENVIRON_KEY] 로 전달 (app.before_request 에서 요청 스냅샷으로 연결)
+      · JSON 본문이고 max_prefetch_body 이하인 요청만 미리 읽어 봄 (업로드 등은 그대로 통과)
+    - lifespan shutdown 때 on_shutdown 함수들 호출 (워커 백그라운드 스레드 정리)
+    """
+
+    def __init__(self, wsgi_app: Callable, prefetch: Optional[PrefetchRule] = None,
+                 threads: int = ASGI_THREADS, max_prefetch_body: int = ASGI_PREFETCH_MAX_BODY,
+                 prefetch_loader: Optional[Callable[[str], List[Dict[str, Any]]]] = None,
+                 on_shutdown: Iterable[Callable[[], None]] = ()):
+        try:
+            from a2wsgi import WSGIMiddleware
+        except ImportError as e:
+            raise RuntimeError("ASGI 서빙(asgi.py)에는 a2wsgi 패키지가 필요합니다.") from e
+        self.app = WSGIMiddleware(_attach_prefetched(wsgi_app), workers=threads)
+        self.prefetch = prefetch
+        self.prefetch_loader = prefetch_loader
+        self.max_prefetch_body = max_prefetch_body
+        self.on_shutdown = list(on_shutdown)
+        self.prefetched = 0
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable[[], Awaitable[dict]],
+                       send: Callable[[dict], Awaitable[None]]) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] == "http" and self.prefetch and _is_json_post(scope):
+            scope, receive = await self._prefetch(scope, receive)
+        await self.app(scope, receive, send)
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for hook in self.on_shutdown:
+                    try:
+                        await asyncio.to_thread(hook)
+                    except Exception:
+                        logger.exception("종료 처리 실패: %s", getattr(hook, "__name__", hook))
+                self.app.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _prefetch(self, scope, receive):
+        """
+        본문을 (max_prefetch_body 까지) 먼저 받아 prefetch 규칙 적용 → (scope, 받은 메시지를 다시 돌려주는 receive)
+        - 본문이 더 크거나 도중에 끊기면 미리 읽지 않고 그대로 넘김
+        """
+        messages: List[dict] = []
+        size = 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            size += len(message.get("body", b""))
+            if not message.get("more_body", False) or size > self.max_prefetch_body:
+                break
+
+        last = messages[-1]
+        if last["type"] == "http.request" and not last.get("more_body", False) and size <= self.max_prefetch_body:
+            body = b"".join(m.get("body", b"") for m in messages)
+            sheet_names = list(self.prefetch(scope, body) or [])
+            if sheet_names:
+                snapshot = await prefetch_snapshot(sheet_names, self.prefetch_loader)
+                scope = {**scope, PREFETCH_ENVIRON_KEY: snapshot}
+                self.prefetched += 1
+
+        async def replay() -> dict:
+            return messages.pop(0) if messages else await receive()
+
+        return scope, replay
+
+
+def _is_json_post(scope: Dict[str, Any]) -> bool:
+    if scope.get("method") != "POST":
+        return False
+    for name, value in scope.get("headers", []):
+        if name.lower() == b"content-type":
+            return value.split(b";", 1)[0].strip().lower() == b"application/json"
+    return False
+
+
+def json_body(body: bytes) -> Optional[Dict[str, Any]]:
+    """요청 본문이 JSON 객체면 dict, 아니면 None (prefetch 규칙용)"""
+    try:
+        data = json.loads(body) if body else None
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
@@ -0,0 +1,253 @@
+# =================================================
+# 표준 라이브러리
+# =================================================
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+# ======================================================================================
+# ✅ 스레드 안전 LRU 캐시
+# ======================================================================================
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    크기 제한이 있는 스레드 안전 LRU 캐시
+
+    - maxsize 초과 시 가장 오래 사용되지 않은 항목부터 제거
+    - get_or_set(): 값 계산은 락 밖에서 수행 (느린 계산이 다른 스레드를 막지 않음)
+    - 값은 그대로 보관하므로, 공유해도 안전한 불변 객체를 넣어야 함
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize <= 0:
+            raise ValueError("maxsize는 1 이상이어야 합니다.")
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """캐시에 있으면 반환, 없으면 factory() 결과를 저장 후 반환"""
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = factory()
+        self.set(key, value)
+        return value
+
+    def pop(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        with self._lock:
+            return self._data.pop(key, default)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """hits / misses / size / maxsize"""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+
+
+# ======================================================================================
+# ✅ TTL + stale-while-revalidate + single-flight 캐시
+# ======================================================================================
+class _InFlight:
+    """진행 중인 조회 1건 (같은 키 요청들이 결과를 함께 기다림)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SWRCache:
+    """
+    원격 조회 결과 캐시
+
+    - ttl 안: 캐시 값 그대로 반환 (hit)
+    - ttl ~ ttl + stale_ttl: 이전 값을 바로 반환하고 백그라운드 스레드에서 갱신 (stale)
+    - 그 이후/없음: 조회 후 저장 (miss)
+    - 같은 키를 동시에 조회하면 한 번만 호출하고 나머지는 그 결과를 기다림 (coalesced)
+    - 조회 실패는 저장하지 않음 (기다리던 요청에도 같은 예외 전달)
+    - 값은 그대로 보관하므로, 호출부에서 수정할 값이면 복사해서 써야 함
+    """
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0, maxsize: int = 256,
+                 clock: Callable[[], float] = time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("maxsize는 1 이상이어야 합니다.")
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.maxsize = maxsize
+        self._clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "stale": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "errors": 0}
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (value, self._clock())
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _run(self, key: Hashable, call: _InFlight, fetch: Callable[[], Any]) -> None:
+        try:
+            call.value = fetch()
+        except BaseException as e:
+            call.error = e
+        with self._lock:
+            current = self._inflight.get(key) is call   # invalidate 뒤면 결과를 저장하지 않음
+            if call.error is not None:
+                self._stats["errors"] += 1
+            elif current:
+                self._store(key, call.value)
+            if current:
+                self._inflight.pop(key, None)
+        call.done.set()
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            age = self._clock() - entry[1] if entry else None
+
+            if entry and age < self.ttl:
+                self._data.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+
+            if entry and age < self.ttl + self.stale_ttl:
+                self._data.move_to_end(key)
+                self._stats["stale"] += 1
+                if key not in self._inflight:
+                    self._stats["refreshes"] += 1
+                    call = self._inflight[key] = _InFlight()
+                    threading.Thread(target=self._run, args=(key, call, fetch),
+                                     name="swr-refresh", daemon=True).start()
+                return entry[0]
+
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InFlight()
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if leader:
+            self._run(key, call, fetch)
+        else:
+            call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """
+        key 하나 또는 전체 삭제
+        - 진행 중 조회도 떼어 냄 → 그 결과는 기다리던 요청에만 전달되고 저장되지 않음
+          (쓰기 전에 시작된 조회가 쓰기 뒤에 옛 값을 다시 채우지 않도록)
+        """
+        with self._lock:
+            if key is None:
+                self._data.clear()
+                self._inflight.clear()
+            else:
+                self._data.pop(key, None)
+                self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, int]:
+        """hits / stale / misses / coalesced / refreshes / errors / size / maxsize"""
+        with self._lock:
+            return {**self._stats, "size": len(self._data), "maxsize": self.maxsize}
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ======================================================================================
+# ✅ single-flight (동시에 들어온 같은 조회를 1회로 합침)
+# ======================================================================================
+class SingleFlight:
+    """
+    같은 key 로 동시에 들어온 호출은 먼저 온 1건만 실행하고 나머지는 그 결과를 함께 받음
+
+    - 결과를 보관하지 않음 (진행 중인 호출끼리만 공유) → 끝난 뒤 호출은 다시 실행
+    - 실패하면 기다리던 호출에도 같은 예외 전달
+    - 결과 객체는 공유되므로, 수정할 값이면 호출부에서 복사해서 써야 함
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "fetches": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InFlight()
+                self._stats["fetches"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if leader:
+            try:
+                call.value = fetch()
+            except BaseException as e:
+                call.error = e
+            with self._lock:
+                if call.error is not None:
+                    self._stats["errors"] += 1
+                self._inflight.pop(key, None)
+            call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return call.value
+
+    def stats(self) -> Dict[str, int]:
+        """calls / fetches / coalesced / errors / in_flight"""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._inflight)}
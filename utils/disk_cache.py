@@ -0,0 +1,194 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+VISION_CACHE_ENABLED = os.getenv("VISION_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+VISION_CACHE_DIR = os.getenv(
+    "VISION_CACHE_DIR", os.path.join(tempfile.gettempdir(), "members_vision_cache")
+)
+VISION_CACHE_MAX_MB = float(os.getenv("VISION_CACHE_MAX_MB", "100"))   # 디스크 사용 상한
+
+# 캐시 항목 형식이 바뀌면 올려서 기존 항목 무효화
+VISION_CACHE_VERSION = "v1"
+
+
+# ======================================================================================
+# ✅ 디스크 LRU 캐시 (콘텐츠 주소 기반)
+# ======================================================================================
+class DiskLRUCache:
+    """
+    key(sha256 hex) → JSON 값을 파일로 보관하는 캐시
+
+    - 파일 경로: <directory>/<key 앞 2자리>/<key>.json
+    - 조회 성공 시 mtime 갱신 → mtime 이 곧 마지막 사용 시각
+    - 총 용량이 max_bytes 를 넘으면 mtime 이 오래된 파일부터 삭제 (LRU)
+    - 쓰기는 임시 파일 + os.replace → 여러 워커 프로세스가 같은 디렉터리를 써도 안전
+    """
+
+    def __init__(self, directory: str, max_bytes: int):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes는 1 이상이어야 합니다.")
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self._lock = threading.Lock()
+        self._total_bytes: Optional[int] = None   # 첫 쓰기 시 디렉터리 스캔으로 계산
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _scan(self) -> List[Tuple[int, int, str]]:
+        """(mtime_ns, size, path) 목록"""
+        entries = []
+        if not os.path.isdir(self.directory):
+            return entries
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except FileNotFoundError:
+                    continue   # 다른 프로세스가 먼저 삭제
+                entries.append((st.st_mtime_ns, st.st_size, path))
+        return entries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path, ns=(time.time_ns(), time.time_ns()))
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return default
+        except (OSError, ValueError):
+            # 깨진 파일 → 지우고 miss 처리
+            self._remove(path)
+            with self._lock:
+                self.misses += 1
+            return default
+
+        with self._lock:
+            self.hits += 1
+        return entry.get("value", default)
+
+    def set(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        data = json.dumps(
+            {"key": key, "created_at": time.time(), "value": value},
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            try:
+                previous = os.path.getsize(path)
+            except OSError:
+                previous = 0
+            os.replace(tmp_path, path)
+        except Exception:
+            self._remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._total_bytes += len(data) - previous
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """오래 사용되지 않은 파일부터 삭제 (락 안에서 호출)"""
+        entries = sorted(self._scan())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if self._remove(path):
+                self.evictions += 1
+            total -= size
+        self._total_bytes = total
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, _, path in self._scan():
+                self._remove(path)
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """hits / misses / evictions / files / bytes / max_bytes"""
+        entries = self._scan()
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "files": len(entries),
+                "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+            }
+
+
+# ======================================================================================
+# ✅ 비전 추출 결과 캐시
+# ======================================================================================
+def vision_cache_key(image_data: bytes, prompt: str, model: str) -> str:
+    """전처리된 이미지 bytes + 프롬프트 + 모델 → sha256 hex"""
+    h = hashlib.sha256()
+    for part in (VISION_CACHE_VERSION.encode(), model.encode("utf-8"), prompt.encode("utf-8")):
+        h.update(part)
+        h.update(b"\0")
+    h.update(image_data)
+    return h.hexdigest()
+
+
+_vision_cache: Optional[DiskLRUCache] = None
+_vision_cache_lock = threading.Lock()
+
+
+def get_vision_cache() -> Optional[DiskLRUCache]:
+    """프로세스 공용 비전 캐시 (VISION_CACHE_ENABLED=0 이면 None)"""
+    global _vision_cache
+    if not VISION_CACHE_ENABLED:
+        return None
+    if _vision_cache is None:
+        with _vision_cache_lock:
+            if _vision_cache is None:
+                _vision_cache = DiskLRUCache(
+                    VISION_CACHE_DIR, int(VISION_CACHE_MAX_MB * 1024 * 1024)
+                )
+    return _vision_cache
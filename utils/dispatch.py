@@ -0,0 +1,106 @@
+# =================================================
+# 표준 라이브러리
+# =================================================
+import inspect
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from utils.cache import LRUCache
+
+
+# ======================================================================================
+# ✅ intent 핸들러 호출 규칙 (시그니처는 등록 시 1회만 분석)
+# ======================================================================================
+class IntentBindingError(TypeError):
+    """핸들러 시그니처에 (query, options) 호출 규칙을 적용할 수 없을 때"""
+
+
+class IntentHandler:
+    """
+    intent 핸들러 + 미리 계산된 호출 방식
+
+    - arity 0  → func()
+    - arity 1  → func(query)
+    - arity 2  → func(query, options)
+    - arity -1 → func(query, options, **extra)   (*args / **kwargs 함수)
+
+    기존 run_intent_func 의 규칙과 동일하되, inspect.signature 는 생성 시 1회만 호출
+    """
+
+    __slots__ = ("intent", "func", "arity", "_call")
+
+    def __init__(self, func: Callable, intent: Optional[str] = None):
+        self.func = func
+        self.intent = intent or getattr(func, "__name__", repr(func))
+        self.arity = _resolve_arity(func, self.intent)
+
+        if self.arity == 0:
+            self._call = lambda query, options, extra: func()
+        elif self.arity == 1:
+            self._call = lambda query, options, extra: func(query)
+        elif self.arity == 2:
+            self._call = lambda query, options, extra: func(query, options)
+        else:
+            self._call = lambda query, options, extra: func(query, options, **extra)
+
+    def __call__(self, query: Any = None, options: Any = None, **extra_kwargs) -> Any:
+        return self._call(query, options, extra_kwargs)
+
+    def __repr__(self) -> str:
+        return f"IntentHandler(intent={self.intent!r}, arity={self.arity})"
+
+
+def _resolve_arity(func: Callable, intent: str) -> int:
+    """시그니처 분석 → 호출 방식 결정, 바인딩 불가능하면 IntentBindingError"""
+    if not callable(func):
+        raise IntentBindingError(f"❌ intent '{intent}' 핸들러가 호출 가능한 객체가 아닙니다: {func!r}")
+
+    try:
+        sig = inspect.signature(func)
+    except (TypeError, ValueError) as e:
+        raise IntentBindingError(f"❌ intent '{intent}' 시그니처 분석 실패: {e}") from e
+
+    params = sig.parameters
+    has_var = any(
+        p.kind in (inspect.Parameter.VAR_POSITIONAL, inspect.Parameter.VAR_KEYWORD)
+        for p in params.values()
+    )
+
+    if len(params) == 0:
+        arity = 0
+    elif len(params) == 1 and not has_var:
+        arity = 1
+    elif not has_var:
+        arity = 2
+    else:
+        arity = -1
+
+    # ✅ 실제 호출 형태로 바인딩 가능한지 확인 (필수 인자 3개 이상, keyword-only 필수 인자 등)
+    args = {0: (), 1: (None,), 2: (None, None), -1: (None, None)}[arity]
+    try:
+        sig.bind(*args)
+    except TypeError as e:
+        raise IntentBindingError(
+            f"❌ intent '{intent}' 핸들러 {getattr(func, '__name__', func)}{sig} 를 "
+            f"{len(args)}개 인자로 호출할 수 없습니다: {e}"
+        ) from e
+
+    return arity
+
+
+def build_intent_registry(intent_map: Mapping[str, Callable]) -> Dict[str, IntentHandler]:
+    """
+    INTENT_MAP(intent → 함수) → intent → IntentHandler
+    - 모듈 import 시 1회 실행, 하나라도 바인딩 불가면 즉시 IntentBindingError
+    """
+    return {intent: IntentHandler(func, intent) for intent, func in intent_map.items()}
+
+
+# 레지스트리 밖 임의 함수용 (run_intent_func) 호출 방식 캐시
+_HANDLER_CACHE = LRUCache(maxsize=256)
+
+
+def get_intent_handler(func: Callable) -> IntentHandler:
+    """함수별 IntentHandler (캐시, 같은 함수는 시그니처 재분석 없음)"""
+    if isinstance(func, IntentHandler):
+        return func
+    return _HANDLER_CACHE.get_or_set(func, lambda: IntentHandler(func))
@@ -0,0 +1,218 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.shared_cache import sheet_version
+from utils.log import get_logger
+from utils.metrics import BACKOFFS
+
+logger = get_logger(__name__)
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+HOT_SHEETS = [s.strip() for s in os.getenv("HOT_SHEETS", "DB,상담일지,제품주문").split(",") if s.strip()]
+# 미리 내려받은 행을 그대로 쓰는 시간(초), 0 이면 사용 안 함
+HOT_SHEET_TTL = float(os.getenv("HOT_SHEET_TTL", "0"))
+HOT_SHEET_STALE_TTL = float(os.getenv("HOT_SHEET_STALE_TTL", "120"))      # TTL 이후 갱신 중에도 쓰는 시간(초)
+HOT_SHEET_REFRESH_AHEAD = float(os.getenv("HOT_SHEET_REFRESH_AHEAD", "0.8"))   # TTL 의 몇 % 에서 미리 갱신
+HOT_SHEET_BACKOFF = float(os.getenv("HOT_SHEET_BACKOFF", "5"))
+HOT_SHEET_BACKOFF_MAX = float(os.getenv("HOT_SHEET_BACKOFF_MAX", "300"))
+
+
+def _default_loader(sheet_name: str) -> List[Dict[str, Any]]:
+    from utils.sheets import open_worksheet, fetch_sheet   # 순환 import 방지
+    return fetch_sheet(open_worksheet(sheet_name))
+
+
+def is_quota_error(e: BaseException) -> bool:
+    """Google Sheets 읽기 할당량 초과(429 / RESOURCE_EXHAUSTED) 여부"""
+    status = getattr(getattr(e, "response", None), "status_code", None)
+    text = str(e).lower()
+    return status == 429 or "429" in text or "quota" in text or "resource_exhausted" in text
+
+
+# ======================================================================================
+# ✅ 자주 읽는 시트 백그라운드 갱신
+# ======================================================================================
+class HotSheetCache:
+    """
+    자주 읽는 시트(DB, 상담일지, 제품주문 …)의 get_all_records() 를 백그라운드 스레드가 미리 갱신
+
+    - ttl 안: 보관 중인 행 사본 반환 (요청이 시트 다운로드를 기다리지 않음)
+    - ttl * refresh_ahead 가 지나면 만료 전에 미리 갱신
+    - ttl ~ ttl + stale_ttl: 이전 행을 그대로 쓰고 갱신 스레드를 깨움 (stale-while-revalidate)
+    - 그 이후 / 이 프로세스에서 시트를 고친 뒤(sheet_version 변경): None → 호출부에서 직접 읽음
+    - 읽기 할당량 초과(429)면 갱신을 backoff 초 쉬고, 연속되면 2배씩 (최대 backoff_max)
+    ⚠️ 다른 워커/사람이 고친 내용은 최대 ttl + stale_ttl 동안 보이지 않을 수 있음
+    """
+
+    def __init__(self, sheets: Iterable[str] = HOT_SHEETS, ttl: float = HOT_SHEET_TTL,
+                 stale_ttl: float = HOT_SHEET_STALE_TTL, refresh_ahead: float = HOT_SHEET_REFRESH_AHEAD,
+                 backoff: float = HOT_SHEET_BACKOFF, backoff_max: float = HOT_SHEET_BACKOFF_MAX,
+                 loader: Optional[Callable[[str], List[Dict[str, Any]]]] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.sheets = list(dict.fromkeys(sheets))
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_ahead = refresh_ahead
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self._loader = loader or _default_loader
+        self._clock = clock
+        # 시트명 → (행, 내려받은 시각, 내려받기 시작 시점의 sheet_version)
+        self._entries: Dict[str, Tuple[List[Dict[str, Any]], float, int]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._paused_until = 0.0
+        self._current_backoff = 0.0
+        self._stats = {"hits": 0, "stale": 0, "misses": 0, "refreshes": 0, "errors": 0, "quota_backoffs": 0}
+
+    # ---------------- 조회 ----------------
+    def get(self, sheet_name: str) -> Optional[List[Dict[str, Any]]]:
+        if sheet_name not in self.sheets:
+            return None
+        with self._lock:
+            entry = self._entries.get(sheet_name)
+            if entry is None or entry[2] != sheet_version(sheet_name):
+                self._stats["misses"] += 1
+                self._wake.set()
+                return None
+            records, fetched_at, _ = entry
+            age = self._clock() - fetched_at
+            if age < self.ttl:
+                self._stats["hits"] += 1
+            elif age < self.ttl + self.stale_ttl:
+                self._stats["stale"] += 1
+                self._wake.set()
+            else:
+                self._stats["misses"] += 1
+                self._wake.set()
+                return None
+        return [dict(r) for r in records]
+
+    # ---------------- 갱신 ----------------
+    def _due_in(self, sheet_name: str, now: float) -> float:
+        """다음 갱신까지 남은 시간(초), 0 이하면 지금 갱신"""
+        entry = self._entries.get(sheet_name)
+        if entry is None or entry[2] != sheet_version(sheet_name):
+            return 0.0
+        return entry[1] + self.ttl * self.refresh_ahead - now
+
+    def refresh(self, sheet_name: str) -> None:
+        version = sheet_version(sheet_name)
+        records = self._loader(sheet_name)
+        with self._lock:
+            self._entries[sheet_name] = (records, self._clock(), version)
+            self._stats["refreshes"] += 1
+
+    def refresh_due(self) -> float:
+        """갱신할 때가 된 시트를 갱신 → 다음 확인까지 기다릴 시간(초)"""
+        now = self._clock()
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        for name in self.sheets:
+            if self._stop.is_set():
+                break
+            if self._due_in(name, self._clock()) > 0:
+                continue
+            try:
+                self.refresh(name)
+                self._current_backoff = 0.0
+            except Exception as e:
+                with self._lock:
+                    self._stats["errors"] += 1
+                    if is_quota_error(e):
+                        self._stats["quota_backoffs"] += 1
+                if is_quota_error(e):
+                    # 할당량 부족 → 연속될수록 2배씩 쉼
+                    self._current_backoff = min(self.backoff_max, (self._current_backoff * 2) or self.backoff)
+                    logger.warning("읽기 할당량 초과 → %.0f초 쉼", self._current_backoff)
+                    BACKOFFS.inc(source="hot_sheets")
+                    pause = self._current_backoff
+                else:
+                    logger.warning("'%s' 갱신 실패: %s", name, e)
+                    pause = self.backoff
+                # 쉬는 동안에는 요청이 깨워도 다시 시도하지 않음
+                self._paused_until = self._clock() + pause
+                return pause
+
+        now = self._clock()
+        waits = [self._due_in(name, now) for name in self.sheets]
+        return max(1.0, min(waits) if waits else self.ttl)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            wait = self.refresh_due()
+            self._wake.wait(timeout=wait)
+            self._wake.clear()
+
+    def start(self) -> "HotSheetCache":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="hot-sheets", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def stats(self) -> Dict[str, Any]:
+        now = self._clock()
+        with self._lock:
+            ages = {name: round(now - entry[1], 1) for name, entry in self._entries.items()}
+            return {**self._stats, "running": self.running, "ages": ages,
+                    "paused_for": max(0.0, round(self._paused_until - now, 1))}
+
+
+_hot_sheets: Optional[HotSheetCache] = None
+_hot_sheets_lock = threading.Lock()
+
+
+def start_hot_sheet_refresher(**kwargs) -> Optional[HotSheetCache]:
+    """백그라운드 갱신 시작 (HOT_SHEET_TTL <= 0 이면 시작하지 않고 None)"""
+    global _hot_sheets
+    kwargs.setdefault("ttl", HOT_SHEET_TTL)
+    if kwargs["ttl"] <= 0:
+        return None
+    with _hot_sheets_lock:
+        if _hot_sheets is None:
+            _hot_sheets = HotSheetCache(**kwargs)
+        return _hot_sheets.start()
+
+
+def stop_hot_sheet_refresher() -> None:
+    global _hot_sheets
+    with _hot_sheets_lock:
+        if _hot_sheets is not None:
+            _hot_sheets.stop()
+            _hot_sheets = None
+
+
+def get_hot_sheets() -> Optional[HotSheetCache]:
+    """실행 중인 HotSheetCache (시작하지 않았으면 None)"""
+    return _hot_sheets
+
+
+def hot_sheet_records(sheet_name: str) -> Optional[List[Dict[str, Any]]]:
+    """백그라운드로 갱신 중인 시트면 행 사본, 아니면 None (호출부에서 직접 읽음)"""
+    hot = _hot_sheets
+    return hot.get(sheet_name) if hot is not None else None
@@ -7,10 +7,11 @@ import os
 import requests
 from typing import Any, Dict, Optional
 
+from utils.upstream import get_upstream
+
 # ==========================================================
 # 환경변수 설정
 # ==========================================================
-DEFAULT_TIMEOUT = int(os.getenv("HTTP_DEFAULT_TIMEOUT", "30"))
 MEMBERSLIST_API_URL = os.getenv("MEMBERSLIST_API_URL")
 IMPACT_API_URL = os.getenv("IMPACT_API_URL")
 
@@ -28,76 +29,93 @@ class ImpactError(Exception):
 # ==========================================================
 # 내부 유틸
 # ==========================================================
-def _normalize_timeout(t: Optional[int]) -> int:
-    """타임아웃 정규화"""
-    try:
-        return int(t) if t is not None else DEFAULT_TIMEOUT
-    except Exception:
-        return DEFAULT_TIMEOUT
-
 def _ensure_json_payload(payload: Any) -> Dict[str, Any]:
     """payload가 dict인지 확인"""
     if isinstance(payload, dict):
         return payload
     raise MemberslistError(f"payload는 dict여야 합니다. (got: {type(payload).__name__})")
 
-def _post_json(url: str, payload: Dict[str, Any], timeout: Optional[int] = None) -> Dict[str, Any]:
-    """POST JSON 요청"""
+def _post_json(url: str, payload: Dict[str, Any], timeout: Optional[int] = None,
+               idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    POST JSON 요청 (timeout 미지정 시 memberslist 기본 connect/read 타임아웃)
+    - idempotency_key 가 있으면 Idempotency-Key 헤더로 보냄
+    - 원격이 Idempotency-Key 를 지원하는지 확인되지 않음 → 처리 전 실패(연결 실패, 429/503)만 재시도
+    """
     p = _ensure_json_payload(payload)
-    to = _normalize_timeout(timeout)
-    r = requests.post(url, json=p, timeout=to)
+    headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
+    r = get_upstream("memberslist").post(url, json=p, timeout=timeout, headers=headers,
+                                         retry_unsent=True)
     r.raise_for_status()
     try:
         return r.json()
     except ValueError:
         return {"ok": True, "raw": r.text}
 
+
+def _add_orders_fallback(url: str) -> Optional[str]:
+    """add_orders <-> addOrders 반대 경로 (해당 없으면 None)"""
+    if url.endswith("/add_orders"):
+        return url[:-len("/add_orders")] + "/addOrders"
+    if url.endswith("/addOrders"):
+        return url[:-len("/addOrders")] + "/add_orders"
+    return None
+
+
+# 404 폴백으로 확인된 실제 경로 (매 호출마다 404 를 다시 거치지 않도록 기억)
+_resolved_add_orders_url: Optional[str] = None
+
 # ==========================================================
 # 외부 API 호출
 # ==========================================================
-def call_memberslist_add_orders(payload: Dict[str, Any], timeout: Optional[int] = None) -> Dict[str, Any]:
+def call_memberslist_add_orders(payload: Dict[str, Any], timeout: Optional[int] = None,
+                                idempotency_key: Optional[str] = None) -> Dict[str, Any]:
     """
     멤버리스트 API로 주문 데이터 전송
     - 기본 URL(환경변수 MEMBERSLIST_API_URL)에 먼저 요청
     - 404 발생 시 add_orders <-> addOrders 경로 자동 변환 후 재시도
+    - 폴백 경로가 성공하면 프로세스 안에서 기억해 다음부터 바로 사용
     """
+    global _resolved_add_orders_url
     if not MEMBERSLIST_API_URL:
         raise MemberslistError("MEMBERSLIST_API_URL 미설정")
 
-    url = MEMBERSLIST_API_URL.rstrip("/")
+    url = _resolved_add_orders_url or MEMBERSLIST_API_URL.rstrip("/")
     try:
-        return _post_json(url, payload, timeout)
+        try:
+            return _post_json(url, payload, timeout, idempotency_key)
+        except requests.HTTPError as e:
+            fallback = _add_orders_fallback(url)
+            if getattr(e.response, "status_code", None) != 404:
+                raise
+            if not fallback:
+                raise MemberslistError(f"404 Not Found: {url}") from e
+            result = _post_json(fallback, payload, timeout, idempotency_key)
+            _resolved_add_orders_url = fallback
+            return result
     except requests.HTTPError as e:
         status = getattr(e.response, "status_code", None)
-        if status == 404:
-            if url.endswith("/add_orders"):
-                fallback = url[:-len("/add_orders")] + "/addOrders"
-            elif url.endswith("/addOrders"):
-                fallback = url[:-len("/addOrders")] + "/add_orders"
-            else:
-                raise MemberslistError(f"404 Not Found: {url}") from e
-            return _post_json(fallback, payload, timeout)
-
         detail = getattr(e.response, "text", str(e))
         raise MemberslistError(f"Memberslist HTTPError: {status} | {detail}") from e
     except requests.RequestException as e:
         raise MemberslistError(f"Memberslist RequestException: {e}") from e
 
 
-def call_impact_sync(payload: dict):
+def call_impact_sync(payload: dict, idempotency_key: Optional[str] = None):
     """
     Impact API로 데이터 동기화
     - 기본 URL: IMPACT_API_URL (예: /sync)
     - payload 예시: {"type": "order", "member": "...", "orders": [...], "source": "sheet_gpt"}
+    - idempotency_key 가 있으면 Idempotency-Key 헤더로 보냄 (재시도는 _post_json 과 같이 처리 전 실패만)
     """
     if not IMPACT_API_URL:
         raise ImpactError("IMPACT_API_URL 미설정")
 
+    headers = {"Idempotency-Key": idempotency_key} if idempotency_key else None
     try:
-        r = requests.post(IMPACT_API_URL, json=payload, timeout=30)
+        r = get_upstream("impact").post(IMPACT_API_URL, json=payload, headers=headers,
+                                        retry_unsent=True)
         r.raise_for_status()
         return r.json()
     except requests.RequestException as e:
         raise ImpactError(f"임팩트 API 요청 실패: {str(e)}")
-
-
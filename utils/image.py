@@ -0,0 +1,191 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import io
+import os
+import base64
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+# =====================================================
+# 외부 라이브러리
+# =====================================================
+from PIL import Image, ImageChops, ImageOps, ImageStat, UnidentifiedImageError
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+VISION_MAX_EDGE = int(os.getenv("VISION_MAX_EDGE", "1600"))          # 긴 변 최대 픽셀
+VISION_IMAGE_FORMAT = os.getenv("VISION_IMAGE_FORMAT", "jpeg").lower()  # jpeg | webp
+VISION_IMAGE_QUALITY = int(os.getenv("VISION_IMAGE_QUALITY", "82"))
+VISION_GRAYSCALE = os.getenv("VISION_GRAYSCALE", "auto").lower()    # auto | 1 | 0
+VISION_TIMEOUT = float(os.getenv("VISION_TIMEOUT", "60"))           # 비전 모델 호출 타임아웃(초)
+
+# 채널 간 평균 차이가 이 값 이하면 사실상 흑백 (스크린샷/주문서 스캔)
+GRAYSCALE_CHROMA_THRESHOLD = 6.0
+
+_FORMATS = {
+    "jpeg": ("JPEG", "image/jpeg"),
+    "jpg": ("JPEG", "image/jpeg"),
+    "webp": ("WEBP", "image/webp"),
+}
+_MIME_BY_PIL_FORMAT = {
+    "JPEG": "image/jpeg", "PNG": "image/png", "WEBP": "image/webp", "GIF": "image/gif",
+}
+
+
+# ======================================================================================
+# ✅ 비전 모델 전송용 이미지 전처리
+# ======================================================================================
+@dataclass(frozen=True)
+class PreparedImage:
+    """전처리된 이미지 + 전송에 필요한 정보"""
+    data: bytes
+    mime_type: str
+    original_bytes: int
+    width: int = 0
+    height: int = 0
+    grayscale: bool = False
+    reencoded: bool = False
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.original_bytes - len(self.data)
+
+    def to_base64(self) -> str:
+        return base64.b64encode(self.data).decode("utf-8")
+
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.to_base64()}"
+
+    def stats(self) -> Dict[str, Any]:
+        """요청별 절감량 리포트"""
+        ratio = (self.saved_bytes / self.original_bytes) if self.original_bytes else 0.0
+        return {
+            "original_bytes": self.original_bytes,
+            "sent_bytes": len(self.data),
+            "saved_bytes": self.saved_bytes,
+            "saved_ratio": round(ratio, 3),
+            "mime_type": self.mime_type,
+            "size": [self.width, self.height],
+            "grayscale": self.grayscale,
+            "reencoded": self.reencoded,
+        }
+
+
+def read_image_bytes(image: Union[bytes, bytearray, io.BytesIO, Any]) -> bytes:
+    """bytes / BytesIO / 업로드 파일(FileStorage 등) → bytes"""
+    if isinstance(image, (bytes, bytearray)):
+        return bytes(image)
+    if hasattr(image, "getvalue"):
+        return image.getvalue()
+    if hasattr(image, "read"):
+        if hasattr(image, "seek"):
+            image.seek(0)
+        return image.read()
+    raise TypeError(f"지원하지 않는 이미지 입력 형식: {type(image)}")
+
+
+def sniff_mime_type(data: bytes) -> str:
+    """파일 시그니처로 MIME 추정 (모르면 image/jpeg)"""
+    if data.startswith(b"\x89PNG"):
+        return "image/png"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "image/jpeg"
+
+
+def _is_effectively_grayscale(img: Image.Image) -> bool:
+    """작은 썸네일에서 픽셀별 채널 차이 평균으로 흑백 여부 판단"""
+    if img.mode in ("L", "LA", "1"):
+        return True
+    r, g_, b = img.convert("RGB").resize((64, 64)).split()
+    rg = ImageStat.Stat(ImageChops.difference(r, g_)).mean[0]
+    gb = ImageStat.Stat(ImageChops.difference(g_, b)).mean[0]
+    return max(rg, gb) <= GRAYSCALE_CHROMA_THRESHOLD
+
+
+def prepare_image_for_vision(image,
+                             max_edge: Optional[int] = None,
+                             fmt: Optional[str] = None,
+                             quality: Optional[int] = None,
+                             grayscale: Optional[Union[bool, str]] = None) -> PreparedImage:
+    """
+    업로드 이미지 → 비전 모델 전송용으로 축소/재인코딩
+
+    1. EXIF 회전 정보 반영 (휴대폰 사진이 눕는 문제)
+    2. 흑백 변환 (grayscale="auto" 면 색이 거의 없는 이미지만)
+    3. 긴 변을 max_edge 이하로 축소
+    4. JPEG/WebP 재인코딩 (품질 지정), MIME 타입 정확히 표기
+
+    - 재인코딩 결과가 원본보다 크고 축소/회전도 없었다면 원본 그대로 전송
+    - 이미지로 열 수 없으면 원본 bytes + 시그니처 기반 MIME 으로 전송
+    """
+    raw = read_image_bytes(image)
+    max_edge = max_edge or VISION_MAX_EDGE
+    pil_format, mime_type = _FORMATS.get((fmt or VISION_IMAGE_FORMAT).lower(), _FORMATS["jpeg"])
+    quality = quality or VISION_IMAGE_QUALITY
+    grayscale = VISION_GRAYSCALE if grayscale is None else grayscale
+
+    try:
+        src = Image.open(io.BytesIO(raw))
+        src.load()
+    except (UnidentifiedImageError, OSError):
+        return PreparedImage(data=raw, mime_type=sniff_mime_type(raw), original_bytes=len(raw))
+
+    original_format = src.format
+    rotated = _has_orientation(src)
+    img = ImageOps.exif_transpose(src)
+
+    # ✅ 흑백 변환
+    if grayscale in (True, "1", "true", "yes"):
+        to_gray = True
+    elif grayscale == "auto":
+        to_gray = _is_effectively_grayscale(img)
+    else:
+        to_gray = False
+
+    if to_gray:
+        img = img.convert("L")
+    elif img.mode not in ("RGB", "L"):
+        # 투명 배경은 흰색으로 합성 (JPEG 는 알파 미지원)
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[-1])
+        img = background
+
+    # ✅ 축소
+    resized = max(img.size) > max_edge
+    if resized:
+        img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+    out = io.BytesIO()
+    save_kwargs = {"quality": quality}
+    if pil_format == "JPEG":
+        save_kwargs.update(optimize=True, progressive=True)
+    else:
+        save_kwargs.update(method=4)
+    img.save(out, format=pil_format, **save_kwargs)
+    encoded = out.getvalue()
+
+    if len(encoded) >= len(raw) and not resized and not rotated and original_format in _MIME_BY_PIL_FORMAT:
+        # 이미 충분히 작은 원본 → 그대로 (MIME 만 정확히)
+        return PreparedImage(
+            data=raw, mime_type=_MIME_BY_PIL_FORMAT[original_format], original_bytes=len(raw),
+            width=src.width, height=src.height,
+        )
+
+    return PreparedImage(
+        data=encoded, mime_type=mime_type, original_bytes=len(raw),
+        width=img.width, height=img.height, grayscale=to_gray, reencoded=True,
+    )
+
+
+def _has_orientation(img: Image.Image) -> bool:
+    """EXIF Orientation 태그가 기본값(1)이 아닌지"""
+    try:
+        return img.getexif().get(0x0112, 1) != 1
+    except Exception:
+        return False
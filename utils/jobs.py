@@ -0,0 +1,282 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import ipaddress
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+# =====================================================
+# 외부 라이브러리
+# =====================================================
+import urllib3
+from requests.certs import where as ca_bundle
+
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+ORDER_JOB_WORKERS = int(os.getenv("ORDER_JOB_WORKERS", "2"))        # 백그라운드 작업 스레드 수
+ORDER_JOB_TTL = int(os.getenv("ORDER_JOB_TTL", "3600"))             # 완료 작업 보관 시간(초)
+ORDER_JOB_MAX = int(os.getenv("ORDER_JOB_MAX", "500"))              # 보관 작업 최대 개수
+# 워커 프로세스들이 함께 쓰는 작업 상태 DB (같은 서버의 모든 gunicorn 워커가 같은 파일 사용)
+ORDER_JOB_DB_PATH = os.getenv(
+    "ORDER_JOB_DB_PATH", os.path.join(tempfile.gettempdir(), "members_jobs.sqlite3")
+)
+JOB_CALLBACK_TIMEOUT = float(os.getenv("JOB_CALLBACK_TIMEOUT", "10"))
+# 완료 콜백을 보낼 수 있는 호스트 (쉼표 구분, 비어 있으면 callback_url 사용 불가)
+JOB_CALLBACK_ALLOWED_HOSTS = [
+    h.strip().lower() for h in os.getenv("JOB_CALLBACK_ALLOWED_HOSTS", "").split(",") if h.strip()
+]
+
+FINISHED_STATES = ("done", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id      TEXT PRIMARY KEY,
+    status      TEXT NOT NULL,
+    data        TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_finished ON jobs (status, finished_at);
+"""
+
+
+# ======================================================================================
+# ✅ 완료 콜백 주소 검사
+# ======================================================================================
+def resolve_callback_url(url: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    callback_url 검사 + 주소 확정 → (거부 사유, 접속할 IP) (통과하면 거부 사유 None)
+    - http / https 만
+    - 호스트가 JOB_CALLBACK_ALLOWED_HOSTS 에 있어야 함
+    - 호스트가 사설 / 루프백 / 링크로컬 / 멀티캐스트 등 공인 아닌 주소로 풀리면 거부
+    """
+    try:
+        parsed = urlparse(url)
+        port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    except ValueError:
+        return "callback_url 형식이 올바르지 않습니다.", None
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return "callback_url 은 http(s) 주소만 가능합니다.", None
+
+    host = parsed.hostname.lower()
+    if host not in JOB_CALLBACK_ALLOWED_HOSTS:
+        return f"허용되지 않은 callback_url 호스트: {host}", None
+
+    try:
+        infos = socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+    except OSError:
+        return f"callback_url 호스트를 찾을 수 없습니다: {host}", None
+    addresses = [ipaddress.ip_address(info[4][0].split("%")[0]) for info in infos]
+    for ip in addresses:
+        if not ip.is_global or ip.is_multicast:
+            return f"내부 주소로는 콜백을 보낼 수 없습니다: {host} ({ip})", None
+    if not addresses:
+        return f"callback_url 호스트를 찾을 수 없습니다: {host}", None
+    return None, str(addresses[0])
+
+
+def check_callback_url(url: str) -> Optional[str]:
+    """callback_url 검사 → 거부 사유 (통과하면 None)"""
+    return resolve_callback_url(url)[0]
+
+
+def post_callback(url: str, ip: str, payload: Dict[str, Any], timeout: float) -> int:
+    """
+    검사한 IP 로 직접 접속해 JSON POST → HTTP 상태 코드
+    - 이름을 다시 조회하지 않음 (검사 후 DNS 가 내부 주소로 바뀌는 rebinding 차단)
+    - Host 헤더 / TLS SNI / 인증서 확인은 원래 호스트 이름 기준
+    - 리다이렉트는 따라가지 않음
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname
+    port = parsed.port or (443 if parsed.scheme == "https" else 80)
+    name = f"[{host}]" if ":" in host else host          # IPv6 리터럴
+    host_header = name if port == (443 if parsed.scheme == "https" else 80) else f"{name}:{port}"
+    path = (parsed.path or "/") + (f"?{parsed.query}" if parsed.query else "")
+
+    if parsed.scheme == "https":
+        pool = urllib3.HTTPSConnectionPool(ip, port, timeout=timeout, server_hostname=host,
+                                           assert_hostname=host, cert_reqs="CERT_REQUIRED",
+                                           ca_certs=ca_bundle())
+    else:
+        pool = urllib3.HTTPConnectionPool(ip, port, timeout=timeout)
+    try:
+        response = pool.urlopen(
+            "POST", path,
+            body=json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8"),
+            headers={"Host": host_header, "Content-Type": "application/json"},
+            redirect=False, retries=False,
+        )
+        return response.status
+    finally:
+        pool.close()
+
+
+# ======================================================================================
+# ✅ 백그라운드 작업 저장소 (작업 id → 상태/결과)
+# ======================================================================================
+class JobStore:
+    """
+    오래 걸리는 작업을 스레드 풀에서 실행하고 상태를 SQLite 에 보관
+
+    - submit(): 즉시 작업 id 반환 (queued → running → done / failed)
+    - get(): 폴링용 상태 조회 (결과 dict 의 status 가 "error" 면 failed)
+      · 상태는 SQLite 파일(path)에 저장 → 다른 워커 프로세스에 제출된 작업도 조회 가능
+      · 실행은 제출한 프로세스의 스레드 풀 (그 워커가 도중에 교체되면 running 으로 남음)
+    - callback_url 지정 시 완료 후 작업 상태를 JSON 으로 POST (실패해도 작업 결과에는 영향 없음)
+      · 보내기 직전에 다시 검사하고 그때 확인한 IP 로 접속 (post_callback), 리다이렉트는 따라가지 않음
+    - 완료 후 ttl 이 지났거나 max_jobs 를 넘으면 오래된 완료 작업부터 삭제
+    """
+
+    def __init__(self, max_workers: int = ORDER_JOB_WORKERS, ttl: int = ORDER_JOB_TTL,
+                 max_jobs: int = ORDER_JOB_MAX, path: str = ORDER_JOB_DB_PATH):
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._local = threading.local()
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드별 연결 (fork 뒤에는 새로 연결)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def submit(self, kind: str, func: Callable[..., Any], *args,
+               callback_url: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        job_id = uuid.uuid4().hex
+        job = {
+            "job_id": job_id,
+            "kind": kind,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "callback_url": callback_url,
+        }
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._purge(conn)
+            conn.execute(
+                "INSERT INTO jobs (job_id, status, data, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, job["status"], _dumps(job), job["created_at"]),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        return self.get(job_id)
+
+    def _run(self, job_id: str, func: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        self._update(job_id, status="running", started_at=time.time())
+        try:
+            result = func(*args, **kwargs)
+            failed = isinstance(result, dict) and result.get("status") == "error"
+            self._update(job_id, status="failed" if failed else "done", result=result,
+                         finished_at=time.time())
+        except Exception as e:
+            logger.exception("작업 실패: %s (%s)", job_id, e)
+            self._update(job_id, status="failed", error=str(e), finished_at=time.time())
+
+        job = self.get(job_id)
+        if job and job.get("callback_url"):
+            self._notify(job)
+
+    def _notify(self, job: Dict[str, Any]) -> None:
+        url = job["callback_url"]
+        payload = {k: v for k, v in job.items() if k != "callback_url"}
+        rejected, ip = resolve_callback_url(url)
+        if rejected:
+            self._update(job["job_id"], callback={"status": "rejected", "message": rejected})
+            return
+        try:
+            outcome = {"status": "sent", "http_status": post_callback(url, ip, payload, JOB_CALLBACK_TIMEOUT)}
+        except Exception as e:
+            outcome = {"status": "error", "message": str(e)}
+        self._update(job["job_id"], callback=outcome)
+
+    def _update(self, job_id: str, **fields) -> None:
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row:
+                job = {**json.loads(row[0]), **fields}
+                conn.execute(
+                    "UPDATE jobs SET status = ?, data = ?, finished_at = ? WHERE job_id = ?",
+                    (job["status"], _dumps(job), job["finished_at"], job_id),
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 사본 (없거나 만료되면 None)"""
+        row = self._conn().execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        """만료/초과 완료 작업 정리 (트랜잭션 안에서 호출)"""
+        placeholders = ",".join("?" * len(FINISHED_STATES))
+        conn.execute(
+            f"DELETE FROM jobs WHERE status IN ({placeholders}) AND finished_at < ?",
+            (*FINISHED_STATES, time.time() - self.ttl),
+        )
+        total = conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        if total >= self.max_jobs:
+            conn.execute(
+                f"DELETE FROM jobs WHERE job_id IN (SELECT job_id FROM jobs WHERE status IN ({placeholders}) "
+                "ORDER BY finished_at LIMIT ?)",
+                (*FINISHED_STATES, total - self.max_jobs + 1),
+            )
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+def _dumps(job: Dict[str, Any]) -> str:
+    return json.dumps(job, ensure_ascii=False, default=str)
+
+
+_job_store: Optional[JobStore] = None
+_job_store_lock = threading.Lock()
+
+
+def get_job_store() -> JobStore:
+    """프로세스 공용 JobStore (첫 사용 시 생성, 상태 DB 는 워커 간 공유)"""
+    global _job_store
+    if _job_store is None:
+        with _job_store_lock:
+            if _job_store is None:
+                _job_store = JobStore()
+    return _job_store
@@ -0,0 +1,100 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import sys
+import json
+import random
+import logging
+import threading
+from typing import Any, Optional
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()          # text | json
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.01"))  # 행 단위 debug 로그 샘플링 비율
+
+# 레벨을 적용할 최상위 패키지 (모듈 로거는 getLogger(__name__) → 이 아래에 속함)
+LOG_PACKAGES = ("app", "asgi", "routes", "parser", "service", "utils")
+
+_TEXT_FORMAT = "[%(asctime)s] %(levelname)s %(name)s: %(message)s"
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+# ======================================================================================
+# ✅ 포맷터
+# ======================================================================================
+class JsonFormatter(logging.Formatter):
+    """1줄 1 JSON (ts / level / logger / msg + logger.info(..., extra={...}) 필드)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RESERVED})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LazyJson:
+    """로그가 실제로 출력될 때만 json.dumps (예: logger.debug("payload=%s", LazyJson(payload)))"""
+
+    __slots__ = ("obj",)
+
+    def __init__(self, obj: Any):
+        self.obj = obj
+
+    def __str__(self) -> str:
+        return json.dumps(self.obj, ensure_ascii=False, default=str)
+
+
+# ======================================================================================
+# ✅ 설정 / 로거
+# ======================================================================================
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, force: bool = False) -> None:
+    """
+    패키지 로거 레벨 설정 + (root 에 핸들러가 없으면) stdout 핸들러 1개 추가
+    - LOG_LEVEL=DEBUG 일 때만 debug 로그 출력, 기본 INFO
+    - gunicorn / pytest 처럼 root 핸들러가 이미 있으면 그대로 사용
+    """
+    global _configured
+    with _configure_lock:
+        if _configured and not force:
+            return
+        level_no = logging.getLevelName((level or LOG_LEVEL).upper())
+        if not isinstance(level_no, int):
+            level_no = logging.INFO
+        for name in LOG_PACKAGES:
+            logging.getLogger(name).setLevel(level_no)
+
+        root = logging.getLogger()
+        if not root.handlers:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(JsonFormatter() if (fmt or LOG_FORMAT) == "json" else logging.Formatter(_TEXT_FORMAT))
+            root.addHandler(handler)
+        _configured = True
+
+
+def get_logger(name: str) -> logging.Logger:
+    """모듈 로거 (처음 호출 시 configure_logging)"""
+    if not _configured:
+        configure_logging()
+    return logging.getLogger(name)
+
+
+def debug_sampled(logger: logging.Logger, msg: str, *args: Any, rate: Optional[float] = None) -> None:
+    """
+    행/키워드 단위로 반복되는 debug 로그는 rate 비율만 출력 (기본 LOG_SAMPLE_RATE)
+    - DEBUG 가 꺼져 있으면 난수도 만들지 않음
+    """
+    if logger.isEnabledFor(logging.DEBUG) and random.random() < (LOG_SAMPLE_RATE if rate is None else rate):
+        logger.debug(msg, *args)
@@ -0,0 +1,304 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# 요청/단계 지연 버킷(초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelKey = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_text(names: Sequence[str], values: LabelKey, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# ======================================================================================
+# ✅ 지표 종류 (Prometheus counter / histogram)
+# ======================================================================================
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelKey:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name}: 라벨은 {self.labels} 이어야 합니다 (받은 값: {tuple(labels)})")
+        return tuple(str(labels[n]) for n in self.labels)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """단조 증가 카운터 (inc(amount, **labels))"""
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        super().__init__(name, help_text, labels)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> Dict[LabelKey, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, value in sorted(self.snapshot().items()):
+            lines.append(f"{self.name}{_label_text(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    """누적 버킷 히스토그램 (observe(seconds, **labels) / with time(**labels): ...)"""
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 → [버킷별 개수(비누적)..., +Inf 개수], 합계
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        if not METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[index] += 1
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: Any) -> int:
+        with self._lock:
+            return sum(self._counts.get(self._key(labels), ()))
+
+    def sum(self, **labels: Any) -> float:
+        with self._lock:
+            return self._sums.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> Dict[LabelKey, Dict[str, Any]]:
+        """라벨 → {"count", "sum", "buckets": {상한: 누적 개수}}"""
+        with self._lock:
+            items = [(k, list(c), self._sums[k]) for k, c in self._counts.items()]
+        result = {}
+        for key, counts, total in items:
+            cumulative, running = {}, 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                cumulative[bound] = running
+            result[key] = {"count": running, "sum": total, "buckets": cumulative}
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counts.clear()
+            self._sums.clear()
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, data in sorted(self.snapshot().items()):
+            for bound, n in data["buckets"].items():
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{float(bound)!r}"'
+                lines.append(f"{self.name}_bucket{_label_text(self.labels, key, le)} {n}")
+            lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {_format_value(data['sum'])}")
+            lines.append(f"{self.name}_count{_label_text(self.labels, key)} {data['count']}")
+        return lines
+
+
+# ======================================================================================
+# ✅ 지표 모음 (프로세스 1개)
+# ======================================================================================
+class MetricsRegistry:
+    """
+    프로세스 안 지표 모음
+    - render(): Prometheus text format (/metrics)
+    - snapshot(): 테스트/디버그용 dict {지표명: {라벨 튜플: 값}}
+    ⚠️ gunicorn 워커마다 따로 집계됨 (스크레이프 시 워커별 값)
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labels != metric.labels:
+                    raise ValueError(f"지표 이름 중복: {metric.name}")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Dict[LabelKey, Any]]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {m.name: m.snapshot() for m in metrics}
+
+    def reset(self) -> None:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for m in metrics:
+            m.reset()
+
+
+METRICS = MetricsRegistry()
+
+# ---------------- 요청 / 단계 ----------------
+INTENT_LATENCY = METRICS.histogram(
+    "members_intent_duration_seconds", "요청 처리 시간 (intent 또는 endpoint 별)", ("intent", "status"))
+STAGE_LATENCY = METRICS.histogram(
+    "members_stage_duration_seconds", "요청 안 단계별 소요 시간 (nlu / sheets)", ("stage",))
+
+# ---------------- Google Sheets ----------------
+SHEETS_CALLS = METRICS.counter(
+    "members_sheets_calls_total", "Google Sheets 호출 수 (gspread 메서드 / 워크시트 별)", ("method", "worksheet"))
+SHEETS_HTTP_REQUESTS = METRICS.counter(
+    "members_sheets_http_requests_total", "Google Sheets API HTTP 요청 수", ("worksheet", "status"))
+SHEETS_BYTES = METRICS.counter(
+    "members_sheets_downloaded_bytes_total", "Google Sheets API 응답 바이트 수", ("worksheet",))
+
+# ---------------- 할당량 / 재시도 ----------------
+RATE_LIMITED = METRICS.counter(
+    "members_rate_limited_total", "429 / 할당량 초과 응답 수", ("source",))
+BACKOFFS = METRICS.counter(
+    "members_backoffs_total", "재시도 전 대기(backoff) 횟수", ("source",))
+
+# ---------------- 외부 서비스 (OpenAI / Memberslist / Impact) ----------------
+UPSTREAM_LATENCY = METRICS.histogram(
+    "members_upstream_request_duration_seconds", "외부 서비스 HTTP 요청 시간 (시도 1회 기준)", ("service", "outcome"))
+OPENAI_TOKENS = METRICS.counter(
+    "members_openai_tokens_total", "OpenAI 사용 토큰 수", ("operation", "kind"))
+
+
+# ======================================================================================
+# ✅ 기록 헬퍼
+# ======================================================================================
+def record_openai_usage(operation: str, body: Any) -> None:
+    """OpenAI 응답 JSON 의 usage(prompt/completion 토큰) 누적"""
+    usage = body.get("usage") if isinstance(body, dict) else None
+    if not isinstance(usage, dict):
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        value = usage.get(kind)
+        if isinstance(value, (int, float)):
+            OPENAI_TOKENS.inc(value, operation=operation, kind=kind.replace("_tokens", ""))
+
+
+def _worksheet_from_url(url: str) -> str:
+    """Sheets API URL → 워크시트 이름 (values/<범위>, values:batchGet?ranges=..., 알 수 없으면 "-")"""
+    parts = urlsplit(url)
+    path = unquote(parts.path)
+    if "/values/" in path:
+        rng = path.split("/values/", 1)[1]
+    else:
+        ranges = parse_qs(parts.query).get("ranges")
+        if not ranges:
+            return "-"
+        rng = ranges[0]
+    if rng.startswith("'"):
+        name = rng[1:].split("'", 1)[0]           # 'DB'!A1:B2 / 'DB':append
+    else:
+        name = rng.split("!", 1)[0].split(":", 1)[0]
+    return name or "-"
+
+
+def record_sheets_response(response: Any, *args: Any, **kwargs: Any) -> Any:
+    """gspread 세션 응답 훅 → HTTP 요청 수 / 내려받은 바이트 / 429"""
+    worksheet = _worksheet_from_url(getattr(response, "url", "") or "")
+    status = getattr(response, "status_code", 0)
+    SHEETS_HTTP_REQUESTS.inc(worksheet=worksheet, status=status)
+    SHEETS_BYTES.inc(len(getattr(response, "content", b"") or b""), worksheet=worksheet)
+    if status == 429:
+        RATE_LIMITED.inc(source="sheets")
+    return response
+
+
+def instrument_gspread_client(client: Any) -> Any:
+    """gspread Client 의 HTTP 세션에 응답 훅 등록 (세션이 없으면 그대로)"""
+    hooks = getattr(getattr(client, "session", None), "hooks", None)
+    if isinstance(hooks, dict):
+        responses = hooks.setdefault("response", [])
+        if record_sheets_response not in responses:
+            responses.append(record_sheets_response)
+    return client
+
+
+def render_metrics() -> str:
+    return METRICS.render()
+
+
+def metrics_snapshot() -> Dict[str, Dict[LabelKey, Any]]:
+    return METRICS.snapshot()
@@ -0,0 +1,280 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import io
+import os
+import re
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# =====================================================
+# 외부 라이브러리
+# =====================================================
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.image import read_image_bytes
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+OCR_ENABLED = os.getenv("OCR_ENABLED", "1").lower() not in ("0", "false", "no")
+OCR_LANG = os.getenv("OCR_LANG", "kor+eng")
+OCR_CONFIDENCE_THRESHOLD = float(os.getenv("OCR_CONFIDENCE_THRESHOLD", "0.85"))  # 이 값 이상이면 OCR 결과 사용
+
+
+class OCRUnavailable(RuntimeError):
+    """pytesseract 또는 tesseract 실행 파일이 없을 때"""
+
+
+# ======================================================================================
+# ✅ 로컬 OCR (Tesseract)
+# ======================================================================================
+def ocr_image(image) -> Tuple[str, float]:
+    """
+    이미지 → (줄 단위 텍스트, 평균 단어 신뢰도 0~1)
+    - pytesseract / tesseract 미설치 시 OCRUnavailable
+    """
+    try:
+        import pytesseract
+    except ImportError as e:
+        raise OCRUnavailable("pytesseract 미설치") from e
+
+    try:
+        img = Image.open(io.BytesIO(read_image_bytes(image)))
+        img = ImageOps.exif_transpose(img).convert("L")
+    except (UnidentifiedImageError, OSError) as e:
+        raise ValueError(f"이미지를 열 수 없습니다: {e}") from e
+
+    try:
+        data = pytesseract.image_to_data(img, lang=OCR_LANG, output_type=pytesseract.Output.DICT)
+    except pytesseract.TesseractNotFoundError as e:
+        raise OCRUnavailable("tesseract 실행 파일 없음") from e
+
+    lines: Dict[Tuple[int, int, int], List[str]] = {}
+    confidences = []
+    for i, word in enumerate(data.get("text", [])):
+        word = (word or "").strip()
+        conf = float(data["conf"][i])
+        if not word or conf < 0:
+            continue
+        key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(key, []).append(word)
+        confidences.append(conf)
+
+    text = "\n".join(" ".join(words) for _, words in sorted(lines.items()))
+    mean_conf = (sum(confidences) / len(confidences) / 100.0) if confidences else 0.0
+    return text, mean_conf
+
+
+# ======================================================================================
+# ✅ 영수증 텍스트 → 주문 (규칙 기반)
+# ======================================================================================
+_LABELS = {
+    "제품명": re.compile(r"^\s*(?:제품명|상품명|품명)\s*[:：]?\s*(.+)$"),
+    "제품가격": re.compile(r"^\s*(?:제품가격|가격|금액|판매가)\s*[:：]?\s*([\d,]+)\s*원?\s*$"),
+    "PV": re.compile(r"^\s*PV\s*[:：]?\s*([\d,.]+)\s*$", re.IGNORECASE),
+    "배송처": re.compile(r"^\s*(?:배송처|배송지|주소)\s*[:：]?\s*(.+)$"),
+    "주문자_고객명": re.compile(r"^\s*(?:고객명|주문자|이름)\s*[:：]?\s*([가-힣A-Za-z ]{2,20})\s*$"),
+}
+
+# "노니 주스 30,000원 PV 20" / "노니주스 30000 20"
+_ITEM_LINE = re.compile(
+    r"^\s*(?P<name>[가-힣A-Za-z][가-힣A-Za-z0-9 ()\-+/]*?)\s+"
+    r"(?P<price>\d{1,3}(?:,\d{3})+|\d{4,})\s*원?\s+"
+    r"(?:PV\s*[:：]?\s*)?(?P<pv>\d+(?:\.\d+)?)\s*(?:PV)?\s*$",
+    re.IGNORECASE,
+)
+_PHONE = re.compile(r"01[016789][-\s.]?\d{3,4}[-\s.]?\d{4}")
+
+_REQUIRED = ("제품명", "제품가격", "PV")
+
+
+def _new_order() -> Dict[str, str]:
+    return {"제품명": "", "제품가격": "", "PV": "", "주문자_고객명": "", "주문자_휴대폰번호": "", "배송처": ""}
+
+
+def parse_receipt_text(text: str) -> Tuple[List[Dict[str, str]], float]:
+    """
+    OCR 텍스트 → (orders, 완성도 0~1)
+
+    지원 레이아웃
+    1. 라벨형: "제품명: 노니" / "가격: 30,000" / "PV: 20" / "배송처: ..." (제품명이 다시 나오면 다음 주문)
+    2. 한 줄형: "노니 주스 30,000원 PV 20"
+    - 배송처/고객명/휴대폰번호는 한 번만 나오면 모든 주문에 적용
+    - 완성도: 주문별 필수 필드(제품명/제품가격/PV) 채움 비율의 평균 (주문이 없으면 0)
+    """
+    orders: List[Dict[str, str]] = []
+    current: Optional[Dict[str, str]] = None
+    shared: Dict[str, str] = {}
+
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+
+        phone = _PHONE.search(line)
+        if phone:
+            shared.setdefault("주문자_휴대폰번호", re.sub(r"[\s.]", "-", phone.group(0)))
+
+        item = _ITEM_LINE.match(line)
+        if item and not _LABELS["제품가격"].match(line):
+            order = _new_order()
+            order.update(
+                제품명=item.group("name").strip(),
+                제품가격=item.group("price").replace(",", ""),
+                PV=item.group("pv"),
+            )
+            orders.append(order)
+            current = None
+            continue
+
+        for field, pattern in _LABELS.items():
+            m = pattern.match(line)
+            if not m:
+                continue
+            value = m.group(1).strip()
+            if field in ("제품가격", "PV"):
+                value = value.replace(",", "")
+            if field in ("배송처", "주문자_고객명"):
+                shared.setdefault(field, value)
+                break
+            if current is None or (field == "제품명" and current["제품명"]):
+                current = _new_order()
+                orders.append(current)
+            current[field] = value
+            break
+
+    for order in orders:
+        for field, value in shared.items():
+            if not order.get(field):
+                order[field] = value
+
+    if not orders:
+        return [], 0.0
+    completeness = sum(
+        sum(1 for f in _REQUIRED if order.get(f)) / len(_REQUIRED) for order in orders
+    ) / len(orders)
+    return orders, completeness
+
+
+# ======================================================================================
+# ✅ 단계별 추출기 (OCR → Vision)
+# ======================================================================================
+class TieredOrderExtractor:
+    """
+    로컬 OCR 로 먼저 추출하고, 신뢰도가 threshold 미만이면 Vision 모델로 넘김
+
+    - 반환 형식은 extract_order_from_uploaded_image 와 동일 ({"orders": [...], ...} 또는 {"error": ...})
+      + "tier": "ocr" / "vision", "ocr_confidence"
+    - stats(): 단계별 시도/채택 수, 채택률, 평균 지연(ms)
+    - OCR 미설치 환경에서는 OCR 단계를 건너뜀 (unavailable 로 집계)
+    """
+
+    TIERS = ("ocr", "vision")
+
+    def __init__(self, vision: Optional[Callable[[Any], Dict[str, Any]]] = None,
+                 ocr: Optional[Callable[[Any], Tuple[str, float]]] = None,
+                 threshold: float = OCR_CONFIDENCE_THRESHOLD,
+                 ocr_enabled: bool = OCR_ENABLED):
+        self._vision = vision
+        self._ocr = ocr or ocr_image
+        self.threshold = threshold
+        self.ocr_enabled = ocr_enabled
+        self._lock = threading.Lock()
+        self._stats = {tier: self._empty_stats() for tier in self.TIERS}
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, float]:
+        return {"attempts": 0, "hits": 0, "errors": 0, "unavailable": 0, "total_ms": 0.0}
+
+    def _record(self, tier: str, elapsed: float, outcome: str) -> None:
+        with self._lock:
+            stats = self._stats[tier]
+            stats["attempts"] += 1
+            stats["total_ms"] += elapsed * 1000
+            if outcome != "miss":
+                stats[outcome] += 1
+
+    def _vision_extract(self, data: bytes) -> Dict[str, Any]:
+        vision = self._vision
+        if vision is None:
+            from utils.utils import extract_order_from_uploaded_image   # 순환 import 방지
+            vision = extract_order_from_uploaded_image
+        return vision(io.BytesIO(data))
+
+    def extract(self, image) -> Dict[str, Any]:
+        data = read_image_bytes(image)
+        ocr_confidence = None
+
+        # 1) 로컬 OCR
+        if self.ocr_enabled:
+            start = time.perf_counter()
+            try:
+                text, text_conf = self._ocr(data)
+                orders, completeness = parse_receipt_text(text)
+                ocr_confidence = round(text_conf * completeness, 3)
+                accepted = bool(orders) and ocr_confidence >= self.threshold
+                self._record("ocr", time.perf_counter() - start, "hits" if accepted else "miss")
+                if accepted:
+                    return {"orders": orders, "tier": "ocr", "ocr_confidence": ocr_confidence}
+            except OCRUnavailable:
+                self._record("ocr", time.perf_counter() - start, "unavailable")
+            except Exception as e:
+                logger.warning("OCR 실패 → vision 사용: %s", e)
+                self._record("ocr", time.perf_counter() - start, "errors")
+
+        # 2) Vision 모델
+        start = time.perf_counter()
+        try:
+            result = self._vision_extract(data)
+        except Exception:
+            self._record("vision", time.perf_counter() - start, "errors")
+            raise
+        ok = isinstance(result, dict) and "orders" in result and "error" not in result
+        self._record("vision", time.perf_counter() - start, "hits" if ok else "errors")
+        if isinstance(result, dict):
+            result = {**result, "tier": "vision", "ocr_confidence": ocr_confidence}
+        return result
+
+    __call__ = extract
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """단계별 attempts / hits / hit_rate / avg_ms (+ errors, unavailable)"""
+        with self._lock:
+            report = {}
+            for tier, s in self._stats.items():
+                attempts = s["attempts"]
+                report[tier] = {
+                    "attempts": attempts,
+                    "hits": s["hits"],
+                    "hit_rate": round(s["hits"] / attempts, 3) if attempts else 0.0,
+                    "avg_ms": round(s["total_ms"] / attempts, 1) if attempts else 0.0,
+                    "errors": s["errors"],
+                    "unavailable": s["unavailable"],
+                }
+            return report
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats = {tier: self._empty_stats() for tier in self.TIERS}
+
+
+_order_extractor: Optional[TieredOrderExtractor] = None
+_order_extractor_lock = threading.Lock()
+
+
+def get_order_extractor() -> TieredOrderExtractor:
+    """프로세스 공용 TieredOrderExtractor"""
+    global _order_extractor
+    if _order_extractor is None:
+        with _order_extractor_lock:
+            if _order_extractor is None:
+                _order_extractor = TieredOrderExtractor()
+    return _order_extractor
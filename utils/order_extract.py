@@ -0,0 +1,202 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import io
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+ORDER_EXTRACT_CONCURRENCY = int(os.getenv("ORDER_EXTRACT_CONCURRENCY", "4"))   # 동시 추출 수
+ORDER_EXTRACT_TIMEOUT = float(os.getenv("ORDER_EXTRACT_TIMEOUT", "90"))        # 이미지 1장당 제한(초)
+ORDER_UPLOAD_MAX_ITEMS = int(os.getenv("ORDER_UPLOAD_MAX_ITEMS", "20"))        # 요청당 이미지/페이지 수
+PDF_RENDER_DPI = int(os.getenv("PDF_RENDER_DPI", "200"))
+
+# 같은 주문으로 보는 필드 (여러 장/페이지에 겹쳐 찍힌 주문 제거용)
+ORDER_DEDUP_FIELDS = ("제품명", "제품가격", "PV", "주문자_고객명", "주문자_휴대폰번호", "배송처")
+
+
+# ======================================================================================
+# ✅ 업로드 → 이미지 목록 (PDF 는 페이지별 이미지로 분리)
+# ======================================================================================
+def is_pdf(data: bytes, filename: str = "") -> bool:
+    return data[:5] == b"%PDF-" or filename.lower().endswith(".pdf")
+
+
+def pdf_to_images(data: bytes, dpi: int = PDF_RENDER_DPI) -> List[bytes]:
+    """PDF → 페이지별 PNG bytes (pdf2image + poppler 필요)"""
+    try:
+        from pdf2image import convert_from_bytes
+    except ImportError as e:
+        raise RuntimeError("PDF 업로드에는 pdf2image 패키지가 필요합니다.") from e
+
+    pages = []
+    for page in convert_from_bytes(data, dpi=dpi):
+        buf = io.BytesIO()
+        page.save(buf, format="PNG")
+        pages.append(buf.getvalue())
+    return pages
+
+
+def expand_upload_items(files: List[Tuple[str, bytes]]) -> List[Tuple[str, bytes]]:
+    """
+    (이름, bytes) 목록 → (라벨, 이미지 bytes) 목록
+    - PDF 는 "파일명#p1", "파일명#p2" ... 페이지별로 분리
+    - 변환 실패한 PDF 는 bytes 를 그대로 두고 추출 단계에서 오류로 기록
+    """
+    items: List[Tuple[str, bytes]] = []
+    for name, data in files:
+        if not is_pdf(data, name):
+            items.append((name, data))
+            continue
+        try:
+            pages = pdf_to_images(data)
+        except Exception as e:
+            logger.error("PDF %s 변환 실패: %s", name, e)
+            items.append((name, data))
+            continue
+        items.extend((f"{name}#p{i}", page) for i, page in enumerate(pages, start=1))
+    return items
+
+
+# ======================================================================================
+# ✅ 이미지별 병렬 추출
+# ======================================================================================
+@dataclass
+class ExtractionResult:
+    """이미지(페이지) 1개의 추출 결과"""
+    index: int
+    source: str
+    status: str = "pending"          # success / error / timeout
+    orders: Optional[List[Dict[str, Any]]] = None
+    message: str = ""
+    elapsed: float = 0.0
+    image_stats: Optional[Dict[str, Any]] = None
+    tier: Optional[str] = None       # ocr / vision (단계별 추출기 사용 시)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "index": self.index,
+            "source": self.source,
+            "status": self.status,
+            "orders": len(self.orders or []),
+            "message": self.message,
+            "elapsed": round(self.elapsed, 3),
+            "image_stats": self.image_stats,
+            "tier": self.tier,
+        }
+
+
+def _extract_one(extractor: Callable[[Any], Dict[str, Any]], index: int, source: str,
+                 data: bytes) -> ExtractionResult:
+    result = ExtractionResult(index=index, source=source)
+    start = time.perf_counter()
+    try:
+        parsed = extractor(io.BytesIO(data))
+        if isinstance(parsed, dict) and "error" not in parsed and "orders" in parsed:
+            result.status = "success"
+            result.orders = [o for o in (parsed.get("orders") or []) if isinstance(o, dict)]
+            result.image_stats = parsed.get("image_stats")
+            result.tier = parsed.get("tier")
+        else:
+            result.status = "error"
+            result.message = str(parsed.get("error", "주문 추출 실패")) if isinstance(parsed, dict) \
+                else "주문 추출 실패"
+    except Exception as e:
+        result.status = "error"
+        result.message = str(e)
+    result.elapsed = time.perf_counter() - start
+    return result
+
+
+def extract_orders_from_images(items: List[Tuple[str, bytes]],
+                               extractor: Optional[Callable[[Any], Dict[str, Any]]] = None,
+                               max_workers: Optional[int] = None,
+                               item_timeout: Optional[float] = None) -> List[ExtractionResult]:
+    """
+    (라벨, bytes) 목록을 스레드 풀에서 동시에 추출 → 입력 순서대로 결과 반환
+
+    - 동시 실행 수: max_workers (기본 ORDER_EXTRACT_CONCURRENCY)
+    - 이미지당 item_timeout 초 기준, 전체 대기 한도 = ceil(이미지 수 / max_workers) × item_timeout
+      → 한도 안에 끝나지 않은 이미지는 timeout 으로 기록
+    """
+    if extractor is None:
+        from utils.utils import extract_order_from_uploaded_image   # 순환 import 방지
+        extractor = extract_order_from_uploaded_image
+    max_workers = max(1, min(max_workers or ORDER_EXTRACT_CONCURRENCY, len(items) or 1))
+    item_timeout = item_timeout or ORDER_EXTRACT_TIMEOUT
+
+    if not items:
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract")
+    try:
+        futures = [
+            executor.submit(_extract_one, extractor, i, name, data)
+            for i, (name, data) in enumerate(items)
+        ]
+        rounds = -(-len(items) // max_workers)
+        wait(futures, timeout=rounds * item_timeout)
+
+        results = []
+        for i, future in enumerate(futures):
+            if future.done():
+                results.append(future.result())
+                continue
+            future.cancel()
+            results.append(ExtractionResult(
+                index=i, source=items[i][0], status="timeout",
+                message=f"{item_timeout:g}초 안에 추출이 끝나지 않았습니다.",
+                elapsed=item_timeout,
+            ))
+    finally:
+        # 시간 초과된 작업은 기다리지 않음 (스레드는 HTTP 타임아웃 후 스스로 종료)
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+# ======================================================================================
+# ✅ 주문 병합 / 중복 제거
+# ======================================================================================
+def _dedup_key(order: Dict[str, Any]) -> Tuple[str, ...]:
+    """공백 무시, 가격/PV 는 숫자만 비교"""
+    key = []
+    for field in ORDER_DEDUP_FIELDS:
+        value = str(order.get(field, "") or "")
+        pattern = r"[^0-9]" if field in ("제품가격", "PV") else r"\s+"
+        key.append(re.sub(pattern, "", value))
+    return tuple(key)
+
+
+def merge_extracted_orders(results: List[ExtractionResult]) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    성공한 결과의 주문을 입력 순서대로 합치고 중복 제거 → (주문 목록, 제거된 개수)
+    - 같은 페이지 안의 같은 주문은 모두 유지 (같은 제품 여러 줄)
+    - 다른 페이지에서 이미 나온 주문만 제거: 키별로 한 페이지에서 나온 최대 개수까지만 유지
+      (같은 사진을 두 번 올린 경우 두 번째 페이지는 모두 제거, 더 많이 나온 페이지의 초과분은 유지)
+    """
+    merged, kept, duplicates = [], Counter(), 0
+    for result in results:
+        in_page = Counter()
+        for order in result.orders or []:
+            key = _dedup_key(order)
+            in_page[key] += 1
+            if in_page[key] <= kept[key]:
+                duplicates += 1
+                continue
+            kept[key] += 1
+            merged.append(order)
+    return merged, duplicates
@@ -0,0 +1,409 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import json
+import time
+import random
+import sqlite3
+import hashlib
+import tempfile
+import threading
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+OUTBOX_ENABLED = os.getenv("OUTBOX_ENABLED", "1").lower() not in ("0", "false", "no")
+# 시트 저장 주문 → Impact 동기화 (주문자 이름/연락처/배송처가 외부로 나가므로 명시적으로 켠 경우만)
+IMPACT_ORDER_SYNC_ENABLED = os.getenv("IMPACT_ORDER_SYNC_ENABLED", "0").lower() in ("1", "true", "yes")
+# 기본값은 임시 디렉터리 (재부팅 시 미전송 이벤트가 사라질 수 있음 → 운영은 영구 디스크 경로 지정)
+OUTBOX_DB_PATH = os.getenv(
+    "OUTBOX_DB_PATH", os.path.join(tempfile.gettempdir(), "members_outbox.sqlite3")
+)
+OUTBOX_POLL_INTERVAL = float(os.getenv("OUTBOX_POLL_INTERVAL", "5"))      # 대기 이벤트 확인 주기(초)
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "50"))             # 목적지별 1회 전송 최대 이벤트 수
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))          # 넘으면 dead (수동 확인)
+OUTBOX_BACKOFF = float(os.getenv("OUTBOX_BACKOFF", "5"))                  # 재시도 대기 기본값(초)
+OUTBOX_BACKOFF_MAX = float(os.getenv("OUTBOX_BACKOFF_MAX", "600"))
+OUTBOX_LEASE = float(os.getenv("OUTBOX_LEASE", "120"))                    # 전송 중 이벤트 점유 시간(초)
+OUTBOX_DEDUP_WINDOW = float(os.getenv("OUTBOX_DEDUP_WINDOW", "600"))      # 같은 키 재등록 무시 구간(초)
+OUTBOX_RETENTION = float(os.getenv("OUTBOX_RETENTION", str(7 * 24 * 3600)))  # 전송 완료 이벤트 보관(초)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    destination     TEXT    NOT NULL,
+    idempotency_key TEXT    NOT NULL,
+    payload         TEXT    NOT NULL,
+    status          TEXT    NOT NULL DEFAULT 'pending',   -- pending / sending / sent / dead
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL    NOT NULL,
+    locked_until    REAL,
+    batch_key       TEXT,                                 -- 처음 전송한 묶음 키 (재시도 때 같은 묶음/키로 전송)
+    last_error      TEXT,
+    created_at      REAL    NOT NULL,
+    sent_at         REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at);
+CREATE INDEX IF NOT EXISTS outbox_key ON outbox (idempotency_key, created_at);
+"""
+
+Sender = Callable[[Dict[str, Any], str], Any]
+
+
+def new_save_id() -> str:
+    """저장 1회 식별자 (주문 저장 호출마다 새로 만들고, 같은 저장을 재시도할 때만 재사용)"""
+    return uuid.uuid4().hex
+
+
+def idempotency_key(destination: str, save_id: str, part: str = "") -> str:
+    """
+    목적지 + 저장 id (+ 회원명 등 구분값) 해시
+    - 내용이 같아도 저장이 다르면 다른 키 (같은 제품을 연달아 두 번 주문해도 둘 다 전송)
+    - 헤더(Idempotency-Key)로 보내므로 ASCII hex
+    """
+    return hashlib.sha256(f"{destination}\n{save_id}\n{part}".encode("utf-8")).hexdigest()
+
+
+def merge_batch(events: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], List[int], str]]:
+    """
+    같은 목적지 이벤트 묶기 → [(payload, 이벤트 id 목록, 묶음 키)]
+    - 이미 한 번 보낸 이벤트(batch_key 있음)는 그때의 묶음 그대로 (구성·키가 재시도마다 같아야 원격이 중복 판단 가능)
+    - 나머지는 orders 를 제외한 필드(회원명, type, source ...)가 같은 이벤트끼리 orders 를 이어 붙여 1회 전송
+    - orders 가 없는 이벤트는 그대로 1건씩
+    - 묶음 키: 이벤트 1건이면 그 키, 여러 건이면 이벤트 키들의 해시
+    """
+    groups: Dict[str, Dict[str, Any]] = {}
+    for event in events:
+        payload = event["payload"]
+        if event.get("batch_key"):
+            group = groups.setdefault(f"batch:{event['batch_key']}", {
+                "payload": {**payload, "orders": []} if isinstance(payload.get("orders"), list) else payload,
+                "ids": [], "keys": [], "batch_key": event["batch_key"],
+            })
+            if isinstance(payload.get("orders"), list):
+                group["payload"]["orders"].extend(payload["orders"])
+            group["ids"].append(event["id"])
+            continue
+        if not isinstance(payload.get("orders"), list):
+            groups[f"single:{event['id']}"] = {"payload": payload, "ids": [event["id"]],
+                                               "keys": [event["idempotency_key"]]}
+            continue
+        head = {k: v for k, v in payload.items() if k != "orders"}
+        group_key = json.dumps(head, ensure_ascii=False, sort_keys=True, default=str)
+        group = groups.setdefault(group_key, {"payload": {**head, "orders": []}, "ids": [], "keys": []})
+        group["payload"]["orders"].extend(payload["orders"])
+        group["ids"].append(event["id"])
+        group["keys"].append(event["idempotency_key"])
+
+    batches = []
+    for group in groups.values():
+        keys = group["keys"]
+        key = group.get("batch_key") or (
+            keys[0] if len(keys) == 1 else hashlib.sha256("\n".join(keys).encode()).hexdigest()
+        )
+        batches.append((group["payload"], group["ids"], key))
+    return batches
+
+
+# ======================================================================================
+# ✅ 외부 동기화 아웃박스 (SQLite)
+# ======================================================================================
+class Outbox:
+    """
+    저장 시점에 외부 동기화 이벤트를 SQLite 에 기록하고, 백그라운드에서 목적지별로 묶어 전송
+
+    - enqueue(): 즉시 반환 (요청 경로에서 외부 API 를 기다리지 않음)
+    - dispatch_once(): 전송 시각이 된 이벤트를 목적지별 batch_size 개씩 점유(lease) → 묶어서 전송
+      · 성공: sent / 실패: attempts+1, 지수 백오프(+지터) 후 재시도, max_attempts 초과 시 dead
+      · 보내기 전에 묶음 키(batch_key)를 기록 → 재시도는 같은 이벤트 묶음을 같은 키로 전송
+    - 같은 idempotency_key 가 dedup_window 안에 다시 오면 무시 (중복 제출/재시도 방지)
+    - 여러 워커 프로세스가 같은 DB 를 써도 점유(locked_until)로 한 곳에서만 전송
+    """
+
+    def __init__(self, path: str = OUTBOX_DB_PATH, senders: Optional[Dict[str, Sender]] = None,
+                 batch_size: int = OUTBOX_BATCH_SIZE, max_attempts: int = OUTBOX_MAX_ATTEMPTS,
+                 backoff: float = OUTBOX_BACKOFF, backoff_max: float = OUTBOX_BACKOFF_MAX,
+                 lease: float = OUTBOX_LEASE, dedup_window: float = OUTBOX_DEDUP_WINDOW,
+                 retention: float = OUTBOX_RETENTION):
+        self.path = path
+        self.senders: Dict[str, Sender] = dict(senders or {})
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+        self.lease = lease
+        self.dedup_window = dedup_window
+        self.retention = retention
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+            columns = {r["name"] for r in conn.execute("PRAGMA table_info(outbox)")}
+            if "batch_key" not in columns:   # 이전 버전 DB
+                try:
+                    conn.execute("ALTER TABLE outbox ADD COLUMN batch_key TEXT")
+                except sqlite3.OperationalError:
+                    pass                     # 다른 워커가 먼저 추가
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    # -----------------------------
+    # 등록
+    # -----------------------------
+    def enqueue(self, destination: str, payload: Dict[str, Any],
+                key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        이벤트 기록 → {"id", "idempotency_key", "duplicate"}
+        - key 미지정: 호출마다 새 키 (중복 제거 없음)
+        """
+        if destination not in self.senders:
+            raise ValueError(f"등록되지 않은 목적지: {destination}")
+        key = key or idempotency_key(destination, new_save_id())
+        now = time.time()
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id FROM outbox WHERE idempotency_key = ? AND created_at >= ? "
+                "ORDER BY id DESC LIMIT 1",
+                (key, now - self.dedup_window),
+            ).fetchone()
+            if row:
+                conn.execute("COMMIT")
+                return {"id": row["id"], "idempotency_key": key, "duplicate": True}
+            cur = conn.execute(
+                "INSERT INTO outbox (destination, idempotency_key, payload, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (destination, key, json.dumps(payload, ensure_ascii=False, default=str), now, now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        self._wake.set()
+        return {"id": cur.lastrowid, "idempotency_key": key, "duplicate": False}
+
+    # -----------------------------
+    # 전송
+    # -----------------------------
+    def _claim(self, conn: sqlite3.Connection, destination: str, now: float) -> List[Dict[str, Any]]:
+        """
+        전송 시각이 된 이벤트(또는 점유 만료된 sending) 를 점유
+        - 이미 묶음으로 보낸 적 있는 이벤트는 같은 묶음의 나머지도 함께 점유 (batch_size 와 무관)
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            columns = "id, idempotency_key, payload, attempts, batch_key"
+            rows = conn.execute(
+                f"SELECT {columns} FROM outbox "
+                "WHERE destination = ? AND ((status = 'pending' AND next_attempt_at <= ?) "
+                "OR (status = 'sending' AND locked_until < ?)) ORDER BY id LIMIT ?",
+                (destination, now, now, self.batch_size),
+            ).fetchall()
+            claimed = {r["id"] for r in rows}
+            for batch_key in sorted({r["batch_key"] for r in rows if r["batch_key"]}):
+                siblings = conn.execute(
+                    f"SELECT {columns} FROM outbox WHERE destination = ? AND batch_key = ? "
+                    "AND status IN ('pending', 'sending') ORDER BY id",
+                    (destination, batch_key),
+                ).fetchall()
+                rows += [r for r in siblings if r["id"] not in claimed]
+                claimed.update(r["id"] for r in siblings)
+            if rows:
+                conn.executemany(
+                    "UPDATE outbox SET status = 'sending', locked_until = ? WHERE id = ?",
+                    [(now + self.lease, r["id"]) for r in rows],
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return [
+            {"id": r["id"], "idempotency_key": r["idempotency_key"],
+             "payload": json.loads(r["payload"]), "attempts": r["attempts"], "batch_key": r["batch_key"]}
+            for r in sorted(rows, key=lambda r: r["id"])
+        ]
+
+    def _retry_delay(self, attempts: int) -> float:
+        cap = min(self.backoff_max, self.backoff * (2 ** max(0, attempts - 1)))
+        return random.uniform(cap / 2, cap)
+
+    def dispatch_once(self, now: Optional[float] = None) -> Dict[str, Dict[str, int]]:
+        """목적지별 1회 전송 → {목적지: {"sent", "failed", "dead", "requests"}}"""
+        now = time.time() if now is None else now
+        report: Dict[str, Dict[str, int]] = {}
+        conn = self._connect()
+        try:
+            for destination, sender in self.senders.items():
+                events = self._claim(conn, destination, now)
+                if not events:
+                    continue
+                counts = report.setdefault(destination, {"sent": 0, "failed": 0, "dead": 0, "requests": 0})
+                attempts = {e["id"]: e["attempts"] for e in events}
+
+                for payload, ids, key in merge_batch(events):
+                    counts["requests"] += 1
+                    # 보내기 전에 묶음 고정 (전송 도중 프로세스가 죽어도 재시도는 같은 구성/키)
+                    conn.executemany("UPDATE outbox SET batch_key = ? WHERE id = ?",
+                                     [(key, event_id) for event_id in ids])
+                    try:
+                        sender(payload, key)
+                    except Exception as e:
+                        logger.warning("%s 전송 실패 (%d건): %s", destination, len(ids), e)
+                        # 묶음 단위로 같은 시도 횟수/재시도 시각 → 다음에도 함께 점유됨
+                        tries = max(attempts[event_id] for event_id in ids) + 1
+                        dead = tries >= self.max_attempts
+                        next_at = now + self._retry_delay(tries)
+                        conn.executemany(
+                            "UPDATE outbox SET status = ?, attempts = ?, next_attempt_at = ?, "
+                            "locked_until = NULL, last_error = ? WHERE id = ?",
+                            [("dead" if dead else "pending", tries, next_at, str(e)[:500], event_id)
+                             for event_id in ids],
+                        )
+                        counts["dead" if dead else "failed"] += len(ids)
+                        continue
+
+                    conn.executemany(
+                        "UPDATE outbox SET status = 'sent', attempts = attempts + 1, sent_at = ?, "
+                        "locked_until = NULL, last_error = NULL WHERE id = ?",
+                        [(now, event_id) for event_id in ids],
+                    )
+                    counts["sent"] += len(ids)
+
+            conn.execute("DELETE FROM outbox WHERE status = 'sent' AND sent_at < ?", (now - self.retention,))
+        finally:
+            conn.close()
+        return report
+
+    # -----------------------------
+    # 백그라운드 실행
+    # -----------------------------
+    def start(self, interval: float = OUTBOX_POLL_INTERVAL) -> None:
+        """데몬 스레드에서 interval 마다 dispatch_once (enqueue 시 즉시 깨움)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.dispatch_once()
+                except Exception as e:
+                    logger.exception("전송 루프 오류: %s", e)
+                self._wake.wait(interval)
+                self._wake.clear()
+
+        self._thread = threading.Thread(target=loop, name="outbox", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """목적지별 상태 건수 {목적지: {"pending": n, "sending": n, "sent": n, "dead": n}}"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT destination, status, COUNT(*) AS n FROM outbox GROUP BY destination, status"
+            ).fetchall()
+        finally:
+            conn.close()
+        report = {d: {"pending": 0, "sending": 0, "sent": 0, "dead": 0} for d in self.senders}
+        for r in rows:
+            report.setdefault(r["destination"], {"pending": 0, "sending": 0, "sent": 0, "dead": 0})
+            report[r["destination"]][r["status"]] = r["n"]
+        return report
+
+
+# ======================================================================================
+# ✅ 목적지 (Memberslist 주문 추가 / Impact 동기화)
+# ======================================================================================
+def _send_memberslist(payload: Dict[str, Any], key: str) -> Any:
+    from utils.http import call_memberslist_add_orders
+    return call_memberslist_add_orders(payload, idempotency_key=key)
+
+
+def _send_impact(payload: Dict[str, Any], key: str) -> Any:
+    from utils.http import call_impact_sync
+    return call_impact_sync(payload, idempotency_key=key)
+
+
+DEFAULT_SENDERS: Dict[str, Sender] = {
+    "memberslist": _send_memberslist,
+    "impact": _send_impact,
+}
+
+def enqueue_impact_orders(member_name: str, orders: List[Dict[str, Any]], source: str = "sheet_gpt",
+                          save_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    시트 저장된 주문 → Impact 동기화 이벤트 기록
+    - 키: 저장 id + 회원명 (같은 저장을 다시 기록할 때만 중복으로 무시)
+    - IMPACT_ORDER_SYNC_ENABLED=1 로 켠 경우만 기록 (기본 꺼짐, 주문자 개인정보가 외부로 나감)
+    - IMPACT_API_URL 미설정 또는 OUTBOX_ENABLED=0 이면 기록하지 않음 (None)
+    - 기록 실패는 주문 저장 결과에 영향 주지 않음 (로그만)
+    """
+    if not (IMPACT_ORDER_SYNC_ENABLED and OUTBOX_ENABLED and os.getenv("IMPACT_API_URL") and orders):
+        return None
+    try:
+        return get_outbox().enqueue(
+            "impact", {"type": "order", "member": member_name, "orders": orders, "source": source},
+            key=idempotency_key("impact", save_id or new_save_id(), member_name),
+        )
+    except Exception as e:
+        logger.warning("Impact 동기화 기록 실패: %s", e)
+        return None
+
+
+_outbox: Optional[Outbox] = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox() -> Outbox:
+    """프로세스 공용 Outbox (첫 사용 시 생성 + 전송 스레드 시작)"""
+    global _outbox
+    if _outbox is None:
+        with _outbox_lock:
+            if _outbox is None:
+                outbox = Outbox(OUTBOX_DB_PATH, senders=DEFAULT_SENDERS)
+                outbox.start()
+                _outbox = outbox
+    return _outbox
+
+
+def stop_outbox() -> None:
+    """전송 스레드 정지 (시작한 적 없으면 아무것도 하지 않음, 다음 get_outbox 때 다시 시작)"""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is not None:
+            _outbox.stop()
+            _outbox = None
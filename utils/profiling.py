@@ -0,0 +1,210 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import time
+import random
+import pstats
+import cProfile
+import itertools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+# =====================================================
+# 외부 라이브러리
+# =====================================================
+from flask import g, has_app_context
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))    # 무작위로 프로파일링할 요청 비율
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")             # 이 헤더가 있으면 프로파일링
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")                        # 헤더 값 / 조회 토큰이 같아야 함
+# 토큰 없이 X-Profile 헤더 / /debug/profiles 허용 (기본: DEBUG=true 일 때만, 그 외에는 PROFILE_TOKEN 필요)
+PROFILE_OPEN = os.getenv("PROFILE_OPEN", os.getenv("DEBUG", "false")).lower() in ("1", "true", "yes")
+PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "20"))                 # 저장할 누적시간 상위 함수 수
+PROFILE_BUFFER_SIZE = int(os.getenv("PROFILE_BUFFER_SIZE", "50"))     # 최근 프로파일 보관 수
+PROFILE_SLOW_MS = float(os.getenv("PROFILE_SLOW_MS", "1000"))         # /debug/profiles 기본 필터(ms)
+
+# 요청 안 단계 (단계 밖 시간은 dispatch 로 집계)
+PHASES = ("parse", "sheets", "dispatch", "serialize")
+
+# cProfile 은 동시에 1개만 켤 수 있음 (3.12+ sys.monitoring) → 바쁘면 단계별 시간만 기록
+_profiler_lock = threading.Lock()
+
+
+# ======================================================================================
+# ✅ 요청 1건 프로파일
+# ======================================================================================
+class RequestProfile:
+    """
+    요청 1건의 단계별 시간 (+ cProfile)
+    - enter(name) / exit(): 안쪽 단계 시간은 바깥 단계에서 빠짐 (단계 합 = 전체 시간)
+    - cProfile 은 요청을 처리하는 스레드만 측정
+    """
+
+    def __init__(self, method: str, path: str, trigger: str, use_cprofile: bool = True,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self._clock = clock
+        self.started = clock()
+        self.phases: Dict[str, float] = {}
+        self._stack: List[str] = ["dispatch"]
+        self._mark = self.started
+        self.profiler: Optional[cProfile.Profile] = None
+        if use_cprofile and _profiler_lock.acquire(blocking=False):
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:          # 다른 프로파일러가 이미 켜져 있음
+                self.profiler = None
+                _profiler_lock.release()
+
+    def _charge(self) -> None:
+        now = self._clock()
+        name = self._stack[-1]
+        self.phases[name] = self.phases.get(name, 0.0) + (now - self._mark)
+        self._mark = now
+
+    def enter(self, name: str) -> None:
+        self._charge()
+        self._stack.append(name)
+
+    def exit(self) -> None:
+        self._charge()
+        if len(self._stack) > 1:
+            self._stack.pop()
+
+    def finish(self, status: int, endpoint: Optional[str] = None, intent: Optional[str] = None,
+               top_n: int = PROFILE_TOP_N) -> Dict[str, Any]:
+        """프로파일 종료 → ring buffer 에 넣을 dict"""
+        top: List[Dict[str, Any]] = []
+        if self.profiler is not None:
+            self.profiler.disable()
+            _profiler_lock.release()
+            top = top_functions(self.profiler, top_n)
+            self.profiler = None
+        self._charge()
+        wall = self._mark - self.started
+        return {
+            "ts": time.time(),
+            "method": self.method,
+            "path": self.path,
+            "endpoint": endpoint,
+            "intent": intent,
+            "status": status,
+            "trigger": self.trigger,
+            "wall_ms": round(wall * 1000, 1),
+            "phases_ms": {name: round(self.phases.get(name, 0.0) * 1000, 1) for name in PHASES},
+            "top": top,
+        }
+
+
+def _function_label(key) -> str:
+    filename, line, func = key
+    if filename == "~":
+        return func                                # 내장 함수 {method 'xxx' of ...}
+    cwd = os.getcwd()
+    if filename.startswith(cwd):
+        filename = os.path.relpath(filename, cwd)
+    return f"{filename}:{line}({func})"
+
+
+def top_functions(profiler: cProfile.Profile, top_n: int = PROFILE_TOP_N) -> List[Dict[str, Any]]:
+    """누적시간(cumtime) 상위 top_n 함수"""
+    stats = pstats.Stats(profiler).stats
+    rows = sorted(stats.items(), key=lambda kv: kv[1][3], reverse=True)[:top_n]
+    return [{
+        "function": _function_label(key),
+        "calls": nc,
+        "tottime_ms": round(tt * 1000, 2),
+        "cumtime_ms": round(ct * 1000, 2),
+    } for key, (cc, nc, tt, ct, callers) in rows]
+
+
+# ======================================================================================
+# ✅ 최근 프로파일 보관 (ring buffer)
+# ======================================================================================
+class ProfileStore:
+    """최근 size 건만 보관 (오래된 것부터 버림)"""
+
+    def __init__(self, size: int = PROFILE_BUFFER_SIZE):
+        self._entries: deque = deque(maxlen=size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, entry: Dict[str, Any]) -> int:
+        with self._lock:
+            entry["id"] = next(self._ids)
+            self._entries.append(entry)
+            return entry["id"]
+
+    def list(self, min_ms: float = 0.0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """최신순, wall_ms >= min_ms"""
+        with self._lock:
+            entries = [e for e in reversed(self._entries) if e["wall_ms"] >= min_ms]
+        return entries[:limit] if limit else entries
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return next((e for e in self._entries if e["id"] == profile_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+PROFILES = ProfileStore()
+
+
+# ======================================================================================
+# ✅ 요청 훅 / 단계 표시
+# ======================================================================================
+def profile_trigger(headers: Mapping[str, str], sample_rate: Optional[float] = None) -> Optional[str]:
+    """
+    프로파일링 여부 → "header" / "sample" / None
+    - 헤더: 값이 PROFILE_TOKEN 과 같아야 함 (토큰 미설정이면 PROFILE_OPEN 일 때만)
+    """
+    value = headers.get(PROFILE_HEADER)
+    if value and token_allowed(value):
+        return "header"
+    rate = PROFILE_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate > 0 and random.random() < rate:
+        return "sample"
+    return None
+
+
+def token_allowed(token: Optional[str]) -> bool:
+    """X-Profile 헤더 / /debug/profiles 허용 여부 (PROFILE_TOKEN 미설정이면 PROFILE_OPEN 일 때만)"""
+    if PROFILE_TOKEN:
+        return token == PROFILE_TOKEN
+    return PROFILE_OPEN
+
+
+def active_profile() -> Optional[RequestProfile]:
+    """현재 요청의 RequestProfile (프로파일링 중이 아니거나 요청 밖이면 None)"""
+    if not has_app_context():
+        return None
+    return g.get("request_profile")
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    요청 단계 표시 (parse / sheets / serialize …)
+    - 프로파일링 중인 요청이 아니면 아무것도 하지 않음
+    """
+    profile = active_profile()
+    if profile is None:
+        yield
+        return
+    profile.enter(name)
+    try:
+        yield
+    finally:
+        profile.exit()
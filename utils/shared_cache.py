@@ -0,0 +1,218 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+SHARED_CACHE_PATH = os.getenv(
+    "SHARED_CACHE_PATH", os.path.join(tempfile.gettempdir(), "members_shared_cache.sqlite3")
+)
+# 시트 전체 행(get_all_records) 공유 보관 시간(초), 0 이면 공유하지 않음
+SHEET_SHARED_CACHE_TTL = float(os.getenv("SHEET_SHARED_CACHE_TTL", "0"))
+SHARED_CACHE_LOAD_WAIT = float(os.getenv("SHARED_CACHE_LOAD_WAIT", "10"))   # 다른 워커 로딩 대기(초)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key        TEXT PRIMARY KEY,
+    value      TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    key   TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    until REAL NOT NULL
+);
+"""
+
+_MISSING = object()
+
+
+# ======================================================================================
+# ✅ 워커 공유 캐시 (SQLite 파일 1개)
+# ======================================================================================
+class SharedCache:
+    """
+    같은 서버의 여러 워커 프로세스가 함께 쓰는 key → JSON 값 캐시
+
+    - get_or_load(): 없거나 만료되면 한 워커만 loader 실행(lease), 나머지는 그 결과를 기다림
+      → N 개 워커가 같은 시트를 각자 내려받지 않음
+      · 기다리다 load_wait 초가 지나면 직접 loader 실행 (로딩 워커가 죽은 경우 대비)
+    - 값은 JSON 으로 저장 → 조회할 때마다 새 객체 (호출부에서 수정해도 안전)
+    - 스레드별 연결 재사용 (sqlite3 연결은 스레드 간 공유 불가)
+    """
+
+    def __init__(self, path: str = SHARED_CACHE_PATH, load_wait: float = SHARED_CACHE_LOAD_WAIT,
+                 poll_interval: float = 0.05):
+        self.path = path
+        self.load_wait = load_wait
+        self.poll_interval = poll_interval
+        self._local = threading.local()
+        self._owner = f"{os.getpid()}"
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str, default: Any = None) -> Any:
+        row = self._conn().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, json.dumps(value, ensure_ascii=False, default=str), time.time() + ttl),
+        )
+
+    def invalidate(self, key: Optional[str] = None, prefix: Optional[str] = None) -> None:
+        """key 하나 / prefix 로 시작하는 키 / 전체 삭제"""
+        conn = self._conn()
+        if key is not None:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        elif prefix is not None:
+            conn.execute("DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+        else:
+            conn.execute("DELETE FROM entries")
+
+    def _acquire(self, key: str, now: float) -> bool:
+        """key 로딩 권한 획득 (이미 다른 워커가 로딩 중이면 False)"""
+        cur = self._conn().execute(
+            "INSERT INTO leases (key, owner, until) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET owner = excluded.owner, until = excluded.until "
+            "WHERE leases.until < ?",
+            (key, self._owner, now + self.load_wait, now),
+        )
+        return cur.rowcount == 1
+
+    def _release(self, key: str) -> None:
+        self._conn().execute("DELETE FROM leases WHERE key = ?", (key,))
+
+    def get_or_load(self, key: str, loader: Callable[[], Any], ttl: float) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            return value
+
+        deadline = time.time() + self.load_wait
+        acquired = self._acquire(key, time.time())
+        while not acquired and time.time() < deadline:
+            # 다른 워커가 로딩 중 → 저장될 때까지 대기
+            self.waits += 1
+            time.sleep(self.poll_interval)
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                self.hits += 1
+                return value
+            acquired = self._acquire(key, time.time())
+
+        self.misses += 1
+        try:
+            value = loader()
+            self.set(key, value, ttl)
+            return value
+        finally:
+            if acquired:
+                self._release(key)
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._conn().execute(
+            "SELECT COUNT(*) FROM entries WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "waits": self.waits,
+                "entries": entries, "path": self.path}
+
+
+_shared_cache: Optional[SharedCache] = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache:
+    """프로세스 공용 SharedCache (모든 워커가 같은 SHARED_CACHE_PATH 사용)"""
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = SharedCache()
+    return _shared_cache
+
+
+# ======================================================================================
+# ✅ 시트 읽기 공유
+# ======================================================================================
+def shared_sheet_records(sheet_name: str, loader: Callable[[], Any],
+                         ttl: float = SHEET_SHARED_CACHE_TTL) -> Any:
+    """
+    시트 전체 행을 워커 간 공유 (ttl <= 0 이면 매번 loader)
+    ⚠️ ttl 동안 다른 프로세스/사람이 시트를 고친 내용은 보이지 않음 → 이 앱의 쓰기는 invalidate_sheet 로 반영
+    """
+    if ttl <= 0:
+        return loader()
+    try:
+        cache = get_shared_cache()
+    except sqlite3.Error as e:
+        logger.warning("사용 불가 → 직접 조회: %s", e)
+        return loader()
+    return cache.get_or_load(f"sheet:{sheet_name}", loader, ttl)
+
+
+# 프로세스 안 시트별 쓰기 버전 (invalidate_sheet 마다 +1)
+# → 쓰기 전에 시작된 조회를 쓰기 뒤의 조회와 합치지 않도록 single-flight 키에 포함
+_sheet_versions: Dict[str, int] = {}
+_sheet_versions_lock = threading.Lock()
+
+
+def sheet_version(sheet_name: str) -> int:
+    return _sheet_versions.get(sheet_name, 0)
+
+
+# invalidate_sheet 때 함께 부를 함수 (시트 내용에 기대는 다른 프로세스 내 캐시 정리용)
+_invalidate_listeners: List[Callable[[str], None]] = []
+
+
+def on_sheet_invalidated(listener: Callable[[str], None]) -> Callable[[str], None]:
+    """invalidate_sheet(sheet_name) 마다 listener(sheet_name) 호출 (데코레이터로도 사용)"""
+    _invalidate_listeners.append(listener)
+    return listener
+
+
+def invalidate_sheet(sheet_name: str) -> None:
+    """시트를 고친 뒤 호출 → 시트 버전 +1, 모든 워커의 공유 행 캐시 무효화, 등록된 listener 호출"""
+    with _sheet_versions_lock:
+        _sheet_versions[sheet_name] = _sheet_versions.get(sheet_name, 0) + 1
+    for listener in list(_invalidate_listeners):
+        try:
+            listener(sheet_name)
+        except Exception:
+            logger.exception("무효화 listener 실패: %s", sheet_name)
+    if SHEET_SHARED_CACHE_TTL <= 0:
+        return
+    try:
+        get_shared_cache().invalidate(f"sheet:{sheet_name}")
+    except sqlite3.Error as e:
+        logger.warning("무효화 실패: %s", e)
@@ -6,17 +6,35 @@ import io
 import re
 import time
 import json
-import base64
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List
 
 # =====================================================
 # 외부 라이브러리
 # =====================================================
-import requests
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from gspread.exceptions import WorksheetNotFound, APIError
 
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.snapshot import active_snapshot
+from utils.image import prepare_image_for_vision, VISION_TIMEOUT
+from utils.disk_cache import get_vision_cache, vision_cache_key
+from utils.shared_cache import shared_sheet_records, invalidate_sheet, sheet_version
+from utils.cache import SingleFlight
+from utils.hot_sheets import hot_sheet_records
+from utils.upstream import get_upstream
+from utils.metrics import (
+    SHEETS_CALLS, STAGE_LATENCY, BACKOFFS, instrument_gspread_client, record_openai_usage,
+)
+from utils.profiling import phase
+from utils.tracing import sheet_span, span
+from utils.log import get_logger
+
+logger = get_logger(__name__)
+
 # =====================================================
 # 환경변수 기반 설정
 # =====================================================
@@ -43,20 +61,40 @@ def get_gspread_client():
     else:  # 로컬 개발용
         creds_path = os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json")
         creds = ServiceAccountCredentials.from_json_keyfile_name(creds_path, scope)
-    return gspread.authorize(creds)
+    return instrument_gspread_client(gspread.authorize(creds))
+
+
+SPREADSHEET_HANDLE_TTL = float(os.getenv("SPREADSHEET_HANDLE_TTL", "1800"))   # 워커별 스프레드시트 핸들 재사용(초)
+_spreadsheet_handle = {"sheet": None, "opened_at": 0.0}
+_spreadsheet_lock = threading.Lock()
 
 
 def get_spreadsheet():
+    """
+    스프레드시트 핸들 (워커 프로세스별로 SPREADSHEET_HANDLE_TTL 동안 재사용)
+    - 매 호출마다 인증 + open_by_key 를 반복하지 않음 (토큰 갱신은 gspread 세션이 처리)
+    """
+    with _spreadsheet_lock:
+        sheet = _spreadsheet_handle["sheet"]
+        if sheet is not None and time.monotonic() - _spreadsheet_handle["opened_at"] < SPREADSHEET_HANDLE_TTL:
+            return sheet
+        sheet = _open_spreadsheet()
+        _spreadsheet_handle.update(sheet=sheet, opened_at=time.monotonic())
+        return sheet
+
+
+def _open_spreadsheet():
     client = get_gspread_client()
     sheet_key = os.getenv("GOOGLE_SHEET_KEY")
     sheet_title = os.getenv("GOOGLE_SHEET_TITLE")
 
-    if sheet_key:
-        return client.open_by_key(sheet_key)
-    elif sheet_title:
-        return client.open(sheet_title)
-    else:
-        raise EnvironmentError("❌ GOOGLE_SHEET_KEY 또는 GOOGLE_SHEET_TITLE 필요")
+    with span("sheets", "open_by_key" if sheet_key else "open"):
+        if sheet_key:
+            return client.open_by_key(sheet_key)
+        elif sheet_title:
+            return client.open(sheet_title)
+        else:
+            raise EnvironmentError("❌ GOOGLE_SHEET_KEY 또는 GOOGLE_SHEET_TITLE 필요")
 
 
 # --------------------------------------------------
@@ -89,7 +127,16 @@ def get_worksheet(sheet_name):
     지정된 이름의 워크시트를 가져옴.
     - sheet_name 이 Worksheet 객체면 .title 사용
     - 대소문자, 공백, 유니코드 차이 무시
+    - 요청 처리 중이면 요청 스냅샷의 워크시트 (같은 요청 안에서 시트 재다운로드 없음)
     """
+    snapshot = active_snapshot()
+    if snapshot is not None:
+        return snapshot.worksheet(sheet_name)
+    return open_worksheet(sheet_name)
+
+
+def open_worksheet(sheet_name):
+    """실제 gspread 워크시트 조회 (스냅샷 미사용)"""
     sheet = get_spreadsheet()   # ✅ 기존 연결 함수 사용
 
     # Worksheet 객체가 넘어오면 title 추출
@@ -100,7 +147,9 @@ def get_worksheet(sheet_name):
 
     target = normalize_text(sheet_name).lower()
 
-    for ws in sheet.worksheets():
+    with span("sheets", "worksheets"):
+        worksheets = sheet.worksheets()
+    for ws in worksheets:
         if normalize_text(ws.title).lower() == target:
             return ws
 
@@ -111,26 +160,77 @@ def get_worksheet(sheet_name):
 
 
 
+# --------------------------------------------------
+# ✅ 시트 전체 조회 single-flight
+# --------------------------------------------------
+# 같은 (워크시트, 범위, 버전) 을 동시에 조회하면 1회만 내려받고 결과를 나눠 가짐
+sheet_fetches = SingleFlight()
+
+
+def fetch_sheet(ws, method: str = "get_all_records", *args):
+    """
+    워크시트 전체 조회 (get_all_records / get_all_values / row_values(1) 등)
+    - 다른 스레드가 같은 조회를 진행 중이면 새로 내려받지 않고 그 결과를 기다림
+    - 버전(invalidate_sheet 횟수)이 다르면 합치지 않음 → 쓰기 뒤 조회는 새로 내려받음
+    - 호출부마다 행 사본을 돌려줌
+    - 실제 다운로드만 members_sheets_calls_total / members_stage_duration_seconds{stage="sheets"} 에 기록
+    """
+    title = getattr(ws, "title", None)
+
+    def download():
+        SHEETS_CALLS.inc(method=method, worksheet=title if isinstance(title, str) else "-")
+        with STAGE_LATENCY.time(stage="sheets"), sheet_span(ws, method, args):
+            return getattr(ws, method)(*args)
+
+    with phase("sheets"):
+        if not isinstance(title, str):
+            return download()
+        key = (title, method, args, sheet_version(title))
+        result = sheet_fetches.do(key, download)
+    return _copy_rows(result)
+
+
+def _copy_rows(result):
+    if not isinstance(result, list):
+        return result
+    return [dict(r) if isinstance(r, dict) else list(r) if isinstance(r, list) else r for r in result]
+
+
+def sheet_fetch_stats() -> Dict[str, int]:
+    """calls / fetches / coalesced / errors / in_flight"""
+    return sheet_fetches.stats()
+
+
 # --------------------------------------------------
 # ✅ 시트에서 모든 행 불러오기
 # --------------------------------------------------
 def get_rows_from_sheet(sheet_name: str):
     try:
+        # ✅ 요청 처리 중이면 요청 단위 스냅샷 재사용 (시트당 1회 다운로드)
+        snapshot = active_snapshot()
+        if snapshot is not None:
+            return [dict(r) for r in snapshot.records(sheet_name)]
+
+        hot = hot_sheet_records(sheet_name)
+        if hot is not None:
+            return hot
+
         client = get_gspread_client()
 
         # 환경변수에서 Sheet key/title 불러오기
         sheet_key = os.getenv("GOOGLE_SHEET_KEY")
         sheet_title = os.getenv("GOOGLE_SHEET_TITLE")
 
-        if sheet_key:
-            sheet = client.open_by_key(sheet_key).worksheet(sheet_name)
-        elif sheet_title:
-            sheet = client.open(sheet_title).worksheet(sheet_name)
-        else:
-            raise ValueError("❌ GOOGLE_SHEET_KEY 또는 GOOGLE_SHEET_TITLE 환경변수가 필요합니다.")
+        with span("sheets", "worksheet", sheet_name):
+            if sheet_key:
+                sheet = client.open_by_key(sheet_key).worksheet(sheet_name)
+            elif sheet_title:
+                sheet = client.open(sheet_title).worksheet(sheet_name)
+            else:
+                raise ValueError("❌ GOOGLE_SHEET_KEY 또는 GOOGLE_SHEET_TITLE 환경변수가 필요합니다.")
 
-        # ✅ dict 리스트 반환
-        return sheet.get_all_records()
+        # ✅ dict 리스트 반환 (SHEET_SHARED_CACHE_TTL > 0 이면 워커 간 공유)
+        return shared_sheet_records(sheet_name, lambda: fetch_sheet(sheet))
 
     except WorksheetNotFound:
         raise ValueError(f"❌ 시트 '{sheet_name}'을(를) 찾을 수 없습니다.")
@@ -146,6 +246,7 @@ def get_rows_from_sheet(sheet_name: str):
 def append_row(sheet_name: str, row: list):
     ws = get_worksheet(sheet_name)
     ws.append_row(row, value_input_option="USER_ENTERED")
+    invalidate_sheet(ws.title)
 
 
 def update_cell(sheet_name: str, row: int, col: int, value, clear_first=True):
@@ -153,6 +254,7 @@ def update_cell(sheet_name: str, row: int, col: int, value, clear_first=True):
     if clear_first:
         ws.update_cell(row, col, "")
     ws.update_cell(row, col, value)
+    invalidate_sheet(ws.title)
 
 
 def delete_row(sheet_or_name, row: int):
@@ -164,6 +266,7 @@ def delete_row(sheet_or_name, row: int):
     else:
         ws = sheet_or_name
     ws.delete_rows(row)
+    invalidate_sheet(ws.title)
 
 
 
@@ -174,18 +277,18 @@ def safe_update_cell(sheet, row, col, value, clear_first=True, max_retries=3, de
             if clear_first:
                 sheet.update_cell(row, col, "")
 
-            print(f"[DEBUG] 시트 업데이트: row={row}, col={col}, value={value}")
+            logger.debug("시트 업데이트: row=%s, col=%s, value=%s", row, col, value)
             sheet.update_cell(row, col, value)
             return True
         except APIError as e:
             if "429" in str(e):
-           
-                print(f"[⏳ 재시도 {attempt}] 429 오류 → {delay}초 대기")
+                logger.warning("재시도 %d: 429 오류 → %s초 대기", attempt, delay)
+                BACKOFFS.inc(source="sheets")
                 time.sleep(delay)
                 delay *= 2
             else:
                 raise
-    print("[❌ 실패] 최대 재시도 초과")
+    logger.error("safe_update_cell 최대 재시도 초과")
     return False
 
 
@@ -258,7 +361,7 @@ def get_gsheet_data(sheet_name: str = "DB"):
     """
     scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
     creds = ServiceAccountCredentials.from_json_keyfile_name("service_account.json", scope)
-    client = gspread.authorize(creds)
+    client = instrument_gspread_client(gspread.authorize(creds))
 
     sheet = client.open("회원관리").worksheet(sheet_name)
     return sheet.get_all_records()
@@ -284,27 +387,8 @@ def _ensure_orders_list(data: Any) -> List[Dict[str, Any]]:
     return []
 
 
-def openai_vision_extract_orders(image_bytes: io.BytesIO) -> List[Dict[str, Any]]:
-    """
-    이미지 → 주문 JSON 추출 (OpenAI Vision 모델)
-    반환: [{'제품명':..., '제품가격':..., 'PV':..., '주문자_고객명':..., '주문자_휴대폰번호':..., '배송처':..., '결재방법': '', '수령확인': ''}, ...]
-    """
-    if not OPENAI_API_KEY:
-        raise RuntimeError("OPENAI_API_KEY 미설정")
-    if not OPENAI_API_URL:
-        raise RuntimeError("OPENAI_API_URL 미설정")
-
-    image_b64 = base64.b64encode(image_bytes.getvalue()).decode("utf-8")
-
-    prompt = (
-        "이미지를 분석하여 JSON 형식으로 추출하세요. "
-        "여러 개의 제품이 있을 경우 'orders' 배열에 모두 담으세요. "
-        "질문하지 말고 추출된 orders 전체를 그대로 저장할 준비를 하세요. "
-        "(이름, 휴대폰번호, 주소)는 소비자 정보임. "
-        "회원명, 결재방법, 수령확인, 주문일자 무시. "
-        "필드: 제품명, 제품가격, PV, 주문자_고객명, 주문자_휴대폰번호, 배송처"
-    )
-
+def _request_vision_content(prepared, prompt: str) -> str:
+    """Vision 모델 호출 → 응답 텍스트 (content 가 리스트여도 텍스트만 모음)"""
     headers = {
         "Authorization": f"Bearer {OPENAI_API_KEY}",
         "Content-Type": "application/json",
@@ -315,16 +399,18 @@ def openai_vision_extract_orders(image_bytes: io.BytesIO) -> List[Dict[str, Any]
             "role": "user",
             "content": [
                 {"type": "text", "text": prompt},
-                {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{image_b64}"}}
+                {"type": "image_url", "image_url": {"url": prepared.data_url()}}
             ]
         }],
         "temperature": 0
     }
 
-    r = requests.post(OPENAI_API_URL, headers=headers, json=payload, timeout=60)
+    r = get_upstream("openai").post(
+        OPENAI_API_URL, headers=headers, json=payload, timeout=VISION_TIMEOUT, idempotent=True)
     r.raise_for_status()
 
     resp = r.json()
+    record_openai_usage("vision_extract", resp)
     msg = resp["choices"][0]["message"]
     content = msg.get("content", "")
 
@@ -337,18 +423,60 @@ def openai_vision_extract_orders(image_bytes: io.BytesIO) -> List[Dict[str, Any]
         ).strip()
     else:
         content_text = str(content).strip()
+    return content_text
+
+
+def openai_vision_extract_orders(image_bytes: io.BytesIO) -> List[Dict[str, Any]]:
+    """
+    이미지 → 주문 JSON 추출 (OpenAI Vision 모델)
+    반환: [{'제품명':..., '제품가격':..., 'PV':..., '주문자_고객명':..., '주문자_휴대폰번호':..., '배송처':..., '결재방법': '', '수령확인': ''}, ...]
+    """
+    if not OPENAI_API_KEY:
+        raise RuntimeError("OPENAI_API_KEY 미설정")
+    if not OPENAI_API_URL:
+        raise RuntimeError("OPENAI_API_URL 미설정")
+
+    # ✅ 전송 전 전처리 (EXIF 회전, 흑백, 축소, 재인코딩)
+    prepared = prepare_image_for_vision(image_bytes)
+    logger.info("이미지 전처리: %s", prepared.stats())
+
+    prompt = (
+        "이미지를 분석하여 JSON 형식으로 추출하세요. "
+        "여러 개의 제품이 있을 경우 'orders' 배열에 모두 담으세요. "
+        "질문하지 말고 추출된 orders 전체를 그대로 저장할 준비를 하세요. "
+        "(이름, 휴대폰번호, 주소)는 소비자 정보임. "
+        "회원명, 결재방법, 수령확인, 주문일자 무시. "
+        "필드: 제품명, 제품가격, PV, 주문자_고객명, 주문자_휴대폰번호, 배송처"
+    )
+
+    # ✅ 같은 이미지+프롬프트+모델 → 디스크 캐시 응답 재사용
+    cache = get_vision_cache()
+    cache_key = vision_cache_key(prepared.data, prompt, MODEL_NAME)
+    content_text = cache.get(cache_key) if cache else None
+    cache_hit = content_text is not None
+
+    if cache_hit:
+        logger.info("비전 캐시 적중: %.12s", cache_key)
+    else:
+        content_text = _request_vision_content(prepared, prompt)
 
     # 코드펜스(json/일반) 제거
     clean = re.sub(r"```(?:json)?|```", "", content_text, flags=re.IGNORECASE).strip()
 
     try:
         data = json.loads(clean)
+        parsed = True
     except json.JSONDecodeError:
         # 모델이 순수 JSON이 아닌 텍스트를 반환한 경우, raw 텍스트로 보존
         data = {"raw_text": content_text}
+        parsed = False
 
     orders_list = _ensure_orders_list(data)
 
+    # JSON 으로 읽히고 주문이 나온 응답만 저장 (거절/깨진 응답은 다음 업로드 때 다시 호출)
+    if cache and not cache_hit and parsed and orders_list:
+        cache.set(cache_key, content_text)
+
     # 정책: 결재방법/수령확인은 공란 유지 + 문자열 필드 trim
     for o in orders_list:
         o.setdefault("결재방법", "")
@@ -378,7 +506,7 @@ if not SHEET_KEY:
     raise EnvironmentError("환경변수 GOOGLE_SHEET_KEY가 설정되지 않았습니다.")
 
 spreadsheet = client.open_by_key(SHEET_KEY)
-print(f"시트에 연결되었습니다. (ID={SHEET_KEY})")
+logger.info("시트에 연결되었습니다. (ID=%s)", SHEET_KEY)
 
 
 # ✅ 별칭 (호환성)
@@ -0,0 +1,403 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+# =====================================================
+# 외부 라이브러리
+# =====================================================
+from flask import g, has_app_context
+
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.shared_cache import invalidate_sheet
+from utils.metrics import SHEETS_CALLS
+from utils.profiling import phase
+from utils.tracing import sheet_span
+
+
+# ======================================================================================
+# ✅ 시트 스냅샷 (요청 단위 읽기 공유 / unit of work)
+# ======================================================================================
+def _default_loader(sheet_name: str) -> List[Dict[str, Any]]:
+    from utils.sheets import get_worksheet, fetch_sheet   # 순환 import 방지
+    from utils.shared_cache import shared_sheet_records
+    from utils.hot_sheets import hot_sheet_records
+
+    # ✅ 백그라운드로 미리 갱신 중인 시트면 다운로드 없이 사용
+    hot = hot_sheet_records(sheet_name)
+    if hot is not None:
+        return hot
+
+    def load():
+        ws = get_worksheet(sheet_name)
+        # 요청 스냅샷의 워크시트면 실제 워크시트에서 내려받음
+        return fetch_sheet(ws.raw if isinstance(ws, SnapshotWorksheet) else ws)
+
+    return shared_sheet_records(sheet_name, load)
+
+
+def _default_opener(sheet_name: str) -> Any:
+    from utils.sheets import open_worksheet   # 순환 import 방지
+    return open_worksheet(sheet_name)
+
+
+def _numericise(value: Any) -> Any:
+    """get_all_records() 와 같은 숫자 변환 ("123" → 123, "1.5" → 1.5)"""
+    if not isinstance(value, str) or value == "" or "_" in value:
+        return value
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+class SheetSnapshot:
+    """
+    요청 1건 동안의 시트 읽기 공유 + 그 요청이 쓴 내용 반영 (unit of work)
+
+    - 워크시트 핸들 / get_all_records() / get_all_values() / 헤더(1행)를 시트당 한 번만 내려받음
+    - 같은 요청 안의 쓰기(SnapshotWorksheet 경유)는 시트에 반영한 뒤 보관 중인 값에도 그대로 적용
+      → 쓰고 나서 다시 읽어도 다운로드 없이 최신 상태
+    - 그대로 적용하기 어려운 쓰기(헤더 수정, update/batch_update 등)는 해당 시트 보관 값을 버림
+    - records() 가 돌려주는 행(dict)은 공유 객체이므로 호출부에서 수정하지 말 것
+    """
+
+    def __init__(self, loader: Optional[Callable[[str], List[Dict[str, Any]]]] = None,
+                 opener: Optional[Callable[[str], Any]] = None):
+        self._loader = loader or _default_loader
+        self._opener = opener or _default_opener
+        self._records: Dict[str, List[Dict[str, Any]]] = {}
+        self._values: Dict[str, List[List[str]]] = {}
+        self._headers: Dict[str, List[str]] = {}
+        self._worksheets: Dict[str, "SnapshotWorksheet"] = {}
+        self.loads = 0
+        self.writes = 0
+
+    # ---------------- 읽기 ----------------
+    def records(self, sheet_name: str) -> List[Dict[str, Any]]:
+        if sheet_name not in self._records:
+            self._records[sheet_name] = self._loader(sheet_name)
+            self.loads += 1
+        return self._records[sheet_name]
+
+    def seed(self, sheet_name: str, records: List[Dict[str, Any]]) -> None:
+        """미리 내려받은 행으로 채우기 (ASGI 미리 읽기)"""
+        self._records[sheet_name] = records
+        self.loads += 1
+
+    def values(self, sheet_name: str) -> List[List[str]]:
+        if sheet_name not in self._values:
+            from utils.sheets import fetch_sheet   # 순환 import 방지
+            self._values[sheet_name] = fetch_sheet(self.worksheet(sheet_name).raw, "get_all_values")
+            self.loads += 1
+        return self._values[sheet_name]
+
+    def headers(self, sheet_name: str) -> List[str]:
+        if sheet_name in self._values:
+            return self._values[sheet_name][0] if self._values[sheet_name] else []
+        if sheet_name not in self._headers:
+            records = self._records.get(sheet_name)
+            if records:
+                self._headers[sheet_name] = list(records[0].keys())
+            else:
+                from utils.sheets import fetch_sheet   # 순환 import 방지
+                self._headers[sheet_name] = fetch_sheet(self.worksheet(sheet_name).raw, "row_values", 1)
+                self.loads += 1
+        return self._headers[sheet_name]
+
+    def worksheet(self, sheet_name: Any) -> "SnapshotWorksheet":
+        """요청 동안 재사용하는 워크시트 (읽기는 스냅샷, 쓰기는 시트 + 스냅샷)"""
+        if isinstance(sheet_name, SnapshotWorksheet):
+            return sheet_name
+        if not isinstance(sheet_name, str):
+            sheet_name = sheet_name.title
+        sheet_name = sheet_name.strip()
+        if sheet_name not in self._worksheets:
+            self._worksheets[sheet_name] = SnapshotWorksheet(self._opener(sheet_name), self, sheet_name)
+        return self._worksheets[sheet_name]
+
+    def invalidate(self, sheet_name: str) -> None:
+        self._records.pop(sheet_name, None)
+        self._values.pop(sheet_name, None)
+        self._headers.pop(sheet_name, None)
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return list(self._records)
+
+    # ---------------- 쓰기 반영 ----------------
+    def _row_dict(self, sheet_name: str, row: list) -> Dict[str, Any]:
+        headers = self.headers(sheet_name)
+        row = list(row) + [""] * (len(headers) - len(row))
+        return {h: _numericise(row[i] if row[i] is not None else "") for i, h in enumerate(headers)}
+
+    def apply_insert(self, sheet_name: str, rows: List[list], index: int) -> None:
+        """insert_row(s)(rows, index) 반영 (index: 시트 행 번호, 1 = 헤더)"""
+        self.writes += 1
+        if index < 2:
+            self.invalidate(sheet_name)
+            return
+        values = self._values.get(sheet_name)
+        if values is not None:
+            if index - 1 > len(values):
+                self._values.pop(sheet_name)
+            else:
+                values[index - 1:index - 1] = [[_cell(v) for v in r] for r in rows]
+        records = self._records.get(sheet_name)
+        if records is not None:
+            if index - 2 > len(records):
+                self._records.pop(sheet_name)
+            else:
+                records[index - 2:index - 2] = [self._row_dict(sheet_name, r) for r in rows]
+
+    def apply_append(self, sheet_name: str, rows: List[list]) -> None:
+        self.writes += 1
+        if sheet_name in self._values:
+            if not self._values[sheet_name]:
+                self.invalidate(sheet_name)       # 빈 시트에 추가 → 첫 행이 헤더
+                return
+            self._values[sheet_name].extend([_cell(v) for v in r] for r in rows)
+        if sheet_name in self._records:
+            self._records[sheet_name].extend(self._row_dict(sheet_name, r) for r in rows)
+
+    def apply_delete(self, sheet_name: str, start: int, end: Optional[int] = None) -> None:
+        self.writes += 1
+        end = end or start
+        if start < 2:
+            self.invalidate(sheet_name)
+            return
+        if sheet_name in self._values:
+            del self._values[sheet_name][start - 1:end]
+        if sheet_name in self._records:
+            del self._records[sheet_name][start - 2:end - 1]
+
+    def apply_update_cell(self, sheet_name: str, row: int, col: int, value: Any) -> None:
+        self.writes += 1
+        if row < 2:
+            self.invalidate(sheet_name)
+            return
+        values = self._values.get(sheet_name)
+        if values is not None:
+            if row - 1 < len(values):
+                line = values[row - 1]
+                line.extend([""] * (col - len(line)))
+                line[col - 1] = _cell(value)
+            else:
+                self._values.pop(sheet_name)
+        records = self._records.get(sheet_name)
+        if records is not None:
+            headers = self.headers(sheet_name)
+            if row - 2 < len(records) and col - 1 < len(headers):
+                records[row - 2][headers[col - 1]] = _numericise(_cell(value))
+            else:
+                self._records.pop(sheet_name)
+
+
+def _cell(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+# 시트 내용을 바꾸지 않는 워크시트 메서드 (그대로 위임)
+_READ_METHODS = {
+    "acell", "cell", "get", "get_values", "batch_get", "find", "findall", "range",
+    "get_note", "list_dimension_group_columns", "list_dimension_group_rows",
+}
+
+
+class SnapshotWorksheet:
+    """
+    gspread Worksheet 래퍼 (요청 unit of work 용)
+
+    - get_all_records() / get_all_values() / row_values(1) → SheetSnapshot 에 보관된 값의 사본
+    - insert_row(s) / append_row(s) / delete_rows / update_cell → 시트에 쓰고 스냅샷에도 반영
+      (다른 워커의 공유 캐시는 invalidate_sheet 로 무효화)
+    - 그 밖의 쓰기 메서드는 시트에 쓴 뒤 해당 시트 보관 값을 버림
+    """
+
+    def __init__(self, raw: Any, snapshot: SheetSnapshot, sheet_name: str):
+        self.raw = raw
+        self._snapshot = snapshot
+        self._name = sheet_name
+
+    # ---------------- 읽기 ----------------
+    def get_all_records(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        if args or kwargs:
+            return self._call("get_all_records", *args, **kwargs)
+        return [dict(r) for r in self._snapshot.records(self._name)]
+
+    def get_all_values(self, *args, **kwargs) -> List[List[str]]:
+        if args or kwargs:
+            return self._call("get_all_values", *args, **kwargs)
+        return [list(r) for r in self._snapshot.values(self._name)]
+
+    def row_values(self, row: int, *args, **kwargs) -> List[str]:
+        if args or kwargs:
+            return self._call("row_values", row, *args, **kwargs)
+        if row == 1:
+            return list(self._snapshot.headers(self._name))
+        values = self._snapshot._values.get(self._name)
+        if values is not None:
+            return list(values[row - 1]) if row - 1 < len(values) else []
+        return self._call("row_values", row)
+
+    def col_values(self, col: int, *args, **kwargs) -> List[str]:
+        values = self._snapshot._values.get(self._name)
+        if args or kwargs or values is None:
+            return self._call("col_values", col, *args, **kwargs)
+        column = [r[col - 1] if col - 1 < len(r) else "" for r in values]
+        while column and column[-1] == "":
+            column.pop()
+        return column
+
+    # ---------------- 쓰기 ----------------
+    def _call(self, method: str, *args, **kwargs):
+        """실제 gspread 호출 (단계 = sheets, 요청 추적 span)"""
+        with phase("sheets"), sheet_span(self._name, method, args):
+            return getattr(self.raw, method)(*args, **kwargs)
+
+    def _written(self, method: str) -> None:
+        title = getattr(self.raw, "title", self._name)
+        SHEETS_CALLS.inc(method=method, worksheet=title)
+        invalidate_sheet(title)
+
+    def insert_row(self, values, index: int = 1, *args, **kwargs):
+        result = self._call("insert_row", values, index, *args, **kwargs)
+        self._snapshot.apply_insert(self._name, [values], index)
+        self._written("insert_row")
+        return result
+
+    def insert_rows(self, values, row: int = 1, *args, **kwargs):
+        result = self._call("insert_rows", values, row, *args, **kwargs)
+        self._snapshot.apply_insert(self._name, values, row)
+        self._written("insert_rows")
+        return result
+
+    def append_row(self, values, *args, **kwargs):
+        result = self._call("append_row", values, *args, **kwargs)
+        self._snapshot.apply_append(self._name, [values])
+        self._written("append_row")
+        return result
+
+    def append_rows(self, values, *args, **kwargs):
+        result = self._call("append_rows", values, *args, **kwargs)
+        self._snapshot.apply_append(self._name, values)
+        self._written("append_rows")
+        return result
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None):
+        if end_index is None:
+            result = self._call("delete_rows", start_index)
+        else:
+            result = self._call("delete_rows", start_index, end_index)
+        self._snapshot.apply_delete(self._name, start_index, end_index)
+        self._written("delete_rows")
+        return result
+
+    def update_cell(self, row: int, col: int, value):
+        result = self._call("update_cell", row, col, value)
+        self._snapshot.apply_update_cell(self._name, row, col, value)
+        self._written("update_cell")
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.raw, name)
+        if name.startswith("_") or name in _READ_METHODS or not callable(attr):
+            return attr
+
+        def write(*args, **kwargs):
+            try:
+                with phase("sheets"), sheet_span(self._name, name, args):
+                    return attr(*args, **kwargs)
+            finally:
+                self._snapshot.invalidate(self._name)
+                self._written(name)
+        return write
+
+    def __repr__(self) -> str:
+        return f"<SnapshotWorksheet {self._name!r} of {self.raw!r}>"
+
+
+# ======================================================================================
+# ✅ 시트 쓰기 배치 (시트별 1회 반영)
+# ======================================================================================
+class SheetWriteBatch:
+    """
+    행 추가를 모아 두었다가 시트별로 한 번에 반영
+
+    - insert_top(): 기존 insert_row(row, index=2) 와 같은 의미 (최신 행이 맨 위)
+    - tag: 현재 추가되는 행의 출처 표시 (예: 배치 항목 index) → flush 결과의 "tags"
+    - flush(): 시트마다 insert_rows 1회 → 시트별 성공/실패 dict 반환
+    """
+
+    def __init__(self, worksheet_getter: Optional[Callable[[str], Any]] = None):
+        self._get_ws = worksheet_getter
+        self._pending: "OrderedDict[str, List[tuple]]" = OrderedDict()
+        self.tag: Any = None
+
+    def insert_top(self, sheet_name: str, row: list) -> None:
+        self._pending.setdefault(sheet_name, []).append((list(row), self.tag))
+
+    def pending(self, sheet_name: Optional[str] = None) -> int:
+        if sheet_name is not None:
+            return len(self._pending.get(sheet_name, []))
+        return sum(len(entries) for entries in self._pending.values())
+
+    def flush(self) -> Dict[str, Dict[str, Any]]:
+        get_ws = self._get_ws
+        if get_ws is None:
+            from utils.sheets import get_worksheet   # 순환 import 방지
+            get_ws = get_worksheet
+
+        outcome: Dict[str, Dict[str, Any]] = {}
+        while self._pending:
+            sheet_name, entries = self._pending.popitem(last=False)
+            rows = [row for row, _ in entries]
+            tags = [tag for _, tag in entries if tag is not None]
+            try:
+                # 하나씩 2행에 넣으면 마지막 행이 맨 위 → 같은 순서가 되도록 역순으로 한 번에 삽입
+                get_ws(sheet_name).insert_rows(rows[::-1], row=2)
+                invalidate_sheet(sheet_name)
+                outcome[sheet_name] = {"status": "success", "rows": len(rows), "tags": tags}
+            except Exception as e:
+                outcome[sheet_name] = {"status": "error", "rows": len(rows), "tags": tags, "message": str(e)}
+        return outcome
+
+
+# ======================================================================================
+# ✅ 현재 요청에 스냅샷/배치 연결
+# ======================================================================================
+# ASGI 어댑터가 미리 읽어 둔 스냅샷을 WSGI environ 으로 넘길 때 쓰는 키
+PREFETCH_ENVIRON_KEY = "members.sheet_snapshot"
+
+
+def active_snapshot() -> Optional[SheetSnapshot]:
+    """현재 요청에 연결된 SheetSnapshot (없으면 None)"""
+    return g.get("sheet_snapshot") if has_app_context() else None
+
+
+def active_write_batch() -> Optional[SheetWriteBatch]:
+    """현재 요청에 연결된 SheetWriteBatch (없으면 None)"""
+    return g.get("sheet_write_batch") if has_app_context() else None
+
+
+@contextmanager
+def sheet_batch_scope(snapshot: Optional[SheetSnapshot] = None,
+                      write_batch: Optional[SheetWriteBatch] = None):
+    """
+    with 블록 동안 g 에 스냅샷/쓰기 배치 연결 (블록 종료 시 원복)
+    - 스냅샷을 넘기지 않으면 요청 스냅샷을 그대로 사용 (없으면 새로 생성)
+    ⚠️ flush 는 호출부에서 명시적으로 수행
+    """
+    prev = (g.get("sheet_snapshot"), g.get("sheet_write_batch"))
+    g.sheet_snapshot = snapshot or prev[0] or SheetSnapshot()
+    g.sheet_write_batch = write_batch or SheetWriteBatch()
+    try:
+        yield g.sheet_snapshot, g.sheet_write_batch
+    finally:
+        g.sheet_snapshot, g.sheet_write_batch = prev
@@ -0,0 +1,188 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence
+from urllib.parse import urlsplit
+
+# =====================================================
+# 외부 라이브러리
+# =====================================================
+from flask import g, has_app_context
+
+# =====================================================
+# 환경변수 기반 설정
+# =====================================================
+# 모든 요청 추적 (기본: DEBUG=true 일 때만), 이때는 X-Trace 요청 헤더만으로 body 모드 선택 가능
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", os.getenv("DEBUG", "false")).lower() in ("1", "true", "yes")
+TRACE_HEADER = os.getenv("TRACE_HEADER", "X-Trace")
+# 꺼져 있을 때 X-Trace 헤더 값에 이 토큰이 있어야 그 요청만 추적 (미설정이면 헤더 무시)
+TRACE_TOKEN = os.getenv("TRACE_TOKEN", "")
+TRACE_HEADER_MAX = int(os.getenv("TRACE_HEADER_MAX", "2000"))      # 응답 헤더 요약 최대 길이
+TRACE_MAX_SPANS = int(os.getenv("TRACE_MAX_SPANS", "200"))         # 요청당 보관 span 수
+
+
+def _column_letter(col: int) -> str:
+    letters = ""
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def sheet_range(method: str, args: Sequence[Any]) -> str:
+    """gspread 메서드 인자 → 범위 표시 (update_cell(3, 5) → E3, delete_rows(4) → 4:4 …)"""
+    try:
+        if method == "update_cell":
+            return f"{_column_letter(int(args[1]))}{int(args[0])}"
+        if method in ("row_values", "delete_rows"):
+            start = int(args[0])
+            end = int(args[1]) if len(args) > 1 and args[1] is not None else start
+            return f"{start}:{end}"
+        if method == "col_values":
+            col = _column_letter(int(args[0]))
+            return f"{col}:{col}"
+        if method == "insert_row":
+            index = int(args[1]) if len(args) > 1 else 1
+            return f"{index}:{index}"
+        if method == "insert_rows":
+            row = int(args[1]) if len(args) > 1 else 1
+            return f"{row}:{row + max(len(args[0]), 1) - 1}"
+        if method in ("append_row", "append_rows"):
+            return "append"
+        if method in ("get_all_records", "get_all_values"):
+            return "all"
+        if args and isinstance(args[0], str):
+            return args[0]                          # update("A2:C3", ...) / get("A1:B2")
+    except (TypeError, ValueError, IndexError):
+        pass
+    return ""
+
+
+# ======================================================================================
+# ✅ 요청 1건의 외부 호출 기록
+# ======================================================================================
+class RequestTrace:
+    """
+    요청 안의 외부 호출(span) 목록
+    - span: kind(sheets / openai / memberslist / impact …), op(메서드), target(워크시트!범위 / URL 경로), ms
+    - 같은 (kind, op, target) 이 여러 번이면 summary 에서 xN 으로 표시 → 중복 호출이 바로 보임
+    """
+
+    def __init__(self, max_spans: int = TRACE_MAX_SPANS):
+        self.started = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.dropped = 0
+        self.max_spans = max_spans
+
+    def add(self, kind: str, op: str, target: str, started: float, ended: float,
+            status: Any = None, error: Optional[str] = None) -> None:
+        if len(self.spans) >= self.max_spans:
+            self.dropped += 1
+            return
+        span = {
+            "kind": kind, "op": op, "target": target,
+            "start_ms": round((started - self.started) * 1000, 1),
+            "ms": round((ended - started) * 1000, 1),
+        }
+        if status is not None:
+            span["status"] = status
+        if error:
+            span["error"] = error
+        self.spans.append(span)
+
+    def grouped(self) -> "OrderedDict[str, Dict[str, Any]]":
+        """kind.op[target] → {"count", "ms"} (처음 호출 순)"""
+        groups: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        for span in self.spans:
+            key = f"{span['kind']}.{span['op']}[{span['target']}]" if span["target"] else f"{span['kind']}.{span['op']}"
+            group = groups.setdefault(key, {"count": 0, "ms": 0.0})
+            group["count"] += 1
+            group["ms"] = round(group["ms"] + span["ms"], 1)
+        return groups
+
+    def summary(self, max_length: int = TRACE_HEADER_MAX) -> str:
+        """X-Trace 헤더용 한 줄 요약 (예: calls=3; ms=812.4; sheets.get_all_records[DB!all]x2=790.1ms; …)"""
+        total = round(sum(s["ms"] for s in self.spans), 1)
+        parts = [f"calls={len(self.spans) + self.dropped}", f"ms={total}"]
+        for key, group in self.grouped().items():
+            count = f"x{group['count']}" if group["count"] > 1 else ""
+            parts.append(f"{key}{count}={group['ms']}ms")
+        text = "; ".join(parts)
+        if len(text) > max_length:
+            text = text[:max(0, max_length - 3)] + "..."
+        # 헤더 값은 latin-1 → 한글 워크시트 이름 등은 \\uXXXX 로
+        return text.encode("ascii", "backslashreplace").decode("ascii")
+
+    def as_dict(self) -> Dict[str, Any]:
+        """_trace 응답 필드"""
+        grouped = self.grouped()
+        return {
+            "calls": len(self.spans) + self.dropped,
+            "ms": round(sum(s["ms"] for s in self.spans), 1),
+            "duplicates": {k: v["count"] for k, v in grouped.items() if v["count"] > 1},
+            "spans": list(self.spans),
+            "dropped": self.dropped,
+        }
+
+
+# ======================================================================================
+# ✅ 요청 훅 / span 기록
+# ======================================================================================
+def trace_requested(headers: Mapping[str, str]) -> Optional[str]:
+    """
+    추적 여부 → "header" / "body"(_trace 필드까지) / None
+    - TRACE_ENABLED: 모든 요청 추적, X-Trace: body 면 body
+    - 꺼져 있으면 X-Trace 값(쉼표 구분)에 TRACE_TOKEN 이 있을 때만 (X-Trace: <토큰>,body)
+    """
+    parts = [p.strip() for p in (headers.get(TRACE_HEADER) or "").split(",") if p.strip()]
+    if not (TRACE_ENABLED or (TRACE_TOKEN and TRACE_TOKEN in parts)):
+        return None
+    return "body" if "body" in (p.lower() for p in parts) else "header"
+
+
+def active_trace() -> Optional[RequestTrace]:
+    """현재 요청의 RequestTrace (추적 중이 아니거나 요청 밖이면 None)"""
+    if not has_app_context():
+        return None
+    return g.get("request_trace")
+
+
+def record_span(kind: str, op: str, target: str, started: float,
+                status: Any = None, error: Optional[str] = None) -> None:
+    """started(perf_counter) 부터 지금까지를 span 으로 기록 (추적 중이 아니면 무시)"""
+    trace = active_trace()
+    if trace is not None:
+        trace.add(kind, op, target, started, time.perf_counter(), status=status, error=error)
+
+
+@contextmanager
+def span(kind: str, op: str, target: str = "") -> Iterator[None]:
+    """with span("sheets", "get_all_records", "DB!all"): ... (추적 중이 아니면 그대로 실행)"""
+    trace = active_trace()
+    if trace is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception as e:
+        trace.add(kind, op, target, started, time.perf_counter(), error=type(e).__name__)
+        raise
+    trace.add(kind, op, target, started, time.perf_counter())
+
+
+def sheet_span(worksheet: Any, method: str, args: Sequence[Any] = ()):
+    """gspread 호출 span (target = 워크시트!범위)"""
+    title = worksheet if isinstance(worksheet, str) else getattr(worksheet, "title", "-")
+    rng = sheet_range(method, args)
+    return span("sheets", method, f"{title}!{rng}" if rng else str(title))
+
+
+def url_target(url: Any) -> str:
+    """URL → 경로만 (쿼리/호스트 제외)"""
+    text = str(url)
+    return urlsplit(text).path or text
@@ -0,0 +1,295 @@
+# =====================================================
+# 표준 라이브러리
+# =====================================================
+import os
+import time
+import random
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional, Tuple, Union
+
+# =====================================================
+# 외부 라이브러리
+# =====================================================
+import requests
+from urllib3.exceptions import NewConnectionError
+
+# =====================================================
+# 프로젝트: utils
+# =====================================================
+from utils.metrics import BACKOFFS, RATE_LIMITED, UPSTREAM_LATENCY
+from utils.tracing import record_span, url_target
+
+# =====================================================
+# 재시도 대상
+# =====================================================
+RETRY_STATUS = {429, 502, 503, 504}
+RETRY_EXCEPTIONS = (requests.ConnectionError, requests.Timeout)
+# 서버가 처리 전에 거절한 응답 (멱등이 보장되지 않는 쓰기도 재시도 가능)
+UNSENT_RETRY_STATUS = {429, 503}
+
+
+def request_not_sent(exc: BaseException) -> bool:
+    """
+    연결 자체가 안 된 실패인지 (요청이 서버에 닿지 않았음이 확실 → 쓰기도 재시도 가능)
+    - 연결 타임아웃, 연결 거부/이름 해석 실패(NewConnectionError)
+    - 읽기 타임아웃 / 응답 도중 끊김은 서버가 이미 처리했을 수 있으므로 False
+    """
+    if isinstance(exc, requests.ConnectTimeout):
+        return True
+    if isinstance(exc, requests.ConnectionError) and exc.args:
+        reason = getattr(exc.args[0], "reason", exc.args[0])
+        return isinstance(reason, NewConnectionError)
+    return False
+
+
+class CircuitOpenError(requests.RequestException):
+    """서킷이 열려 있어 요청을 보내지 않고 즉시 실패"""
+
+    def __init__(self, service: str, retry_after: float):
+        super().__init__(f"{service} 서킷 열림 (약 {retry_after:.0f}초 후 재시도)")
+        self.service = service
+        self.retry_after = retry_after
+
+
+# ======================================================================================
+# ✅ 서비스별 설정
+# ======================================================================================
+@dataclass(frozen=True)
+class UpstreamConfig:
+    """서비스별 타임아웃 / 재시도 / 서킷 설정 (환경변수 UPSTREAM_<NAME>_<항목> 으로 덮어쓰기)"""
+    name: str
+    connect_timeout: float = 3.0
+    read_timeout: float = 30.0
+    retries: int = 2                 # 멱등 요청의 추가 시도 횟수
+    backoff: float = 0.5             # 백오프 기본값(초), 시도마다 2배 + full jitter
+    backoff_max: float = 5.0
+    failure_threshold: int = 5       # 연속 실패 몇 번이면 서킷 열림
+    reset_timeout: float = 30.0      # 열린 뒤 몇 초 후 시험 요청 허용
+
+    @classmethod
+    def from_env(cls, name: str, **defaults) -> "UpstreamConfig":
+        base = cls(name=name, **defaults)
+        prefix = f"UPSTREAM_{name.upper()}_"
+        overrides = {}
+        for field, value in asdict(base).items():
+            raw = os.getenv(prefix + field.upper())
+            if field != "name" and raw not in (None, ""):
+                overrides[field] = type(value)(raw)
+        return cls(**{**asdict(base), **overrides})
+
+
+# ======================================================================================
+# ✅ 서킷 브레이커
+# ======================================================================================
+class CircuitBreaker:
+    """
+    closed → (연속 실패 failure_threshold 회) → open → (reset_timeout 경과) → half_open
+    - half_open: 시험 요청 1개만 통과, 성공하면 closed / 실패하면 다시 open
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.total_failures = 0
+        self.total_short_circuits = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> Tuple[bool, float]:
+        """(요청 허용 여부, 허용 안 될 때 남은 대기 시간)"""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True, 0.0
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True, 0.0
+            self.total_short_circuits += 1
+            remaining = max(0.0, self.reset_timeout - (time.monotonic() - (self._opened_at or 0.0)))
+            return False, remaining
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self.total_failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """결과를 알 수 없이 끝난 시험 요청(취소 / 중단) → 다음 요청이 다시 시험하도록 자리만 반환"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = self._state()
+            opened_for = (time.monotonic() - self._opened_at) if self._opened_at is not None else None
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opened_for": round(opened_for, 1) if opened_for is not None else None,
+                "total_failures": self.total_failures,
+                "total_short_circuits": self.total_short_circuits,
+            }
+
+
+# ======================================================================================
+# ✅ 외부 서비스 공용 클라이언트 (타임아웃 / 재시도 / 서킷)
+# ======================================================================================
+Timeout = Union[None, float, Tuple[float, float]]
+
+
+class UpstreamClient:
+    """
+    서비스 1개 전용 HTTP 클라이언트 (requests.Session 재사용 → 연결 풀)
+
+    - request(): 응답 객체 반환 (raise_for_status 는 호출부에서)
+    - idempotent=True 인 요청만 연결 오류/타임아웃/429·5xx 에서 재시도
+    - retry_unsent=True (멱등 보장 없는 쓰기): 서버가 처리하지 않은 게 확실한 실패만 재시도
+      (연결 실패, 429/503) → 읽기 타임아웃/502/504 뒤에는 중복 저장될 수 있어 재시도하지 않음
+    - 연결 오류/타임아웃/그 밖의 requests 오류/5xx 는 서킷 실패로 기록, 그 외 응답(4xx 포함)은 성공으로 기록
+    - 서킷이 열려 있으면 CircuitOpenError (requests.RequestException 하위 → 기존 except 그대로 동작)
+    """
+
+    def __init__(self, config: UpstreamConfig, session: Optional[requests.Session] = None):
+        self.config = config
+        self.name = config.name
+        self.session = session or requests.Session()
+        self.breaker = CircuitBreaker(config.failure_threshold, config.reset_timeout)
+        self.calls = 0
+        self.retried = 0
+
+    def _timeout(self, timeout: Timeout) -> Tuple[float, float]:
+        if isinstance(timeout, tuple):
+            return timeout
+        if timeout is not None:
+            return (self.config.connect_timeout, float(timeout))
+        return (self.config.connect_timeout, self.config.read_timeout)
+
+    def _sleep_before_retry(self, attempt: int) -> None:
+        BACKOFFS.inc(source=self.name)
+        cap = min(self.config.backoff_max, self.config.backoff * (2 ** attempt))
+        time.sleep(random.uniform(0, cap))
+
+    def _observe(self, started: float, status: Optional[int], method: str = "", url: str = "") -> None:
+        """시도 1회 지연/결과 기록 + 요청 추적 span (status None = 연결 오류/타임아웃)"""
+        record_span(self.name, method, url_target(url), started,
+                    status=status, error="connection" if status is None else None)
+        if status is None or status >= 500:
+            outcome = "error"
+        elif status == 429:
+            outcome = "rate_limited"
+            RATE_LIMITED.inc(source=self.name)
+        else:
+            outcome = "client_error" if status >= 400 else "ok"
+        UPSTREAM_LATENCY.observe(time.perf_counter() - started, service=self.name, outcome=outcome)
+
+    def request(self, method: str, url: str, idempotent: bool = False, retry_unsent: bool = False,
+                timeout: Timeout = None, **kwargs) -> requests.Response:
+        attempts = 1 + (self.config.retries if idempotent or retry_unsent else 0)
+        retry_status = RETRY_STATUS if idempotent else UNSENT_RETRY_STATUS
+        kwargs["timeout"] = self._timeout(timeout)
+
+        for attempt in range(attempts):
+            allowed, retry_after = self.breaker.allow()
+            if not allowed:
+                raise CircuitOpenError(self.name, retry_after)
+
+            self.calls += 1
+            last = attempt == attempts - 1
+            started = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except RETRY_EXCEPTIONS as e:
+                self._observe(started, None, method, url)
+                self.breaker.record_failure()
+                if last or not (idempotent or request_not_sent(e)):
+                    raise
+                self.retried += 1
+                self._sleep_before_retry(attempt)
+                continue
+            except requests.RequestException:
+                # 재시도하지 않는 요청 오류 (ChunkedEncodingError / TooManyRedirects …) 도 실패로 기록
+                self._observe(started, None, method, url)
+                self.breaker.record_failure()
+                raise
+            except BaseException:
+                self.breaker.release_trial()
+                raise
+
+            self._observe(started, response.status_code, method, url)
+            if response.status_code >= 500:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+            if response.status_code in retry_status and not last:
+                self.retried += 1
+                self._sleep_before_retry(attempt)
+                continue
+            return response
+
+        raise RuntimeError("unreachable")   # pragma: no cover
+
+    def get(self, url: str, idempotent: bool = True, **kwargs) -> requests.Response:
+        return self.request("GET", url, idempotent=idempotent, **kwargs)
+
+    def post(self, url: str, idempotent: bool = False, **kwargs) -> requests.Response:
+        return self.request("POST", url, idempotent=idempotent, **kwargs)
+
+    def health(self) -> Dict[str, Any]:
+        return {
+            **self.breaker.snapshot(),
+            "calls": self.calls,
+            "retried": self.retried,
+            "connect_timeout": self.config.connect_timeout,
+            "read_timeout": self.config.read_timeout,
+            "retries": self.config.retries,
+        }
+
+
+# ======================================================================================
+# ✅ 서비스 등록 + 상태 조회
+# ======================================================================================
+UPSTREAMS: Dict[str, UpstreamClient] = {
+    "openai": UpstreamClient(UpstreamConfig.from_env(
+        "openai", connect_timeout=5.0, read_timeout=60.0, retries=2)),
+    "memberslist": UpstreamClient(UpstreamConfig.from_env(
+        "memberslist", connect_timeout=3.0, read_timeout=20.0, retries=2)),
+    "impact": UpstreamClient(UpstreamConfig.from_env(
+        "impact", connect_timeout=3.0, read_timeout=30.0, retries=1)),
+}
+
+
+def get_upstream(name: str) -> UpstreamClient:
+    """등록된 서비스 클라이언트 (없으면 KeyError)"""
+    return UPSTREAMS[name]
+
+
+def upstream_health() -> Dict[str, Any]:
+    """서비스별 서킷 상태 + 호출 통계, 하나라도 open 이면 degraded"""
+    services = {name: client.health() for name, client in UPSTREAMS.items()}
+    degraded = any(s["state"] == "open" for s in services.values())
+    return {"status": "degraded" if degraded else "ok", "services": services}
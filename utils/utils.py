@@ -7,13 +7,20 @@ import io
 import time
 import json
 import base64
+import copy
 import calendar
-import logging
-import inspect
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 from flask import request, g
 from utils.sheets import get_worksheet
+from utils.dispatch import get_intent_handler
+from utils.image import prepare_image_for_vision, VISION_TIMEOUT
+from utils.disk_cache import get_vision_cache, vision_cache_key
+from utils.upstream import get_upstream
+from utils.cache import SWRCache
+from utils.shared_cache import on_sheet_invalidated
+from utils.log import get_logger
+from utils.metrics import record_openai_usage
 
 # =====================================================
 # 외부 라이브러리
@@ -34,6 +41,8 @@ from utils.sheets import (
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_API_URL = os.getenv("OPENAI_API_URL")
 
+logger = get_logger(__name__)
+
 
 def get_member_fields() -> list:
     """
@@ -58,9 +67,9 @@ def get_member_fields() -> list:
 # ======================================================================================
 def simulate_delay(seconds: int = 1):
     """작업 시작/완료를 출력하며 지정된 시간만큼 대기 (디버그용)"""
-    print("작업 시작")
+    logger.debug("작업 시작")
     time.sleep(seconds)
-    print("작업 완료")
+    logger.debug("작업 완료")
 
 
 
@@ -107,7 +116,7 @@ def process_order_date(raw_date: str) -> str:
             return f"{int(y):04d}-{int(m):02d}-{int(d):02d}"
 
     except Exception as e:
-        print(f"[날짜 파싱 오류] {e}")
+        logger.warning("날짜 파싱 오류: %s", e)
 
     return now_kst().strftime('%Y-%m-%d')
 
@@ -308,9 +317,7 @@ def clean_member_query(text: str) -> str:
 
     # ✅ 디버그 로그 출력
     if removed_tokens:
-        print(f"[clean_member_query] 원문: '{original}'")
-        print(f"[clean_member_query] 제거된 토큰: {removed_tokens}")
-        print(f"[clean_member_query] 최종 query: '{cleaned}'")
+        logger.debug("clean_member_query 원문=%r 제거된 토큰=%s 최종 query=%r", original, removed_tokens, cleaned)
 
     return cleaned
 
@@ -347,9 +354,7 @@ def clean_memo_query(text: str, intent: str = None) -> str:
             text = text.replace(t, "")
 
     if removed_tokens:
-        print(f"[clean_memo_query] 원문: '{original}'")
-        print(f"[clean_memo_query] 제거된 토큰: {removed_tokens}")
-        print(f"[clean_memo_query] 최종 query: '{text.strip()}'")
+        logger.debug("clean_memo_query 원문=%r 제거된 토큰=%s 최종 query=%r", original, removed_tokens, text.strip())
 
     return text.strip()
 
@@ -439,17 +444,6 @@ def match_condition(text: str, keywords: list[str], mode: str = "any") -> bool:
 # utils_search
 # ======================================================================================
 
-# ---------------------------------------------------------
-# 로거 설정 (중복 방지 포함)
-# ---------------------------------------------------------
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-if not logger.handlers:  # ✅ 중복 방지
-    handler = logging.StreamHandler()  # 콘솔 출력
-    formatter = logging.Formatter("[%(asctime)s] %(levelname)s in %(module)s: %(message)s")
-    handler.setFormatter(formatter)
-    logger.addHandler(handler)
-
 from utils.sheets import get_member_sheet
 
 
@@ -710,23 +704,23 @@ def searchMemberByNaturalText(query: str):
     """
 
     query = query.strip().lower()
-    logger.info(f"searchMemberByNaturalText called with query='{query}'")
+    logger.debug("searchMemberByNaturalText called with query=%r", query)
 
     # ✅ "코드a" 또는 "코드 a"
     if query in ["코드a", "코드 a"]:
-        logger.info("→ 특수 규칙 매칭: 코드=A")
+        logger.debug("→ 특수 규칙 매칭: 코드=A")
         return find_all_members_from_sheet("DB", field="코드", value="A")
 
     # ✅ "코드 + 알파벳" 패턴
     if query.startswith("코드"):
         code_value = query.replace("코드", "").strip().upper()
         if code_value:
-            logger.info(f"→ 코드 패턴 매칭: 코드={code_value}")
+            logger.debug("→ 코드 패턴 매칭: 코드=%s", code_value)
             return find_all_members_from_sheet("DB", field="코드", value=code_value)
 
     # ✅ fallback 경로
     conditions = fallback_natural_search(query)
-    logger.info(f"→ fallback 경로 실행, conditions={conditions}")
+    logger.debug("→ fallback 경로 실행, conditions=%s", conditions)
     return search_members(get_gsheet_data(), conditions)
 
 
@@ -801,11 +795,21 @@ def find_member_in_text(text: str) -> str | None:
 
     sheet = get_member_sheet()
     member_names = sheet.col_values(1)[1:]  # 첫 행은 헤더 제외
+    return match_member_name(text, member_names)
+
+
+def match_member_name(text: str, member_names) -> str | None:
+    """
+    회원명 목록 중 문장에 포함된 이름 반환 (시트 조회 없음)
+    - 긴 이름 우선 (예: '김철수' > '김')
+    """
+    if not text:
+        return None
 
     # 긴 이름부터 매칭되도록 정렬 (예: '김철수' > '김')
-    member_names = sorted([n.strip() for n in member_names if n], key=len, reverse=True)
+    names = sorted({str(n).strip() for n in member_names if n and str(n).strip()}, key=len, reverse=True)
 
-    for name in member_names:
+    for name in names:
         if name in text:
             return name
     return None
@@ -927,15 +931,6 @@ def filter_results_by_member(results, member_name):
 
 
 
-# 로거 설정
-logger = logging.getLogger("utils_memo")
-logger.setLevel(logging.DEBUG)
-if not logger.handlers:  # 중복 등록 방지
-    ch = logging.StreamHandler()
-    ch.setLevel(logging.DEBUG)
-    formatter = logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s')
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
 
 
 
@@ -949,7 +944,7 @@ def handle_search_memo(data: dict):
     # 1) 자연어 요청 (text 필드가 있는 경우)
     if "text" in data:
         query = data["text"].strip()
-        logger.info(f"[FromText-Direct] text 필드 감지 → searchMemoFromText 실행 | query='{query}'")
+        logger.debug("[FromText-Direct] text 필드 감지 → searchMemoFromText 실행 | query=%r", query)
 
         res = call_searchMemoFromText({"text": query})
 
@@ -975,7 +970,7 @@ def handle_search_memo(data: dict):
             date_text = f"{data['start_date']}부터 {data['end_date']}까지"
 
         query = f"{mode}일지 검색 {search_mode_text} {date_text}".strip()
-        logger.info(f"[FromText-Converted] keywords 없음 → query 변환 후 searchMemoFromText 실행 | query='{query}'")
+        logger.debug("[FromText-Converted] keywords 없음 → query 변환 후 searchMemoFromText 실행 | query=%r", query)
 
         res = call_searchMemoFromText({"text": query})
 
@@ -993,7 +988,7 @@ def handle_search_memo(data: dict):
         return res
 
     # 3) 정상 content 기반 요청 → searchMemo 실행
-    logger.info(f"[Content-Mode] keywords 감지 → searchMemo 실행 | keywords={data.get('keywords')}, mode={data.get('mode')}")
+    logger.debug("[Content-Mode] keywords 감지 → searchMemo 실행 | keywords=%s, mode=%s", data.get("keywords"), data.get("mode"))
     return call_searchMemo(data)
 
 
@@ -1020,15 +1015,70 @@ if not MEMBERSLIST_API_URL:
     raise RuntimeError("❌ 환경변수 MEMBERSLIST_API_URL 이 설정되지 않았습니다. .env 파일을 확인하세요.")
 
 
+# ✅ searchMemo 응답 캐시 (같은 검색을 연달아 보내도 원격 호출 1회)
+MEMO_SEARCH_CACHE_TTL = float(os.getenv("MEMO_SEARCH_CACHE_TTL", "30"))       # 그대로 반환(초)
+MEMO_SEARCH_STALE_TTL = float(os.getenv("MEMO_SEARCH_STALE_TTL", "120"))      # 이전 값 반환 + 백그라운드 갱신(초)
+MEMO_SEARCH_CACHE_SIZE = int(os.getenv("MEMO_SEARCH_CACHE_SIZE", "256"))
+
+memo_search_cache = SWRCache(MEMO_SEARCH_CACHE_TTL, MEMO_SEARCH_STALE_TTL, MEMO_SEARCH_CACHE_SIZE)
+
+# 원격 searchMemo 가 읽는 일지 시트 → 이 앱에서 고치면 검색 캐시 비움 (저장 직후 검색에 바로 보이도록)
+# ⚠️ 워커별 캐시 → 다른 워커는 최대 MEMO_SEARCH_CACHE_TTL + MEMO_SEARCH_STALE_TTL 동안 이전 결과를 볼 수 있음
+MEMO_SEARCH_SHEETS = ("상담일지", "개인일지", "활동일지")
+
+
+@on_sheet_invalidated
+def _invalidate_memo_search(sheet_name: str) -> None:
+    if sheet_name in MEMO_SEARCH_SHEETS:
+        memo_search_cache.invalidate()
+
+_MEMO_DATE_FIELDS = ("start_date", "end_date", "date")
+
+
+def memo_search_cache_key(kind: str, payload: dict) -> str:
+    """
+    검색 payload → 캐시 키 (의미가 같은 검색은 같은 키)
+    - keywords: 공백 정리, 중복 제거, 정렬 (문자열이면 공백 기준 분리)
+    - start_date / end_date / date: YYYY-MM-DD 로 통일 (해석 실패 시 원문)
+    - 그 밖의 문자열: 앞뒤 공백 제거 + 연속 공백 1개로
+    - 빈 값(None, "", []) 은 생략
+    """
+    canonical = {}
+    for key, value in (payload or {}).items():
+        if key == "keywords":
+            words = value.split() if isinstance(value, str) else [str(v) for v in (value or [])]
+            value = sorted({w.strip() for w in words if w and w.strip()})
+        elif key in _MEMO_DATE_FIELDS and isinstance(value, str):
+            dt = parse_dt(value)
+            value = dt.strftime("%Y-%m-%d") if dt else value.strip()
+        elif isinstance(value, str):
+            value = " ".join(value.split())
+        if value in (None, "", [], {}):
+            continue
+        canonical[key] = value
+    return kind + ":" + json.dumps(canonical, ensure_ascii=False, sort_keys=True, default=str)
+
+
+def _post_search_memo(payload: dict):
+    url = f"{MEMBERSLIST_API_URL.rstrip('/')}/search_memo"
+    r = get_upstream("memberslist").post(url, json=payload, idempotent=True)   # 조회 → 재시도 허용
+    r.raise_for_status()
+    return r.json().get("results", [])
+
+
+def _cached_search_memo(kind: str, payload: dict):
+    key = memo_search_cache_key(kind, payload)
+    results = memo_search_cache.get_or_fetch(key, lambda: _post_search_memo(payload))
+    return copy.deepcopy(results)   # 호출부에서 결과를 고쳐도 캐시는 그대로
+
+
 def call_searchMemo(payload: dict):
     """
     searchMemo API 호출 (키워드 기반 검색)
+    - memo_search_cache 경유 (TTL + stale-while-revalidate + 동시 요청 1회 호출)
     """
-    url = f"{MEMBERSLIST_API_URL.rstrip('/')}/search_memo"
     try:
-        r = requests.post(url, json=payload, timeout=30)
-        r.raise_for_status()
-        return r.json().get("results", [])
+        return _cached_search_memo("searchMemo", payload)
     except requests.RequestException as e:
         raise RuntimeError(f"❌ call_searchMemo 요청 실패: {e}")
 
@@ -1036,12 +1086,10 @@ def call_searchMemo(payload: dict):
 def call_searchMemoFromText(payload: dict):
     """
     searchMemoFromText API 호출 (자연어 검색)
+    - memo_search_cache 경유 (TTL + stale-while-revalidate + 동시 요청 1회 호출)
     """
-    url = f"{MEMBERSLIST_API_URL.rstrip('/')}/search_memo"
     try:
-        r = requests.post(url, json=payload, timeout=30)
-        r.raise_for_status()
-        return r.json().get("results", [])
+        return _cached_search_memo("searchMemoFromText", payload)
     except requests.RequestException as e:
         raise RuntimeError(f"❌ call_searchMemoFromText 요청 실패: {e}")
 
@@ -1185,34 +1233,15 @@ def parse_natural_query_multi(text: str):
 
 def run_intent_func(func, query=None, options=None, **extra_kwargs):
     """
-    함수 시그니처를 검사해 안전하게 실행하는 공통 유틸
+    함수 시그니처에 맞춰 안전하게 실행하는 공통 유틸
     - 인자 없음  → func()
     - 인자 1개   → func(query)
     - 인자 2개   → func(query, options)
     - *args/**kwargs 있으면 → query, options 전달 + extra_kwargs 병합
-    """
-    sig = inspect.signature(func)
-    params = sig.parameters
 
-    # 가변 인자 지원 여부 확인
-    has_var_positional = any(
-        p.kind == inspect.Parameter.VAR_POSITIONAL for p in params.values()
-    )
-    has_var_keyword = any(
-        p.kind == inspect.Parameter.VAR_KEYWORD for p in params.values()
-    )
-
-    param_count = len(params)
-
-    if param_count == 0:
-        return func()
-    elif param_count == 1 and not has_var_positional and not has_var_keyword:
-        return func(query)
-    elif param_count >= 2 and not (has_var_positional or has_var_keyword):
-        return func(query, options)
-    else:
-        # *args / **kwargs 지원 함수라면 → 최대한 풍부하게 전달
-        return func(query, options, **extra_kwargs)
+    ✅ 시그니처 분석은 함수별 1회만 (utils.dispatch.get_intent_handler 캐시)
+    """
+    return get_intent_handler(func)(query, options, **extra_kwargs)
 
 
 
@@ -1234,21 +1263,22 @@ def extract_order_from_uploaded_image(image_bytes):
     주문서 이미지에서 JSON 구조의 주문 데이터를 추출합니다.
     """
     import os
-    print("📌 [DEBUG] extract_order_from_uploaded_image 함수 호출됨")  # ✅ 디버깅 로그 추가
+    logger.debug("extract_order_from_uploaded_image 함수 호출됨")
 
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     OPENAI_API_URL = os.getenv("OPENAI_API_URL")
 
-    print(f"📌 [DEBUG] OPENAI_API_KEY 설정됨? {bool(OPENAI_API_KEY)}")
-    print(f"📌 [DEBUG] OPENAI_API_URL: {OPENAI_API_URL}")
+    logger.debug("OPENAI_API_KEY 설정됨? %s, OPENAI_API_URL: %s", bool(OPENAI_API_KEY), OPENAI_API_URL)
 
     if not OPENAI_API_KEY or not OPENAI_API_URL:
         return {
             "error": "❌ OPENAI_API_KEY 또는 OPENAI_API_URL 환경변수가 설정되지 않았습니다."
         }
 
-    image_base64 = base64.b64encode(image_bytes.getvalue()).decode("utf-8")
-    print(f"📌 [DEBUG] base64 변환 완료, 길이={len(image_base64)}")
+    # ✅ 전송 전 전처리 (EXIF 회전, 흑백, 축소, 재인코딩) → 절감량 리포트
+    prepared = prepare_image_for_vision(image_bytes)
+    image_stats = prepared.stats()
+    logger.debug("이미지 전처리: %s", image_stats)
 
     headers = {
         "Authorization": f"Bearer {OPENAI_API_KEY}",
@@ -1264,46 +1294,64 @@ def extract_order_from_uploaded_image(image_bytes):
         "필드: 제품명, 제품가격, PV, 주문자_고객명, 주문자_휴대폰번호, 배송처"
     )
 
-    payload = {
-        "model": "gpt-4o",
-        "messages": [
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": prompt},
-                    {"type": "image_url", "image_url": {
-                        "url": f"data:image/jpeg;base64,{image_base64}"
-                    }}
-                ]
-            }
-        ],
-        "temperature": 0
-    }
+    model = "gpt-4o"
 
-    try:
-        print(f"📌 [DEBUG] OpenAI API 호출 시작 → {OPENAI_API_URL}")
-        response = requests.post(OPENAI_API_URL, headers=headers, json=payload)
-        print(f"📌 [DEBUG] 응답 코드: {response.status_code}")
-        response.raise_for_status()
-        result_text = response.json()["choices"][0]["message"]["content"]
-        print(f"📌 [DEBUG] 응답 내용: {result_text[:200]}...")  # 앞 200자만 출력
-    except Exception as e:
-        print(f"❌ [DEBUG] OpenAI API 호출 실패: {str(e)}")
-        return {"error": f"OpenAI API 호출 실패: {str(e)}"}
+    # ✅ 같은 이미지+프롬프트+모델 → 디스크 캐시 응답 재사용 (동명이인 재시도, 중복 업로드)
+    cache = get_vision_cache()
+    cache_key = vision_cache_key(prepared.data, prompt, model)
+    result_text = cache.get(cache_key) if cache else None
+    cache_hit = result_text is not None
+
+    if cache_hit:
+        logger.debug("비전 캐시 적중: %.12s", cache_key)
+    else:
+        payload = {
+            "model": model,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": prompt},
+                        {"type": "image_url", "image_url": {
+                            "url": prepared.data_url()
+                        }}
+                    ]
+                }
+            ],
+            "temperature": 0
+        }
+
+        try:
+            logger.debug("OpenAI API 호출 시작 → %s", OPENAI_API_URL)
+            response = get_upstream("openai").post(
+                OPENAI_API_URL, headers=headers, json=payload, timeout=VISION_TIMEOUT, idempotent=True)
+            logger.debug("응답 코드: %s", response.status_code)
+            response.raise_for_status()
+            body = response.json()
+            record_openai_usage("order_image", body)
+            result_text = body["choices"][0]["message"]["content"]
+            logger.debug("응답 내용: %.200s...", result_text)  # 앞 200자만 출력
+        except Exception as e:
+            logger.error("OpenAI API 호출 실패: %s", e)
+            return {"error": f"OpenAI API 호출 실패: {str(e)}"}
 
     # ✅ 코드블록 제거
     clean_text = re.sub(r"```(?:json)?(.*?)```", r"\1", result_text, flags=re.DOTALL).strip()
-    print(f"📌 [DEBUG] 코드블록 제거 후 텍스트: {clean_text[:200]}...")
+    logger.debug("코드블록 제거 후 텍스트: %.200s...", clean_text)
 
     try:
         order_data = json.loads(clean_text)
         if not isinstance(order_data, dict) or "orders" not in order_data:
-            print("❌ [DEBUG] orders 필드 없음")
+            logger.warning("orders 필드 없음")
             return {"error": "orders 필드가 없습니다", "raw_text": result_text}
-        print("✅ [DEBUG] JSON 파싱 성공")
+        logger.debug("JSON 파싱 성공")
+        if cache and not cache_hit:
+            cache.set(cache_key, result_text)   # 파싱 성공한 응답만 저장
+        order_data["image_stats"] = image_stats
+        order_data["vision_cache"] = "hit" if cache_hit else "miss"
         return order_data
     except json.JSONDecodeError:
-        print("❌ [DEBUG] JSON 파싱 실패")
+        logger.warning("JSON 파싱 실패")
         return {"error": "JSON 파싱 실패", "raw_text": result_text}
 
 
@@ -1328,9 +1376,11 @@ def parse_order_from_text(text: str):
         "temperature": 0.0
     }
 
-    resp = requests.post(OPENAI_API_URL, headers=headers, json=payload)
+    resp = get_upstream("openai").post(OPENAI_API_URL, headers=headers, json=payload, idempotent=True)
     resp.raise_for_status()
-    return resp.json()
+    body = resp.json()
+    record_openai_usage("order_text", body)
+    return body
 
 
 